@@ -18,7 +18,7 @@ from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_GET
 from django.http import JsonResponse
-from django.db.models import Count, Case, When, IntegerField, Q
+from django.db.models import Count, Q
 from django.utils.translation import gettext as _
 from datetime import datetime, date
 from dateutil.relativedelta import relativedelta
@@ -39,9 +39,21 @@ from backends.studies.study_43en.models import (
     ENR_CONTACT,    # Contact enrollment
 )
 
+# Pre-aggregated per-site monthly counts (maintained by signals)
+from backends.studies.study_43en.services.rollup_service import (
+    DashboardRollupService,
+    PATIENT_ELIGIBLE_Q,
+)
+
+# Sample matrix (one conditional aggregate per SAM_* table)
+from backends.studies.study_43en.services.sample_stats_service import SampleStatsService
+
 # Import tenancy models (for site/study info)
 from backends.tenancy.models import Site, Study, StudySite
 
+# Shared response cache (invalidated by model signals)
+from backends.tenancy.utils.dashboard_cache import DashboardCache
+
 # Import sample models (with fallback)
 try:
     from backends.studies.study_43en.models.patient.SAM_CASE import SAM_CASE
@@ -50,6 +62,8 @@ except ImportError:
     SAM_CASE = None
     SAM_CONTACT = None
 
+from backends.studies.study_43en.models.rollup import SiteMonthlyRollup
+
 logger = logging.getLogger(__name__)
 
 # ============================================================================
@@ -228,6 +242,29 @@ def get_site_filter_with_validation(request):
     return site_filter, filter_type, allowed_sites, None
 
 
+def _dashboard_cache_scope(request):
+    """Cache scope for APIs filtered by the middleware site context."""
+    site_filter, filter_type = get_site_filter_params(request)
+    return DashboardCache.normalize_scope(site_filter, filter_type), None
+
+
+def _validated_dashboard_cache_scope(request):
+    """Cache scope for APIs accepting ?site= (403 returned before any cache lookup)."""
+    site_filter, filter_type, allowed_sites, error = get_site_filter_with_validation(request)
+    if error:
+        return None, error
+    return DashboardCache.normalize_scope(site_filter, filter_type), None
+
+
+def _kpneumoniae_cache_scope(request):
+    """Same as above, plus the user's allowed sites (echoed in the response)."""
+    site_filter, filter_type, allowed_sites, error = get_site_filter_with_validation(request)
+    if error:
+        return None, error
+    scope = DashboardCache.normalize_scope(site_filter, filter_type)
+    return f"{scope}|allowed:{','.join(allowed_sites)}", None
+
+
 # ============================================================================
 # MAIN MANAGEMENT REPORT VIEW
 # ============================================================================
@@ -262,46 +299,14 @@ def management_report(request):
     logger.info(f"Management Report loading - Site: {site_filter}, Type: {filter_type}")
     
     try:
-        # ===== OPTIMIZED: Single aggregation query for patient stats =====
-        # Instead of 2 separate count queries, use Case/When aggregation
-        # Note: SCR_CASE uses USUBJID as primary key, not 'id' - use 'pk' instead
-        patient_qs = get_filtered_queryset(SCR_CASE, site_filter, filter_type)
-        patient_stats = patient_qs.aggregate(
-            screening_patients=Count('pk'),
-            enrolled_patients=Count(
-                Case(
-                    When(
-                        UPPER16AGE=True,
-                        INFPRIOR2OR48HRSADMIT=True,
-                        ISOLATEDKPNFROMINFECTIONORBLOOD=True,
-                        KPNISOUNTREATEDSTABLE=False,
-                        CONSENTTOSTUDY=True,
-                        is_confirmed=True,
-                        then=1
-                    ),
-                    output_field=IntegerField()
-                )
-            )
-        )
-        screening_patients = patient_stats['screening_patients']
-        enrolled_patients = patient_stats['enrolled_patients']
+        # ===== ROLLUP: one query over SiteMonthlyRollup =====
+        summary = _get_summary_counts(site_filter, filter_type)
+        screening_patients = summary['screening_patients']
+        enrolled_patients = summary['enrolled_patients']
+        screening_contacts = summary['screening_contacts']
+        enrolled_contacts = summary['enrolled_contacts']
         
         logger.debug(f"Patients - Screening: {screening_patients}, Enrolled: {enrolled_patients}")
-        
-        # ===== OPTIMIZED: Single aggregation query for contact stats =====
-        # Instead of 2 separate count queries for SCR_CONTACT and ENR_CONTACT
-        screening_contacts = get_filtered_queryset(
-            SCR_CONTACT,
-            site_filter,
-            filter_type
-        ).count()
-        
-        enrolled_contacts = get_filtered_queryset(
-            ENR_CONTACT,
-            site_filter,
-            filter_type
-        ).count()
-        
         logger.debug(f"Contacts - Screening: {screening_contacts}, Enrolled: {enrolled_contacts}")
         
         # ===== SITE PERMISSIONS =====
@@ -426,6 +431,15 @@ def _get_study_name(request):
         return ""
 
 
+def _get_filter_sites(site_filter, filter_type):
+    """Site list for SampleStatsService (None = all sites)."""
+    if filter_type == 'single':
+        return [site_filter]
+    if filter_type == 'multiple':
+        return list(site_filter or [])
+    return None
+
+
 def _get_site_display_name(site_filter, filter_type):
     """
     Generate human-readable site name for display.
@@ -552,11 +566,54 @@ def _calculate_target_cumulative(filter_type, site_filter, site_target, site_sta
     return target_cumulative
 
 
+# Summary card → rollup metric
+SUMMARY_METRICS = {
+    'screening_patients': 'patient_screening',
+    'enrolled_patients': 'patient_eligible',
+    'screening_contacts': 'contact_screening',
+    'enrolled_contacts': 'contact_enrollment',
+}
+
+
+def _get_summary_counts(site_filter, filter_type):
+    """
+    Get the four summary counts for the management report.
+    
+    Reads SiteMonthlyRollup (one query). Falls back to live counts when
+    the rollup has no row for the scope (not built yet / no data).
+    
+    Args:
+        site_filter: site code(s)
+        filter_type: 'all' | 'single' | 'multiple'
+        
+    Returns:
+        dict: screening_patients, enrolled_patients, screening_contacts, enrolled_contacts
+    """
+    totals = DashboardRollupService(DB_ALIAS).totals(
+        list(SUMMARY_METRICS.values()), site_filter, filter_type
+    )
+    if totals is not None:
+        return {key: totals[metric] for key, metric in SUMMARY_METRICS.items()}
+    
+    # Live fallback - Note: SCR_CASE uses USUBJID as primary key, use 'pk'
+    patient_stats = get_filtered_queryset(SCR_CASE, site_filter, filter_type).aggregate(
+        screening_patients=Count('pk'),
+        enrolled_patients=Count('pk', filter=PATIENT_ELIGIBLE_Q),
+    )
+    return {
+        'screening_patients': patient_stats['screening_patients'],
+        'enrolled_patients': patient_stats['enrolled_patients'],
+        'screening_contacts': get_filtered_queryset(SCR_CONTACT, site_filter, filter_type).count(),
+        'enrolled_contacts': get_filtered_queryset(ENR_CONTACT, site_filter, filter_type).count(),
+    }
+
+
 def _calculate_actual_cumulative(site_filter, filter_type, months, month_dates):
     """
     Calculate actual cumulative enrollment from database.
     
-    Optimized version using database-level aggregation.
+    Reads per-month ENR_CASE counts and last ENRDATE from SiteMonthlyRollup
+    (no scan of ENR_CASE, no separate Max query).
     
     Args:
         site_filter: site code(s)
@@ -567,37 +624,20 @@ def _calculate_actual_cumulative(site_filter, filter_type, months, month_dates):
     Returns:
         tuple: (actual_cumulative: list, last_enrollment_date: date or None)
     """
-    from django.db.models.functions import TruncMonth, ExtractYear, ExtractMonth
-    from django.db.models import Max
-    from collections import Counter
+    monthly = DashboardRollupService(DB_ALIAS).monthly('patient_enrollment', site_filter, filter_type)
     
-    # Get base queryset with only needed fields
-    base_qs = get_filtered_queryset(
-        ENR_CASE, site_filter, filter_type
-    ).filter(ENRDATE__isnull=False).only('ENRDATE')
-    
-    # Get last enrollment date and count by month in a single pass
-    # Using database-level aggregation for better performance
-    # Use 'pk' instead of 'id' as model uses USUBJID as primary key
-    monthly_counts = (
-        base_qs
-        .annotate(
-            enr_year=ExtractYear('ENRDATE'),
-            enr_month=ExtractMonth('ENRDATE')
+    if monthly is None:
+        monthly = _get_live_monthly_counts(
+            ENR_CASE, site_filter, filter_type, 'ENRDATE', None, None
         )
-        .values('enr_year', 'enr_month')
-        .annotate(count=Count('pk'))
-        .order_by('enr_year', 'enr_month')
-    )
-    
-    # Get max date efficiently
-    last_enrollment_date = base_qs.aggregate(max_date=Max('ENRDATE'))['max_date']
     
     # Build month key -> count mapping
-    enrollment_by_month = {}
-    for row in monthly_counts:
-        month_key = f"{row['enr_month']:02d}/{row['enr_year']}"
-        enrollment_by_month[month_key] = row['count']
+    enrollment_by_month = {
+        month.strftime('%m/%Y'): count
+        for month, (count, last_date) in monthly.items()
+    }
+    last_dates = [last_date for count, last_date in monthly.values() if last_date]
+    last_enrollment_date = max(last_dates) if last_dates else None
     
     # Build cumulative array
     actual_cumulative = []
@@ -623,14 +663,51 @@ def _calculate_actual_cumulative(site_filter, filter_type, months, month_dates):
     return actual_cumulative, last_enrollment_date
 
 
-def _get_monthly_counts(model, site_filter, filter_type, date_field, start_date, end_date, months, extra_filters=None):
+def _get_live_monthly_counts(model, site_filter, filter_type, date_field, start_date, end_date, extra_filters=None):
+    """
+    Group a CRF table by month directly (fallback / partial months).
+    
+    Returns:
+        dict: {month_date: (count, last_date)}
+    """
+    from django.db.models.functions import TruncMonth
+    from django.db.models import Max
+    
+    qs = get_filtered_queryset(model, site_filter, filter_type).filter(
+        **{f'{date_field}__isnull': False}
+    )
+    if start_date:
+        qs = qs.filter(**{f'{date_field}__gte': start_date})
+    if end_date:
+        qs = qs.filter(**{f'{date_field}__lte': end_date})
+    if extra_filters:
+        qs = qs.filter(**extra_filters)
+    
+    # Use 'pk' instead of 'id' as models may use custom primary keys
+    monthly_counts = (
+        qs
+        .annotate(record_month=TruncMonth(date_field))
+        .values('record_month')
+        .annotate(count=Count('pk'), last_date=Max(date_field))
+        .order_by()
+    )
+    return {
+        row['record_month']: (row['count'], row['last_date'])
+        for row in monthly_counts
+    }
+
+
+def _get_monthly_counts(model, metric, site_filter, filter_type, date_field, start_date, end_date, months, extra_filters=None):
     """
     Get counts per month for a model.
     
-    Optimized with database-level aggregation instead of Python iteration.
+    Whole months come from SiteMonthlyRollup. A partial first/last month
+    (start_date not on the 1st, end_date before month end) is counted live
+    over just those days, so results match a direct date-range query.
     
     Args:
-        model: Django model class
+        model: Django model class (used for partial months / fallback)
+        metric: str - rollup metric for this model + extra_filters
         site_filter: site code(s)
         filter_type: 'all' | 'single' | 'multiple'
         date_field: str - name of date field
@@ -642,36 +719,43 @@ def _get_monthly_counts(model, site_filter, filter_type, date_field, start_date,
     Returns:
         list: Count per month
     """
-    from django.db.models.functions import ExtractYear, ExtractMonth
+    first_month = start_date.replace(day=1)
+    last_month = end_date.replace(day=1)
     
-    qs = get_filtered_queryset(model, site_filter, filter_type).filter(
-        **{f'{date_field}__isnull': False},
-        **{f'{date_field}__gte': start_date},
-        **{f'{date_field}__lte': end_date},
-    )
-    
-    if extra_filters:
-        qs = qs.filter(**extra_filters)
-    
-    # Use database-level aggregation for better performance
-    # Use 'pk' instead of 'id' as models may use custom primary keys
-    monthly_counts = (
-        qs
-        .annotate(
-            record_year=ExtractYear(date_field),
-            record_month=ExtractMonth(date_field)
-        )
-        .values('record_year', 'record_month')
-        .annotate(count=Count('pk'))
-    )
+    # Months fully inside [start_date, end_date]
+    full_from = first_month if start_date == first_month else first_month + relativedelta(months=1)
+    full_to = last_month if end_date + relativedelta(days=1) == last_month + relativedelta(months=1) else last_month - relativedelta(months=1)
     
-    # Build month key -> count mapping
     counts_by_month = {}
-    for row in monthly_counts:
-        month_key = f"{row['record_month']:02d}/{row['record_year']}"
-        counts_by_month[month_key] = row['count']
     
-    return [counts_by_month.get(month, 0) for month in months]
+    if full_from <= full_to:
+        rollup = DashboardRollupService(DB_ALIAS).monthly(
+            metric, site_filter, filter_type, start_month=full_from, end_month=full_to
+        )
+        if rollup is None:
+            rollup = _get_live_monthly_counts(
+                model, site_filter, filter_type, date_field,
+                full_from, full_to + relativedelta(months=1, days=-1), extra_filters
+            )
+        counts_by_month.update(rollup)
+    
+    # Partial boundary months (live, indexed date range)
+    if start_date != full_from:
+        counts_by_month.update(_get_live_monthly_counts(
+            model, site_filter, filter_type, date_field,
+            start_date, min(end_date, first_month + relativedelta(months=1, days=-1)), extra_filters
+        ))
+    if last_month > full_to and (last_month != first_month or start_date == first_month):
+        counts_by_month.update(_get_live_monthly_counts(
+            model, site_filter, filter_type, date_field,
+            last_month, end_date, extra_filters
+        ))
+    
+    by_label = {
+        month.strftime('%m/%Y'): count
+        for month, (count, last_date) in counts_by_month.items()
+    }
+    return [by_label.get(month, 0) for month in months]
 
 
 # ============================================================================
@@ -680,6 +764,11 @@ def _get_monthly_counts(model, site_filter, filter_type, date_field, start_date,
 
 @require_GET
 @login_required
+@DashboardCache.cached_response(
+    STUDY_CODE, DB_ALIAS,
+    [SCR_CASE, ENR_CASE, SCR_CONTACT, ENR_CONTACT, SiteMonthlyRollup],
+    scope=_dashboard_cache_scope,
+)
 def get_dashboard_stats_api(request):
     """
     API endpoint to refresh dashboard statistics
@@ -705,29 +794,12 @@ def get_dashboard_stats_api(request):
     site_filter, filter_type = get_site_filter_params(request)
     
     try:
-        # Get counts
-        screening_patients = get_filtered_queryset(
-            SCR_CASE, site_filter, filter_type
-        ).count()
-        
-        enrolled_patients = get_filtered_queryset(
-            SCR_CASE, site_filter, filter_type
-        ).filter(
-            UPPER16AGE=True,
-            INFPRIOR2OR48HRSADMIT=True,
-            ISOLATEDKPNFROMINFECTIONORBLOOD=True,
-            KPNISOUNTREATEDSTABLE=False,
-            CONSENTTOSTUDY=True,
-            is_confirmed=True
-        ).count()
-        
-        screening_contacts = get_filtered_queryset(
-            SCR_CONTACT, site_filter, filter_type
-        ).count()
-        
-        enrolled_contacts = get_filtered_queryset(
-            ENR_CONTACT, site_filter, filter_type
-        ).count()
+        # Get counts (rollup, live fallback)
+        summary = _get_summary_counts(site_filter, filter_type)
+        screening_patients = summary['screening_patients']
+        enrolled_patients = summary['enrolled_patients']
+        screening_contacts = summary['screening_contacts']
+        enrolled_contacts = summary['enrolled_contacts']
         
         return JsonResponse({
             'success': True,
@@ -851,11 +923,12 @@ def get_monthly_screening_enrollment_api(request):
         
         # Get screening and enrollment data
         screening_data = _get_monthly_counts(
-            SCR_CASE, site_filter, filter_type, 'SCREENINGFORMDATE', start_date, end_date, months
+            SCR_CASE, 'patient_screening', site_filter, filter_type, 'SCREENINGFORMDATE',
+            start_date, end_date, months
         )
         enrollment_data = _get_monthly_counts(
-            SCR_CASE, site_filter, filter_type, 'SCREENINGFORMDATE', start_date, end_date, months,
-            extra_filters={'is_confirmed': True}
+            SCR_CASE, 'patient_screening_confirmed', site_filter, filter_type, 'SCREENINGFORMDATE',
+            start_date, end_date, months, extra_filters={'is_confirmed': True}
         )
         
         return JsonResponse({
@@ -907,11 +980,12 @@ def get_monthly_contact_stats_api(request):
         
         # Get screening and enrollment data using helper
         screening_data = _get_monthly_counts(
-            SCR_CONTACT, site_filter, filter_type, 'SCREENINGFORMDATE', start_date, end_date, months
+            SCR_CONTACT, 'contact_screening', site_filter, filter_type, 'SCREENINGFORMDATE',
+            start_date, end_date, months
         )
         enrollment_data = _get_monthly_counts(
-            SCR_CONTACT, site_filter, filter_type, 'SCREENINGFORMDATE', start_date, end_date, months,
-            extra_filters={'is_confirmed': True}
+            SCR_CONTACT, 'contact_screening_confirmed', site_filter, filter_type, 'SCREENINGFORMDATE',
+            start_date, end_date, months, extra_filters={'is_confirmed': True}
         )
         
         return JsonResponse({
@@ -937,6 +1011,11 @@ def get_monthly_contact_stats_api(request):
 
 @require_GET
 @login_required
+@DashboardCache.cached_response(
+    STUDY_CODE, DB_ALIAS,
+    [ENR_CASE, ENR_CONTACT, SAM_CASE, SAM_CONTACT],
+    scope=_validated_dashboard_cache_scope,
+)
 def get_sampling_followup_stats_api(request):
     """
     API endpoint for patient and contact sampling follow-up statistics.
@@ -958,41 +1037,38 @@ def get_sampling_followup_stats_api(request):
     if error:
         return error
     
-    def _get_visit_stats(samples_qs, visit_type):
+    def _get_visit_stats(visits, visit_type):
         """Get sampling stats for a specific visit type."""
-        visit_samples = samples_qs.filter(SAMPLE_TYPE=visit_type, SAMPLE=True)
         return {
-            'total': visit_samples.count(),
-            'blood': visit_samples.filter(BLOOD=True).count(),
+            'total': visits[visit_type]['sampled'],
+            'blood': visits[visit_type]['blood'],
         }
     
     try:
-        # ===== PATIENT SAMPLING STATISTICS =====
-        enrolled_patients = get_filtered_queryset(ENR_CASE, site_filter, filter_type).count()
+        service = SampleStatsService()
+        sites = _get_filter_sites(site_filter, filter_type)
+        subject_counts = service.subject_counts(sites).values()
         
-        patient_samples_qs = SAM_CASE.objects.filter(
-            USUBJID__in=get_filtered_queryset(ENR_CASE, site_filter, filter_type).values('USUBJID')
-        )
+        # ===== PATIENT SAMPLING STATISTICS =====
+        enrolled_patients = sum(counts['patients'] for counts in subject_counts)
+        patient_visits = service.by_visit(service.sample_matrix('patient', sites))
         
         patient_stats = {
-            'visit1': _get_visit_stats(patient_samples_qs, '1'),  # Day 1
-            'visit2': _get_visit_stats(patient_samples_qs, '2'),  # Day 10
-            'visit3': _get_visit_stats(patient_samples_qs, '3'),  # Day 28
-            'visit4': _get_visit_stats(patient_samples_qs, '4'),  # Day 90
+            'visit1': _get_visit_stats(patient_visits, '1'),  # Day 1
+            'visit2': _get_visit_stats(patient_visits, '2'),  # Day 10
+            'visit3': _get_visit_stats(patient_visits, '3'),  # Day 28
+            'visit4': _get_visit_stats(patient_visits, '4'),  # Day 90
         }
         
         # ===== CONTACT SAMPLING STATISTICS =====
-        enrolled_contacts = get_filtered_queryset(ENR_CONTACT, site_filter, filter_type).count()
-        
-        contact_samples_qs = SAM_CONTACT.objects.filter(
-            USUBJID__in=get_filtered_queryset(ENR_CONTACT, site_filter, filter_type).values('USUBJID')
-        )
+        enrolled_contacts = sum(counts['contacts'] for counts in subject_counts)
+        contact_visits = service.by_visit(service.sample_matrix('contact', sites))
         
         contact_stats = {
-            'visit1': _get_visit_stats(contact_samples_qs, '1'),  # Day 1
+            'visit1': _get_visit_stats(contact_visits, '1'),  # Day 1
             'visit2': {'total': None, 'blood': None},  # Not applicable for contacts
-            'visit3': _get_visit_stats(contact_samples_qs, '3'),  # Day 28
-            'visit4': _get_visit_stats(contact_samples_qs, '4'),  # Day 90
+            'visit3': _get_visit_stats(contact_visits, '3'),  # Day 28
+            'visit4': _get_visit_stats(contact_visits, '4'),  # Day 90
         }
         
         # ===== RETURN DATA =====
@@ -1023,6 +1099,11 @@ def get_sampling_followup_stats_api(request):
 
 @require_GET
 @login_required
+@DashboardCache.cached_response(
+    STUDY_CODE, DB_ALIAS,
+    [SCR_CASE, ENR_CASE, ENR_CONTACT, SAM_CASE, SAM_CONTACT],
+    scope=_kpneumoniae_cache_scope,
+)
 def get_kpneumoniae_isolation_stats_api(request):
     """
     API endpoint for K. pneumoniae isolation statistics from samples.
@@ -1038,37 +1119,25 @@ def get_kpneumoniae_isolation_stats_api(request):
         - Throat swab: Day 1, 10, 28, 90 (KLEBPNEU_3 positive / Total THROATSWAB)
         - Stool/Rectal: Day 1, 10, 28, 90 (KLEBPNEU_1 or KLEBPNEU_2 positive / Total STOOL or RECTSWAB)
     """
-    from django.db.models import Q
-    
     # Validate site access and get filter
     site_filter, filter_type, allowed_sites, error = get_site_filter_with_validation(request)
     if error:
         return error
     
-    def _get_sample_stat(samples_qs, day, sample_type, positive_filter):
-        """Get sample statistics for a specific day and sample type."""
-        try:
-            if sample_type == 'throat':
-                samples = samples_qs.filter(SAMPLE_TYPE=day, THROATSWAB=True)
-                total = samples.count()
-                positive = samples.filter(KLEBPNEU_3=True).count()
-            else:  # stool_rectal
-                samples = samples_qs.filter(SAMPLE_TYPE=day).filter(Q(STOOL=True) | Q(RECTSWAB=True))
-                total = samples.count()
-                positive = samples.filter(Q(KLEBPNEU_1=True) | Q(KLEBPNEU_2=True)).count()
-            return {
-                'positive': positive,
-                'total': total,
-                'display': f"{positive}/{total}" if total > 0 else "-"
-            }
-        except Exception as e:
-            logger.warning(f"Error getting {sample_type} samples day {day}: {e}")
-            return {'positive': 0, 'total': 0, 'display': "-"}
+    def _get_sample_stat(metrics, sample_type):
+        """Get sample statistics for one visit and sample type."""
+        positive = metrics[f'{sample_type}_kp']
+        total = metrics[f'{sample_type}_total']
+        return {
+            'positive': positive,
+            'total': total,
+            'display': f"{positive}/{total}" if total > 0 else "-"
+        }
     
-    def _get_all_sample_stats(samples_qs):
+    def _get_all_sample_stats(visits):
         """Get all sample statistics (throat and stool_rectal) for all days."""
-        throat = {f'day{day}': _get_sample_stat(samples_qs, day, 'throat', None) for day in ['1', '2', '3', '4']}
-        stool_rectal = {f'day{day}': _get_sample_stat(samples_qs, day, 'stool_rectal', None) for day in ['1', '2', '3', '4']}
+        throat = {f'day{day}': _get_sample_stat(visits[day], 'throat') for day in ['1', '2', '3', '4']}
+        stool_rectal = {f'day{day}': _get_sample_stat(visits[day], 'stool') for day in ['1', '2', '3', '4']}
         return throat, stool_rectal
     
     try:
@@ -1084,45 +1153,30 @@ def get_kpneumoniae_isolation_stats_api(request):
         else:  # 'all'
             sites_to_query = list(study_site_codes)
         
+        # One grouped query per table for all sites
+        service = SampleStatsService()
+        subject_counts = service.subject_counts(sites_to_query)
+        patient_matrix = service.sample_matrix('patient', sites_to_query)
+        contact_matrix = service.sample_matrix('contact', sites_to_query)
+        
         result_data = {}
         
         for site_code in sites_to_query:
             site_name = site_names_map.get(site_code, site_code)
+            counts = subject_counts[site_code]
             
             # ===== PATIENT DATA =====
-            patients = ENR_CASE.objects.filter(USUBJID__SITEID=site_code)
-            patient_count = patients.count()
+            patient_count = counts['patients']
             
             # Clinical Kp (patients with Klebsiella at enrollment/infection)
-            clinical_kp = SCR_CASE.objects.filter(
-                SITEID=site_code,
-                is_confirmed=True,
-                ISOLATEDKPNFROMINFECTIONORBLOOD=True
-            ).count()
-            
-            # Get patient samples for this site
-            try:
-                patient_samples = SAM_CASE.objects.filter(USUBJID__USUBJID__SITEID=site_code)
-            except Exception as e:
-                logger.warning(f"Could not access SAM_CASE for site {site_code}: {e}")
-                patient_samples = SAM_CASE.objects.none()
+            clinical_kp = counts['clinical_kp']
             
-            # Get patient sample stats using helper
-            patient_throat, patient_stool_rectal = _get_all_sample_stats(patient_samples)
+            patient_throat, patient_stool_rectal = _get_all_sample_stats(patient_matrix[site_code])
             
             # ===== CONTACT DATA =====
-            contacts = ENR_CONTACT.objects.filter(USUBJID__SITEID=site_code)
-            contact_count = contacts.count()
+            contact_count = counts['contacts']
             
-            # Get contact samples for this site
-            try:
-                contact_samples = SAM_CONTACT.objects.filter(USUBJID__USUBJID__SITEID=site_code)
-            except Exception as e:
-                logger.warning(f"Could not access SAM_CONTACT for site {site_code}: {e}")
-                contact_samples = SAM_CONTACT.objects.none()
-            
-            # Get contact sample stats using helper
-            contact_throat, contact_stool_rectal = _get_all_sample_stats(contact_samples)
+            contact_throat, contact_stool_rectal = _get_all_sample_stats(contact_matrix[site_code])
             
             # ===== BUILD SITE DATA =====
             result_data[site_code] = {
@@ -1159,3 +1213,18 @@ def get_kpneumoniae_isolation_stats_api(request):
         }, status=500)
 
 
+
+
+# ============================================================================
+# ASYNC VARIANTS (ASGI)
+# ============================================================================
+# Routed in urls.py. Cached APIs answer cache hits on the event loop; misses
+# (and the uncached chart APIs) run the sync view in the request's
+# thread-sensitive executor, so one ASGI worker serves many slow requests.
+
+get_dashboard_stats_api_async = DashboardCache.async_view(get_dashboard_stats_api)
+get_enrollment_chart_api_async = DashboardCache.async_view(get_enrollment_chart_api)
+get_monthly_screening_enrollment_api_async = DashboardCache.async_view(get_monthly_screening_enrollment_api)
+get_monthly_contact_stats_api_async = DashboardCache.async_view(get_monthly_contact_stats_api)
+get_sampling_followup_stats_api_async = DashboardCache.async_view(get_sampling_followup_stats_api)
+get_kpneumoniae_isolation_stats_api_async = DashboardCache.async_view(get_kpneumoniae_isolation_stats_api)
@@ -1,16 +1,26 @@
 # backends/api/studies/study_43en/services/signals.py
 
-from django.db.models.signals import post_save, pre_delete
+from django.db.models.signals import post_init, post_save, post_delete, pre_delete
+from django.apps import apps
 from django.dispatch import receiver
 from backends.studies.study_43en.models.patient import (
-    ENR_CASE, FU_CASE_28, FU_CASE_90, SAM_CASE
+    SCR_CASE, ENR_CASE, FU_CASE_28, FU_CASE_90, SAM_CASE
 )
 from backends.studies.study_43en.models.contact import (
-    ENR_CONTACT, FU_CONTACT_28, FU_CONTACT_90, SAM_CONTACT
+    SCR_CONTACT, ENR_CONTACT, FU_CONTACT_28, FU_CONTACT_90, SAM_CONTACT
 )
 from backends.studies.study_43en.models.schedule import (
     ExpectedCalendar, ExpectedDates, ContactExpectedDates, FollowUpStatus
 )
+from backends.studies.study_43en.services.rollup_service import (
+    DashboardRollupService, SOURCES_BY_MODEL, month_start
+)
+from backends.studies.study_43en.services.progress_service import (
+    SubjectProgressService, PROGRESS_SPECS, SOURCE_MODELS
+)
+from backends.tenancy.utils.dashboard_cache import DashboardCache
+from backends.audit_logs.utils.site_utils import track_site_models
+from backends.studies.blind_index import blind_index_values
 # Import trực tiếp PII models
 from backends.studies.study_43en.models.patient.PER_DATA import PERSONAL_DATA
 from backends.studies.study_43en.models.contact.PER_CONTACT_DATA import PERSONAL_CONTACT_DATA
@@ -115,7 +125,8 @@ def sync_enrollment_date_to_expected_dates(sender, instance, **kwargs):
                 SUBJECT_TYPE='PATIENT'
             ).update(
                 INITIAL=initial,
-                PHONE=phone
+                PHONE=phone,
+                **blind_index_values(FollowUpStatus, 'PHONE', phone)
             )
             
             if updated_count > 0:
@@ -157,7 +168,8 @@ def sync_enrollment_date_to_contact_expected_dates(sender, instance, **kwargs):
                 SUBJECT_TYPE='CONTACT'
             ).update(
                 INITIAL=initial,
-                PHONE=phone
+                PHONE=phone,
+                **blind_index_values(FollowUpStatus, 'PHONE', phone)
             )
             
             if updated_count > 0:
@@ -548,3 +560,137 @@ def delete_followup_status_on_sample_delete(sender, instance, **kwargs):
                 logger.info(f"Deleted {deleted_count} FollowUpStatus V2 (sample) for {instance.USUBJID.USUBJID.USUBJID}")
         except Exception as e:
             logger.error(f"Error deleting FollowUpStatus: {e}", exc_info=True)
+
+
+# ==========================================
+# DASHBOARD ROLLUP SIGNALS - Per-site monthly counts
+# ==========================================
+
+def _rollup_snapshot(instance, source):
+    """
+    (site or subject ref, date) from already-loaded attributes only
+
+    Reads instance.__dict__ so deferred fields never trigger a query;
+    returns None when the date field was not loaded.
+    """
+    values = instance.__dict__
+    if source.date_field not in values:
+        return None
+    ref = values.get('SITEID') if source.has_direct_site else values.get('USUBJID_id')
+    return ref, values.get(source.date_field)
+
+
+def _rollup_bucket(instance, source, snapshot, using):
+    """Resolve a snapshot to a (site, month) bucket"""
+    ref, record_date = snapshot
+    if source.has_direct_site:
+        site = ref or ''
+    else:
+        # ENR_* → SCR_*.SITEID (use the cached relation when available)
+        screening = instance._state.fields_cache.get('USUBJID')
+        if screening is not None:
+            site = screening.SITEID or ''
+        else:
+            screening_model = instance._meta.get_field('USUBJID').related_model
+            site = screening_model.objects.using(using).filter(
+                USUBJID=ref
+            ).values_list('SITEID', flat=True).first() or ''
+    return site, month_start(record_date)
+
+
+@receiver(post_init, sender=SCR_CASE)
+@receiver(post_init, sender=ENR_CASE)
+@receiver(post_init, sender=SCR_CONTACT)
+@receiver(post_init, sender=ENR_CONTACT)
+def snapshot_rollup_bucket(sender, instance, **kwargs):
+    """Remember the loaded bucket so a date/site change refreshes both months"""
+    instance._rollup_snapshot = _rollup_snapshot(instance, SOURCES_BY_MODEL[sender.__name__])
+
+
+@receiver(post_save, sender=SCR_CASE)
+@receiver(post_save, sender=ENR_CASE)
+@receiver(post_save, sender=SCR_CONTACT)
+@receiver(post_save, sender=ENR_CONTACT)
+def refresh_rollup_on_save(sender, instance, raw=False, using=None, **kwargs):
+    """Refresh the rollup buckets touched by a CRF save (after commit)"""
+    if raw:
+        return
+    using = using or 'db_study_43en'
+    try:
+        source = SOURCES_BY_MODEL[sender.__name__]
+        current = _rollup_snapshot(instance, source)
+        original = getattr(instance, '_rollup_snapshot', None)
+        
+        buckets = set()
+        if current is not None:
+            buckets.add(_rollup_bucket(instance, source, current, using))
+        if original is not None and original != current:
+            buckets.add(_rollup_bucket(instance, source, original, using))
+        
+        if buckets:
+            DashboardRollupService.schedule_refresh(sender.__name__, buckets, using=using)
+        instance._rollup_snapshot = current
+    except Exception as e:
+        logger.error(f"Error scheduling rollup refresh for {sender.__name__}: {e}", exc_info=True)
+
+
+@receiver(post_delete, sender=SCR_CASE)
+@receiver(post_delete, sender=ENR_CASE)
+@receiver(post_delete, sender=SCR_CONTACT)
+@receiver(post_delete, sender=ENR_CONTACT)
+def refresh_rollup_on_delete(sender, instance, using=None, **kwargs):
+    """Refresh the rollup bucket of a deleted CRF (after commit)"""
+    using = using or 'db_study_43en'
+    try:
+        source = SOURCES_BY_MODEL[sender.__name__]
+        snapshot = getattr(instance, '_rollup_snapshot', None) or _rollup_snapshot(instance, source)
+        if snapshot is not None:
+            DashboardRollupService.schedule_refresh(
+                sender.__name__, [_rollup_bucket(instance, source, snapshot, using)], using=using
+            )
+    except Exception as e:
+        logger.error(f"Error scheduling rollup refresh for {sender.__name__}: {e}", exc_info=True)
+
+
+# ==========================================
+# SUBJECT PROGRESS SIGNALS - patient_list / contact_list
+# ==========================================
+
+def refresh_subject_progress(sender, instance, raw=False, using=None, **kwargs):
+    """Refresh the progress row of the subject a CRF belongs to (after commit)"""
+    if raw:
+        return
+    using = using or 'db_study_43en'
+    try:
+        spec = PROGRESS_SPECS[SOURCE_MODELS[sender.__name__]]
+        if sender.__name__ in _SCREENING_MODELS:
+            SubjectProgressService.schedule_refresh(spec.kind, 'SCRID', instance.pk, using=using)
+        else:
+            SubjectProgressService.schedule_refresh(spec.kind, 'USUBJID', instance.USUBJID_id, using=using)
+    except Exception as e:
+        logger.error(f"Error scheduling progress refresh for {sender.__name__}: {e}", exc_info=True)
+
+
+_SCREENING_MODELS = {spec.screening_model_name for spec in PROGRESS_SPECS.values()}
+
+for _model_name in SOURCE_MODELS:
+    _model = apps.get_model('study_43en', _model_name)
+    post_save.connect(refresh_subject_progress, sender=_model, dispatch_uid=f"subject_progress_{_model_name}_save")
+    # Screening deletes cascade to the progress row
+    if _model_name not in _SCREENING_MODELS:
+        post_delete.connect(refresh_subject_progress, sender=_model, dispatch_uid=f"subject_progress_{_model_name}_delete")
+
+
+# ==========================================
+# DASHBOARD CACHE SIGNALS - Data versions
+# ==========================================
+
+# Every save/delete bumps the table's data version (after commit), which
+# invalidates the cached dashboard API responses reading that table.
+DashboardCache.track_models('db_study_43en', [
+    SCR_CASE, ENR_CASE, SCR_CONTACT, ENR_CONTACT, SAM_CASE, SAM_CONTACT,
+])
+
+# Site-filtered models: generation namespaces of cached query results
+# (site_utils.get_cached_result)
+track_site_models('db_study_43en', 'study_43en')
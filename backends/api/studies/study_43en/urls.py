@@ -35,29 +35,29 @@ urlpatterns = [
     path('dashboard/', dashboard.management_report, name='management_report'),
     
     path('api/dashboard-stats/', 
-         dashboard.get_dashboard_stats_api, 
+         dashboard.get_dashboard_stats_api_async, 
          name='dashboard_stats_api'),
     
     # Enrollment chart data
     path('api/enrollment-chart/', 
-         dashboard.get_enrollment_chart_api, 
+         dashboard.get_enrollment_chart_api_async, 
          name='enrollment_chart_api'),
     
     # Monthly screening & enrollment statistics
     path('api/patient-monthly-stats/', 
-         dashboard.get_monthly_screening_enrollment_api, 
+         dashboard.get_monthly_screening_enrollment_api_async, 
          name='patient_monthly_stats_api'),
 
     # Contact monthly screening & enrollment statistics
     path('api/contact-monthly-stats/', 
-         dashboard.get_monthly_contact_stats_api, 
+         dashboard.get_monthly_contact_stats_api_async, 
          name='contact_monthly_stats_api'),
     # Sampling follow-up (patient & contact)
     path('api/sampling-followup/', 
-         dashboard.get_sampling_followup_stats_api, 
+         dashboard.get_sampling_followup_stats_api_async, 
          name='sampling_followup_api'),
     path('api/kpneumoniae-isolation/', 
-         dashboard.get_kpneumoniae_isolation_stats_api, 
+         dashboard.get_kpneumoniae_isolation_stats_api_async, 
          name='kpneumoniae_isolation_api'),
 
     # ===== SCREENING CASE =====
@@ -228,6 +228,8 @@ urlpatterns = [
     path('export/', views_Base.export_data_page, name='export_data_page'),  
     path('export/download/', views_Base.export_data, name='export_data'),  
     path('export-excel/', views_Base.export_to_excel, name='export_to_excel'),
+    path('export/jobs/<int:job_id>/status/', views_Base.export_job_status, name='export_job_status'),
+    path('export/jobs/<int:job_id>/download/', views_Base.export_job_download, name='export_job_download'),
 
     # Audit Log URLs
     path('audit-logs/', views_audit.audit_log_list, name='audit_log_list'),
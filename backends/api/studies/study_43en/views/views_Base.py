@@ -5,11 +5,12 @@ from datetime import date
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import HttpResponse
 from django.core.paginator import Paginator
-from django.db.models import Q
+from django.db.models import F
+from django.core.exceptions import ObjectDoesNotExist
+from django.utils import timezone
+from django.utils.http import urlencode
 from django.utils.translation import gettext as _
-from django.db.models import DateTimeField 
 
 #  Import models từ study app
 from backends.studies.study_43en.models.patient import (
@@ -26,34 +27,121 @@ from backends.studies.study_43en.models.contact import (
 
 
 from backends.studies.study_43en.models.schedule import ExpectedDates, ContactExpectedDates
+from backends.studies.study_43en.models.progress import ProcessStatus
+from backends.studies.study_43en.services.progress_service import SubjectProgressService
+from backends.studies.search import search_q
 
 #  Import utils từ study app
 
-from backends.audit_logs.utils import get_site_filtered_object_or_404
 from backends.studies.study_43en.utils.permission_decorators import require_export_permission
 
 logger = logging.getLogger(__name__)
 
 
-import pandas as pd
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse, FileResponse, JsonResponse, Http404
 from django.apps import apps
-from io import BytesIO
-from django.db.models import DateTimeField
-from django.http import HttpResponse
+
+from backends.tenancy.models import ExportJob
+from backends.tenancy.utils.export_store import ExportFileStore
+from backends.tenancy.tasks import run_export_job_task
+
+from backends.studies.study_43en.services.export_service import (
+    CRFExportService,
+    build_export_filename,
+    get_export_content_type,
+)
 
 
 from backends.studies.study_43en.utils.site_utils import (
     get_site_filter_params,
     get_filtered_queryset,
     get_site_filtered_object_or_404,
-    batch_get_related,
-    batch_check_exists,
 )
 
 
 # ==========================================
-#  PATIENT LIST - 🚀 OPTIMIZED WITH REDIS
+#  SUBJECT PROGRESS - list filters / sort
+# ==========================================
+
+# ?sort=<key> or ?sort=-<key>, always followed by the list's own order
+PROGRESS_SORTS = {
+    'usubjid': 'USUBJID',
+    'enrolled': 'progress__ENRDATE',
+    'progress': 'progress__CRF_COUNT',
+    'status': 'progress__PROCESS_STATUS',
+}
+
+PROGRESS_STATUS_FILTERS = [
+    (ProcessStatus.NOT_ENROLLED, ProcessStatus.NOT_ENROLLED.label),
+    (ProcessStatus.ONGOING, ProcessStatus.ONGOING.label),
+    (ProcessStatus.COMPLETED, ProcessStatus.COMPLETED.label),
+]
+
+
+def _apply_progress_filters(queryset, request, default_order):
+    """
+    Filter/sort a screening queryset by its progress row (1 JOIN, indexed)
+    
+    Returns:
+        (queryset, status, sort) - status/sort as applied ('' = none)
+    """
+    status = request.GET.get('status', '')
+    if status == 'died':
+        queryset = queryset.filter(progress__IS_DECEASED=True)
+    elif status in ProcessStatus.values:
+        queryset = queryset.filter(progress__PROCESS_STATUS=status)
+    else:
+        status = ''
+    
+    sort = request.GET.get('sort', '')
+    field = PROGRESS_SORTS.get(sort.lstrip('-'))
+    if field is None:
+        sort = ''
+        order = [default_order]
+    elif sort.startswith('-'):
+        order = [F(field).desc(nulls_last=True), default_order]
+    else:
+        order = [F(field).asc(nulls_last=True), default_order]
+    
+    return queryset.select_related('progress').order_by(*order), status, sort
+
+
+def _attach_progress(page_obj, kind):
+    """
+    Copy progress onto the page's screening records (template attributes)
+    
+    Records without a progress row yet (table not rebuilt) are computed and
+    stored now - 1 query + 1 upsert for the whole page.
+    """
+    progress_map = {}
+    missing = []
+    for subject in page_obj:
+        try:
+            progress_map[subject.pk] = subject.progress
+        except ObjectDoesNotExist:
+            missing.append(subject.pk)
+    
+    if missing:
+        for progress in SubjectProgressService().refresh(kind, scrids=missing):
+            progress_map[progress.SCRID_id] = progress
+    
+    for subject in page_obj:
+        progress = progress_map.get(subject.pk)
+        subject.has_enrollment = bool(progress and progress.HAS_ENROLLMENT)
+        subject.enrollment_date = progress.ENRDATE if progress else None
+        subject.process_status = progress.PROCESS_STATUS if progress else ProcessStatus.NOT_ENROLLED
+        subject.process_label = progress.process_label if progress else ProcessStatus.NOT_ENROLLED.label
+        subject.process_badge = progress.process_badge if progress else 'secondary'
+
+
+def _list_querystring(query, status, sort):
+    """Filter params kept across pagination links"""
+    params = {key: value for key, value in (('q', query), ('status', status), ('sort', sort)) if value}
+    return f"&{urlencode(params)}" if params else ''
+
+
+# ==========================================
+#  PATIENT LIST - 🚀 PRECOMPUTED PROGRESS
 # ==========================================
 
 @login_required
@@ -62,9 +150,9 @@ def patient_list(request):
     Danh sách các bệnh nhân - OPTIMIZED VERSION
     
      Improvements:
-    - Redis caching for queries
-    - Batch queries thay vì N+1
-    - Giảm từ ~100 queries xuống ~10 queries
+    - Progress (CRFs, death, process status) precomputed in PatientProgress
+    - 1 query per page (SCR_CASE JOIN patient_progress) + count
+    - Filter (?status=) / sort (?sort=) by progress
     """
     query = request.GET.get('q', '')
     
@@ -73,17 +161,16 @@ def patient_list(request):
     
     logger.info(f"patient_list - User: {request.user.username}, Site: {site_filter}, Type: {filter_type}")
     
-    # 🚀 Get filtered queryset (with Redis caching)
+    # 🚀 Site-filtered queryset (cached predicate)
     cases = get_filtered_queryset(SCR_CASE, site_filter, filter_type).filter(
         is_confirmed=True
-    ).order_by('USUBJID')
+    )
     
     # Search
     if query:
-        cases = cases.filter(
-            Q(USUBJID__icontains=query) | 
-            Q(INITIAL__icontains=query)
-        )
+        cases = cases.filter(search_q(query, 'USUBJID', 'INITIAL'))
+    
+    cases, status, sort = _apply_progress_filters(cases, request, 'USUBJID')
     
     # Stats
     total_patients = cases.count()
@@ -93,95 +180,16 @@ def patient_list(request):
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    # 🚀 BATCH: Get all enrollments trong 1 query
-    enrollment_map = batch_get_related(
-        list(page_obj.object_list),
-        ENR_CASE,
-        'USUBJID',
-        site_filter,
-        filter_type
-    )
-    
-    # 🚀 BATCH: Check all CRFs existence
-    enrollments = [e for e in enrollment_map.values() if e is not None]
-    
-    if enrollments:
-        crf_status_map = batch_check_exists(
-            enrollments,
-            [CLI_CASE, DISCH_CASE, EndCaseCRF, FU_CASE_28, FU_CASE_90, SAM_CASE, LaboratoryTest],
-            'USUBJID',
-            site_filter,
-            filter_type
-        )
-    else:
-        crf_status_map = {}
-    
-    # 🚀 BATCH: Get all discharge cases to check death status
-    discharge_map = {}
-    if enrollments:
-        enrollment_ids = [e.pk for e in enrollments]
-        discharges = DISCH_CASE.objects.using('db_study_43en').filter(
-            USUBJID__in=enrollment_ids
-        ).select_related('USUBJID')
-        discharge_map = {d.USUBJID_id: d for d in discharges}
-    
-    # Process status (giờ chỉ là lookup, không query DB!)
-    for case in page_obj:
-        enrollment = enrollment_map.get(case.pk)
-        
-        case.has_enrollment = enrollment is not None
-        case.enrollment_date = enrollment.ENRDATE if enrollment else None
-        
-        if not case.has_enrollment:
-            case.process_status = 'not_enrolled'
-            case.process_label = 'Not Enrolled'
-            case.process_badge = 'secondary'
-            continue
-        
-        # Get CRF status từ batch results
-        crf_status = crf_status_map.get(enrollment.pk, {})
-        
-        # 🔥 Check death status from discharge
-        discharge_case = discharge_map.get(enrollment.pk)
-        is_deceased = discharge_case and discharge_case.DEATHATDISCH == 'Yes'
-        
-        # If patient died, study ends early (no need for all CRFs)
-        if is_deceased:
-            case.process_status = 'completed'
-            case.process_label = 'Study Completed (Died)'
-            case.process_badge = 'dark'
-            continue
-        
-        # Check EndCaseCRF
-        if crf_status.get('EndCaseCRF', False):
-            case.process_status = 'completed'
-            case.process_label = 'Study Completed'
-            case.process_badge = 'success'
-            continue
-        
-        # Check other CRFs
-        all_completed = all([
-            crf_status.get('CLI_CASE', False),
-            crf_status.get('DISCH_CASE', False),
-            crf_status.get('FU_CASE_28', False),
-            crf_status.get('FU_CASE_90', False),
-            crf_status.get('SAM_CASE', False),
-            crf_status.get('LaboratoryTest', False),
-        ])
-        
-        if all_completed:
-            case.process_status = 'completed'
-            case.process_label = 'Study Completed'
-            case.process_badge = 'success'
-        else:
-            case.process_status = 'ongoing'
-            case.process_label = 'Ongoing'
-            case.process_badge = 'primary'
+    _attach_progress(page_obj, 'patient')
     
     context = {
         'page_obj': page_obj,
         'total_patients': total_patients,
         'query': query,
+        'status': status,
+        'sort': sort,
+        'status_choices': PROGRESS_STATUS_FILTERS + [('died', 'Study Completed (Died)')],
+        'filter_query': _list_querystring(query, status, sort),
         'view_type': 'patients',
         'is_paginated': page_obj.has_other_pages(),
         'site_filter': site_filter,
@@ -378,7 +386,7 @@ def patient_detail(request, usubjid):
 
 
 # ==========================================
-#  CONTACT LIST - 🚀 OPTIMIZED WITH REDIS
+#  CONTACT LIST - 🚀 PRECOMPUTED PROGRESS
 # ==========================================
 
 @login_required
@@ -387,9 +395,9 @@ def contact_list(request):
     Danh sách contacts - OPTIMIZED VERSION
     
      Improvements:
-    - Redis caching for queries
-    - Batch queries thay vì N+1
-    - Giảm từ ~50+ queries xuống ~10 queries
+    - Progress (CRFs, process status) precomputed in ContactProgress
+    - 1 query per page (SCR_CONTACT JOIN contact_progress) + counts
+    - Filter (?status=) / sort (?sort=) by progress
     """
     query = request.GET.get('q', '')
     
@@ -398,7 +406,7 @@ def contact_list(request):
     
     logger.info(f"contact_list - User: {request.user.username}, Site: {site_filter}, Type: {filter_type}")
     
-    # 🚀 Get filtered queryset (with Redis caching)
+    # 🚀 Site-filtered queryset (cached predicate)
     eligible_screening_contacts = get_filtered_queryset(SCR_CONTACT, site_filter, filter_type).filter(
         CONSENTTOSTUDY=True,
         LIVEIN5DAYS3MTHS=True,
@@ -407,13 +415,11 @@ def contact_list(request):
     
     # Search
     if query:
-        eligible_screening_contacts = eligible_screening_contacts.filter(
-            Q(USUBJID__icontains=query) |
-            Q(INITIAL__icontains=query)
-        )
+        eligible_screening_contacts = eligible_screening_contacts.filter(search_q(query, 'USUBJID', 'INITIAL'))
     
-    # Sort
-    eligible_screening_contacts = eligible_screening_contacts.order_by('SCRID')
+    eligible_screening_contacts, status, sort = _apply_progress_filters(
+        eligible_screening_contacts, request, 'SCRID'
+    )
     
     # Stats
     total_contacts = eligible_screening_contacts.count()
@@ -425,67 +431,7 @@ def contact_list(request):
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    # 🚀 BATCH: Get all enrollments trong 1 query
-    enrollment_map = batch_get_related(
-        list(page_obj.object_list),
-        ENR_CONTACT,
-        'USUBJID',
-        site_filter,
-        filter_type
-    )
-    
-    # 🚀 BATCH: Check all CRFs existence
-    enrollments = [e for e in enrollment_map.values() if e is not None]
-    
-    if enrollments:
-        crf_status_map = batch_check_exists(
-            enrollments,
-            [ContactEndCaseCRF, SAM_CONTACT, FU_CONTACT_28, FU_CONTACT_90],
-            'USUBJID',
-            site_filter,
-            filter_type
-        )
-    else:
-        crf_status_map = {}
-    
-    # Process status (giờ chỉ là lookup, không query DB!)
-    for contact in page_obj:
-        enrollment = enrollment_map.get(contact.pk)
-        
-        contact.has_enrollment = enrollment is not None
-        contact.enrollment_date = enrollment.ENRDATE if enrollment else None
-        
-        if not contact.has_enrollment:
-            contact.process_status = 'not_enrolled'
-            contact.process_label = 'Not Enrolled'
-            contact.process_badge = 'secondary'
-            continue
-        
-        # Get CRF status từ batch results
-        crf_status = crf_status_map.get(enrollment.pk, {})
-        
-        # Check EndCaseCRF
-        if crf_status.get('ContactEndCaseCRF', False):
-            contact.process_status = 'completed'
-            contact.process_label = 'Study Completed'
-            contact.process_badge = 'success'
-            continue
-        
-        # Check other CRFs
-        all_completed = all([
-            crf_status.get('SAM_CONTACT', False),
-            crf_status.get('FU_CONTACT_28', False),
-            crf_status.get('FU_CONTACT_90', False),
-        ])
-        
-        if all_completed:
-            contact.process_status = 'completed'
-            contact.process_label = 'Study Completed'
-            contact.process_badge = 'success'
-        else:
-            contact.process_status = 'ongoing'
-            contact.process_label = 'Ongoing'
-            contact.process_badge = 'primary'
+    _attach_progress(page_obj, 'contact')
     
     context = {
         'page_obj': page_obj,
@@ -493,6 +439,10 @@ def contact_list(request):
         'enrolled_contacts': enrolled_contacts,
         'not_enrolled_contacts': not_enrolled_contacts,
         'query': query,
+        'status': status,
+        'sort': sort,
+        'status_choices': PROGRESS_STATUS_FILTERS,
+        'filter_query': _list_querystring(query, status, sort),
         'view_type': 'contacts',
         'site_filter': site_filter,
         'filter_type': filter_type,
@@ -594,70 +544,29 @@ def contact_detail(request, usubjid):
 
 
 def export_to_excel(request):
-    """Legacy export function -  WITH SITE FILTERING"""
+    """Legacy export function -  WITH SITE FILTERING (streaming XLSX)"""
     #  Get site filter with proper strategy
     site_filter, filter_type = get_site_filter_params(request)
     
     logger.info(f"export_to_excel (legacy) - User: {request.user.username}, Site: {site_filter}, Type: {filter_type}")
     
-    buffer = BytesIO()
-    writer = pd.ExcelWriter(buffer, engine='openpyxl')
-
-    # Get all models
-    models = apps.get_models()
-
-    # Sensitive fields to remove
-    sensitive_fields = ['FULLNAME', 'PHONE', 'ADDRESS', 'MEDRECORDID']
-
-    for model in models:
-        try:
-            #  Apply site filtering
-            queryset = get_filtered_queryset(model, site_filter, filter_type)
-            if not queryset.exists():
-                continue
-                
-            data = list(queryset.values())
-            df = pd.DataFrame(data)
-            
-            # Remove sensitive fields
-            for field in sensitive_fields:
-                if field in df.columns:
-                    df = df.drop(field, axis=1)
-            
-            # Format datetime fields
-            for field in model._meta.get_fields():
-                field_name = field.name
-                
-                if field_name in sensitive_fields:
-                    continue
-                    
-                if field_name in df.columns:
-                    if isinstance(field, DateTimeField):
-                        df[field_name] = df[field_name].apply(
-                            lambda x: x.strftime('%Y-%m-%d %H:%M:%S %z') if pd.notnull(x) else ''
-                        )
-                    elif isinstance(field, models.DateField):
-                        df[field_name] = df[field_name].apply(
-                            lambda x: x.strftime('%Y-%m-%d') if pd.notnull(x) else ''
-                        )
-            
-            # Write to Excel
-            sheet_name = model.__name__[:31]
-            df.to_excel(writer, sheet_name=sheet_name, index=False)
-            
-        except Exception as e:
-            logger.error(f"Error exporting {model.__name__}: {str(e)}")
-            continue
-
-    writer.close()
-    buffer.seek(0)
-
-    response = HttpResponse(
-        content=buffer.getvalue(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    # All site-filtered models of the study app
+    model_names = [
+        model.__name__
+        for model in apps.get_app_config('study_43en').get_models()
+        if hasattr(model, 'site_objects')
+    ]
+    
+    service = CRFExportService(site_filter, filter_type)
+    tables, _skipped = service.build_tables(model_names)
+    fileobj, _file_size = service.write_xlsx(tables)
+    
+    return FileResponse(
+        fileobj,
+        as_attachment=True,
+        filename='database_export.xlsx',
+        content_type=get_export_content_type('excel'),
     )
-    response['Content-Disposition'] = 'attachment; filename="database_export.xlsx"'
-    return response
 
 @login_required
 @require_export_permission()
@@ -742,8 +651,8 @@ def export_data_page(request):
         except:
             estimated_counts[model_name] = 0
     
-    #  Get recent exports from session (simple implementation)
-    recent_exports = request.session.get('recent_exports', [])[:5]  # Last 5 exports
+    #  Recent exports are background export jobs with real files
+    recent_exports = ExportFileStore.get_recent_exports(request.user, request.study, limit=5)
     
     context = {
         'sites': sites,
@@ -783,110 +692,55 @@ def export_data(request):
         messages.error(request, 'Please select at least one CRF to export!')
         return redirect('study_43en:export_data_page')
     
-    # Create buffer
-    buffer = BytesIO()
-    
-    if export_format == 'excel':
-        writer = pd.ExcelWriter(buffer, engine='openpyxl')
-    
-    # Sensitive fields to remove
-    sensitive_fields = [] if include_sensitive else ['FULLNAME', 'PHONE', 'ADDRESS', 'MEDRECORDID']
-    
-    # Export each selected CRF
-    exported_count = 0
-    skipped_models = []
-    
-    for model_name in selected_crfs:
+    job_params = {
+        'crfs': selected_crfs,
+        'start_date': start_date or None,
+        'end_date': end_date or None,
+        'include_sensitive': include_sensitive,
+        'site_filter': site_filter,
+        'filter_type': filter_type,
+    }
+    job_format = ExportJob.Format.EXCEL if export_format == 'excel' else ExportJob.Format.CSV
+    
+    # 🚀 Background export: build the file in a Celery task, poll for progress
+    if request.POST.get('run_in_background') == 'on':
+        job = ExportJob.objects.create(
+            user=request.user,
+            study=request.study,
+            export_format=job_format,
+            params=job_params,
+            total_crfs=len(selected_crfs),
+        )
         try:
-            # Get model from study_43en app
-            model = apps.get_model('study_43en', model_name)
-            
-            #  NEW: Apply site filtering with proper security
-            #  Skip models without site_objects (child/related models)
-            if not hasattr(model, 'site_objects'):
-                logger.warning(f" Skipping {model_name}: No site_objects manager (likely a related model)")
-                skipped_models.append(model_name)
-                continue
-            
-            try:
-                queryset = get_filtered_queryset(model, site_filter, filter_type)
-            except Exception as e:
-                # Handle models with complex relationships that fail site filtering
-                if 'OneToOneField' in str(e) or 'startswith' in str(e):
-                    logger.warning(f" Skipping {model_name}: Cannot apply site filtering ({str(e)[:100]})")
-                    skipped_models.append(model_name)
-                    continue
-                else:
-                    raise  # Re-raise other errors
-            
-            # Apply date filter - check multiple possible date fields
-            date_field = None
-            if  hasattr(model, 'SCREENINGFORMDATE'):
-                date_field = 'SCREENINGFORMDATE'
-            elif hasattr(model, 'ENRDATE'):
-                date_field = 'ENRDATE'
-            elif hasattr(model, 'ADMISDATE'):
-                date_field = 'ADMISDATE'
-            elif hasattr(model, 'created_at'):
-                date_field = 'created_at'
-            elif hasattr(model, 'last_modified_at'):
-                date_field = 'last_modified_at'
-            
-            if date_field:
-                if start_date:
-                    queryset = queryset.filter(**{f'{date_field}__gte': start_date})
-                if end_date:
-                    queryset = queryset.filter(**{f'{date_field}__lte': end_date})
-            
-            # Convert to DataFrame
-            if not queryset.exists():
-                logger.info(f"No data for {model_name} with current filters")
-                continue
-            
-            data = list(queryset.values())
-            df = pd.DataFrame(data)
-            
-            # Remove sensitive fields
-            for field in sensitive_fields:
-                if field in df.columns:
-                    df = df.drop(field, axis=1)
-            
-            # Format datetime and date fields
-            from django.db.models import DateTimeField, DateField  #  Import locally if not at top
-            
-            for field in model._meta.get_fields():
-                field_name = field.name
-                if field_name not in df.columns:
-                    continue
-                
-                #  FIXED: Use DateField instead of models.DateField
-                if isinstance(field, DateTimeField):
-                    df[field_name] = df[field_name].apply(
-                        lambda x: x.strftime('%Y-%m-%d %H:%M:%S %z') if pd.notnull(x) else ''
-                    )
-                elif isinstance(field, DateField):  #  CHANGED from models.DateField
-                    df[field_name] = df[field_name].apply(
-                        lambda x: x.strftime('%Y-%m-%d') if pd.notnull(x) else ''
-                    )
-            
-            # Write to file
-            sheet_name = model_name[:31]  # Excel sheet name limit
-            
-            if export_format == 'excel':
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
-            else:  # CSV - append to buffer
-                csv_content = df.to_csv(index=False)
-                if exported_count > 0:
-                    buffer.write(b'\n\n')  # Separator between tables
-                buffer.write(f"# {model_name}\n".encode('utf-8'))
-                buffer.write(csv_content.encode('utf-8'))
-            
-            exported_count += 1
-            logger.info(f"Successfully exported {model_name}: {len(df)} records")
-        
+            run_export_job_task.delay(job.pk)
         except Exception as e:
-            logger.error(f"Error exporting {model_name}: {str(e)}", exc_info=True)
-            continue
+            # Broker unreachable - don't leave the job PENDING forever
+            logger.error(f"export_data - could not queue export job {job.pk}: {e}")
+            ExportJob.objects.filter(pk=job.pk).update(
+                status=ExportJob.Status.FAILED,
+                error_message='Background export queue is unavailable',
+                finished_at=timezone.now(),
+            )
+            messages.error(
+                request,
+                'Background export is unavailable right now. Please try again, or export without "Run in background".'
+            )
+            return redirect('study_43en:export_data_page')
+        
+        logger.info(f"export_data - queued export job {job.pk} for {request.user.username}")
+        messages.info(request, f'Export #{job.pk} queued. It will appear under Recent Exports when ready.')
+        return redirect('study_43en:export_data_page')
+    
+    # 🚀 Streaming export: rows are read in chunks through a server-side cursor
+    service = CRFExportService(
+        site_filter,
+        filter_type,
+        start_date=start_date,
+        end_date=end_date,
+        include_sensitive=include_sensitive,
+    )
+    tables, skipped_models = service.build_tables(selected_crfs)
+    exported_count = len(tables)
     
     # Check if anything was exported
     if exported_count == 0:
@@ -899,58 +753,106 @@ def export_data(request):
             messages.warning(request, 'No data found matching your filters!')
         return redirect('study_43en:export_data_page')
     
-    # Finalize file
-    if export_format == 'excel':
-        writer.close()
-    
-    buffer.seek(0)
-    
-    # Create response
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    
-    #  Generate filename with site info
-    if filter_type == 'single':
-        site_suffix = f"_site_{site_filter}"
-    elif filter_type == 'multiple':
-        site_suffix = f"_sites_{'_'.join(sorted(site_filter))}"
-    else:
-        site_suffix = "_all_sites"
-    
-    filename = f'study_43en{site_suffix}_export_{timestamp}'
+    filename = build_export_filename(site_filter, filter_type, export_format, timestamp)
+    content_type = get_export_content_type(export_format)
+    
+    # Recent Exports history: the file goes to the browser, nothing is stored
+    job = ExportJob(
+        user=request.user,
+        study=request.study,
+        export_format=job_format,
+        params=job_params,
+        total_crfs=len(selected_crfs),
+        completed_crfs=len(selected_crfs),
+        filename=filename,
+        started_at=timezone.now(),
+    )
     
     if export_format == 'excel':
-        content_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        filename += '.xlsx'
+        # XLSX: openpyxl write-only mode into a spooled temp file
+        fileobj, file_size = service.write_xlsx(tables)
+        response = FileResponse(fileobj, content_type=content_type)
+        
+        # CRFs whose rows failed to load were left out of the workbook
+        failed = [table.name for table in tables if table.error]
+        exported_count -= len(failed)
+        skipped_models += failed
+        
+        job.status = ExportJob.Status.COMPLETED
+        job.file_size = file_size
+        job.finished_at = timezone.now()
+        job.save()
     else:
-        content_type = 'text/csv'
-        filename += '.csv'
+        # CSV: rows are generated while the response is being sent
+        job.status = ExportJob.Status.RUNNING
+        job.save()
+        response = StreamingHttpResponse(
+            _record_streamed_export(service.iter_csv(tables), job.pk), content_type=content_type
+        )
     
-    response = HttpResponse(content=buffer.getvalue(), content_type=content_type)
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
     
-    #  Save to recent exports history (in session)
-    file_size = len(buffer.getvalue())
-    file_size_mb = round(file_size / (1024 * 1024), 2)
-    
-    export_record = {
-        'filename': filename,
-        'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'file_size': f'{file_size_mb} MB',
-        'crf_count': exported_count,
-        'site_filter': site_filter if isinstance(site_filter, str) else ', '.join(sorted(site_filter)),
-    }
-    
-    recent_exports = request.session.get('recent_exports', [])
-    recent_exports.insert(0, export_record)  # Add to beginning
-    request.session['recent_exports'] = recent_exports[:10]  # Keep last 10
-    
     # Build success message
     success_msg = f' Export completed! {exported_count} CRFs exported. Downloaded: {filename}'
     
     if skipped_models:
-        success_msg += f' |  {len(skipped_models)} related models skipped (no site filtering available)'
+        success_msg += f' |  {len(skipped_models)} models skipped (no site filtering available or export error)'
         logger.info(f"Skipped models: {', '.join(skipped_models)}")
     
     messages.success(request, success_msg)
     
     return response
+
+
+def _record_streamed_export(chunks, job_pk):
+    """Pass the CSV stream through, then record its size on the export job"""
+    file_size = 0
+    completed = False
+    try:
+        for text in chunks:
+            file_size += len(text.encode('utf-8'))
+            yield text
+        completed = True
+    finally:
+        ExportJob.objects.filter(pk=job_pk).update(
+            status=ExportJob.Status.COMPLETED if completed else ExportJob.Status.FAILED,
+            error_message='' if completed else 'Download interrupted',
+            file_size=file_size,
+            finished_at=timezone.now(),
+        )
+
+
+@login_required
+@require_export_permission()
+def export_job_status(request, job_id):
+    """Polling endpoint: per-CRF progress of a background export job"""
+    job = ExportFileStore.get_job_for_user(request.user, request.study, job_id)
+    if job is None:
+        return JsonResponse({'success': False, 'message': 'Export job not found'}, status=404)
+    
+    return JsonResponse({'success': True, 'job': job.to_status_dict()})
+
+
+@login_required
+@require_export_permission()
+def export_job_download(request, job_id):
+    """Download the artifact of a completed background export job"""
+    job = ExportFileStore.get_job_for_user(request.user, request.study, job_id)
+    if job is None or not job.is_downloadable:
+        raise Http404('Export file not found or expired')
+    
+    try:
+        fileobj = ExportFileStore.open_for_read(job)
+    except (FileNotFoundError, ValueError):
+        logger.warning(f"Export file missing for job {job.pk}: {job.file_path}")
+        raise Http404('Export file not found or expired')
+    
+    logger.info(f"export_job_download - User: {request.user.username}, Job: {job.pk}")
+    
+    return FileResponse(
+        fileobj,
+        as_attachment=True,
+        filename=job.filename,
+        content_type=get_export_content_type(job.export_format),
+    )
@@ -5,7 +5,7 @@ from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse, HttpResponse
 from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
-from django.db.models import Q, Case, When, Value, IntegerField
+from django.db.models import Q, Case, When, Value, IntegerField, Count
 from django.utils.translation import gettext as _
 from django.utils.timezone import localtime
 from backends.api.studies.study_43en.services.context_processors import upcoming_appointments
@@ -22,21 +22,44 @@ from backends.studies.study_43en.models.contact import (
 from backends.studies.study_43en.models.schedule import (
     FollowUpStatus
 )
+from backends.studies.study_43en.services.followup_status_service import FollowUpStatusService
+
+# Encrypted PHONE is searched through its blind index
+from backends.studies.blind_index import blind_search_q
+
+# Trigram-indexed substring search
+from backends.studies.search import search_q
 
 #  Import site utilities
 from backends.studies.study_43en.utils.site_utils import (
     get_site_filter_params,
-    get_filtered_queryset
+    get_filtered_queryset,
+    get_cached_result,
 )
 
 logger = logging.getLogger(__name__)
 
 
+def _count_followups_by_visit(queryset):
+    """Đếm lịch hẹn theo SUBJECT_TYPE/VISIT (1 GROUP BY query)"""
+    stats = {
+        'PATIENT': {'V2': 0, 'V3': 0, 'V4': 0, 'total': 0},
+        'CONTACT': {'V2': 0, 'V3': 0, 'V4': 0, 'total': 0}
+    }
+    
+    rows = queryset.order_by().values('SUBJECT_TYPE', 'VISIT').annotate(n=Count('pk'))
+    for row in rows:
+        subject_stats = stats.setdefault(row['SUBJECT_TYPE'], {'total': 0})
+        subject_stats[row['VISIT']] = subject_stats.get(row['VISIT'], 0) + row['n']
+        subject_stats['total'] += row['n']
+    
+    return stats
+
+
 @login_required
 def followup_tracking_list(request):
     """Hiển thị danh sách theo dõi lịch hẹn - 3 TABLES: pending/completed/missed"""
     
-    study_db = getattr(request, 'study_db_alias', 'db_study_43en')
     today = date.today()
     
     day_of_week = today.weekday()
@@ -65,30 +88,11 @@ def followup_tracking_list(request):
     site_filter, filter_type = get_site_filter_params(request)
     logger.info(f"followup_tracking_list - User: {request.user.username}, Site: {site_filter}, Type: {filter_type}")
     
-    # Auto-update outdated statuses
+    # Auto-update outdated statuses (set-based, at most once per throttle window)
     try:
-        pending_to_update = get_filtered_queryset(FollowUpStatus, site_filter, filter_type).exclude(
-            STATUS__in=['COMPLETED', 'MISSED']
-        )
-        updated = 0
-        for followup in pending_to_update:
-            old_status = followup.STATUS
-            
-            if followup.ACTUAL_DATE:
-                followup.STATUS = 'COMPLETED'
-            elif followup.MISSED_DATE:
-                followup.STATUS = 'MISSED'
-            elif followup.EXPECTED_TO and today > followup.EXPECTED_TO:
-                followup.STATUS = 'LATE'
-            elif followup.EXPECTED_DATE and today > followup.EXPECTED_DATE:
-                followup.STATUS = 'LATE'
-            
-            if followup.STATUS != old_status:
-                followup.save(using=study_db, update_fields=['STATUS'])
-                updated += 1
-        
-        if updated > 0:
-            logger.info(f"Auto-updated {updated} followup statuses")
+        transitions = FollowUpStatusService.recompute_throttled()
+        if transitions:
+            logger.info(f"Auto-updated {sum(transitions.values())} followup statuses")
     except Exception as e:
         logger.error(f"Error auto-updating status: {e}")
     
@@ -115,9 +119,8 @@ def followup_tracking_list(request):
         base_followups = base_followups.filter(SUBJECT_TYPE=subject_type_filter)
     if search_query:
         base_followups = base_followups.filter(
-            Q(USUBJID__icontains=search_query) | 
-            Q(INITIAL__icontains=search_query) |
-            Q(PHONE__icontains=search_query)
+            search_q(search_query, 'USUBJID', 'INITIAL') |
+            blind_search_q(FollowUpStatus, 'PHONE', search_query)
         )
     
     pending_followups = base_followups.exclude(STATUS__in=['COMPLETED', 'MISSED']).order_by(
@@ -173,33 +176,24 @@ def followup_tracking_list(request):
     except (PageNotAnInteger, EmptyPage):
         missed_page_obj = missed_paginator.page(1)
     
-    upcoming_stats = {
-        'PATIENT': {'V2': 0, 'V3': 0, 'V4': 0, 'total': 0},
-        'CONTACT': {'V2': 0, 'V3': 0, 'V4': 0, 'total': 0}
-    }
-    
-    upcoming_date = today + timedelta(days=7)
-    
-    upcoming_followups = get_filtered_queryset(FollowUpStatus, site_filter, filter_type).filter(
-        STATUS='UPCOMING',
-        EXPECTED_DATE__lte=upcoming_date,
-        EXPECTED_DATE__gte=today
+    # Cached per site scope + day; any FollowUpStatus write starts a new generation
+    upcoming_stats = get_cached_result(
+        FollowUpStatus, site_filter, filter_type, f"upcoming_stats_{today.isoformat()}",
+        lambda: _count_followups_by_visit(
+            get_filtered_queryset(FollowUpStatus, site_filter, filter_type).filter(
+                STATUS='UPCOMING',
+                EXPECTED_DATE__lte=today + timedelta(days=7),
+                EXPECTED_DATE__gte=today
+            )
+        ),
     )
     
-    for followup in upcoming_followups:
-        upcoming_stats[followup.SUBJECT_TYPE][followup.VISIT] = upcoming_stats[followup.SUBJECT_TYPE].get(followup.VISIT, 0) + 1
-        upcoming_stats[followup.SUBJECT_TYPE]['total'] = upcoming_stats[followup.SUBJECT_TYPE].get('total', 0) + 1
-    
-    late_stats = {
-        'PATIENT': {'V2': 0, 'V3': 0, 'V4': 0, 'total': 0},
-        'CONTACT': {'V2': 0, 'V3': 0, 'V4': 0, 'total': 0}
-    }
-    
-    late_followups = get_filtered_queryset(FollowUpStatus, site_filter, filter_type).filter(STATUS='LATE')
-    
-    for followup in late_followups:
-        late_stats[followup.SUBJECT_TYPE][followup.VISIT] = late_stats[followup.SUBJECT_TYPE].get(followup.VISIT, 0) + 1
-        late_stats[followup.SUBJECT_TYPE]['total'] = late_stats[followup.SUBJECT_TYPE].get('total', 0) + 1
+    late_stats = get_cached_result(
+        FollowUpStatus, site_filter, filter_type, 'late_stats',
+        lambda: _count_followups_by_visit(
+            get_filtered_queryset(FollowUpStatus, site_filter, filter_type).filter(STATUS='LATE')
+        ),
+    )
     
     context = {
         'pending_followups': pending_page_obj,
@@ -574,9 +568,6 @@ def update_followup_status(request, pk):
 def export_followup_tracking(request):
     """Xuất danh sách theo dõi lịch hẹn ra Excel -  WITH SITE FILTERING"""
     
-    #  Get study database
-    study_db = getattr(request, 'study_db_alias', 'db_study_43en')
-    
     #  NEW: Get site filter with proper strategy
     site_filter, filter_type = get_site_filter_params(request)
     
@@ -623,10 +614,7 @@ def export_followup_tracking(request):
         followups = followups.filter(SUBJECT_TYPE=subject_type_filter)
     
     if search_query:
-        followups = followups.filter(
-            Q(USUBJID__icontains=search_query) | 
-            Q(INITIAL__icontains=search_query)
-        )
+        followups = followups.filter(search_q(search_query, 'USUBJID', 'INITIAL'))
     
     # Sắp xếp
     followups = followups.order_by(
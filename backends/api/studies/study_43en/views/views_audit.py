@@ -12,16 +12,16 @@ Features:
 import logging
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, get_object_or_404, redirect
-from django.core.paginator import Paginator
 from django.core.cache import cache
-from django.db.models import Q
 from django.contrib import messages
 from datetime import datetime
 from django.contrib.auth import get_user_model
 
-from backends.studies.study_43en.models import AuditLog, AuditLogDetail
+from backends.studies.study_43en.models import AuditLog, AuditLogDetail, AuditLogUser
+from backends.audit_logs.utils.pagination import KeysetPaginator
 from backends.audit_logs.utils.permission_decorators import require_crf_view
 from backends.studies.study_43en.utils.site_utils import get_site_filter_params
+from backends.studies.search import AUDIT_SEARCH_FIELDS, search_q
 
 # Explicit database alias for reliable routing
 DB_ALIAS = 'db_study_43en'
@@ -87,7 +87,7 @@ def audit_log_list(request):
     - Patient ID search
     - Date range filter
     - Full-text search
-    - Pagination
+    - Keyset (cursor) pagination
     """
     logger.info(f"=== AUDIT LOG LIST ===")
     logger.info(f"User: {request.user.username}")
@@ -147,7 +147,7 @@ def audit_log_list(request):
     # Filter by patient ID
     patient_id = request.GET.get('patient_id', '').strip()
     if patient_id:
-        logs = logs.filter(patient_id__icontains=patient_id)
+        logs = logs.filter(search_q(patient_id, 'patient_id'))
         filters['patient_id'] = patient_id
         logger.debug(f"Filter by patient: {patient_id}")
     
@@ -178,39 +178,27 @@ def audit_log_list(request):
     # Full-text search
     query = request.GET.get('q', '').strip()
     if query:
-        logs = logs.filter(
-            Q(username__icontains=query) |
-            Q(patient_id__icontains=query) |
-            Q(reason__icontains=query) |
-            Q(model_name__icontains=query)
-        )
+        # pg_trgm GIN indexes (backends/studies/search.py)
+        logs = logs.filter(search_q(query, *AUDIT_SEARCH_FIELDS))
         filters['query'] = query
         logger.debug(f"Search query: {query}")
     
     # ==========================================
-    # 4. ORDER AND PAGINATE
+    # 4. PAGINATE (KEYSET)
     # ==========================================
-    logs = logs.order_by('-timestamp')
+    # Cursor on (timestamp, id) - no OFFSET scan; planner estimate for the
+    # total when nothing is filtered (no COUNT(*) over the whole log)
+    paginator = KeysetPaginator(logs, per_page=25, estimate_total=(filter_type == 'all' and not filters))
+    page_obj = paginator.get_page(request.GET.get('cursor'), request.GET.get('dir'))
     
-    paginator = Paginator(logs, 25)  # 25 logs per page
-    page_number = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page_number)
-    
-    logger.info(f" Found {paginator.count} audit logs, showing page {page_obj.number}/{paginator.num_pages}")
+    logger.info(f" Found {page_obj.total} audit logs (estimate={page_obj.total_is_estimate}), showing {len(page_obj)}")
     
     # ==========================================
     # 5. GET FILTER OPTIONS (OPTIMIZED WITH CACHING)
     # ==========================================
     
-    # Get unique user_ids from audit logs (with explicit DB routing)
-    user_ids = AuditLog.objects.using(DB_ALIAS)\
-        .values_list('user_id', flat=True)\
-        .distinct()
-    
-    # Query users from management DB
-    users = User.objects.using('default')\
-        .filter(id__in=list(user_ids))\
-        .order_by('username')
+    # Users seen in the audit log (maintained dimension, no DISTINCT scan)
+    users = list(AuditLogUser.objects.using(DB_ALIAS).order_by('username'))
     
     # Get cached filter options (actions & model_names)
     filter_options = _get_cached_filter_options()
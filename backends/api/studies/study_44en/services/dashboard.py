@@ -11,7 +11,11 @@ from backends.studies.study_44en.models.household import (
     HH_Member,
 )
 from backends.studies.study_44en.models.individual import Individual
-from backends.studies.study_44en.models.per_data import HH_PERSONAL_DATA
+
+# Shared response cache (invalidated by model signals)
+from backends.tenancy.utils.dashboard_cache import DashboardCache
+
+from .ward_distribution_service import WardDistributionService
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +24,7 @@ logger = logging.getLogger(__name__)
 # ============================================================================
 
 DB_ALIAS = 'db_study_44en'
+STUDY_CODE = '44EN'
 
 
 # ============================================================================
@@ -81,8 +86,8 @@ def home_dashboard(request):
         
         # ===== WARD DISTRIBUTION DATA =====
         
-        # Get ward distribution (WARD is encrypted in HH_PERSONAL_DATA)
-        # We need to decrypt each record to count by ward
+        # Get ward distribution (WARD is encrypted in HH_PERSONAL_DATA,
+        # grouped on its blind index - no per-household queries)
         ward_distribution = get_ward_distribution()
         
         # ===== CONTEXT =====
@@ -127,66 +132,20 @@ def home_dashboard(request):
 def get_ward_distribution():
     """
     Calculate household and participant distribution by ward
-    
+
     Returns:
         list: [{
             'ward': 'Phường X',
             'total_households': N,
             'total_participants': M
         }, ...]
-    
-    Note: WARD is encrypted, so we need to decrypt each record
+
+    Note: WARD is encrypted - grouped on its blind index, see
+    WardDistributionService (cached, invalidated by signals)
     """
     try:
-        # Get all personal data with related household and members
-        personal_data_records = HH_PERSONAL_DATA.objects.select_related(
-            'HHID'
-        ).prefetch_related(
-            'HHID__members'
-        ).all()
-        
-        # Aggregate by ward (after decryption)
-        ward_stats = {}
-        
-        for pd in personal_data_records:
-            # Decrypt ward (EncryptedCharField auto-decrypts on access)
-            ward = pd.WARD
-            
-            if not ward:
-                ward = 'Không xác định'
-            
-            # Initialize ward entry if not exists
-            if ward not in ward_stats:
-                ward_stats[ward] = {
-                    'ward': ward,
-                    'total_households': 0,
-                    'total_participants': 0,
-                }
-            
-            # Count household
-            ward_stats[ward]['total_households'] += 1
-            
-            # Count participants (members of this household)
-            member_count = pd.HHID.members.count()
-            ward_stats[ward]['total_participants'] += member_count
-        
-        # Convert to list and sort by ward name
-        ward_list = list(ward_stats.values())
-        ward_list.sort(key=lambda x: x['ward'])
-        
-        # Calculate totals
-        total_row = {
-            'ward': 'TỔNG CỘNG',
-            'total_households': sum(w['total_households'] for w in ward_list),
-            'total_participants': sum(w['total_participants'] for w in ward_list),
-            'is_total': True,
-        }
-        
-        # Add total row at the end
-        ward_list.append(total_row)
-        
-        return ward_list
-        
+        return WardDistributionService(using=DB_ALIAS).get_distribution()
+
     except Exception as e:
         logger.error(f"Ward distribution error: {str(e)}", exc_info=True)
         return []
@@ -227,6 +186,7 @@ def get_ward_distribution_api(request):
 
 @require_GET
 @login_required
+@DashboardCache.cached_response(STUDY_CODE, DB_ALIAS, [HH_CASE, HH_Member, Individual])
 def get_dashboard_stats_api(request):
     """
     API endpoint for dashboard statistics (for refresh)
@@ -273,3 +233,11 @@ def get_dashboard_stats_api(request):
         }, status=500)
 
 
+
+
+# ============================================================================
+# ASYNC VARIANTS (ASGI)
+# ============================================================================
+
+get_dashboard_stats_api_async = DashboardCache.async_view(get_dashboard_stats_api)
+get_ward_distribution_api_async = DashboardCache.async_view(get_ward_distribution_api)
@@ -1,2 +1,21 @@
-# Empty signals file
-# Add signal handlers here when needed
+# backends/api/studies/study_44en/services/signals.py
+
+from backends.studies.study_44en.models.household import HH_CASE, HH_Member
+from backends.studies.study_44en.models.individual import Individual
+from backends.studies.study_44en.models.per_data import HH_PERSONAL_DATA
+from backends.tenancy.utils.dashboard_cache import DashboardCache
+from backends.audit_logs.utils.site_utils import track_site_models
+
+
+# ==========================================
+# DASHBOARD CACHE SIGNALS - Data versions
+# ==========================================
+
+# Every save/delete bumps the table's data version (after commit), which
+# invalidates the cached dashboard API responses (and the ward
+# distribution) reading that table.
+DashboardCache.track_models('db_study_44en', [HH_CASE, HH_Member, Individual, HH_PERSONAL_DATA])
+
+# Site-filtered models: generation namespaces of cached query results
+# (site_utils.get_cached_result)
+track_site_models('db_study_44en', 'study_44en')
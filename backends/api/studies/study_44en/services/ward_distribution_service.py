@@ -0,0 +1,98 @@
+# backends/api/studies/study_44en/services/ward_distribution_service.py
+"""
+Ward Distribution Service - Households / participants per ward
+
+WARD is encrypted (HH_PERSONAL_DATA), so the database groups on its blind
+index WARD_BIDX instead of the plaintext:
+
+    1 query:   GROUP BY WARD_BIDX → households + member counts (SQL)
+    2 queries: decrypt one representative WARD per group (labels)
+
+Spelling variants of a ward ('Phường Bến Nghé' / 'phuong ben nghe') share
+a blind index and are counted as one ward.
+
+The query count no longer grows with the number of households. The result
+is cached by DashboardCache and invalidated by the HH_PERSONAL_DATA /
+HH_Member signals (see signals.py).
+"""
+
+import logging
+from typing import Dict, List
+
+from django.db.models import Count
+
+from backends.studies.blind_index import blind_group_labels
+from backends.studies.study_44en.models.household import HH_CASE, HH_Member
+from backends.studies.study_44en.models.per_data import HH_PERSONAL_DATA
+from backends.tenancy.utils.dashboard_cache import DashboardCache
+
+logger = logging.getLogger(__name__)
+
+# Database alias for study_44en
+DB_ALIAS = 'db_study_44en'
+STUDY_CODE = '44EN'
+
+UNKNOWN_WARD_LABEL = 'Không xác định'
+TOTAL_LABEL = 'TỔNG CỘNG'
+
+# Tables the distribution reads (cache invalidation)
+SOURCE_MODELS = (HH_CASE, HH_PERSONAL_DATA, HH_Member)
+
+
+class WardDistributionService:
+    """
+    Service thống kê hộ gia đình / thành viên theo phường
+
+    Usage:
+        rows = WardDistributionService().get_distribution()
+        # [{'ward': 'Phường X', 'total_households': N, 'total_participants': M},
+        #  ..., {'ward': 'TỔNG CỘNG', ..., 'is_total': True}]
+    """
+
+    def __init__(self, using: str = DB_ALIAS):
+        self.using = using
+
+    def get_distribution(self) -> List[Dict]:
+        """Cached distribution (recomputed after any household/member write)"""
+        return DashboardCache.get_or_compute(
+            STUDY_CODE, 'ward_distribution', self.using, SOURCE_MODELS, self.compute
+        )
+
+    def compute(self) -> List[Dict]:
+        """Distribution straight from the database (3 queries, any data size)"""
+        queryset = HH_PERSONAL_DATA.objects.using(self.using)
+
+        # Joining members repeats each household once per member:
+        # households are counted DISTINCT, members as is
+        rows = (
+            queryset.values('WARD_BIDX')
+            .annotate(
+                households=Count('pk', distinct=True),
+                participants=Count('HHID__members'),
+            )
+            .order_by()
+        )
+        labels = blind_group_labels(queryset, 'WARD')
+
+        ward_stats = {}
+        for row in rows:
+            ward = labels.get(row['WARD_BIDX']) or UNKNOWN_WARD_LABEL
+            stats = ward_stats.setdefault(ward, {
+                'ward': ward,
+                'total_households': 0,
+                'total_participants': 0,
+            })
+            # NULL index (no ward) and blank plaintext share one row
+            stats['total_households'] += row['households']
+            stats['total_participants'] += row['participants']
+
+        ward_list = sorted(ward_stats.values(), key=lambda x: x['ward'])
+
+        ward_list.append({
+            'ward': TOTAL_LABEL,
+            'total_households': sum(w['total_households'] for w in ward_list),
+            'total_participants': sum(w['total_participants'] for w in ward_list),
+            'is_total': True,
+        })
+
+        return ward_list
@@ -18,11 +18,11 @@ urlpatterns = [
     
     # Dashboard API endpoints
     path('api/dashboard-stats/', 
-         dashboard.get_dashboard_stats_api, 
+         dashboard.get_dashboard_stats_api_async, 
          name='dashboard_stats_api'),
     
     path('api/ward-distribution/', 
-         dashboard.get_ward_distribution_api, 
+         dashboard.get_ward_distribution_api_async, 
          name='ward_distribution_api'),
     
     # ===== HOUSEHOLD MODULE =====
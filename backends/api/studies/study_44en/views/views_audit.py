@@ -11,14 +11,14 @@ Features:
 import logging
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, get_object_or_404, redirect
-from django.core.paginator import Paginator
-from django.db.models import Q
 from django.contrib import messages
 from datetime import datetime
 from django.contrib.auth import get_user_model
 
-from backends.studies.study_44en.models import AuditLog, AuditLogDetail
+from backends.studies.study_44en.models import AuditLog, AuditLogDetail, AuditLogUser
+from backends.audit_logs.utils.pagination import KeysetPaginator
 from backends.audit_logs.utils.permission_decorators import require_crf_view
+from backends.studies.search import AUDIT_SEARCH_FIELDS, search_q
 
 # Explicit database alias for reliable routing
 DB_ALIAS = 'db_study_44en'
@@ -41,7 +41,7 @@ def audit_log_list(request):
     - Model filter
     - Date range filter
     - Full-text search
-    - Pagination
+    - Keyset (cursor) pagination
     """
     logger.info(f"=== AUDIT LOG LIST (44EN) ===")
     logger.info(f"User: {request.user.username}")
@@ -76,7 +76,7 @@ def audit_log_list(request):
     # Filter by patient ID (HHID or MEMBERID)
     patient_id = request.GET.get('patient_id', '').strip()
     if patient_id:
-        logs = logs.filter(patient_id__icontains=patient_id)
+        logs = logs.filter(search_q(patient_id, 'patient_id'))
         filters['patient_id'] = patient_id
     
     # Filter by date range
@@ -103,31 +103,18 @@ def audit_log_list(request):
     # Full-text search
     query = request.GET.get('q', '').strip()
     if query:
-        logs = logs.filter(
-            Q(username__icontains=query) |
-            Q(patient_id__icontains=query) |
-            Q(reason__icontains=query) |
-            Q(model_name__icontains=query)
-        )
+        # pg_trgm GIN indexes (backends/studies/search.py)
+        logs = logs.filter(search_q(query, *AUDIT_SEARCH_FIELDS))
         filters['query'] = query
     
-    # Order and paginate
-    logs = logs.order_by('-timestamp')
+    # Keyset pagination (planner estimate for the total when unfiltered)
+    paginator = KeysetPaginator(logs, per_page=25, estimate_total=not filters)
+    page_obj = paginator.get_page(request.GET.get('cursor'), request.GET.get('dir'))
     
-    paginator = Paginator(logs, 25)
-    page_number = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page_number)
-    
-    logger.info(f"Found {paginator.count} audit logs")
+    logger.info(f"Found {page_obj.total} audit logs (estimate={page_obj.total_is_estimate})")
     
     # Get filter options (with explicit DB routing)
-    user_ids = AuditLog.objects.using(DB_ALIAS)\
-        .values_list('user_id', flat=True)\
-        .distinct()
-    
-    users = User.objects.using('default')\
-        .filter(id__in=list(user_ids))\
-        .order_by('username')
+    users = list(AuditLogUser.objects.using(DB_ALIAS).order_by('username'))
     
     actions = AuditLog.objects.using(DB_ALIAS)\
         .values_list('action', flat=True)\
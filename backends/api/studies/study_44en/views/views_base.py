@@ -16,6 +16,7 @@ from backends.api.base.utils import sanitize_search_query, validate_order_by
 from backends.studies.study_44en.models.household import (
     HH_CASE
 )
+from backends.studies.study_44en.models.per_data import HH_PERSONAL_DATA
 from backends.studies.study_44en.models.individual import (
     Individual, Individual_Exposure
 )
@@ -24,6 +25,9 @@ from backends.audit_logs.utils.permission_decorators import (
     require_crf_view,
 )
 
+# Encrypted WARD/CITY are searched through their blind indexes
+from backends.studies.blind_index import blind_search_q
+
 
 
 def get_filtered_households(user):
@@ -69,8 +73,8 @@ def household_list(request):
     if search_query:
         queryset = queryset.filter(
             Q(HHID__icontains=search_query) |
-            Q(WARD__icontains=search_query) |
-            Q(CITY__icontains=search_query)
+            blind_search_q(HH_PERSONAL_DATA, 'WARD', search_query, path='personal_data__') |
+            blind_search_q(HH_PERSONAL_DATA, 'CITY', search_query, path='personal_data__')
         )
     
     # SECURITY: Validate order_by parameter
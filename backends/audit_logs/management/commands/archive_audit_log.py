@@ -0,0 +1,98 @@
+# backends/audit_logs/management/commands/archive_audit_log.py
+"""
+Management command to archive old audit log partitions to files.
+
+Every monthly partition that ended more than --keep-months ago is exported
+with its details to <AUDIT_ARCHIVE_ROOT>/<study>/<partition>.jsonl.gz, with
+a signed manifest (row counts, stored-checksum check, SHA-256 of the file),
+then detached and dropped. Requires a partitioned audit_log
+(partition_audit_log --convert).
+
+Usage:
+    python manage.py archive_audit_log --all-studies --dry-run
+    python manage.py archive_audit_log --database db_study_43en --keep-months 36
+"""
+import logging
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from backends.audit_logs.utils.partitioning import AuditPartitionManager, study_databases
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Archive audit log partitions older than the hot period to compressed files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            type=str,
+            help='Specific study database alias (e.g., db_study_43en)',
+        )
+        parser.add_argument(
+            '--all-studies',
+            action='store_true',
+            help='All study databases',
+        )
+        parser.add_argument(
+            '--keep-months',
+            type=int,
+            default=getattr(settings, 'AUDIT_HOT_MONTHS', 24),
+            help='Months kept in the database (default: AUDIT_HOT_MONTHS)',
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            default=None,
+            help='Archive directory (default: AUDIT_ARCHIVE_ROOT)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='List the partitions that would be archived',
+        )
+
+    def handle(self, *args, **options):
+        targets = study_databases()
+        if options['database']:
+            targets = {label: alias for label, alias in targets.items() if alias == options['database']}
+            if not targets:
+                raise CommandError(f"Database {options['database']} not found in settings.")
+        elif not options['all_studies']:
+            raise CommandError('You must specify either --database or --all-studies')
+
+        failed = False
+        for app_label, db_alias in targets.items():
+            manager = AuditPartitionManager(app_label, db_alias)
+            if not manager.is_partitioned():
+                self.stdout.write(self.style.WARNING(f'{db_alias}: audit_log is not partitioned, skipped'))
+                continue
+
+            partitions = manager.archivable(options['keep_months'])
+            self.stdout.write(f'{db_alias}: {len(partitions)} partition(s) to archive')
+
+            for partition in partitions:
+                if options['dry_run']:
+                    self.stdout.write(f'  [DRY RUN] {partition.name} ({partition.start:%Y-%m})')
+                    continue
+                try:
+                    manifest = manager.archive(partition, options['output'])
+                except Exception as e:
+                    failed = True
+                    self.stdout.write(self.style.ERROR(f'  {partition.name}: {e}'))
+                    logger.exception(f'Archiving {partition.name} of {db_alias} failed')
+                    break  # keep months in order
+
+                self.stdout.write(
+                    f"  {partition.name}: {manifest['rows']} rows, {manifest['details']} details → {manifest['file']}"
+                )
+                if manifest['invalid_ids']:
+                    self.stdout.write(self.style.ERROR(
+                        f"  ⚠ {len(manifest['invalid_ids'])} rows had invalid checksums (listed in the manifest)"
+                    ))
+
+        if failed:
+            raise CommandError('Audit log archival failed', returncode=1)
+
+        self.stdout.write(self.style.SUCCESS('✅ Hoàn thành!'))
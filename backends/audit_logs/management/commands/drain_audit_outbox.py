@@ -0,0 +1,71 @@
+# backends/audit_logs/management/commands/drain_audit_outbox.py
+"""
+Management command to write the audit entries queued by the async writer.
+
+Normally done by Celery (after each commit and every minute); use this when
+no worker is running, or with --retry-parked to retry the rows parked after
+AUDIT_OUTBOX_MAX_ATTEMPTS failures once their cause is fixed.
+
+Usage:
+    python manage.py drain_audit_outbox
+    python manage.py drain_audit_outbox --study study_43en --batch-size 1000
+    python manage.py drain_audit_outbox --retry-parked
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from backends.audit_logs.utils.outbox import DEFAULT_BATCH_SIZE, AuditOutboxWriter, outbox_studies
+
+
+class Command(BaseCommand):
+    help = 'Write audit entries queued in logging.audit_outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--study',
+            type=str,
+            help='Only this study app label (e.g., study_43en)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Entries per INSERT batch (default: {DEFAULT_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--retry-parked',
+            action='store_true',
+            help='Retry rows parked after too many failed attempts',
+        )
+
+    def handle(self, *args, **options):
+        targets = outbox_studies()
+        if options['study']:
+            if options['study'] not in targets:
+                raise CommandError(f"{options['study']} is not in AUDIT_OUTBOX_STUDIES")
+            targets = {options['study']: targets[options['study']]}
+
+        if not targets:
+            self.stdout.write(self.style.WARNING('No study uses the async audit writer.'))
+            return
+
+        failed = 0
+        for app_label, db_alias in targets.items():
+            writer = AuditOutboxWriter(app_label, db_alias)
+            if options['retry_parked']:
+                self.stdout.write(f'  {app_label}: {writer.retry_parked()} parked entries queued again')
+            stats = writer.drain(batch_size=options['batch_size'])
+            failed += stats['failed']
+            self.stdout.write(
+                f"  {app_label}: {stats['written']} written, {stats['failed']} failed, "
+                f"{writer.pending_count()} still queued"
+            )
+            parked = writer.parked_count()
+            if parked:
+                self.stdout.write(self.style.WARNING(
+                    f'  ⚠ {parked} entries parked (see last_error, then --retry-parked)'
+                ))
+
+        if failed:
+            raise CommandError(f'{failed} audit entries could not be written (see last_error)', returncode=1)
+
+        self.stdout.write(self.style.SUCCESS('✅ Hoàn thành!'))
@@ -0,0 +1,110 @@
+# backends/audit_logs/management/commands/partition_audit_log.py
+"""
+Management command to partition logging.audit_log by month (PostgreSQL).
+
+Run after setup_audit_schema and migrate. --convert rebuilds an existing
+table as a partitioned one (copies all rows under an exclusive lock - use a
+maintenance window). Without it the command only creates the partitions
+for the coming months (also done daily by Celery beat).
+
+See backends/audit_logs/utils/partitioning.py
+
+Usage:
+    python manage.py partition_audit_log --database db_study_43en --convert
+    python manage.py partition_audit_log --all-studies
+    python manage.py partition_audit_log --all-studies --months-ahead 6 --dry-run
+"""
+import logging
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from backends.audit_logs.utils.partitioning import AuditPartitionManager, study_databases
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Partition audit log tables by month and create upcoming partitions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            type=str,
+            help='Specific study database alias (e.g., db_study_43en)',
+        )
+        parser.add_argument(
+            '--all-studies',
+            action='store_true',
+            help='All study databases',
+        )
+        parser.add_argument(
+            '--convert',
+            action='store_true',
+            help='Convert an unpartitioned audit_log (copies all rows)',
+        )
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=getattr(settings, 'AUDIT_PARTITION_MONTHS_AHEAD', 3),
+            help='Months to create after the current one',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show the current state without making changes',
+        )
+
+    def handle(self, *args, **options):
+        targets = study_databases()
+        if options['database']:
+            targets = {label: alias for label, alias in targets.items() if alias == options['database']}
+            if not targets:
+                raise CommandError(f"Database {options['database']} not found in settings.")
+        elif not options['all_studies']:
+            raise CommandError('You must specify either --database or --all-studies')
+
+        if not targets:
+            self.stdout.write(self.style.WARNING('No study databases found.'))
+            return
+
+        failed = False
+        for app_label, db_alias in targets.items():
+            self.stdout.write(f'\n{"="*50}')
+            self.stdout.write(f'{db_alias} ({app_label})')
+            self.stdout.write(f'{"="*50}')
+            try:
+                self._partition(AuditPartitionManager(app_label, db_alias), options)
+            except Exception as e:
+                failed = True
+                self.stdout.write(self.style.ERROR(f'Error: {e}'))
+                logger.exception(f'Audit log partitioning failed for {db_alias}')
+
+        if failed:
+            raise CommandError('Audit log partitioning failed', returncode=1)
+
+        self.stdout.write(self.style.SUCCESS('\n✅ Hoàn thành!'))
+
+    def _partition(self, manager, options):
+        if not manager.supported:
+            self.stdout.write(self.style.WARNING(f'{manager.connection.vendor} - partitioning needs PostgreSQL, skipped'))
+            return
+
+        if not manager.is_partitioned():
+            if options['dry_run'] or not options['convert']:
+                self.stdout.write(self.style.WARNING('  audit_log is not partitioned (use --convert)'))
+                return
+
+            self.stdout.write('  🚀 Converting audit_log to monthly partitions...')
+            result = manager.convert(options['months_ahead'])
+            self.stdout.write(f"  {result['rows']} rows copied into {len(result['partitions'])} partitions")
+        elif not options['dry_run']:
+            created = manager.ensure_partitions(options['months_ahead'])
+            self.stdout.write(f"  Created: {', '.join(created) if created else '-'}")
+
+        partitions = manager.partitions()
+        if partitions:
+            self.stdout.write(f'  Partitions: {partitions[0].name} … {partitions[-1].name} ({len(partitions)})')
+
+        stray = manager.default_rows()
+        if stray:
+            self.stdout.write(self.style.WARNING(f'  {stray} rows in the DEFAULT partition'))
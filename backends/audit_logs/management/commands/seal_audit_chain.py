@@ -0,0 +1,42 @@
+# backends/audit_logs/management/commands/seal_audit_chain.py
+"""
+Management command to seal the hash-chained audit logs.
+
+Stores a signed Merkle checkpoint for every complete block of
+AUDIT_CHAIN_BLOCK_SIZE entries (also run hourly by Celery beat).
+
+Usage:
+    python manage.py seal_audit_chain
+    python manage.py seal_audit_chain --study study_43en
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from backends.audit_logs.utils.chain import AuditChain, chained_studies
+
+
+class Command(BaseCommand):
+    help = 'Seal complete blocks of hash-chained audit logs with signed checkpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--study',
+            type=str,
+            help='Only this study app label (e.g., study_43en)',
+        )
+
+    def handle(self, *args, **options):
+        targets = chained_studies()
+        if options['study']:
+            if options['study'] not in targets:
+                raise CommandError(f"{options['study']} is not in AUDIT_HASH_CHAIN_STUDIES")
+            targets = {options['study']: targets[options['study']]}
+
+        if not targets:
+            self.stdout.write(self.style.WARNING('No study uses the hash-chained audit log.'))
+            return
+
+        for app_label, db_alias in targets.items():
+            created = AuditChain(app_label, db_alias).seal()
+            self.stdout.write(f'  {app_label}: {created} block(s) sealed')
+
+        self.stdout.write(self.style.SUCCESS('✅ Hoàn thành!'))
@@ -0,0 +1,98 @@
+# backends/audit_logs/management/commands/verify_audit_chain.py
+"""
+Management command to verify the hash-chained audit logs.
+
+Checks checkpoint signatures, the unsealed tail and seq gaps; --block
+re-reads the given sealed blocks and compares their Merkle roots (archived
+entries are read from their archive files when available).
+
+Usage:
+    python manage.py verify_audit_chain
+    python manage.py verify_audit_chain --study study_43en --block 0 --block 41
+    python manage.py verify_audit_chain --study study_43en --all-blocks
+
+Exit status is 1 when the chain is broken.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from backends.audit_logs.utils.chain import AuditChain, chained_studies
+
+
+class Command(BaseCommand):
+    help = 'Verify hash-chained audit logs (checkpoints, blocks, tail, gaps)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--study',
+            type=str,
+            help='Only this study app label (e.g., study_43en)',
+        )
+        parser.add_argument(
+            '--block',
+            type=int,
+            action='append',
+            default=[],
+            help='Also re-read this sealed block (can be repeated)',
+        )
+        parser.add_argument(
+            '--all-blocks',
+            action='store_true',
+            help='Re-read every sealed block',
+        )
+
+    def handle(self, *args, **options):
+        targets = chained_studies()
+        if options['study']:
+            if options['study'] not in targets:
+                raise CommandError(f"{options['study']} is not in AUDIT_HASH_CHAIN_STUDIES")
+            targets = {options['study']: targets[options['study']]}
+
+        if not targets:
+            self.stdout.write(self.style.WARNING('No study uses the hash-chained audit log.'))
+            return
+
+        broken = False
+        for app_label, db_alias in targets.items():
+            chain = AuditChain(app_label, db_alias)
+            blocks = options['block']
+            if options['all_blocks']:
+                blocks = list(chain.Checkpoint.objects.using(db_alias).values_list('block_no', flat=True))
+
+            result = chain.verify(blocks)
+            broken = broken or not result['ok']
+
+            self.stdout.write(f'\n{"="*50}')
+            self.stdout.write(f'{app_label} ({db_alias})')
+            self.stdout.write(f'{"="*50}')
+            self.stdout.write(
+                f"Checkpoints: {result['checkpoints']['checkpoints']} "
+                f"{'✓' if result['checkpoints']['ok'] else '✗'}"
+            )
+            for error in result['checkpoints']['errors']:
+                self.stdout.write(self.style.ERROR(f'  {error}'))
+
+            for block in result['blocks']:
+                status = '✓' if block['ok'] else f"✗ {block.get('error')}"
+                self.stdout.write(f"Block {block['block_no']}: {status}")
+                if block.get('missing'):
+                    self.stdout.write(self.style.ERROR(f"  missing seq: {block['missing']}"))
+                if block.get('archived'):
+                    self.stdout.write(f"  {block['archived']} entr(ies) read from archive files")
+                if block.get('warning'):
+                    self.stdout.write(self.style.WARNING(f"  {block['warning']}"))
+
+            tail = result['tail']
+            self.stdout.write(f"Tail: {tail['entries']} entr(ies) {'✓' if tail['ok'] else '✗ ' + tail.get('error', '')}")
+
+            gaps = result['gaps']
+            self.stdout.write(
+                f"Head seq {gaps['head_seq']}, {gaps['entries']} chained entries, "
+                f"{gaps['archived']} archived, {gaps['missing']} missing"
+            )
+            for error in gaps['errors']:
+                self.stdout.write(self.style.ERROR(f'  {error}'))
+
+        if broken:
+            raise CommandError('ALERT: audit hash chain is broken!', returncode=1)
+
+        self.stdout.write(self.style.SUCCESS('\n✓ Audit hash chain intact.'))
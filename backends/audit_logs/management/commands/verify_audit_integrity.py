@@ -4,24 +4,34 @@ Management command to verify integrity of audit log records.
 
 This command checks HMAC checksums to detect any tampering with audit logs.
 
+By default it verifies every row added since the previous run (per-study
+watermark) - schedule it nightly. --full re-verifies the whole table.
+Databases are read concurrently and checksums computed in a process pool
+(see backends/audit_logs/utils/verification.py). A JSON report per study is
+written to settings.AUDIT_VERIFICATION_ROOT.
+
 Usage:
-    python manage.py verify_audit_integrity --database db_study_43en
-    python manage.py verify_audit_integrity --database db_study_43en --fix
     python manage.py verify_audit_integrity --all-studies
+    python manage.py verify_audit_integrity --database db_study_43en --full --workers 8
+    python manage.py verify_audit_integrity --database db_study_43en --days 30 --limit 1000
+
+Exit status is 1 when an invalid record was found.
 """
 import logging
-from datetime import datetime, timedelta
+from datetime import timedelta
 from django.core.management.base import BaseCommand, CommandError
 from django.db import connections
 from django.conf import settings
 from django.utils import timezone
 
+from backends.audit_logs.utils.verification import DEFAULT_CHUNK_SIZE, verify_studies
+
 logger = logging.getLogger(__name__)
 
 
 class Command(BaseCommand):
     help = 'Verify integrity of audit log records using HMAC checksums'
-    
+
     def add_arguments(self, parser):
         parser.add_argument(
             '--database',
@@ -33,24 +43,41 @@ class Command(BaseCommand):
             action='store_true',
             help='Verify all study databases',
         )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Verify the whole table, ignoring the stored watermark',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Checksum worker processes (default: CPU count)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f'Rows read per query (default: {DEFAULT_CHUNK_SIZE})',
+        )
         parser.add_argument(
             '--days',
             type=int,
-            default=30,
-            help='Number of days to check (default: 30)',
+            default=None,
+            help='Spot check: only the last N days (no checkpoint)',
         )
         parser.add_argument(
             '--limit',
             type=int,
-            default=1000,
-            help='Maximum number of records to check per database (default: 1000)',
+            default=None,
+            help='Spot check: at most N records per database (no checkpoint)',
         )
         parser.add_argument(
             '--mark-invalid',
             action='store_true',
             help='Mark invalid records with is_verified=False',
         )
-    
+
     def handle(self, *args, **options):
         if options['all_studies']:
             databases = self._get_all_study_databases()
@@ -60,123 +87,105 @@ class Command(BaseCommand):
             raise CommandError(
                 'You must specify either --database or --all-studies'
             )
-        
+
         if not databases:
             self.stdout.write(
                 self.style.WARNING('No study databases found.')
             )
             return
-        
+
+        targets = {self._study_label(db_alias): db_alias for db_alias in databases}
+        since = timezone.now() - timedelta(days=options['days']) if options['days'] else None
+
+        self.stdout.write(
+            f"🚀 Verifying {', '.join(databases)} "
+            f"({'full' if options['full'] else 'incremental'}"
+            f"{', spot check' if since or options['limit'] else ''})..."
+        )
+
+        reports = verify_studies(
+            targets,
+            workers=options['workers'],
+            chunk_size=options['chunk_size'],
+            full=options['full'],
+            since=since,
+            limit=options['limit'],
+            mark_invalid=options['mark_invalid'],
+        )
+
         total_valid = 0
         total_invalid = 0
-        
-        for db_alias in databases:
-            valid, invalid = self._verify_database(
-                db_alias,
-                days=options['days'],
-                limit=options['limit'],
-                mark_invalid=options['mark_invalid'],
+        failed = False
+
+        for app_label, report in reports.items():
+            self.stdout.write(f'\n{"="*50}')
+            self.stdout.write(f'{report["database"]} ({app_label})')
+            self.stdout.write(f'{"="*50}')
+
+            if 'error' in report:
+                failed = True
+                self.stdout.write(self.style.ERROR(f'Error verifying {report["database"]}: {report["error"]}'))
+                continue
+
+            for entry in report['invalid']:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f'  INVALID: ID={entry["id"]} '
+                        f'User={entry["username"]} '
+                        f'Action={entry["action"]} '
+                        f'Time={entry["timestamp"]}'
+                    )
+                )
+
+            self.stdout.write(
+                f'Results: {report["valid"]} valid, {report["invalid_count"]} invalid '
+                f'(out of {report["checked"]} checked, {report["duration_seconds"]}s, '
+                f'{report["rows_per_second"] or 0} rows/s)'
             )
-            total_valid += valid
-            total_invalid += invalid
-        
+            self.stdout.write(f'Watermark: {report["watermark_from"] or "-"} → {report["watermark_to"] or "-"}')
+            if report.get('held_by_outbox'):
+                self.stdout.write(self.style.WARNING(
+                    f'  Stopped before {report["held_by_outbox"]}: entry still queued in the audit outbox'
+                ))
+            self.stdout.write(f'Report: {report["report_path"]}')
+
+            total_valid += report['valid']
+            total_invalid += report['invalid_count']
+
         # Summary
         self.stdout.write('\n' + '='*60)
         self.stdout.write('VERIFICATION SUMMARY')
         self.stdout.write('='*60)
         self.stdout.write(f'Total valid records:   {total_valid}')
         self.stdout.write(f'Total invalid records: {total_invalid}')
-        
+
         if total_invalid > 0:
             self.stdout.write(
                 self.style.ERROR(
                     f'\n ALERT: {total_invalid} audit log(s) may have been tampered!'
                 )
             )
-        else:
+        elif not failed:
             self.stdout.write(
                 self.style.SUCCESS('\n✓ All checked records have valid checksums.')
             )
-    
+
+        if total_invalid or failed:
+            raise CommandError('Audit integrity verification failed', returncode=1)
+
     def _get_all_study_databases(self):
         """Get all study database aliases from settings."""
         study_prefix = getattr(settings, 'STUDY_DB_PREFIX', 'db_study_')
         databases = []
-        
+
         for db_alias in connections.databases.keys():
             if db_alias.startswith(study_prefix):
                 databases.append(db_alias)
-        
+
         return databases
-    
-    def _verify_database(self, db_alias, days, limit, mark_invalid):
-        """Verify audit logs in a specific database."""
-        self.stdout.write(f'\n{"="*50}')
-        self.stdout.write(f'Verifying: {db_alias}')
-        self.stdout.write(f'{"="*50}')
-        
-        # Extract study code from db_alias (e.g., 'db_study_43en' -> 'study_43en')
+
+    @staticmethod
+    def _study_label(db_alias):
+        """App label of a study database (e.g., 'db_study_43en' -> 'study_43en')"""
         study_prefix = getattr(settings, 'STUDY_DB_PREFIX', 'db_study_')
-        study_code = db_alias.replace(study_prefix.rstrip('_'), '').lstrip('_')
-        
-        try:
-            # Import audit models for this study
-            from backends.audit_logs.models import get_audit_models
-            models = get_audit_models(study_code)
-            
-            if not models:
-                self.stdout.write(
-                    self.style.WARNING(
-                        f'Audit models not found for {study_code}. '
-                        'Make sure study app is loaded.'
-                    )
-                )
-                return 0, 0
-            
-            AuditLog, AuditLogDetail = models
-            
-            # Query recent audit logs
-            cutoff_date = timezone.now() - timedelta(days=days)
-            audit_logs = AuditLog.objects.using(db_alias).filter(
-                timestamp__gte=cutoff_date
-            ).prefetch_related('details').order_by('-timestamp')[:limit]
-            
-            valid_count = 0
-            invalid_count = 0
-            
-            for audit_log in audit_logs:
-                is_valid = audit_log.verify_integrity()
-                
-                if is_valid:
-                    valid_count += 1
-                else:
-                    invalid_count += 1
-                    self.stdout.write(
-                        self.style.ERROR(
-                            f'  INVALID: ID={audit_log.id} '
-                            f'User={audit_log.username} '
-                            f'Action={audit_log.action} '
-                            f'Time={audit_log.timestamp}'
-                        )
-                    )
-                    
-                    if mark_invalid:
-                        # Update is_verified flag (requires admin override)
-                        AuditLog.objects.using(db_alias).filter(
-                            pk=audit_log.pk
-                        ).update(is_verified=False)
-                        self.stdout.write('    → Marked as invalid')
-            
-            self.stdout.write(
-                f'\nResults: {valid_count} valid, {invalid_count} invalid '
-                f'(out of {valid_count + invalid_count} checked)'
-            )
-            
-            return valid_count, invalid_count
-            
-        except Exception as e:
-            self.stdout.write(
-                self.style.ERROR(f'Error verifying {db_alias}: {e}')
-            )
-            logger.exception(f'Verification error for {db_alias}')
-            return 0, 0
+        return f'study_{db_alias[len(study_prefix):]}'
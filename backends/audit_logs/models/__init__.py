@@ -33,15 +33,33 @@ For runtime usage (views, decorators, etc.):
 from .base import (
     AbstractAuditLog,
     AbstractAuditLogDetail,
+    AbstractAuditLogUser,
+    AbstractAuditChainHead,
+    AbstractAuditChainCheckpoint,
+    AbstractAuditChainArchive,
+    AbstractAuditOutbox,
     create_audit_models,
     get_audit_models,
+    get_audit_user_model,
+    get_audit_chain_models,
+    get_audit_chain_archive_model,
+    get_audit_outbox_model,
 )
 
 __all__ = [
     # Abstract base models
     'AbstractAuditLog',
     'AbstractAuditLogDetail',
+    'AbstractAuditLogUser',
+    'AbstractAuditChainHead',
+    'AbstractAuditChainCheckpoint',
+    'AbstractAuditChainArchive',
+    'AbstractAuditOutbox',
     # Factory function
     'create_audit_models',
     'get_audit_models',
+    'get_audit_user_model',
+    'get_audit_chain_models',
+    'get_audit_chain_archive_model',
+    'get_audit_outbox_model',
 ]
\ No newline at end of file
@@ -9,12 +9,24 @@ This module provides:
 Database Schema Structure:
 - Each study database has 2 schemas: 'data' (CRF tables) and 'logging' (audit tables)
 - Audit tables: logging.audit_log, logging.audit_log_detail
+- logging.audit_log_user: users that appear in the log (filter dropdown),
+  maintained on save instead of SELECT DISTINCT over the whole log
+- logging.audit_chain_head / audit_chain_checkpoint: optional hash chain
+  (seq + chain_hash per entry, signed Merkle checkpoints), see
+  backends/audit_logs/utils/chain.py
+- logging.audit_chain_archive: signed record of the chained seq numbers
+  moved to archive files (backends/audit_logs/utils/partitioning.py)
+- logging.audit_outbox: audit records queued by the async writer, written
+  with the CRF change and drained in batches (utils/outbox.py)
+- logging.audit_log can be converted to monthly range partitions on
+  timestamp and old months archived to files (utils/partitioning.py)
 
 Usage in study app (e.g., study_43en/models/__init__.py):
     from backends.audit_logs.models.base import create_audit_models
     
     # Create concrete AuditLog and AuditLogDetail for this study
     AuditLog, AuditLogDetail = create_audit_models('study_43en')
+    AuditLogUser = get_audit_user_model('study_43en')
 
 This ensures:
 - `makemigrations study_43en` includes AuditLog tables
@@ -23,13 +35,25 @@ This ensures:
 
 Security Features:
 - HMAC-SHA256 checksum for tamper detection
+- Optional hash chain: detects deleted/reordered entries
 - Immutable records (no update/delete allowed)
 - IP address and session tracking
 """
-from django.db import models
+import logging
+
+from django.contrib.postgres.indexes import BrinIndex
+from django.db import models, router, transaction
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
 from django.utils import timezone
 
+from backends.studies.search import trigram_index
+
+logger = logging.getLogger(__name__)
+
+# A user's dimension row is re-upserted at most once per timeout
+AUDIT_USER_CACHE_TIMEOUT = 3600
+
 
 class AbstractAuditLog(models.Model):
     """
@@ -44,38 +68,32 @@ class AbstractAuditLog(models.Model):
     
     # WHO: User information
     user_id = models.IntegerField(
-        db_index=True,
         help_text="User ID from management database"
     )
     
     username = models.CharField(
         max_length=150,
-        db_index=True,
         help_text="Username backup"
     )
     
-    # WHEN: Timestamp
+    # WHEN: Timestamp (partition key when partitioned, utils/partitioning.py)
     timestamp = models.DateTimeField(
-        default=timezone.now,
-        db_index=True
+        default=timezone.now
     )
     
     # WHAT: Action details
     action = models.CharField(
         max_length=10,
-        choices=ACTION_CHOICES,
-        db_index=True
+        choices=ACTION_CHOICES
     )
     
     model_name = models.CharField(
         max_length=100,
-        db_index=True,
         help_text="CRF model (e.g., SCREENINGCASE)"
     )
     
     patient_id = models.CharField(
         max_length=50,
-        db_index=True,
         help_text="Patient identifier (USUBJID or SCRID)"
     )
     
@@ -83,7 +101,6 @@ class AbstractAuditLog(models.Model):
         max_length=10,
         null=True,
         blank=True,
-        db_index=True,
         help_text="Site code for filtering"
     )
     
@@ -116,6 +133,22 @@ class AbstractAuditLog(models.Model):
         help_text="Integrity status"
     )
     
+    # CHAIN: Set only in chained mode (settings.AUDIT_HASH_CHAIN_STUDIES)
+    seq = models.BigIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Position in the study's hash chain (gap-free)"
+    )
+    
+    chain_hash = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="HMAC over previous chain hash, seq and checksum"
+    )
+    
     class Meta:
         abstract = True
         ordering = ['-timestamp']
@@ -165,35 +198,25 @@ class AbstractAuditLog(models.Model):
             
             self.checksum = IntegrityChecker.generate_checksum(audit_data)
         
-        super().save(*args, **kwargs)
+        from backends.audit_logs.utils.chain import AuditChain, chain_enabled
+        
+        if chain_enabled(self._meta.app_label):
+            using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+            with AuditChain(self._meta.app_label, using).appending(self):
+                super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+        self._record_user()
+    
+    def _record_user(self):
+        """Upsert the author into the study's AuditLogUser dimension"""
+        record_audit_users(self._meta.app_label, self._state.db, [self])
     
     def verify_integrity(self) -> bool:
-        """Verify checksum integrity"""
+        """Verify checksum integrity (uses prefetched details if any)"""
         from backends.audit_logs.utils.integrity import IntegrityChecker
         
-        details = self.details.all()
-        
-        old_data = {}
-        new_data = {}
-        
-        for detail in details:
-            old_data[detail.field_name] = detail.old_value
-            new_data[detail.field_name] = detail.new_value
-        
-        audit_data = {
-            'user_id': self.user_id,
-            'username': self.username,
-            'action': self.action,
-            'model_name': self.model_name,
-            'patient_id': self.patient_id,
-            'timestamp': str(self.timestamp),
-            'old_data': old_data,
-            'new_data': new_data,
-            'reason': self.reason,
-        }
-        
-        calculated_checksum = IntegrityChecker.generate_checksum(audit_data)
-        return calculated_checksum == self.checksum
+        return IntegrityChecker.verify_integrity(self)
     
     def get_user(self):
         """Get user from management database"""
@@ -254,12 +277,283 @@ class AbstractAuditLogDetail(models.Model):
         super().save(*args, **kwargs)
 
 
+class AbstractAuditLogUser(models.Model):
+    """
+    Abstract base audit log user dimension
+    
+    One row per user_id found in the audit log - feeds the user filter of
+    the audit log browser. Written by AbstractAuditLog.save(); no checksum,
+    rebuildable from the log at any time.
+    """
+    
+    user_id = models.IntegerField(
+        primary_key=True,
+        help_text="User ID from management database"
+    )
+    
+    username = models.CharField(
+        max_length=150,
+        help_text="Latest username seen in the log"
+    )
+    
+    last_seen = models.DateTimeField(
+        default=timezone.now,
+        help_text="Timestamp of a recent audit entry (refreshed at most hourly)"
+    )
+    
+    class Meta:
+        abstract = True
+        ordering = ['username']
+        verbose_name = 'Audit Log User'
+        verbose_name_plural = 'Audit Log Users'
+        default_permissions = ('view',)
+    
+    def __str__(self):
+        return f"{self.username} ({self.user_id})"
+    
+    # Template compatibility with User objects in the filter dropdown
+    @property
+    def id(self):
+        return self.user_id
+
+
+class AbstractAuditChainHead(models.Model):
+    """
+    Abstract base chain head - last linked entry of the study's audit log
+    
+    Single row (id=1), locked by every chained append.
+    """
+    
+    id = models.PositiveSmallIntegerField(primary_key=True, default=1)
+    
+    seq = models.BigIntegerField(
+        default=0,
+        help_text="seq of the last chained entry"
+    )
+    
+    chain_hash = models.CharField(
+        max_length=64,
+        default='0' * 64,
+        help_text="chain_hash of the last chained entry"
+    )
+    
+    updated_at = models.DateTimeField(
+        default=timezone.now
+    )
+    
+    class Meta:
+        abstract = True
+        verbose_name = 'Audit Chain Head'
+        default_permissions = ('view',)
+    
+    def __str__(self):
+        return f"seq {self.seq}: {self.chain_hash[:16]}..."
+
+
+class AbstractAuditChainCheckpoint(models.Model):
+    """
+    Abstract base signed checkpoint over one block of chained entries
+    
+    Immutable like the audit log itself.
+    """
+    
+    block_no = models.IntegerField(primary_key=True)
+    
+    first_seq = models.BigIntegerField()
+    
+    last_seq = models.BigIntegerField()
+    
+    merkle_root = models.CharField(
+        max_length=64,
+        help_text="Merkle root of the block's chain hashes"
+    )
+    
+    end_chain_hash = models.CharField(
+        max_length=64,
+        help_text="chain_hash of the block's last entry"
+    )
+    
+    signature = models.CharField(
+        max_length=64,
+        help_text="HMAC over the checkpoint and the previous signature"
+    )
+    
+    created_at = models.DateTimeField(
+        default=timezone.now
+    )
+    
+    class Meta:
+        abstract = True
+        ordering = ['block_no']
+        verbose_name = 'Audit Chain Checkpoint'
+        verbose_name_plural = 'Audit Chain Checkpoints'
+        default_permissions = ('add', 'view')
+    
+    def __str__(self):
+        return f"block {self.block_no} (seq {self.first_seq}-{self.last_seq})"
+    
+    def delete(self, *args, **kwargs):
+        raise PermissionDenied("Audit chain checkpoints cannot be deleted")
+    
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise PermissionDenied("Audit chain checkpoints are immutable")
+        super().save(*args, **kwargs)
+
+
+class AbstractAuditChainArchive(models.Model):
+    """
+    Abstract base record of chained entries moved out by archive_audit_log
+    
+    Written in the transaction that drops the partition, so chain
+    verification can tell archived seq numbers from deleted ones.
+    Immutable like the checkpoints.
+    """
+    
+    id = models.BigAutoField(primary_key=True)
+    
+    partition = models.CharField(
+        max_length=63,
+        help_text="Dropped partition (e.g. audit_log_y2024m01)"
+    )
+    
+    first_seq = models.BigIntegerField()
+    
+    last_seq = models.BigIntegerField()
+    
+    seq_ranges = models.JSONField(
+        help_text="Archived seq numbers as [first, last] runs"
+    )
+    
+    entries = models.BigIntegerField(
+        help_text="Chained entries in the archive file"
+    )
+    
+    file = models.CharField(
+        max_length=255,
+        help_text="Archive file, relative to AUDIT_ARCHIVE_ROOT (absolute when archived elsewhere)"
+    )
+    
+    sha256 = models.CharField(
+        max_length=64
+    )
+    
+    signature = models.CharField(
+        max_length=64,
+        help_text="HMAC over partition, seq ranges, entries and file hash"
+    )
+    
+    archived_at = models.DateTimeField(
+        default=timezone.now
+    )
+    
+    class Meta:
+        abstract = True
+        ordering = ['first_seq']
+        verbose_name = 'Audit Chain Archive'
+        verbose_name_plural = 'Audit Chain Archives'
+        default_permissions = ('view',)
+    
+    def __str__(self):
+        return f"{self.partition} (seq {self.first_seq}-{self.last_seq}, {self.entries} entries)"
+    
+    def delete(self, *args, **kwargs):
+        raise PermissionDenied("Audit chain archive records cannot be deleted")
+    
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise PermissionDenied("Audit chain archive records are immutable")
+        super().save(*args, **kwargs)
+
+
+class AbstractAuditOutbox(models.Model):
+    """
+    Abstract base audit outbox - audit records waiting to be written
+    
+    Filled by the audit_log decorator in the CRF change's transaction,
+    drained in batches into audit_log by a Celery worker
+    (backends/audit_logs/utils/outbox.py). A row is deleted in the same
+    transaction that writes its audit entry.
+    """
+    
+    id = models.BigAutoField(primary_key=True)
+    
+    created_at = models.DateTimeField(
+        default=timezone.now
+    )
+    
+    payload = models.JSONField(
+        help_text="Audit entry fields, details and checksum data"
+    )
+    
+    attempts = models.PositiveIntegerField(
+        default=0,
+        help_text="Failed drain attempts"
+    )
+    
+    last_error = models.TextField(
+        blank=True,
+        default=''
+    )
+    
+    class Meta:
+        abstract = True
+        ordering = ['id']
+        verbose_name = 'Audit Outbox Entry'
+        verbose_name_plural = 'Audit Outbox'
+        default_permissions = ('view',)
+    
+    def __str__(self):
+        return f"outbox {self.id}: {self.payload.get('action')} {self.payload.get('model_name')}"
+
+
+def record_audit_users(app_label: str, using: str, entries):
+    """
+    Upsert the authors of saved audit entries into AuditLogUser
+    
+    Cached per user, so steady-state writes skip the upsert. Runs in a
+    savepoint and never fails the audit write.
+    """
+    user_model = get_audit_user_model(app_label)
+    if user_model is None:
+        return
+    
+    latest = {}
+    for entry in entries:
+        if entry.user_id:
+            latest[entry.user_id] = entry
+    
+    try:
+        stale = [
+            entry for user_id, entry in latest.items()
+            if cache.get(f'audit_log_user_{app_label}_{user_id}') != entry.username
+        ]
+        if not stale:
+            return
+        
+        with transaction.atomic(using=using):
+            user_model.objects.using(using).bulk_create(
+                [user_model(user_id=e.user_id, username=e.username, last_seen=e.timestamp) for e in stale],
+                update_conflicts=True,
+                unique_fields=['user_id'],
+                update_fields=['username', 'last_seen'],
+            )
+        for entry in stale:
+            cache.set(f'audit_log_user_{app_label}_{entry.user_id}', entry.username, AUDIT_USER_CACHE_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Audit user dimension not updated for users {sorted(latest)}: {e}")
+
+
 # =============================================================================
 # FACTORY FUNCTION - Creates concrete models for each study
 # =============================================================================
 
 # Cache to store created models per study
 _audit_model_cache = {}
+_audit_user_model_cache = {}
+_audit_chain_model_cache = {}
+_audit_outbox_model_cache = {}
+_audit_chain_archive_model_cache = {}
 
 
 def create_audit_models(app_label: str, index_prefix: str = None):
@@ -302,12 +596,22 @@ def create_audit_models(app_label: str, index_prefix: str = None):
         verbose_name = 'Audit Log'
         verbose_name_plural = 'Audit Logs'
         default_permissions = ('add', 'view')
+        # Single-column B-trees are covered by the composites below; time
+        # ranges (verification, archival) use the BRIN index
         indexes = [
-            models.Index(fields=['-timestamp'], name=f'{_index_prefix}_audit_log_time_idx'),
+            BrinIndex(fields=['timestamp'], name=f'{_index_prefix}_audit_log_time_brin', autosummarize=True),
+            models.Index(fields=['seq'], name=f'{_index_prefix}_audit_log_seq_idx'),
+            # Keyset pagination order (utils/pagination.py)
+            models.Index(fields=['-timestamp', '-id'], name=f'{_index_prefix}_audit_log_keyset_idx'),
             models.Index(fields=['patient_id', '-timestamp'], name=f'{_index_prefix}_audit_log_patient_idx'),
             models.Index(fields=['user_id', '-timestamp'], name=f'{_index_prefix}_audit_log_user_idx'),
             models.Index(fields=['SITEID', '-timestamp'], name=f'{_index_prefix}_audit_log_site_idx'),
             models.Index(fields=['model_name', 'action'], name=f'{_index_prefix}_audit_log_model_idx'),
+            # Search box (icontains) - pg_trgm GIN
+            trigram_index('username', f'{_index_prefix}_audit_log_user_trgm'),
+            trigram_index('patient_id', f'{_index_prefix}_audit_log_patient_trgm'),
+            trigram_index('reason', f'{_index_prefix}_audit_log_reason_trgm'),
+            trigram_index('model_name', f'{_index_prefix}_audit_log_model_trgm'),
         ]
     
     # Create AuditLog model using type()
@@ -333,12 +637,89 @@ def create_audit_models(app_label: str, index_prefix: str = None):
         'audit_log': models.ForeignKey(
             AuditLog,
             on_delete=models.PROTECT,
-            related_name='details'
+            related_name='details',
+            # A partitioned audit_log has no unique constraint on id alone
+            db_constraint=False
         ),
     })
     
+    # Create Meta class for AuditLogUser
+    class AuditLogUserMeta:
+        app_label = _app_label
+        db_table = 'logging"."audit_log_user'
+        db_table_comment = 'Users appearing in the audit log (filter dropdown)'
+        ordering = ['username']
+        verbose_name = 'Audit Log User'
+        verbose_name_plural = 'Audit Log Users'
+        default_permissions = ('view',)
+    
+    AuditLogUser = type('AuditLogUser', (AbstractAuditLogUser,), {
+        'Meta': AuditLogUserMeta,
+        '__module__': f'backends.studies.{_app_label}.models',
+    })
+    
+    # Create Meta classes for the hash chain (utils/chain.py)
+    class AuditChainHeadMeta:
+        app_label = _app_label
+        db_table = 'logging"."audit_chain_head'
+        db_table_comment = 'Last entry of the audit log hash chain'
+        verbose_name = 'Audit Chain Head'
+        default_permissions = ('view',)
+    
+    class AuditChainCheckpointMeta:
+        app_label = _app_label
+        db_table = 'logging"."audit_chain_checkpoint'
+        db_table_comment = 'Signed Merkle checkpoints over blocks of chained audit entries'
+        ordering = ['block_no']
+        verbose_name = 'Audit Chain Checkpoint'
+        verbose_name_plural = 'Audit Chain Checkpoints'
+        default_permissions = ('add', 'view')
+    
+    AuditChainHead = type('AuditChainHead', (AbstractAuditChainHead,), {
+        'Meta': AuditChainHeadMeta,
+        '__module__': f'backends.studies.{_app_label}.models',
+    })
+    
+    AuditChainCheckpoint = type('AuditChainCheckpoint', (AbstractAuditChainCheckpoint,), {
+        'Meta': AuditChainCheckpointMeta,
+        '__module__': f'backends.studies.{_app_label}.models',
+    })
+    
+    class AuditChainArchiveMeta:
+        app_label = _app_label
+        db_table = 'logging"."audit_chain_archive'
+        db_table_comment = 'Chained audit entries moved to archive files'
+        ordering = ['first_seq']
+        verbose_name = 'Audit Chain Archive'
+        verbose_name_plural = 'Audit Chain Archives'
+        default_permissions = ('view',)
+    
+    AuditChainArchive = type('AuditChainArchive', (AbstractAuditChainArchive,), {
+        'Meta': AuditChainArchiveMeta,
+        '__module__': f'backends.studies.{_app_label}.models',
+    })
+    
+    # Create Meta class for AuditOutbox (utils/outbox.py)
+    class AuditOutboxMeta:
+        app_label = _app_label
+        db_table = 'logging"."audit_outbox'
+        db_table_comment = 'Audit records waiting to be written to audit_log'
+        ordering = ['id']
+        verbose_name = 'Audit Outbox Entry'
+        verbose_name_plural = 'Audit Outbox'
+        default_permissions = ('view',)
+    
+    AuditOutbox = type('AuditOutbox', (AbstractAuditOutbox,), {
+        'Meta': AuditOutboxMeta,
+        '__module__': f'backends.studies.{_app_label}.models',
+    })
+    
     # Cache the models
     _audit_model_cache[_app_label] = (AuditLog, AuditLogDetail)
+    _audit_user_model_cache[_app_label] = AuditLogUser
+    _audit_chain_model_cache[_app_label] = (AuditChainHead, AuditChainCheckpoint)
+    _audit_outbox_model_cache[_app_label] = AuditOutbox
+    _audit_chain_archive_model_cache[_app_label] = AuditChainArchive
     
     return AuditLog, AuditLogDetail
 
@@ -350,3 +731,39 @@ def get_audit_models(app_label: str):
     Returns None if models haven't been created yet.
     """
     return _audit_model_cache.get(app_label)
+
+
+def get_audit_user_model(app_label: str):
+    """
+    Get the AuditLogUser model created with the study's audit models.
+    
+    Returns None if create_audit_models() hasn't run for the study.
+    """
+    return _audit_user_model_cache.get(app_label)
+
+
+def get_audit_chain_models(app_label: str):
+    """
+    Get (AuditChainHead, AuditChainCheckpoint) for a study.
+    
+    Returns None if create_audit_models() hasn't run for the study.
+    """
+    return _audit_chain_model_cache.get(app_label)
+
+
+def get_audit_outbox_model(app_label: str):
+    """
+    Get the AuditOutbox model created with the study's audit models.
+    
+    Returns None if create_audit_models() hasn't run for the study.
+    """
+    return _audit_outbox_model_cache.get(app_label)
+
+
+def get_audit_chain_archive_model(app_label: str):
+    """
+    Get the AuditChainArchive model created with the study's audit models.
+    
+    Returns None if create_audit_models() hasn't run for the study.
+    """
+    return _audit_chain_archive_model_cache.get(app_label)
@@ -18,11 +18,15 @@ Export all utility classes and functions
 """
 from .helpers import get_client_ip, normalize_value, format_value_for_display
 from .integrity import IntegrityChecker
-from .detector import ChangeDetector
+from .detector import ChangeDetector, DiffPlan
 from .sanitizer import SecuritySanitizer
 from .validator import ReasonValidator
 from .decorators import audit_log
 from .rate_limiter import rate_limit
+from .pagination import KeysetPaginator
+from .verification import AuditVerificationEngine
+from .outbox import AuditOutboxWriter
+from .partitioning import AuditPartitionManager
 
 __all__ = [
     # Helpers
@@ -33,6 +37,7 @@ __all__ = [
     # Core classes
     'IntegrityChecker',
     'ChangeDetector',
+    'DiffPlan',
     'SecuritySanitizer',
     'ReasonValidator',
     
@@ -40,6 +45,18 @@ __all__ = [
     'audit_log',
     'rate_limit',
     
+    # Pagination
+    'KeysetPaginator',
+    
+    # Bulk integrity verification
+    'AuditVerificationEngine',
+    
+    # Async audit writer
+    'AuditOutboxWriter',
+    
+    # Partitioning & archival
+    'AuditPartitionManager',
+    
     # Legacy - deprecated (for backwards compatibility)
     'get_site_filtered_object_or_404',
     'get_queryset_for_model',
@@ -0,0 +1,495 @@
+# backends/audit_logs/utils/chain.py
+"""
+Audit Hash Chain - Tamper-evident ordering of a study's audit log
+
+Per-row checksums detect edited rows but not deleted ones. In chained mode
+(settings.AUDIT_HASH_CHAIN_STUDIES) every new entry also gets:
+
+    seq         1, 2, 3, ... without gaps (per study)
+    chain_hash  HMAC(key, previous chain_hash : seq : checksum)
+
+so removing or reordering entries breaks the chain. Appends are O(1): the
+writer locks the single chain head row (last seq + hash), links the entry
+and moves the head, all in the entry's transaction. A rolled-back append
+rolls back the head too, so seq stays gap-free.
+
+Sealing (seal_audit_chain, hourly task) stores a signed checkpoint for
+every complete block of AUDIT_CHAIN_BLOCK_SIZE entries: the Merkle root of
+the block's chain hashes, the block's last chain hash and an HMAC
+signature that also covers the previous checkpoint's signature.
+
+Verification (verify_audit_chain):
+- checkpoints: signatures only, no audit rows read
+- one block: its N rows compared with the checkpoint (one root comparison,
+  missing seq numbers reported) - no need to re-read the history
+- tail: entries after the last checkpoint up to the chain head
+
+Archival (archive_audit_log) moves sealed entries to files and records
+their seq numbers in a signed AuditChainArchive row. Archived seq numbers
+are not counted as missing; a block with archived entries is re-read from
+the archive files when they are available under AUDIT_ARCHIVE_ROOT (same
+Merkle root check), otherwise its archived part is reported as unverified.
+
+Row content against its checksum is verified by verify_audit_integrity.
+Entries written before chained mode was enabled have seq = NULL.
+"""
+
+import gzip
+import hashlib
+import hmac
+import json
+import logging
+from bisect import bisect_right
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .integrity import IntegrityChecker
+
+logger = logging.getLogger(__name__)
+
+GENESIS_HASH = '0' * 64
+
+# The chain head is a single row
+HEAD_ID = 1
+
+DEFAULT_BLOCK_SIZE = 1024
+
+
+def chain_enabled(app_label: str) -> bool:
+    """True when the study's audit log is written in chained mode"""
+    return app_label in getattr(settings, 'AUDIT_HASH_CHAIN_STUDIES', ())
+
+
+def chained_studies() -> dict:
+    """{app_label: db_alias} of the studies in chained mode"""
+    prefix = getattr(settings, 'STUDY_DB_PREFIX', 'db_study_')
+    return {
+        app_label: f"{prefix}{app_label[len('study_'):]}"
+        for app_label in getattr(settings, 'AUDIT_HASH_CHAIN_STUDIES', ())
+    }
+
+
+class AuditChain:
+    """
+    Hash chain + Merkle checkpoints của audit log một nghiên cứu
+
+    Usage:
+        chain = AuditChain('study_43en', 'db_study_43en')
+        chain.seal()
+        chain.verify_block(12)
+        chain.verify()
+    """
+
+    def __init__(self, app_label: str, using: str):
+        from backends.audit_logs.models import (
+            get_audit_models, get_audit_chain_models, get_audit_chain_archive_model,
+        )
+
+        models = get_audit_models(app_label)
+        chain_models = get_audit_chain_models(app_label)
+        if not models or not chain_models:
+            raise LookupError(f'Audit models not found for {app_label}')
+
+        self.AuditLog = models[0]
+        self.Head, self.Checkpoint = chain_models
+        self.Archive = get_audit_chain_archive_model(app_label)
+        self.app_label = app_label
+        self.using = using
+
+    # ==========================================
+    # HASHING
+    # ==========================================
+
+    @staticmethod
+    def link_hash(prev_hash: str, seq: int, checksum: str) -> str:
+        return IntegrityChecker.sign(f'{prev_hash}:{seq}:{checksum}')
+
+    @staticmethod
+    def leaf_hash(seq: int, chain_hash: str) -> bytes:
+        return hashlib.sha256(b'\x00' + f'{seq}:{chain_hash}'.encode()).digest()
+
+    @staticmethod
+    def merkle_root(leaves: List[bytes]) -> str:
+        """Root of a binary Merkle tree (an odd last node is promoted)"""
+        if not leaves:
+            return GENESIS_HASH
+
+        level = leaves
+        while len(level) > 1:
+            paired = [
+                hashlib.sha256(b'\x01' + level[i] + level[i + 1]).digest()
+                for i in range(0, len(level) - 1, 2)
+            ]
+            if len(level) % 2:
+                paired.append(level[-1])
+            level = paired
+        return level[0].hex()
+
+    @staticmethod
+    def checkpoint_signature(block_no: int, first_seq: int, last_seq: int, merkle_root: str,
+                             end_chain_hash: str, prev_signature: str) -> str:
+        return IntegrityChecker.sign(
+            f'{block_no}:{first_seq}:{last_seq}:{merkle_root}:{end_chain_hash}:{prev_signature}'
+        )
+
+    @staticmethod
+    def archive_signature(partition: str, seq_ranges: List[List[int]], entries: int, sha256: str) -> str:
+        return IntegrityChecker.sign(f'{partition}:{json.dumps(seq_ranges)}:{entries}:{sha256}')
+
+    @staticmethod
+    def seq_ranges(seqs: List[int]) -> List[List[int]]:
+        """[first, last] runs of a set of seq numbers"""
+        runs = []
+        for seq in sorted(seqs):
+            if runs and seq == runs[-1][1] + 1:
+                runs[-1][1] = seq
+            else:
+                runs.append([seq, seq])
+        return runs
+
+    # ==========================================
+    # APPEND
+    # ==========================================
+
+    @contextmanager
+    def appending(self, *entries):
+        """
+        Link unsaved entries (in order) to the chain; save them inside the block
+
+        The head row stays locked until the surrounding transaction commits,
+        which serializes concurrent appends of the study. A batch (async
+        writer) takes the lock once for all its entries.
+        """
+        with transaction.atomic(using=self.using):
+            head = self._locked_head()
+
+            seq, chain_hash = head.seq, head.chain_hash
+            for entry in entries:
+                seq += 1
+                chain_hash = self.link_hash(chain_hash, seq, entry.checksum)
+                entry.seq, entry.chain_hash = seq, chain_hash
+
+            yield
+
+            self.Head.objects.using(self.using).filter(pk=HEAD_ID).update(
+                seq=seq,
+                chain_hash=chain_hash,
+                updated_at=timezone.now(),
+            )
+
+    def _locked_head(self):
+        head = self.Head.objects.using(self.using).select_for_update().filter(pk=HEAD_ID).first()
+        if head is None:
+            # First append of the study - concurrent creators race on the PK
+            self.Head.objects.using(self.using).bulk_create([self.Head(pk=HEAD_ID)], ignore_conflicts=True)
+            head = self.Head.objects.using(self.using).select_for_update().get(pk=HEAD_ID)
+        return head
+
+    # ==========================================
+    # SEAL
+    # ==========================================
+
+    def seal(self, block_size: Optional[int] = None) -> int:
+        """
+        Store checkpoints for every complete, not yet sealed block
+
+        A block whose rows do not link is not sealed (logged as an
+        integrity violation); sealing stops there.
+
+        Returns:
+            number of checkpoints created
+        """
+        block_size = block_size or getattr(settings, 'AUDIT_CHAIN_BLOCK_SIZE', DEFAULT_BLOCK_SIZE)
+        head = self.Head.objects.using(self.using).filter(pk=HEAD_ID).first()
+        if head is None:
+            return 0
+
+        last = self.Checkpoint.objects.using(self.using).order_by('-block_no').first()
+        block_no = last.block_no + 1 if last else 0
+        first_seq = last.last_seq + 1 if last else 1
+        prev_hash = last.end_chain_hash if last else GENESIS_HASH
+        prev_signature = last.signature if last else ''
+
+        created = 0
+        while first_seq + block_size - 1 <= head.seq:
+            last_seq = first_seq + block_size - 1
+            result = self._check_range(first_seq, last_seq, prev_hash)
+            if not result['ok']:
+                logger.error(
+                    f"INTEGRITY VIOLATION: {self.app_label} audit chain block {block_no} "
+                    f"not sealed: {result['error']}"
+                )
+                break
+
+            signature = self.checkpoint_signature(
+                block_no, first_seq, last_seq, result['merkle_root'], result['end_chain_hash'], prev_signature
+            )
+            self.Checkpoint.objects.using(self.using).create(
+                block_no=block_no,
+                first_seq=first_seq,
+                last_seq=last_seq,
+                merkle_root=result['merkle_root'],
+                end_chain_hash=result['end_chain_hash'],
+                signature=signature,
+            )
+            created += 1
+
+            block_no += 1
+            first_seq = last_seq + 1
+            prev_hash = result['end_chain_hash']
+            prev_signature = signature
+
+        if created:
+            logger.info(f"Audit chain {self.app_label}: sealed {created} block(s) up to seq {first_seq - 1}")
+        return created
+
+    # ==========================================
+    # VERIFY
+    # ==========================================
+
+    def verify_checkpoints(self) -> dict:
+        """Signatures and continuity of all checkpoints (no audit rows read)"""
+        prev_signature = ''
+        expected_first = 1
+        errors = []
+        count = 0
+
+        for checkpoint in self.Checkpoint.objects.using(self.using).order_by('block_no').iterator():
+            count += 1
+            if checkpoint.first_seq != expected_first:
+                errors.append(f'block {checkpoint.block_no}: starts at seq {checkpoint.first_seq}, expected {expected_first}')
+
+            expected = self.checkpoint_signature(
+                checkpoint.block_no, checkpoint.first_seq, checkpoint.last_seq,
+                checkpoint.merkle_root, checkpoint.end_chain_hash, prev_signature,
+            )
+            if expected != checkpoint.signature:
+                errors.append(f'block {checkpoint.block_no}: bad signature')
+
+            prev_signature = checkpoint.signature
+            expected_first = checkpoint.last_seq + 1
+
+        return {'ok': not errors, 'checkpoints': count, 'errors': errors}
+
+    def verify_block(self, block_no: int) -> dict:
+        """Compare one sealed block's rows with its checkpoint"""
+        checkpoint = self.Checkpoint.objects.using(self.using).filter(block_no=block_no).first()
+        if checkpoint is None:
+            return {'ok': False, 'block_no': block_no, 'error': 'block not sealed'}
+
+        previous = self.Checkpoint.objects.using(self.using).filter(block_no=block_no - 1).first()
+        prev_hash = previous.end_chain_hash if previous else GENESIS_HASH
+
+        archives, errors = self._archives(checkpoint.first_seq, checkpoint.last_seq)
+        if errors:
+            return {'ok': False, 'block_no': block_no, 'error': ', '.join(errors)}
+
+        result = self._check_range(checkpoint.first_seq, checkpoint.last_seq, prev_hash, archives)
+        if result['ok'] and result['merkle_root'] is None:
+            # Archive file not available: the rows still in the database link
+            result['warning'] = f"{result['unverified']} archived entr(ies) not re-read (archive file unavailable)"
+        elif result['ok'] and result['merkle_root'] != checkpoint.merkle_root:
+            result.update(ok=False, error='Merkle root mismatch')
+        result['block_no'] = block_no
+        return result
+
+    def verify(self, blocks: Optional[List[int]] = None) -> dict:
+        """
+        Checkpoints, the given blocks (default: none) and the unsealed tail
+
+        Returns:
+            {'ok', 'checkpoints', 'blocks', 'tail', 'gaps'}
+        """
+        checkpoints = self.verify_checkpoints()
+        block_results = [self.verify_block(block_no) for block_no in blocks or ()]
+        tail = self.verify_tail()
+        gaps = self.gap_summary()
+
+        return {
+            'ok': checkpoints['ok'] and tail['ok'] and gaps['ok'] and all(r['ok'] for r in block_results),
+            'checkpoints': checkpoints,
+            'blocks': block_results,
+            'tail': tail,
+            'gaps': gaps,
+        }
+
+    def verify_tail(self) -> dict:
+        """Entries after the last checkpoint must link up to the chain head"""
+        head = self.Head.objects.using(self.using).filter(pk=HEAD_ID).first()
+        if head is None:
+            return {'ok': True, 'entries': 0}
+
+        last = self.Checkpoint.objects.using(self.using).order_by('-block_no').first()
+        first_seq = last.last_seq + 1 if last else 1
+        prev_hash = last.end_chain_hash if last else GENESIS_HASH
+
+        if head.seq < first_seq:
+            ok = head.seq == first_seq - 1 and head.chain_hash == prev_hash
+            return {'ok': ok, 'entries': 0, **({} if ok else {'error': 'chain head behind last checkpoint'})}
+
+        result = self._check_range(first_seq, head.seq, prev_hash)
+        if result['ok'] and result['end_chain_hash'] != head.chain_hash:
+            result.update(ok=False, error='last entry does not match the chain head')
+        return result
+
+    def gap_summary(self) -> dict:
+        """One aggregate query: chained entries vs. the head's seq"""
+        head = self.Head.objects.using(self.using).filter(pk=HEAD_ID).first()
+        stats = self.AuditLog.objects.using(self.using).filter(seq__isnull=False).aggregate(
+            entries=Count('seq'), max_seq=Max('seq')
+        )
+        archives, errors = self._archives()
+        archived = sum(archive.entries for archive in archives)
+        max_seq = max([stats['max_seq'] or 0, *(archive.last_seq for archive in archives)])
+
+        head_seq = head.seq if head else 0
+        missing = head_seq - stats['entries'] - archived
+        return {
+            'ok': missing == 0 and max_seq == head_seq and not errors,
+            'head_seq': head_seq,
+            'entries': stats['entries'],
+            'archived': archived,
+            'missing': missing,
+            'errors': errors,
+        }
+
+    # ==========================================
+    # ARCHIVED ENTRIES
+    # ==========================================
+
+    def _archives(self, first_seq: Optional[int] = None, last_seq: Optional[int] = None):
+        """(archive records overlapping first..last, signature errors)"""
+        if self.Archive is None:
+            return [], []
+
+        queryset = self.Archive.objects.using(self.using).order_by('first_seq')
+        if first_seq is not None:
+            queryset = queryset.filter(first_seq__lte=last_seq, last_seq__gte=first_seq)
+
+        archives, errors = [], []
+        for archive in queryset:
+            expected = self.archive_signature(archive.partition, archive.seq_ranges, archive.entries, archive.sha256)
+            if hmac.compare_digest(expected, archive.signature):
+                archives.append(archive)
+            else:
+                errors.append(f'archive record of {archive.partition}: bad signature')
+        return archives, errors
+
+    @staticmethod
+    def _archive_path(archive) -> Path:
+        # Relative to AUDIT_ARCHIVE_ROOT, or absolute for --output archives
+        return Path(getattr(settings, 'AUDIT_ARCHIVE_ROOT', '')) / archive.file
+
+    def _archived_rows(self, archive, first_seq: int, last_seq: int):
+        """(seq, checksum, chain_hash) of first..last from the archive file, None if unavailable"""
+        path = self._archive_path(archive)
+        if not path.is_file():
+            return None
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as raw:
+            for block in iter(lambda: raw.read(1 << 20), b''):
+                digest.update(block)
+        if digest.hexdigest() != archive.sha256:
+            logger.error(f"INTEGRITY VIOLATION: {path} does not match its archive record (SHA-256)")
+            return None
+
+        rows = []
+        with gzip.open(path, 'rt', encoding='utf-8') as lines:
+            for line in lines:
+                row = json.loads(line)
+                if row.get('seq') is not None and first_seq <= row['seq'] <= last_seq:
+                    rows.append((row['seq'], row['checksum'], row['chain_hash']))
+        return rows
+
+    def _check_range(self, first_seq: int, last_seq: int, prev_hash: str, archives=()) -> dict:
+        """
+        Read seq first..last: contiguity, links and Merkle root
+
+        Entries of archives are read from their files; when a file is not
+        available its seq numbers are skipped (not missing), and links and
+        Merkle root cannot be checked across them (merkle_root None).
+        """
+        rows = (
+            self.AuditLog.objects.using(self.using)
+            .filter(seq__gte=first_seq, seq__lte=last_seq)
+            .order_by('seq')
+            .values_list('seq', 'checksum', 'chain_hash')
+        )
+
+        archived_rows, skipped_runs = [], []
+        for archive in archives:
+            loaded = self._archived_rows(archive, first_seq, last_seq)
+            if loaded is None:
+                skipped_runs.extend(archive.seq_ranges)
+            else:
+                archived_rows.extend(loaded)
+
+        if archived_rows:
+            rows = sorted([*rows.iterator(chunk_size=2000), *archived_rows])
+        else:
+            rows = rows.iterator(chunk_size=2000)
+
+        skipped_runs.sort()
+        run_starts = [run[0] for run in skipped_runs]
+
+        def skipped(seq):
+            index = bisect_right(run_starts, seq) - 1
+            return index >= 0 and seq <= skipped_runs[index][1]
+
+        leaves = []
+        expected_seq = first_seq
+        missing = []
+        broken = []
+        unverified = 0
+        linked = True  # prev_hash is the hash of seq expected_seq - 1
+
+        def gap(start, stop):
+            nonlocal unverified, linked
+            for seq in range(start, stop):
+                if skipped(seq):
+                    unverified += 1
+                    linked = False
+                else:
+                    missing.append(seq)
+
+        for seq, checksum, chain_hash in rows:
+            if seq != expected_seq:
+                gap(expected_seq, seq)
+            if linked and self.link_hash(prev_hash, seq, checksum) != chain_hash:
+                broken.append(seq)
+            leaves.append(self.leaf_hash(seq, chain_hash))
+            prev_hash = chain_hash
+            expected_seq = seq + 1
+            linked = True
+
+        gap(expected_seq, last_seq + 1)
+
+        result = {
+            'ok': not missing and not broken,
+            'first_seq': first_seq,
+            'last_seq': last_seq,
+            'entries': len(leaves),
+            'merkle_root': None if unverified else self.merkle_root(leaves),
+            'end_chain_hash': prev_hash if linked else None,
+        }
+        if archived_rows:
+            result['archived'] = len(archived_rows)
+        if unverified:
+            result['unverified'] = unverified
+        errors = []
+        if missing:
+            result['missing'] = missing[:100]
+            errors.append(f'{len(missing)} missing entr(ies)')
+        if broken:
+            result['broken'] = broken[:100]
+            errors.append(f'{len(broken)} broken link(s)')
+        if errors:
+            result['error'] = ', '.join(errors)
+        return result
@@ -16,10 +16,16 @@ Usage:
     @audit_log('SCREENINGCASE', audit_log_model=AuditLog, audit_log_detail_model=AuditLogDetail)
     def my_view(request):
         ...
+
+Async writer (settings.AUDIT_OUTBOX_STUDIES):
+    POST views run in a transaction on the study database; the audit record
+    is enqueued in logging.audit_outbox inside it and written to audit_log
+    by a Celery worker (see outbox.py).
 """
 import logging
 from functools import wraps
-from django.db import transaction
+from django.db import router, transaction
+from django.utils import timezone
 from .helpers import get_client_ip
 
 logger = logging.getLogger(__name__)
@@ -48,15 +54,27 @@ def resolve_site_id(request, patient_id, patient_model=None):
         str: Site ID or None
     """
     audit_data = getattr(request, 'audit_data', {})
-    site_id = audit_data.get('site_id')
+    return resolve_site_id_from(
+        audit_data.get('site_id'),
+        request.session.get('selected_site_id'),
+        patient_id,
+        patient_model,
+    )
+
+
+def resolve_site_id_from(site_id, session_site_id, patient_id, patient_model=None):
+    """
+    resolve_site_id() on values captured from the request
     
+    Used by the outbox writer, which resolves SITEID off the request path.
+    """
     # Try database lookup
     if not site_id and patient_id:
         site_id = _lookup_site_from_db(patient_id, patient_model)
     
     # Try session
     if not site_id:
-        site_id = request.session.get('selected_site_id')
+        site_id = session_site_id
     
     # Try extract from patient_id pattern (XXX-X-XXX)
     if not site_id or site_id == 'all':
@@ -173,73 +191,24 @@ def audit_log(model_name: str, get_patient_id_from: str = 'usubjid',
             
             logger.debug(f"[AuditLog] View: {view_func.__name__} | Patient ID param: {get_patient_id_from} | Found: {patient_id}")
             
-            # Call view FIRST to let it set audit_data
-            response = view_func(request, *args, **kwargs)
-            
-            # Get audit_data from request
-            audit_data = getattr(request, 'audit_data', {})
+            # Async writer: the outbox row is committed with the CRF change
+            outbox = _get_outbox_writer(audit_log_model)
             
-            # Determine action - Priority order:
-            # 1. From audit_data (set by view) - Most accurate
-            # 2. Auto-detect CREATE from URL pattern
-            # 3. From request method + patient_id - Fallback
-            action = audit_data.get('action')
-            
-            if not action:
-                if request.method == 'GET':
-                    action = 'VIEW'
-                elif request.method == 'POST':
-                    # Auto-detect CREATE from URL path (case-insensitive)
-                    path_lower = request.path.lower()
-                    action = 'CREATE' if '/create' in path_lower or '_create' in path_lower else 'UPDATE'
-                else:
-                    action = 'UNKNOWN'
-            
-            # NEW: Auto-log CREATE and VIEW even without audit_data
-            if request.user.is_authenticated:
-                if action == 'UPDATE' and audit_data:
-                    # UPDATE with changes → full audit log
-                    try:
-                        _create_audit_log_with_details(
-                            request=request,
-                            action=action,
-                            model_name=model_name,
-                            patient_id=patient_id or audit_data.get('patient_id'),
-                            audit_data=audit_data,
-                            patient_model=patient_model,
-                            audit_log_model=audit_log_model,
-                            audit_log_detail_model=audit_log_detail_model
-                        )
-                    except Exception as e:
-                        logger.error(f"Audit log error: {e}", exc_info=True)
-                
-                elif action == 'CREATE':
-                    # CREATE → log without details (no "changes")
-                    try:
-                        _create_simple_audit_log(
-                            request=request,
-                            action=action,
-                            model_name=model_name,
-                            patient_id=patient_id,
-                            patient_model=patient_model,
-                            audit_log_model=audit_log_model
-                        )
-                    except Exception as e:
-                        logger.error(f"CREATE audit log error: {e}", exc_info=True)
-                
-                elif action == 'VIEW':
-                    # VIEW → log without details
-                    try:
-                        _create_simple_audit_log(
-                            request=request,
-                            action=action,
-                            model_name=model_name,
-                            patient_id=patient_id,
-                            patient_model=patient_model,
-                            audit_log_model=audit_log_model
-                        )
-                    except Exception as e:
-                        logger.error(f"VIEW audit log error: {e}", exc_info=True)
+            if outbox is not None and request.method != 'GET':
+                with transaction.atomic(using=outbox.using):
+                    # Call view FIRST to let it set audit_data
+                    response = view_func(request, *args, **kwargs)
+                    _log_request(
+                        request, model_name, patient_id, patient_model,
+                        audit_log_model, audit_log_detail_model, outbox
+                    )
+            else:
+                # Call view FIRST to let it set audit_data
+                response = view_func(request, *args, **kwargs)
+                _log_request(
+                    request, model_name, patient_id, patient_model,
+                    audit_log_model, audit_log_detail_model, outbox
+                )
             
             return response
         
@@ -247,6 +216,99 @@ def audit_log(model_name: str, get_patient_id_from: str = 'usubjid',
     return decorator
 
 
+def _get_outbox_writer(audit_log_model):
+    """AuditOutboxWriter of the study, or None when it is written synchronously"""
+    from .outbox import AuditOutboxWriter, outbox_enabled
+    
+    app_label = audit_log_model._meta.app_label
+    if not outbox_enabled(app_label):
+        return None
+    return AuditOutboxWriter(app_label, router.db_for_write(audit_log_model))
+
+
+def _log_request(request, model_name, patient_id, patient_model,
+                 audit_log_model, audit_log_detail_model, outbox=None):
+    """
+    Write (or enqueue) the audit log of a handled request
+    
+    Synchronous writes never fail the request. Outbox writes do: the CRF
+    change must not commit without its audit record.
+    """
+    # Get audit_data from request
+    audit_data = getattr(request, 'audit_data', {})
+    
+    # Determine action - Priority order:
+    # 1. From audit_data (set by view) - Most accurate
+    # 2. Auto-detect CREATE from URL pattern
+    # 3. From request method + patient_id - Fallback
+    action = audit_data.get('action')
+    
+    if not action:
+        if request.method == 'GET':
+            action = 'VIEW'
+        elif request.method == 'POST':
+            # Auto-detect CREATE from URL path (case-insensitive)
+            path_lower = request.path.lower()
+            action = 'CREATE' if '/create' in path_lower or '_create' in path_lower else 'UPDATE'
+        else:
+            action = 'UNKNOWN'
+    
+    # NEW: Auto-log CREATE and VIEW even without audit_data
+    if request.user.is_authenticated:
+        if action == 'UPDATE' and audit_data:
+            # UPDATE with changes → full audit log
+            try:
+                _create_audit_log_with_details(
+                    request=request,
+                    action=action,
+                    model_name=model_name,
+                    patient_id=patient_id or audit_data.get('patient_id'),
+                    audit_data=audit_data,
+                    patient_model=patient_model,
+                    audit_log_model=audit_log_model,
+                    audit_log_detail_model=audit_log_detail_model,
+                    outbox=outbox
+                )
+            except Exception as e:
+                if outbox is not None:
+                    raise
+                logger.error(f"Audit log error: {e}", exc_info=True)
+        
+        elif action == 'CREATE':
+            # CREATE → log without details (no "changes")
+            try:
+                _create_simple_audit_log(
+                    request=request,
+                    action=action,
+                    model_name=model_name,
+                    patient_id=patient_id,
+                    patient_model=patient_model,
+                    audit_log_model=audit_log_model,
+                    outbox=outbox
+                )
+            except Exception as e:
+                if outbox is not None:
+                    raise
+                logger.error(f"CREATE audit log error: {e}", exc_info=True)
+        
+        elif action == 'VIEW':
+            # VIEW → log without details
+            try:
+                _create_simple_audit_log(
+                    request=request,
+                    action=action,
+                    model_name=model_name,
+                    patient_id=patient_id,
+                    patient_model=patient_model,
+                    audit_log_model=audit_log_model,
+                    outbox=outbox
+                )
+            except Exception as e:
+                if outbox is not None:
+                    raise
+                logger.error(f"VIEW audit log error: {e}", exc_info=True)
+
+
 def _build_checksum_data(user_id, username, action, model_name, patient_id_str,
                          reason, old_data=None, new_data=None):
     """
@@ -278,9 +340,51 @@ def _build_checksum_data(user_id, username, action, model_name, patient_id_str,
     }
 
 
+def _build_outbox_record(request, action, model_name, patient_id, patient_model,
+                         reason, old_data=None, new_data=None, details=None):
+    """
+    AuditOutbox payload for one entry - no database access
+    
+    Holds the checksum data (old/new values already serialized, so the
+    writer hashes exactly what the synchronous path hashes), the entry's
+    timestamp and the inputs of resolve_site_id(), which the writer runs.
+    
+    Returns:
+        dict: JSON-serializable payload
+    """
+    from .integrity import IntegrityChecker
+    
+    audit_data = getattr(request, 'audit_data', {})
+    patient_id_str = str(patient_id) if patient_id else 'unknown'
+    
+    record = _build_checksum_data(
+        user_id=request.user.id,
+        username=request.user.username,
+        action=action,
+        model_name=model_name,
+        patient_id_str=patient_id_str,
+        reason=reason,
+        old_data=IntegrityChecker._serialize_dict(old_data or {}),
+        new_data=IntegrityChecker._serialize_dict(new_data or {})
+    )
+    record.update({
+        'timestamp': timezone.now().isoformat(),
+        'ip_address': get_client_ip(request),
+        'session_id': request.session.session_key if hasattr(request, 'session') else None,
+        'site': {
+            'site_id': audit_data.get('site_id'),
+            'session_site_id': request.session.get('selected_site_id'),
+            'patient_id': patient_id_str if patient_id else None,
+            'patient_model': patient_model._meta.label if patient_model else None,
+        },
+        'details': details or [],
+    })
+    return record
+
+
 def _create_simple_audit_log(request, action, model_name, patient_id,
                              patient_model=None,
-                             audit_log_model=None):
+                             audit_log_model=None, outbox=None):
     """
     GENERIC Create simple audit log for CREATE/VIEW (no change details)
     
@@ -294,11 +398,19 @@ def _create_simple_audit_log(request, action, model_name, patient_id,
         patient_id: Patient ID 
         patient_model: Optional - Main patient/subject model for SITEID lookup
         audit_log_model: REQUIRED - AuditLog model class from study app
+        outbox: Optional - AuditOutboxWriter; the entry is enqueued instead
     """
     if not audit_log_model:
         logger.warning("_create_simple_audit_log: audit_log_model not provided")
         return
     
+    if outbox is not None:
+        outbox.enqueue(_build_outbox_record(
+            request, action, model_name, patient_id, patient_model,
+            reason=f'{action} action'
+        ))
+        return
+    
     # Use shared utility for SITEID resolution
     site_id = resolve_site_id(request, patient_id, patient_model)
     
@@ -338,7 +450,8 @@ def _create_simple_audit_log(request, action, model_name, patient_id,
 def _create_audit_log_with_details(request, action, model_name, 
                                    patient_id, audit_data,
                                    patient_model=None,
-                                   audit_log_model=None, audit_log_detail_model=None):
+                                   audit_log_model=None, audit_log_detail_model=None,
+                                   outbox=None):
     """
     GENERIC Create audit log with proper data structure
     
@@ -353,18 +466,12 @@ def _create_audit_log_with_details(request, action, model_name,
         patient_model: Optional - Main patient/subject model for SITEID lookup
         audit_log_model: REQUIRED - AuditLog model class from study app
         audit_log_detail_model: REQUIRED - AuditLogDetail model class from study app
+        outbox: Optional - AuditOutboxWriter; the entry is enqueued instead
     """
     if not audit_log_model or not audit_log_detail_model:
         logger.warning("_create_audit_log_with_details: audit models not provided")
         return
     
-    # Use shared utility - but prefer audit_data first
-    site_id = audit_data.get('site_id')
-    if not site_id:
-        site_id = resolve_site_id(request, patient_id, patient_model)
-    
-    patient_id_str = str(patient_id) if patient_id else 'unknown'
-    
     # Prepare details BEFORE creating audit log
     changes = audit_data.get('changes', [])
     reasons = audit_data.get('reasons_json', {})
@@ -391,6 +498,23 @@ def _create_audit_log_with_details(request, action, model_name,
     
     reason_text = audit_data.get('reason', '')
     
+    if outbox is not None:
+        outbox.enqueue(_build_outbox_record(
+            request, action, model_name, patient_id, patient_model,
+            reason=reason_text,
+            old_data=old_data_dict,
+            new_data=new_data_dict,
+            details=details_list
+        ))
+        return
+    
+    # Use shared utility - but prefer audit_data first
+    site_id = audit_data.get('site_id')
+    if not site_id:
+        site_id = resolve_site_id(request, patient_id, patient_model)
+    
+    patient_id_str = str(patient_id) if patient_id else 'unknown'
+    
     with transaction.atomic():
         audit_log_entry = audit_log_model(
             user_id=request.user.id,
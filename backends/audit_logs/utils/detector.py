@@ -3,11 +3,19 @@
 BASE Change Detection - Shared across all studies
 
 FIXED Change detection - Exclude metadata fields but KEEP date fields
+
+DiffPlan: compiled per-model variant used for formsets (one values() query
+for the old rows, field normalizers picked once per field)
 """
 import logging
-from typing import Dict, List, Any
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Callable, Dict, List, Any, Tuple
+from django.db import models
 from django.forms.models import model_to_dict
-from .helpers import normalize_value, format_value_for_display
+from django.utils.encoding import force_str
+from django.utils.hashable import make_hashable
+from .helpers import normalize_value, normalize_text, format_value_for_display
 
 logger = logging.getLogger(__name__)
 
@@ -170,3 +178,185 @@ class ChangeDetector:
         if logger.isEnabledFor(5):  # TRACE level (below DEBUG)
             logger.log(5, "Extracted new data: %d fields", len(new_data))
         return new_data
+
+
+# ==========================================
+# COMPILED DIFF PLAN (formsets)
+# ==========================================
+# Typed fast paths of normalize_value. Each one falls back to normalize_value
+# for any other type (None, strings in a BooleanField, ...), so results are
+# always identical to ChangeDetector.detect_changes.
+
+def _normalize_bool(val) -> str:
+    if type(val) is bool:
+        return '1' if val else '0'
+    return normalize_value(val)
+
+
+def _normalize_date(val) -> str:
+    if type(val) is date or type(val) is datetime:
+        return val.strftime('%Y-%m-%d')
+    return normalize_value(val)
+
+
+def _normalize_text(val) -> str:
+    if type(val) is str:
+        return normalize_text(val)
+    return normalize_value(val)
+
+
+def _normalize_int(val) -> str:
+    if type(val) is int:
+        return str(val)
+    return normalize_value(val)
+
+
+def _normalize_number(val) -> str:
+    if type(val) is Decimal or type(val) is float:
+        return str(val).lower()
+    return normalize_value(val)
+
+
+# Model field internal type -> normalizer (anything else: normalize_value)
+FIELD_NORMALIZERS = {
+    'BooleanField': _normalize_bool,
+    'NullBooleanField': _normalize_bool,
+    'DateField': _normalize_date,
+    'DateTimeField': _normalize_date,
+    'CharField': _normalize_text,
+    'TextField': _normalize_text,
+    'EmailField': _normalize_text,
+    'SlugField': _normalize_text,
+    'URLField': _normalize_text,
+    'IntegerField': _normalize_int,
+    'SmallIntegerField': _normalize_int,
+    'BigIntegerField': _normalize_int,
+    'PositiveIntegerField': _normalize_int,
+    'PositiveSmallIntegerField': _normalize_int,
+    'PositiveBigIntegerField': _normalize_int,
+    'DecimalField': _normalize_number,
+    'FloatField': _normalize_number,
+}
+
+# Equal values of these types always normalize equally (not true for
+# Decimal('1.0') / Decimal('1.00') or aware datetimes in different zones)
+_EQUAL_MEANS_UNCHANGED = frozenset({str, int, bool, date, type(None)})
+
+
+class DiffPlan:
+    """
+    Compiled change detection for one model
+    
+    Same results as extract_old_data + extract_new_data + detect_changes,
+    but the field list and normalizers are worked out once per model (and
+    per form field layout) instead of for every form of a formset.
+    
+    Usage:
+        plan = DiffPlan.for_model(LaboratoryTest)
+        old_rows = plan.fetch_old(queryset)         # {pk: {field: value}}
+        changes = plan.diff(old_rows[form.instance.pk], form)
+    """
+    
+    _cache: Dict[type, 'DiffPlan'] = {}
+    
+    def __init__(self, model):
+        self.model = model
+        
+        # Same selection as model_to_dict(exclude=EXCLUDED_METADATA_FIELDS)
+        opts = model._meta
+        fields = [
+            f for f in [*opts.concrete_fields, *opts.private_fields, *opts.many_to_many]
+            if getattr(f, 'editable', False) and f.name not in EXCLUDED_METADATA_FIELDS_SET
+        ]
+        self.old_fields = [f.name for f in fields]
+        
+        # values() returns the same Python values as value_from_object,
+        # except for M2M (list of objects), file fields (FieldFile) and
+        # private fields - those models keep the per-instance path
+        self.values_supported = all(
+            f.concrete and not f.many_to_many and not isinstance(f, models.FileField)
+            for f in fields
+        )
+        
+        self.normalizers = {
+            f.name: FIELD_NORMALIZERS.get(f.get_internal_type(), normalize_value)
+            for f in opts.get_fields()
+            if f.concrete and not f.many_to_many
+        }
+        self._form_layouts: Dict[Tuple[str, ...], List[Tuple[str, Callable]]] = {}
+        self._choice_labels: Dict[str, Dict] = {}
+    
+    @classmethod
+    def for_model(cls, model) -> 'DiffPlan':
+        """Cached plan of a model"""
+        plan = cls._cache.get(model)
+        if plan is None:
+            plan = cls._cache[model] = cls(model)
+        return plan
+    
+    def fetch_old(self, queryset) -> Dict[Any, Dict]:
+        """Old data of every row in queryset: {pk: {field: value}} in one query"""
+        if not self.values_supported:
+            detector = ChangeDetector()
+            return {obj.pk: detector.extract_old_data(obj) for obj in queryset}
+        
+        pk_name = self.model._meta.pk.name
+        pk_key = '_diff_plan_pk'
+        rows = {}
+        for row in queryset.values(*self.old_fields, **{pk_key: models.F(pk_name)}):
+            rows[row.pop(pk_key)] = row
+        return rows
+    
+    def form_fields(self, form) -> List[Tuple[str, Callable]]:
+        """(field name, normalizer) of the compared fields, cached per form field layout"""
+        layout = tuple(form.fields)
+        compiled = self._form_layouts.get(layout)
+        if compiled is None:
+            compiled = self._form_layouts[layout] = [
+                (name, self.normalizers.get(name, normalize_value))
+                for name in layout
+                if name not in EXCLUDED_METADATA_FIELDS_SET
+            ]
+        return compiled
+    
+    def display_value(self, instance, field_name: str) -> str:
+        """
+        Same as instance.get_<field>_display(), with the choices dict built
+        once (Django rebuilds it - translating every label - on each call)
+        """
+        labels = self._choice_labels.get(field_name)
+        if labels is None:
+            field = self.model._meta.get_field(field_name)
+            labels = self._choice_labels[field_name] = dict(make_hashable(field.flatchoices))
+        value = getattr(instance, field_name)
+        return force_str(labels.get(make_hashable(value), value), strings_only=True)
+    
+    def diff(self, old_data: Dict, form) -> List[Dict]:
+        """Changes between old_data and the cleaned data of a bound form"""
+        if not form.is_valid():
+            logger.warning("Form not valid - cannot extract new data")
+            return []
+        
+        cleaned = form.cleaned_data
+        changes = []
+        for field, normalize in self.form_fields(form):
+            if field not in cleaned:
+                continue
+            
+            new_value = cleaned[field]
+            old_value = old_data.get(field)
+            
+            # Fast path: unchanged value (most formset rows)
+            value_type = type(new_value)
+            if value_type is type(old_value) and value_type in _EQUAL_MEANS_UNCHANGED and old_value == new_value:
+                continue
+            
+            if normalize(old_value) != normalize(new_value):
+                changes.append({
+                    'field': field,
+                    'old_value': old_value,
+                    'new_value': new_value,
+                    'old_display': format_value_for_display(old_value),
+                    'new_display': format_value_for_display(new_value),
+                })
+        return changes
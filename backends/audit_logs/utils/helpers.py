@@ -80,8 +80,16 @@ def normalize_value(val: Any) -> str:
     if val_type is list:
         return '' if not val else str(val)
     
-    # String handling
-    v = str(val).strip()
+    return normalize_text(str(val))
+
+
+def normalize_text(val: str) -> str:
+    """
+    String part of normalize_value (val must already be a str)
+    
+    Used directly by the compiled diff plans (detector.DiffPlan) for text fields
+    """
+    v = val.strip()
     if not v:
         return ''
     
@@ -137,6 +137,42 @@ class IntegrityChecker:
         
         return hash_hex
     
+    @staticmethod
+    def sign(message: str) -> str:
+        """HMAC-SHA-256 (hex) of a string with the audit secret key"""
+        return hmac.new(_AUDIT_SECRET_KEY_BYTES, message.encode('utf-8'), hashlib.sha256).hexdigest()
+    
+    @staticmethod
+    def checksum_for_row(row: dict, details) -> str:
+        """
+        Checksum of a stored audit log row
+        
+        Used for verification without model instances (bulk verification
+        reads values() rows and their details in one query per chunk).
+        
+        Args:
+            row: audit log values (user_id, username, action, model_name,
+                 patient_id, timestamp, reason)
+            details: iterable of (field_name, old_value, new_value)
+        """
+        old_data = {}
+        new_data = {}
+        for field_name, old_value, new_value in details:
+            old_data[field_name] = old_value
+            new_data[field_name] = new_value
+        
+        return IntegrityChecker.generate_checksum({
+            'user_id': row['user_id'],
+            'username': row['username'],
+            'action': row['action'],
+            'model_name': row['model_name'],
+            'patient_id': row['patient_id'],
+            'timestamp': str(row['timestamp']),
+            'old_data': old_data,
+            'new_data': new_data,
+            'reason': row['reason'],
+        })
+    
     @staticmethod
     def verify_integrity(audit_log) -> bool:
         """
@@ -156,32 +192,22 @@ class IntegrityChecker:
             logger.warning("No checksum stored")
             return False
         
-        # Rebuild old_data and new_data from details
-        # OPTIMIZED: Use select_related to avoid N+1 queries
-        details = audit_log.details.all()
-        
-        old_data = {}
-        new_data = {}
-        
-        for detail in details:
-            old_data[detail.field_name] = detail.old_value
-            new_data[detail.field_name] = detail.new_value
-        
-        # Build audit_data for verification
-        audit_data = {
+        details = [
+            (detail.field_name, detail.old_value, detail.new_value)
+            for detail in audit_log.details.all()
+        ]
+        audit_row = {
             'user_id': audit_log.user_id,
             'username': audit_log.username,
             'action': audit_log.action,
             'model_name': audit_log.model_name,
             'patient_id': audit_log.patient_id,
-            'timestamp': str(audit_log.timestamp),
-            'old_data': old_data,
-            'new_data': new_data,
+            'timestamp': audit_log.timestamp,
             'reason': audit_log.reason,
         }
         
         # Calculate checksum
-        calculated_checksum = IntegrityChecker.generate_checksum(audit_data)
+        calculated_checksum = IntegrityChecker.checksum_for_row(audit_row, details)
         
         # Use constant-time comparison to prevent timing attacks
         # SECURITY: hmac.compare_digest is resistant to timing attacks
@@ -0,0 +1,356 @@
+# backends/audit_logs/utils/outbox.py
+"""
+Audit Outbox - Asynchronous, batched audit log writer
+
+Writing an audit entry in the CRF save request costs a SITEID lookup, an
+HMAC, an INSERT for the log and one for its details. For studies in
+settings.AUDIT_OUTBOX_STUDIES the request only does one INSERT instead:
+
+    request:  CRF change + INSERT logging.audit_outbox   (one transaction)
+    worker:   outbox rows -> audit_log + audit_log_detail (multi-row INSERTs)
+
+- Durable: the outbox row commits or rolls back with the CRF change, and is
+  deleted in the transaction that writes its audit entry - an event is
+  written exactly once and never lost (a failed drain leaves it queued).
+- The entry keeps the timestamp of the request; the worker resolves SITEID
+  and computes the checksum, so stored rows are identical to synchronous
+  ones and verify_audit_integrity needs no changes.
+- Chained mode (chain.py): a batch takes the chain head lock once.
+- Drains are triggered after commit (debounced per study) and every minute
+  by celery beat; concurrent workers skip each other's rows (SKIP LOCKED).
+  Without a worker the commit drains inline (schedule_drain).
+- A row that fails AUDIT_OUTBOX_MAX_ATTEMPTS drains is parked: kept, but not
+  retried until drain_audit_outbox --retry-parked.
+- Entries are inserted after their timestamp, so AuditVerificationEngine
+  holds its watermark before the oldest queued entry
+  (oldest_pending_timestamp).
+
+Usage:
+    writer = AuditOutboxWriter('study_43en', 'db_study_43en')
+    writer.enqueue(record)          # from the audit_log decorator
+    writer.drain()                  # drain_audit_outbox_task / command
+"""
+
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import DateTimeField, F, Min
+from django.db.models.fields.json import KT
+from django.db.models.functions import Cast
+
+from .integrity import IntegrityChecker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+# Failed drains of a row before it is parked
+DEFAULT_MAX_ATTEMPTS = 5
+
+# Payload keys read by the writer (see decorators._build_outbox_record)
+REQUIRED_KEYS = (
+    'user_id', 'username', 'action', 'model_name', 'patient_id', 'reason',
+    'old_data', 'new_data', 'timestamp', 'ip_address', 'session_id', 'site', 'details',
+)
+SITE_KEYS = ('site_id', 'session_site_id', 'patient_id', 'patient_model')
+DETAIL_KEYS = ('field_name', 'old_value', 'new_value', 'reason')
+
+# A commit schedules at most one drain per study per DRAIN_DELAY_SECONDS
+DRAIN_DELAY_SECONDS = 1
+
+
+def outbox_enabled(app_label: str) -> bool:
+    """True when the study's audit log is written through the outbox"""
+    return app_label in getattr(settings, 'AUDIT_OUTBOX_STUDIES', ())
+
+
+def outbox_studies() -> dict:
+    """{app_label: db_alias} of the studies using the outbox"""
+    prefix = getattr(settings, 'STUDY_DB_PREFIX', 'db_study_')
+    return {
+        app_label: f"{prefix}{app_label[len('study_'):]}"
+        for app_label in getattr(settings, 'AUDIT_OUTBOX_STUDIES', ())
+    }
+
+
+def max_attempts() -> int:
+    return getattr(settings, 'AUDIT_OUTBOX_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)
+
+
+def validate_record(record: dict):
+    """
+    Raise ValueError for a payload the writer could not write
+    
+    Called by enqueue(), so a malformed record fails the request (and rolls
+    back its CRF change) instead of failing in the worker on every drain.
+    """
+    if not isinstance(record, dict):
+        raise ValueError(f'Audit outbox record must be a dict, got {type(record).__name__}')
+    
+    missing = [key for key in REQUIRED_KEYS if key not in record]
+    if missing:
+        raise ValueError(f"Audit outbox record is missing {', '.join(missing)}")
+    
+    site = record['site']
+    if not isinstance(site, dict) or any(key not in site for key in SITE_KEYS):
+        raise ValueError(f"Audit outbox record 'site' must have {', '.join(SITE_KEYS)}")
+    
+    details = record['details']
+    if not isinstance(details, list) or any(
+        not isinstance(detail, dict) or any(key not in detail for key in DETAIL_KEYS)
+        for detail in details
+    ):
+        raise ValueError(f"Audit outbox record 'details' must be a list of {', '.join(DETAIL_KEYS)}")
+    
+    try:
+        datetime.fromisoformat(record['timestamp'])
+    except (TypeError, ValueError):
+        raise ValueError(f"Audit outbox record has an invalid timestamp: {record['timestamp']!r}")
+
+
+def schedule_drain(app_label: str):
+    """
+    Queue a drain of the study's outbox (never raises)
+
+    Without a worker (no broker, or CELERY_TASK_ALWAYS_EAGER) or when the
+    broker is unreachable, the outbox is drained inline instead, so entries
+    never wait for a worker that does not exist.
+    """
+    from backends.tenancy.tasks import drain_audit_outbox_task
+
+    conf = drain_audit_outbox_task.app.conf
+    if conf.task_always_eager or not conf.broker_url:
+        drain_inline(app_label)
+        return
+
+    key = f'audit_outbox_drain_{app_label}'
+    try:
+        if not cache.add(key, 1, DRAIN_DELAY_SECONDS):
+            return  # a drain is already due
+
+        try:
+            drain_audit_outbox_task.apply_async(args=[app_label], countdown=DRAIN_DELAY_SECONDS)
+        except Exception:
+            cache.delete(key)  # the next commit schedules again
+            raise
+    except Exception as e:
+        logger.warning(f"Audit outbox drain of {app_label} not scheduled, draining inline: {e}")
+        drain_inline(app_label)
+
+
+def drain_inline(app_label: str):
+    """Drain the study's outbox in this process (never raises)"""
+    try:
+        AuditOutboxWriter(app_label, outbox_studies()[app_label]).drain()
+    except Exception as e:
+        # Rows stay queued for the next drain
+        logger.error(f"Audit outbox {app_label} not drained inline: {e}", exc_info=True)
+
+
+class AuditOutboxWriter:
+    """
+    Ghi audit log bất đồng bộ qua bảng outbox của một nghiên cứu
+    """
+
+    def __init__(self, app_label: str, using: str):
+        from backends.audit_logs.models import get_audit_models, get_audit_outbox_model
+
+        models = get_audit_models(app_label)
+        outbox_model = get_audit_outbox_model(app_label)
+        if not models or not outbox_model:
+            raise LookupError(f'Audit models not found for {app_label}')
+
+        self.AuditLog, self.AuditLogDetail = models
+        self.Outbox = outbox_model
+        self.app_label = app_label
+        self.using = using
+
+    # ==========================================
+    # ENQUEUE (request path)
+    # ==========================================
+
+    def enqueue(self, record: dict):
+        """
+        Queue one audit entry in the current transaction
+
+        Args:
+            record: payload built by the audit_log decorator
+        
+        Raises:
+            ValueError: record is malformed (see validate_record)
+        """
+        validate_record(record)
+        self.Outbox.objects.using(self.using).create(payload=record)
+        transaction.on_commit(lambda: schedule_drain(self.app_label), using=self.using)
+
+    # ==========================================
+    # DRAIN (worker)
+    # ==========================================
+
+    def drain(self, batch_size: int = DEFAULT_BATCH_SIZE, max_batches: Optional[int] = None) -> dict:
+        """
+        Write queued entries until the outbox is empty
+
+        A batch that fails is retried row by row, so one bad record cannot
+        hold back the others; failing rows stay queued with attempts and
+        last_error set, and are retried on every drain until they are
+        parked after max_attempts() failures.
+
+        Returns:
+            {'written': n, 'failed': n, 'batches': n}
+        """
+        from backends.tenancy.db_router import tenant_db
+
+        stats = {'written': 0, 'failed': 0, 'batches': 0}
+
+        # SITEID lookups on study models follow the request context
+        with tenant_db(self.using):
+            # Failures of earlier runs (not parked yet), one at a time
+            stats['written'], stats['failed'] = self._drain_rows(
+                list(
+                    self._pending().filter(attempts__gt=0, attempts__lt=max_attempts())
+                    .order_by('id').values_list('id', flat=True)
+                )
+            )
+
+            while max_batches is None or stats['batches'] < max_batches:
+                pending = self._pending().filter(attempts=0)
+                failed = 0
+                try:
+                    written = self._drain_batch(pending, batch_size)
+                except Exception as e:
+                    logger.warning(f"Audit outbox batch of {self.app_label} failed, retrying row by row: {e}")
+                    written = None
+
+                if written is None:
+                    # Failed rows get attempts > 0 and leave the fresh queue
+                    written, failed = self._drain_rows(
+                        list(pending.order_by('id').values_list('id', flat=True)[:batch_size])
+                    )
+                    stats['failed'] += failed
+
+                if not written and not failed:
+                    break
+                stats['written'] += written
+                stats['batches'] += 1
+
+        if stats['written'] or stats['failed']:
+            logger.info(
+                f"Audit outbox {self.app_label}: {stats['written']} written, "
+                f"{stats['failed']} failed in {stats['batches']} batches"
+            )
+        return stats
+
+    def pending_count(self) -> int:
+        return self._pending().count()
+    
+    def parked_count(self) -> int:
+        return self._pending().filter(attempts__gte=max_attempts()).count()
+    
+    def retry_parked(self) -> int:
+        """Give parked rows a new series of attempts (after fixing their cause)"""
+        return self._pending().filter(attempts__gte=max_attempts()).update(attempts=0, last_error='')
+    
+    def oldest_pending_timestamp(self) -> Optional[datetime]:
+        """Earliest entry timestamp still queued (parked rows included), or None"""
+        return self._pending().aggregate(
+            oldest=Min(Cast(KT('payload__timestamp'), DateTimeField()))
+        )['oldest']
+
+    def _pending(self):
+        return self.Outbox.objects.using(self.using).order_by()
+
+    def _drain_batch(self, queryset, limit: int) -> int:
+        """Write and delete up to limit queued rows in one transaction"""
+        from backends.audit_logs.models.base import record_audit_users
+
+        with transaction.atomic(using=self.using):
+            rows = list(queryset.select_for_update(skip_locked=True).order_by('id')[:limit])
+            if not rows:
+                return 0
+
+            entries = self._write([row.payload for row in rows])
+            self.Outbox.objects.using(self.using).filter(pk__in=[row.pk for row in rows]).delete()
+
+        record_audit_users(self.app_label, self.using, entries)
+        return len(rows)
+
+    def _drain_rows(self, ids: List[int]):
+        """(written, failed) - each row in its own transaction"""
+        written = failed = 0
+        for pk in ids:
+            try:
+                written += self._drain_batch(self._pending().filter(pk=pk), 1)
+            except Exception as e:
+                failed += 1
+                self._record_failure(pk, e)
+        return written, failed
+    
+    def _record_failure(self, pk: int, error: Exception):
+        """Count a failed attempt; log the traceback once, when the row is parked"""
+        row = self._pending().filter(pk=pk)
+        row.update(attempts=F('attempts') + 1, last_error=f'{type(error).__name__}: {error}'[:2000])
+        attempts = row.values_list('attempts', flat=True).first()
+        
+        if attempts is not None and attempts >= max_attempts():
+            logger.error(
+                f"Audit outbox {self.app_label} row {pk} parked after {attempts} attempts "
+                f"(drain_audit_outbox --retry-parked after fixing): {error}",
+                exc_info=error,
+            )
+        else:
+            logger.warning(f"Audit outbox {self.app_label} row {pk} not written (attempt {attempts}): {error}")
+
+    def _write(self, records: List[dict]) -> list:
+        """Multi-row INSERTs of the entries and their details"""
+        from .chain import AuditChain, chain_enabled
+
+        entries = [self._build_entry(record) for record in records]
+
+        if chain_enabled(self.app_label):
+            with AuditChain(self.app_label, self.using).appending(*entries):
+                self.AuditLog.objects.using(self.using).bulk_create(entries)
+        else:
+            self.AuditLog.objects.using(self.using).bulk_create(entries)
+
+        self.AuditLogDetail.objects.using(self.using).bulk_create([
+            self.AuditLogDetail(
+                audit_log=entry,
+                field_name=detail['field_name'],
+                old_value=detail['old_value'],
+                new_value=detail['new_value'],
+                reason=detail['reason'],
+            )
+            for entry, record in zip(entries, records)
+            for detail in record['details']
+        ])
+        return entries
+
+    def _build_entry(self, record: dict):
+        """Unsaved AuditLog with SITEID and checksum (same values as a synchronous save)"""
+        from .decorators import resolve_site_id_from
+
+        site = record['site']
+        patient_model = apps.get_model(site['patient_model']) if site['patient_model'] else None
+        timestamp = datetime.fromisoformat(record['timestamp'])
+
+        return self.AuditLog(
+            user_id=record['user_id'],
+            username=record['username'],
+            timestamp=timestamp,
+            action=record['action'],
+            model_name=record['model_name'],
+            patient_id=record['patient_id'],
+            SITEID=resolve_site_id_from(
+                site['site_id'], site['session_site_id'], site['patient_id'], patient_model
+            ),
+            reason=record['reason'],
+            ip_address=record['ip_address'],
+            session_id=record['session_id'],
+            checksum=IntegrityChecker.generate_checksum({**record, 'timestamp': str(timestamp)}),
+        )
@@ -0,0 +1,206 @@
+# backends/audit_logs/utils/pagination.py
+"""
+Keyset (cursor) pagination and cheap totals for the audit log browser
+
+OFFSET pagination reads and discards every row before the requested page,
+and Paginator runs a full COUNT(*) on each request - both grow with the
+log. Instead:
+
+- Pages are addressed by a cursor: the (timestamp, id) of the last row
+  shown. The next page is "rows strictly older than the cursor", served by
+  the (-timestamp, -id) index in constant time at any depth.
+- Totals: planner estimate (pg_class.reltuples) when the list is not
+  filtered, otherwise an exact count capped at COUNT_LIMIT rows.
+
+Usage:
+    paginator = KeysetPaginator(logs, per_page=25)
+    page_obj = paginator.get_page(request.GET.get('cursor'), request.GET.get('dir'))
+
+    {% for log in page_obj %} ...
+    ?cursor={{ page_obj.next_cursor }}&dir=next
+"""
+
+import base64
+import json
+import logging
+from datetime import datetime
+
+from django.db import connections
+from django.db.models import Q
+
+logger = logging.getLogger(__name__)
+
+# Filtered lists count at most this many rows ("10000+")
+COUNT_LIMIT = 10000
+
+DIRECTION_NEXT = 'next'     # Older rows (after the cursor)
+DIRECTION_PREV = 'prev'     # Newer rows (before the cursor)
+DIRECTION_LAST = 'last'     # Oldest page
+
+
+def encode_cursor(timestamp: datetime, pk: int) -> str:
+    """Opaque URL-safe cursor for one row position"""
+    raw = json.dumps([timestamp.isoformat(), pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str):
+    """(timestamp, pk) or None for a missing/invalid cursor"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        timestamp, pk = json.loads(raw)
+        return datetime.fromisoformat(timestamp), int(pk)
+    except (ValueError, TypeError):
+        logger.warning(f"Invalid pagination cursor: {cursor[:50]}")
+        return None
+
+
+class KeysetPage:
+    """One page of rows, newest first; iterable like a Paginator page"""
+
+    def __init__(self, object_list: list, has_next: bool, has_previous: bool,
+                 total: int, total_is_estimate: bool = False, total_is_capped: bool = False):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.total = total
+        self.total_is_estimate = total_is_estimate
+        self.total_is_capped = total_is_capped
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def next_cursor(self):
+        if not self.has_next:
+            return None
+        last = self.object_list[-1]
+        return encode_cursor(last.timestamp, last.pk)
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous:
+            return None
+        first = self.object_list[0]
+        return encode_cursor(first.timestamp, first.pk)
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+class KeysetPaginator:
+    """
+    Cursor pagination ordered by (timestamp DESC, id DESC)
+
+    The id tie-breaker keeps the order total: rows with the same timestamp
+    are never skipped or repeated between pages.
+    """
+
+    def __init__(self, queryset, per_page: int = 25, estimate_total: bool = False):
+        """
+        Args:
+            queryset: Filtered queryset (any ordering is replaced)
+            per_page: Rows per page
+            estimate_total: Use the planner estimate for the total
+                            (only correct when the queryset is not filtered)
+        """
+        self.queryset = queryset.order_by()
+        self.per_page = per_page
+        self.estimate_total = estimate_total
+
+    def get_page(self, cursor: str = None, direction: str = DIRECTION_NEXT) -> KeysetPage:
+        position = decode_cursor(cursor)
+
+        if direction == DIRECTION_LAST:
+            rows = list(self.queryset.order_by('timestamp', 'pk')[:self.per_page + 1])
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            has_next = False
+
+        elif direction == DIRECTION_PREV and position:
+            timestamp, pk = position
+            newer = self.queryset.filter(timestamp__gte=timestamp).filter(
+                Q(timestamp__gt=timestamp) | Q(pk__gt=pk)
+            )
+            rows = list(newer.order_by('timestamp', 'pk')[:self.per_page + 1])
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            has_next = True
+
+        else:
+            queryset = self.queryset
+            if position:
+                timestamp, pk = position
+                # timestamp__lte keeps the condition index-sargable
+                queryset = queryset.filter(timestamp__lte=timestamp).filter(
+                    Q(timestamp__lt=timestamp) | Q(pk__lt=pk)
+                )
+            rows = list(queryset.order_by('-timestamp', '-pk')[:self.per_page + 1])
+            has_next = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            has_previous = position is not None
+
+        total, is_estimate, is_capped = self._total()
+        return KeysetPage(rows, has_next, has_previous, total, is_estimate, is_capped)
+
+    # ==========================================
+    # TOTALS
+    # ==========================================
+
+    def _total(self):
+        """(total, is_estimate, is_capped)"""
+        if self.estimate_total:
+            estimate = estimate_table_rows(self.queryset.model, self.queryset.db)
+            if estimate is not None:
+                return estimate, True, False
+
+        count = self.queryset[:COUNT_LIMIT + 1].count()
+        if count > COUNT_LIMIT:
+            return COUNT_LIMIT, False, True
+        return count, False, False
+
+
+def estimate_table_rows(model, using: str):
+    """
+    Planner row estimate of the model's table (PostgreSQL pg_class.reltuples)
+
+    Kept current by autovacuum/ANALYZE. A partitioned table (audit_log after
+    partition_audit_log --convert) has no rows of its own and is never
+    analyzed by autovacuum, so its estimate is the sum over its partitions.
+    Returns None on other backends or when nothing was analyzed yet.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relkind, c.reltuples::bigint, (
+                SELECT SUM(p.reltuples)::bigint
+                FROM pg_inherits i
+                JOIN pg_class p ON p.oid = i.inhrelid
+                WHERE i.inhparent = c.oid AND p.reltuples >= 0
+            )
+            FROM pg_class c
+            WHERE c.oid = %s::regclass
+            """,
+            [connection.ops.quote_name(model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+
+    if not row:
+        return None
+
+    relkind, reltuples, partition_tuples = row
+    if relkind == 'p':
+        # Never-analyzed partitions (reltuples = -1) are left out
+        return partition_tuples
+    if reltuples < 0:
+        return None
+    return reltuples
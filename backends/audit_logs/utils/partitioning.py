@@ -0,0 +1,515 @@
+# backends/audit_logs/utils/partitioning.py
+"""
+Audit Log Partitioning - Monthly range partitions and an archival tier
+
+logging.audit_log only grows. On PostgreSQL it can be converted into a
+table partitioned by month on timestamp:
+
+    logging.audit_log                 (partitioned, PK (id, timestamp))
+    ├── logging.audit_log_y2026m09    [2026-09-01, 2026-10-01) UTC
+    ├── logging.audit_log_y2026m10
+    ├── ...                           (created AUDIT_PARTITION_MONTHS_AHEAD ahead)
+    └── logging.audit_log_default     (catch-all - an insert never fails)
+
+- Indexes are those of AuditLog Meta (BRIN on timestamp + composite
+  B-trees), created on the parent and inherited by every partition.
+- Partitions for the coming months are created daily (celery beat). Rows
+  that landed in the DEFAULT partition are moved into the month's
+  partition when it is created.
+- Archival: a month older than AUDIT_HOT_MONTHS is exported with its
+  details and stored checksums to a gzip JSONL file plus a signed
+  manifest (row counts, SHA-256 of the file), then detached and dropped.
+  Only sealed hash-chain ranges are archived; their seq numbers are
+  recorded in a signed AuditChainArchive row in the drop's transaction, so
+  verify_audit_chain counts them as archived (not missing) and re-reads
+  them from the file.
+
+audit_log_detail is not partitioned (it has no timestamp); an archived
+month's details are exported and deleted with it.
+
+Commands:
+    python manage.py partition_audit_log --database db_study_43en --convert
+    python manage.py archive_audit_log --all-studies --dry-run
+"""
+
+import gzip
+import hashlib
+import hmac
+import json
+import logging
+import os
+import re
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .integrity import IntegrityChecker
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = 'logging'
+PARENT = f'"{SCHEMA}"."audit_log"'
+DETAIL = f'"{SCHEMA}"."audit_log_detail"'
+DEFAULT_PARTITION = 'audit_log_default'
+
+# Name of the original table while its rows are copied
+LEGACY_TABLE = 'audit_log_unpartitioned'
+
+PARTITION_RE = re.compile(r'^audit_log_y(\d{4})m(\d{2})$')
+
+EXPORT_CHUNK_SIZE = 5000
+
+
+def month_start(value: datetime) -> datetime:
+    """First instant (UTC) of the value's month"""
+    value = value.astimezone(dt_timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(start: datetime, months: int) -> datetime:
+    index = start.year * 12 + start.month - 1 + months
+    return start.replace(year=index // 12, month=index % 12 + 1)
+
+
+def study_databases() -> dict:
+    """{app_label: db_alias} of all study databases in settings"""
+    prefix = getattr(settings, 'STUDY_DB_PREFIX', 'db_study_')
+    return {
+        f'study_{db_alias[len(prefix):]}': db_alias
+        for db_alias in connections.databases
+        if db_alias.startswith(prefix)
+    }
+
+
+class Partition(NamedTuple):
+    """One monthly partition [start, end)"""
+    name: str
+    start: datetime
+    end: datetime
+
+    @classmethod
+    def for_month(cls, start: datetime) -> 'Partition':
+        return cls(f'audit_log_y{start.year:04d}m{start.month:02d}', start, add_months(start, 1))
+
+    @property
+    def table(self) -> str:
+        return f'"{SCHEMA}"."{self.name}"'
+
+    @property
+    def bounds_sql(self) -> str:
+        return f"FROM ('{self.start.isoformat()}') TO ('{self.end.isoformat()}')"
+
+
+class AuditPartitionManager:
+    """
+    Quản lý partition theo tháng và lưu trữ audit log của một nghiên cứu
+
+    Usage:
+        manager = AuditPartitionManager('study_43en', 'db_study_43en')
+        manager.convert()
+        manager.ensure_partitions()
+        for partition in manager.archivable():
+            manager.archive(partition)
+    """
+
+    def __init__(self, app_label: str, db_alias: str):
+        from backends.audit_logs.models import (
+            get_audit_models, get_audit_chain_models, get_audit_chain_archive_model,
+        )
+
+        models = get_audit_models(app_label)
+        if not models:
+            raise LookupError(f'Audit models not found for {app_label}')
+
+        self.AuditLog, self.AuditLogDetail = models
+        self.chain_models = get_audit_chain_models(app_label)
+        self.ChainArchive = get_audit_chain_archive_model(app_label)
+        self.app_label = app_label
+        self.db_alias = db_alias
+        self.connection = connections[db_alias]
+
+    # ==========================================
+    # STATE
+    # ==========================================
+
+    @property
+    def supported(self) -> bool:
+        return self.connection.vendor == 'postgresql'
+
+    def is_partitioned(self) -> bool:
+        if not self.supported:
+            return False
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))',
+                [PARENT],
+            )
+            return cursor.fetchone()[0]
+
+    def partitions(self) -> List[Partition]:
+        """Monthly partitions, oldest first (DEFAULT partition excluded)"""
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+                'WHERE i.inhparent = to_regclass(%s)',
+                [PARENT],
+            )
+            names = [row[0] for row in cursor.fetchall()]
+
+        partitions = []
+        for name in names:
+            match = PARTITION_RE.match(name)
+            if match:
+                start = datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=dt_timezone.utc)
+                partitions.append(Partition.for_month(start))
+        return sorted(partitions, key=lambda p: p.start)
+
+    def default_rows(self) -> int:
+        """Rows in the DEFAULT partition (should stay 0)"""
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM "{SCHEMA}"."{DEFAULT_PARTITION}"')
+            return cursor.fetchone()[0]
+
+    # ==========================================
+    # CONVERT & MAINTAIN
+    # ==========================================
+
+    def convert(self, months_ahead: Optional[int] = None) -> dict:
+        """
+        Rebuild logging.audit_log as a partitioned table (one transaction)
+
+        Copies every row into its monthly partition under an ACCESS
+        EXCLUSIVE lock - run in a maintenance window. Requires migration
+        0009 (no foreign key from audit_log_detail).
+
+        Returns:
+            {'rows': n, 'partitions': [names]}
+        """
+        if months_ahead is None:
+            months_ahead = getattr(settings, 'AUDIT_PARTITION_MONTHS_AHEAD', 3)
+        if not self.supported:
+            raise RuntimeError(f'{self.db_alias} is {self.connection.vendor} - partitioning needs PostgreSQL')
+        if self.is_partitioned():
+            raise RuntimeError(f'{PARENT} of {self.db_alias} is already partitioned')
+
+        quote = self.connection.ops.quote_name
+        legacy = f'"{SCHEMA}".{quote(LEGACY_TABLE)}'
+        new_sequence = f'"{SCHEMA}"."audit_log_id_seq_partitioned"'
+        columns = ', '.join(quote(field.column) for field in self.AuditLog._meta.concrete_fields)
+
+        with transaction.atomic(using=self.db_alias), self.connection.cursor() as cursor:
+            cursor.execute(f'LOCK TABLE {PARENT} IN ACCESS EXCLUSIVE MODE')
+
+            cursor.execute(
+                "SELECT conname FROM pg_constraint WHERE contype = 'f' AND confrelid = to_regclass(%s)",
+                [PARENT],
+            )
+            foreign_keys = [row[0] for row in cursor.fetchall()]
+            if foreign_keys:
+                raise RuntimeError(
+                    f'Foreign keys reference {PARENT} ({", ".join(foreign_keys)}) - run migrate first'
+                )
+
+            cursor.execute(f'SELECT min("timestamp"), max(id), count(*) FROM {PARENT}')
+            first, max_id, rows = cursor.fetchone()
+
+            cursor.execute(f'ALTER TABLE {PARENT} RENAME TO {quote(LEGACY_TABLE)}')
+            cursor.execute(
+                f'CREATE TABLE {PARENT} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING COMMENTS) '
+                f'PARTITION BY RANGE ("timestamp")'
+            )
+
+            # The identity column stays with the old table - use a sequence
+            cursor.execute(f'CREATE SEQUENCE {new_sequence} AS bigint')
+            if max_id:
+                cursor.execute('SELECT setval(%s, %s)', [new_sequence, max_id])
+            cursor.execute(f"ALTER TABLE {PARENT} ALTER COLUMN id SET DEFAULT nextval('{new_sequence}')")
+            cursor.execute(f'ALTER SEQUENCE {new_sequence} OWNED BY {PARENT}.id')
+
+            current = month_start(timezone.now())
+            month = month_start(first) if first else current
+            created = []
+            self._create_default(cursor)
+            while month <= add_months(current, months_ahead):
+                partition = Partition.for_month(month)
+                self._create_partition(cursor, partition)
+                created.append(partition.name)
+                month = partition.end
+
+            cursor.execute(f'INSERT INTO {PARENT} ({columns}) SELECT {columns} FROM {legacy}')
+            if cursor.rowcount != rows:
+                raise RuntimeError(f'Copied {cursor.rowcount} of {rows} audit rows - conversion rolled back')
+
+            # Frees the old constraint/index names
+            cursor.execute(f'DROP TABLE {legacy}')
+            cursor.execute(f'ALTER SEQUENCE {new_sequence} RENAME TO "audit_log_id_seq"')
+            cursor.execute(f'ALTER TABLE {PARENT} ADD PRIMARY KEY (id, "timestamp")')
+
+            with self.connection.schema_editor(atomic=False) as editor:
+                for sql in editor._model_indexes_sql(self.AuditLog):
+                    editor.execute(sql)
+                editor.alter_db_table_comment(self.AuditLog, None, self.AuditLog._meta.db_table_comment)
+
+        logger.info(f"Audit log of {self.db_alias} partitioned: {rows} rows in {len(created)} partitions")
+        return {'rows': rows, 'partitions': created}
+
+    def ensure_partitions(self, months_ahead: Optional[int] = None) -> List[str]:
+        """Create the current and next months' partitions; returns created names"""
+        if months_ahead is None:
+            months_ahead = getattr(settings, 'AUDIT_PARTITION_MONTHS_AHEAD', 3)
+
+        existing = {partition.name for partition in self.partitions()}
+        current = month_start(timezone.now())
+        created = []
+
+        with transaction.atomic(using=self.db_alias), self.connection.cursor() as cursor:
+            self._create_default(cursor)
+            for offset in range(months_ahead + 1):
+                partition = Partition.for_month(add_months(current, offset))
+                if partition.name not in existing:
+                    self._create_partition(cursor, partition)
+                    created.append(partition.name)
+
+        if created:
+            logger.info(f"Audit log partitions created in {self.db_alias}: {', '.join(created)}")
+        return created
+
+    def _create_default(self, cursor):
+        cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS "{SCHEMA}"."{DEFAULT_PARTITION}" PARTITION OF {PARENT} DEFAULT'
+        )
+
+    def _create_partition(self, cursor, partition: Partition):
+        """Create one month; rows of the month found in DEFAULT are moved into it"""
+        default = f'"{SCHEMA}"."{DEFAULT_PARTITION}"'
+        cursor.execute(
+            f'SELECT EXISTS (SELECT 1 FROM {default} WHERE "timestamp" >= %s AND "timestamp" < %s)',
+            [partition.start, partition.end],
+        )
+        if not cursor.fetchone()[0]:
+            cursor.execute(f'CREATE TABLE {partition.table} PARTITION OF {PARENT} FOR VALUES {partition.bounds_sql}')
+            return
+
+        cursor.execute(f'CREATE TABLE {partition.table} (LIKE {PARENT} INCLUDING DEFAULTS)')
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM {default} WHERE "timestamp" >= %s AND "timestamp" < %s RETURNING *) '
+            f'INSERT INTO {partition.table} SELECT * FROM moved',
+            [partition.start, partition.end],
+        )
+        logger.warning(f"Moved {cursor.rowcount} audit rows from {DEFAULT_PARTITION} into {partition.name}")
+        cursor.execute(f'ALTER TABLE {PARENT} ATTACH PARTITION {partition.table} FOR VALUES {partition.bounds_sql}')
+
+    # ==========================================
+    # ARCHIVE
+    # ==========================================
+
+    def archivable(self, keep_months: Optional[int] = None) -> List[Partition]:
+        """Partitions that ended more than keep_months ago"""
+        if keep_months is None:
+            keep_months = getattr(settings, 'AUDIT_HOT_MONTHS', 24)
+        cutoff = add_months(month_start(timezone.now()), -keep_months)
+        return [partition for partition in self.partitions() if partition.end <= cutoff]
+
+    def archive(self, partition: Partition, root: Optional[str] = None) -> dict:
+        """
+        Export one month to <root>/<study>/<partition>.jsonl.gz, then drop it
+
+        The partition is only dropped after the file was read back and
+        matched the exported row count; the drop itself re-checks the
+        counts under lock.
+
+        Returns:
+            manifest dict (also written next to the file)
+        """
+        self._check_sealed(partition)
+
+        directory = Path(root or settings.AUDIT_ARCHIVE_ROOT) / self.app_label
+        directory.mkdir(parents=True, exist_ok=True)
+        data_path = directory / f'{partition.name}.jsonl.gz'
+
+        stats = self.export(partition, data_path)
+        sha256, lines = self._read_back(data_path)
+        if lines != stats['rows']:
+            raise RuntimeError(f'{data_path} has {lines} lines, expected {stats["rows"]}')
+
+        manifest = {
+            'study': self.app_label,
+            'database': self.db_alias,
+            'partition': partition.name,
+            'from': partition.start.isoformat(),
+            'to': partition.end.isoformat(),
+            'file': data_path.name,
+            'sha256': sha256,
+            'archived_at': timezone.now().isoformat(),
+            **stats,
+        }
+        manifest['signature'] = IntegrityChecker.sign(json.dumps(manifest, sort_keys=True))
+
+        manifest_path = directory / f'{partition.name}.manifest.json'
+        manifest_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False))
+
+        self._drop(partition, stats['rows'], stats['details'], self._chain_archive(partition, manifest, data_path))
+        logger.info(
+            f"Archived {partition.name} of {self.db_alias}: {stats['rows']} rows, "
+            f"{stats['details']} details -> {data_path}"
+        )
+        return manifest
+
+    def export(self, partition: Partition, path: Path) -> dict:
+        """
+        Write the month's entries (one JSON object per line, details nested)
+
+        Stored checksums are kept and recomputed on the way, so the
+        manifest records rows that were already invalid when archived.
+        """
+        fields = [field.attname for field in self.AuditLog._meta.concrete_fields]
+        queryset = self.AuditLog.objects.using(self.db_alias).filter(
+            timestamp__gte=partition.start, timestamp__lt=partition.end
+        ).order_by()
+
+        stats = {'rows': 0, 'details': 0, 'invalid_ids': [], 'first_id': None, 'last_id': None,
+                 'first_seq': None, 'last_seq': None}
+        seqs = []
+        tmp = path.with_suffix('.tmp')
+
+        with gzip.open(tmp, 'wt', encoding='utf-8') as out:
+            position = None
+            while True:
+                page = queryset
+                if position is not None:
+                    timestamp, pk = position
+                    page = page.filter(timestamp__gte=timestamp).filter(Q(timestamp__gt=timestamp) | Q(pk__gt=pk))
+                rows = list(page.order_by('timestamp', 'pk').values(*fields)[:EXPORT_CHUNK_SIZE])
+                if not rows:
+                    break
+
+                details = {}
+                for detail in (
+                    self.AuditLogDetail.objects.using(self.db_alias)
+                    .filter(audit_log_id__in=[row['id'] for row in rows])
+                    .order_by('audit_log_id', 'id')
+                    .values('audit_log_id', 'field_name', 'old_value', 'new_value', 'reason')
+                ):
+                    details.setdefault(detail.pop('audit_log_id'), []).append(detail)
+
+                for row in rows:
+                    row_details = details.get(row['id'], [])
+                    calculated = IntegrityChecker.checksum_for_row(
+                        row, [(d['field_name'], d['old_value'], d['new_value']) for d in row_details]
+                    )
+                    if not row['checksum'] or not hmac.compare_digest(calculated, row['checksum']):
+                        stats['invalid_ids'].append(row['id'])
+
+                    self._track(stats, row)
+                    if row.get('seq') is not None:
+                        seqs.append(row['seq'])
+                    stats['details'] += len(row_details)
+                    out.write(json.dumps(
+                        {**row, 'timestamp': row['timestamp'].isoformat(), 'details': row_details},
+                        ensure_ascii=False, default=str,
+                    ) + '\n')
+
+                position = (rows[-1]['timestamp'], rows[-1]['id'])
+
+        os.replace(tmp, path)
+
+        from .chain import AuditChain
+        stats['chained'] = len(seqs)
+        stats['seq_ranges'] = AuditChain.seq_ranges(seqs)
+        if stats['invalid_ids']:
+            logger.error(
+                f"INTEGRITY VIOLATION: {len(stats['invalid_ids'])} invalid audit rows archived from {partition.name}"
+            )
+        return stats
+
+    @staticmethod
+    def _track(stats: dict, row: dict):
+        stats['rows'] += 1
+        stats['first_id'] = row['id'] if stats['first_id'] is None else min(stats['first_id'], row['id'])
+        stats['last_id'] = row['id'] if stats['last_id'] is None else max(stats['last_id'], row['id'])
+        if row.get('seq') is not None:
+            stats['first_seq'] = row['seq'] if stats['first_seq'] is None else min(stats['first_seq'], row['seq'])
+            stats['last_seq'] = row['seq'] if stats['last_seq'] is None else max(stats['last_seq'], row['seq'])
+
+    @staticmethod
+    def _read_back(path: Path):
+        """(sha256 of the file, number of lines) - also proves the gzip is readable"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as raw:
+            for block in iter(lambda: raw.read(1 << 20), b''):
+                digest.update(block)
+        with gzip.open(path, 'rt', encoding='utf-8') as lines:
+            count = sum(1 for _ in lines)
+        return digest.hexdigest(), count
+
+    def _check_sealed(self, partition: Partition):
+        """Refuse to archive chained entries not covered by a checkpoint"""
+        if self.chain_models is None:
+            return
+
+        checkpoint_model = self.chain_models[1]
+        last = checkpoint_model.objects.using(self.db_alias).order_by('-block_no').first()
+        sealed_seq = last.last_seq if last else 0
+
+        unsealed = self.AuditLog.objects.using(self.db_alias).filter(
+            timestamp__gte=partition.start, timestamp__lt=partition.end, seq__gt=sealed_seq
+        ).exists()
+        if unsealed:
+            raise RuntimeError(
+                f'{partition.name} has hash-chained entries after the last checkpoint - run seal_audit_chain first'
+            )
+
+    def _chain_archive(self, partition: Partition, manifest: dict, data_path: Path):
+        """Unsaved signed AuditChainArchive of the month's chained entries (None if there are none)"""
+        from .chain import AuditChain
+
+        if self.ChainArchive is None or not manifest['chained']:
+            return None
+
+        # Relative to AUDIT_ARCHIVE_ROOT when stored there (archives can move with the root)
+        try:
+            stored = str(data_path.resolve().relative_to(Path(settings.AUDIT_ARCHIVE_ROOT).resolve()))
+        except ValueError:
+            stored = str(data_path.resolve())
+
+        return self.ChainArchive(
+            partition=partition.name,
+            first_seq=manifest['first_seq'],
+            last_seq=manifest['last_seq'],
+            seq_ranges=manifest['seq_ranges'],
+            entries=manifest['chained'],
+            file=stored,
+            sha256=manifest['sha256'],
+            signature=AuditChain.archive_signature(
+                partition.name, manifest['seq_ranges'], manifest['chained'], manifest['sha256']
+            ),
+        )
+
+    def _drop(self, partition: Partition, rows: int, details: int, chain_archive=None):
+        """Delete the month's details, detach and drop the partition (one transaction)"""
+        with transaction.atomic(using=self.db_alias), self.connection.cursor() as cursor:
+            # SHARE: no writes to the month; readers of audit_log are not blocked
+            # until DETACH takes the parent's lock
+            cursor.execute(f'LOCK TABLE {partition.table} IN SHARE MODE')
+            cursor.execute(f'SELECT count(*) FROM {partition.table}')
+            current = cursor.fetchone()[0]
+            if current != rows:
+                raise RuntimeError(f'{partition.name} has {current} rows, {rows} exported - archive it again')
+
+            cursor.execute(f'DELETE FROM {DETAIL} WHERE audit_log_id IN (SELECT id FROM {partition.table})')
+            if cursor.rowcount != details:
+                raise RuntimeError(
+                    f'{partition.name} has {cursor.rowcount} details, {details} exported - archive it again'
+                )
+
+            cursor.execute(f'ALTER TABLE {PARENT} DETACH PARTITION {partition.table}')
+            cursor.execute(f'DROP TABLE {partition.table}')
+
+            # Archived seq numbers must not read as deleted entries
+            if chain_archive is not None:
+                chain_archive.save(using=self.db_alias)
@@ -14,7 +14,7 @@ from django.shortcuts import render, redirect
 from django.db import transaction
 from django.contrib import messages
 
-from .detector import ChangeDetector, EXCLUDED_METADATA_FIELDS
+from .detector import ChangeDetector, DiffPlan, EXCLUDED_METADATA_FIELDS
 from .validator import ReasonValidator
 
 logger = logging.getLogger(__name__)
@@ -740,33 +740,30 @@ class ComplexAuditProcessor(MultiFormAuditProcessor):
         all_old_data['formsets'] = {}
         
         for name, config in forms_config.get('formsets', {}).items():
-            formset_old_data = {}
-            
-            # Support both InlineFormSet (instance+related_name) and ModelFormSet (queryset)
-            instance = config.get('instance')
-            queryset = config.get('queryset')
-            
-            if instance:
-                related_name = config.get('related_name', name)
-                manager = getattr(instance, related_name, None)
-                
-                if manager:
-                    for obj in manager.all():
-                        formset_old_data[obj.pk] = filter_metadata_fields(
-                            self.detector.extract_old_data(obj)
-                        )
-            
-            elif queryset is not None:
-                for obj in queryset:
-                    formset_old_data[obj.pk] = filter_metadata_fields(
-                        self.detector.extract_old_data(obj)
-                    )
-            
+            formset_old_data = self._capture_formset_old_data(name, config)
             all_old_data['formsets'][name] = formset_old_data
             logger.debug("Captured %d old %s records", len(formset_old_data), name)
         
         return all_old_data
     
+    def _capture_formset_old_data(self, name, config) -> Dict:
+        """Old data of a formset's rows: {pk: {field: value}} (one query)"""
+        # Support both InlineFormSet (instance+related_name) and ModelFormSet (queryset)
+        instance = config.get('instance')
+        queryset = config.get('queryset')
+        
+        if instance:
+            related_name = config.get('related_name', name)
+            manager = getattr(instance, related_name, None)
+            if not manager:
+                return {}
+            queryset = manager.all()
+        
+        elif queryset is None:
+            return {}
+        
+        return DiffPlan.for_model(queryset.model).fetch_old(queryset)
+    
 
     def _initialize_complex_forms(self, request, forms_config):
         """Initialize forms + formsets"""
@@ -854,72 +851,73 @@ class ComplexAuditProcessor(MultiFormAuditProcessor):
         # Start with multi-form changes
         all_changes = self._detect_multi_form_changes(all_old_data, forms_dict)
         
-        # Add formset changes with optimized batch processing
+        # Add formset changes (compiled per-model diff plan)
         for name, formset in forms_dict.get('formsets', {}).items():
             formset_old_data = all_old_data['formsets'].get(name, {})
-            formset_changes_count = 0
+            all_changes.extend(self._detect_formset_changes(name, formset, formset_old_data))
+        
+        return all_changes
+    
+    def _detect_formset_changes(self, name, formset, formset_old_data) -> List[Dict]:
+        """Changes of one formset against its captured old data"""
+        changes = []
+        plan = DiffPlan.for_model(formset.model)
+        
+        for form in formset.forms:
+            # Skip early if no cleaned_data or no changes detected by Django
+            if not form.cleaned_data:
+                continue
             
-            for form in formset.forms:
-                # Skip early if no cleaned_data or no changes detected by Django
-                if not form.cleaned_data:
-                    continue
-                
-                #  OPTIMIZATION REMOVED: Form.has_changed() can be unreliable for DateFields
-                # (mismatch between initial Date and submitted String).
-                # We rely on our robust ChangeDetector logic instead.
-                # if hasattr(form, 'has_changed') and not form.has_changed():
-                #    continue
-                
-                instance = form.instance
-                
-                # Check DELETE
-                if form.cleaned_data.get('DELETE'):
-                    if instance.pk:
-                        all_changes.append({
-                            'field': f'{name}_{instance.pk}_DELETED',
-                            'old_value': str(instance),
-                            'new_value': None,
-                            'old_display': f'{instance} (Deleted)',
-                            'new_display': 'Deleted',
-                        })
-                    continue
+            #  OPTIMIZATION REMOVED: Form.has_changed() can be unreliable for DateFields
+            # (mismatch between initial Date and submitted String).
+            # We rely on our robust ChangeDetector logic instead.
+            # if hasattr(form, 'has_changed') and not form.has_changed():
+            #    continue
+            
+            instance = form.instance
+            
+            # Check DELETE
+            if form.cleaned_data.get('DELETE'):
+                if instance.pk:
+                    changes.append({
+                        'field': f'{name}_{instance.pk}_DELETED',
+                        'old_value': str(instance),
+                        'new_value': None,
+                        'old_display': f'{instance} (Deleted)',
+                        'new_display': 'Deleted',
+                    })
+                continue
+            
+            # Check existing item changes (only fields present in the form)
+            if instance.pk and instance.pk in formset_old_data:
+                form_changes = plan.diff(formset_old_data[instance.pk], form)
                 
-                # Check existing item changes
-                if instance.pk and instance.pk in formset_old_data:
-                    old_data = formset_old_data[instance.pk]
-                    new_data = filter_metadata_fields(self.detector.extract_new_data(form))
-                    
-                    # Only compare fields present in the form
-                    old_data_filtered = {k: v for k, v in old_data.items() if k in new_data}
-                    
-                    changes = self.detector.detect_changes(old_data_filtered, new_data)
+                # Enhanced: Add human-readable display name for formset changes
+                for change in form_changes:
+                    # Keep technical field name for reason collection
+                    change['field'] = f"{name}_{instance.pk}_{change['field']}"
                     
-                    # Enhanced: Add human-readable display name for formset changes
-                    for change in changes:
-                        # Keep technical field name for reason collection
-                        change['field'] = f"{name}_{instance.pk}_{change['field']}"
-                        
-                        # Add display_name for modal UI
-                        display_name = self._get_formset_display_name(instance, change['field'])
-                        if display_name:
-                            change['display_name'] = display_name
-                    
-                    all_changes.extend(changes)
+                    # Add display_name for modal UI
+                    display_name = self._get_formset_display_name(instance, change['field'])
+                    if display_name:
+                        change['display_name'] = display_name
                 
-                # New item - SKIP (don't require reason for adding new items)
-                # elif not instance.pk:
-                #     new_data = self.detector.extract_new_data(form)
-                #     display_field = self._get_display_field(new_data)
-                #     
-                #     all_changes.append({
-                #         'field': f'{name}_NEW_{display_field}',
-                #         'old_value': None,
-                #         'new_value': display_field,
-                #         'old_display': 'N/A',
-                #         'new_display': str(display_field),
-                #     })
-        
-        return all_changes
+                changes.extend(form_changes)
+            
+            # New item - SKIP (don't require reason for adding new items)
+            # elif not instance.pk:
+            #     new_data = self.detector.extract_new_data(form)
+            #     display_field = self._get_display_field(new_data)
+            #     
+            #     changes.append({
+            #         'field': f'{name}_NEW_{display_field}',
+            #         'old_value': None,
+            #         'new_value': display_field,
+            #         'old_display': 'N/A',
+            #         'new_display': str(display_field),
+            #     })
+        
+        return changes
     
     def _get_formset_display_name(self, instance, technical_field: str) -> str:
         """
@@ -964,10 +962,10 @@ class ComplexAuditProcessor(MultiFormAuditProcessor):
             except Exception as e:
                 logger.warning(f"Failed to get AST_ID: {e}")
         
-        # For LaboratoryTest: use get_TESTTYPE_display()
+        # For LaboratoryTest: get_TESTTYPE_display() (labels cached by the diff plan)
         if hasattr(instance, 'get_TESTTYPE_display'):
             try:
-                test_name = instance.get_TESTTYPE_display()
+                test_name = DiffPlan.for_model(type(instance)).display_value(instance, 'TESTTYPE')
                 if test_name:
                     return f"{test_name} - {field_label}"
             except Exception as e:
@@ -8,6 +8,7 @@ SECURITY:
 - Protects against brute force attacks
 - Logs suspicious activity with user-agent
 - Async email alerts via Celery (throttled)
+- Atomic sliding-window counting (backends.tenancy.utils.rate_limiter)
 """
 from django.core.cache import cache
 from django.http import HttpResponse
@@ -15,6 +16,8 @@ from functools import wraps
 from datetime import datetime
 import logging
 
+from backends.tenancy.utils.rate_limiter import RateLimiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,9 +26,11 @@ def rate_limit(key_prefix: str, max_requests: int = 10, window: int = 60):
     Rate limit decorator
     
     ENHANCED: Added user-agent logging for security analysis
+    Uses the shared sliding-window RateLimiter (1 atomic Redis round trip);
+    API_RATE_LIMIT_POLICIES[key_prefix] overrides max_requests / window.
     
     Args:
-        key_prefix: Prefix for cache key
+        key_prefix: Policy name (also the cache key prefix)
         max_requests: Max requests allowed in window
         window: Time window in seconds
     
@@ -37,37 +42,33 @@ def rate_limit(key_prefix: str, max_requests: int = 10, window: int = 60):
     def decorator(view_func):
         @wraps(view_func)
         def wrapper(request, *args, **kwargs):
-            # Build cache key with IP and user ID
+            # Identify client by IP and user ID
             ip = request.META.get('REMOTE_ADDR', 'unknown')
             user_id = request.user.id if request.user.is_authenticated else 'anon'
-            cache_key = f'rate_limit:{key_prefix}:{ip}:{user_id}'
             
-            # Atomic increment with get_or_set
-            count = cache.get(cache_key, 0)
+            policy = RateLimiter.get_policy(key_prefix, limit=max_requests, window=window)
+            result = RateLimiter.hit(policy, f'{ip}:{user_id}')
             
-            if count >= max_requests:
+            if not result.allowed:
                 # Log with user-agent for security analysis
                 user_agent = request.META.get('HTTP_USER_AGENT', 'unknown')[:200]
                 logger.warning(
                     "RATE LIMIT EXCEEDED: ip=%s user=%s count=%d window=%ds path=%s ua=%s",
-                    ip, user_id, count, window, request.path, user_agent
+                    ip, user_id, result.count, policy.window, request.path, user_agent
                 )
                 
                 # Send async alert email via Celery (throttled - once per 5 min)
-                alert_key = f'alert_sent:{cache_key}'
+                alert_key = f'alert_sent:rate_limit:{key_prefix}:{ip}:{user_id}'
                 if not cache.get(alert_key):
-                    _send_rate_limit_alert(request, ip, user_id, count, window)
+                    _send_rate_limit_alert(request, ip, user_id, result.count, policy.window)
                     cache.set(alert_key, True, 300)  # Don't spam alerts
                 
                 return HttpResponse(
                     'Quá nhiều yêu cầu. Vui lòng thử lại sau.',
                     status=429,
-                    headers={'Retry-After': str(window)}  # RFC 6585 compliance
+                    headers=result.headers()  # Retry-After: RFC 6585 compliance
                 )
             
-            # Increment counter atomically
-            cache.set(cache_key, count + 1, window)
-            
             return view_func(request, *args, **kwargs)
         
         return wrapper
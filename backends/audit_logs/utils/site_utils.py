@@ -12,14 +12,30 @@ Usage:
     
     site_filter, filter_type = get_site_filter_params(request)
     queryset = get_filtered_queryset(model, site_filter, filter_type, db_alias='db_study_43en')
+
+Cached results (generation namespaces):
+    Query results derived from a site-filtered model can be cached with
+    get_cached_result(). Keys embed the model's current generation - the
+    per-(study db, table) data version of DashboardCache - so invalidating a
+    model is one INCR: old entries are never looked up again and expire by
+    TTL. No KEYS/SCAN/delete_pattern.
+    
+    Generations are bumped (after commit) by post_save/post_delete of every
+    tracked model (track_site_models()). Writes that bypass signals
+    (QuerySet.update, bulk_create, raw SQL) must call bump_generation().
 """
 
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from django.core.exceptions import PermissionDenied
+from django.apps import apps
 from django.core.cache import cache
-import logging
+from asgiref.sync import sync_to_async
 import hashlib
+import logging
+import threading
+
+from backends.tenancy.utils.dashboard_cache import DashboardCache
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +47,16 @@ CACHE_TIMEOUT_SHORT = 300  # 5 minutes - for query results
 CACHE_TIMEOUT_MEDIUM = 1800  # 30 minutes - for metadata
 CACHE_TIMEOUT_LONG = 3600  # 1 hour - for rarely changed data
 
+# Site-filter predicate cache (in-process)
+# Key: (model label, normalized site filter, filter_type, db) -> unevaluated QuerySet
+PREDICATE_CACHE_MAX_SIZE = 1024
+_PREDICATE_CACHE = {}
+_PREDICATE_CACHE_LOCK = threading.Lock()
+
+# Site-filtered models whose generation is bumped by signals
+# Key: db alias -> {model label: model}
+_TRACKED_MODELS = {}
+
 
 def get_site_filter_params(request):
     """
@@ -79,13 +105,19 @@ def get_site_filter_params(request):
 
 def get_filtered_queryset(model, site_filter, filter_type, use_cache=True, db_alias=None):
     """
-    OPTIMIZED: Get filtered queryset with Redis caching
+    OPTIMIZED: Get filtered queryset with a cached site-filter predicate
+    
+    The site filter (SITEID / USUBJID prefix / FK chain) is resolved once per
+    (model, site filter, db) and kept in-process as an unevaluated queryset.
+    Each call returns a clone, so the database runs the site predicate
+    directly - no PK list round trip, no pk__in parameter list, and no stale
+    results after writes (the predicate does not depend on table contents).
     
     Args:
         model: Django model class
         site_filter: 'all' | str | list
         filter_type: 'all' | 'single' | 'multiple'
-        use_cache: Enable/disable caching (default True)
+        use_cache: Enable/disable predicate caching (default True)
         db_alias: Database alias to use (default: DEFAULT_DB_ALIAS)
     
     Returns:
@@ -93,23 +125,56 @@ def get_filtered_queryset(model, site_filter, filter_type, use_cache=True, db_al
     """
     db = db_alias or DEFAULT_DB_ALIAS
     
-    # Cache key generation
-    if use_cache:
-        cache_key = _generate_cache_key('queryset', model.__name__, site_filter, filter_type, db)
-        
-        # Try to get from cache
-        cached_pks = cache.get(cache_key)
-        if cached_pks is not None:
-            logger.debug("Cache HIT: [%s] %d objects", model.__name__, len(cached_pks))
-            # Return queryset filtered by cached PKs
-            return model.objects.using(db).filter(pk__in=cached_pks)
-    
-    # Cache MISS - query database
+    if not use_cache:
+        return _build_site_queryset(model, site_filter, filter_type, db)
+    
+    cache_key = _predicate_cache_key(model, site_filter, filter_type, db)
+    template = _PREDICATE_CACHE.get(cache_key)
+    
+    if template is None:
+        template = _build_site_queryset(model, site_filter, filter_type, db)
+        with _PREDICATE_CACHE_LOCK:
+            if len(_PREDICATE_CACHE) >= PREDICATE_CACHE_MAX_SIZE:
+                _PREDICATE_CACHE.clear()
+            _PREDICATE_CACHE[cache_key] = template
+        logger.debug("Predicate cached: [%s] %s", model.__name__, cache_key[1:])
+    
+    # .all() clones the query - the cached template is never evaluated
+    return template.all()
+
+
+async def aget_site_filter_params(request):
+    """
+    Async get_site_filter_params() for ASGI views
+    
+    request.user_sites may be a lazy ORM object, so it is resolved in the
+    request's thread-sensitive executor.
+    """
+    return await sync_to_async(get_site_filter_params)(request)
+
+
+async def aget_filtered_queryset(model, site_filter, filter_type, use_cache=True, db_alias=None):
+    """
+    Async get_filtered_queryset() for ASGI views
+    
+    Building the site-filtered queryset never hits the database, so it runs
+    inline; evaluate the result with the async ORM API:
+    
+        queryset = await aget_filtered_queryset(SCR_CASE, site_filter, filter_type)
+        total = await queryset.acount()
+        async for row in queryset.values('SITEID'):
+            ...
+    """
+    return get_filtered_queryset(model, site_filter, filter_type, use_cache=use_cache, db_alias=db_alias)
+
+
+def _build_site_queryset(model, site_filter, filter_type, db):
+    """Build the site-filtered queryset (no evaluation)"""
     if filter_type == 'all':
         logger.debug(f"[{model.__name__}] Query all sites")
-        queryset = model.objects.using(db)
+        return model.objects.using(db).all()
     
-    elif filter_type == 'multiple':
+    if filter_type == 'multiple':
         logger.debug(f"[{model.__name__}] Query multiple sites: {site_filter}")
         
         if not site_filter:
@@ -117,35 +182,29 @@ def get_filtered_queryset(model, site_filter, filter_type, use_cache=True, db_al
             return model.objects.using(db).none()
         
         # Use manager's filter_by_site which handles multiple sites
-        queryset = model.site_objects.using(db).filter_by_site(site_filter)
-    
-    else:  # filter_type == 'single'
-        logger.debug(f"[{model.__name__}] Query single site: {site_filter}")
-        queryset = model.site_objects.using(db).filter_by_site(site_filter)
+        return model.site_objects.using(db).filter_by_site(site_filter)
     
-    # Cache the result (PKs only to save memory)
-    if use_cache:
-        try:
-            pks = list(queryset.values_list('pk', flat=True))
-            cache.set(cache_key, pks, CACHE_TIMEOUT_SHORT)
-            logger.debug("Cached: [%s] %d objects", model.__name__, len(pks))
-        except Exception as e:
-            logger.warning("Failed to cache queryset: %s", e)
-    
-    return queryset
+    # filter_type == 'single'
+    logger.debug(f"[{model.__name__}] Query single site: {site_filter}")
+    return model.site_objects.using(db).filter_by_site(site_filter)
 
 
-def _generate_cache_key(*args):
-    """
-    Generate unique cache key from arguments
-    
-    Example: 'site_query_SCR_CASE_all_all_v1'
-    """
-    # Create deterministic hash
-    content = '_'.join(str(arg) for arg in args)
-    hash_suffix = hashlib.md5(content.encode()).hexdigest()[:8]
-    
-    return f"site_query_{hash_suffix}_v1"
+def _normalize_site_filter(site_filter):
+    """Order-independent, hashable form of a site filter"""
+    if isinstance(site_filter, (list, tuple, set, frozenset)):
+        return tuple(sorted(str(code) for code in site_filter))
+    return site_filter
+
+
+def _predicate_cache_key(model, site_filter, filter_type, db):
+    return (model._meta.label, _normalize_site_filter(site_filter), filter_type, db)
+
+
+def _result_cache_key(*parts):
+    key = '_'.join(str(p) for p in parts)
+    if len(key) > 200:
+        key = hashlib.sha256(key.encode()).hexdigest()[:32]
+    return f"site_query_{key}"
 
 
 def batch_get_related(primary_instances, related_model, fk_field, site_filter, filter_type):
@@ -241,23 +300,138 @@ def batch_check_exists(instances, check_models, fk_field, site_filter, filter_ty
     return results
 
 
-def invalidate_cache(model_name=None, site_filter=None):
+def invalidate_cache(model_name=None, site_filter=None, db_alias=None):
     """
-    Invalidate cache when data changes
+    Invalidate cached site-filter predicates and cached results
+    
+    Predicates do not depend on table contents, so normal writes never need
+    this; use it after changing a model's site-filter strategy, or after
+    writes that bypass signals.
+    
+    Cached results are namespaced by model generation, so they are
+    invalidated per model (all site filters) with one INCR per model.
     
     Args:
         model_name: Specific model to invalidate (None = all)
-        site_filter: Specific site filter (None = all)
+        site_filter: Specific site filter (None = all) - predicates only
+        db_alias: Study database of the results (None = all tracked databases)
     """
-    if model_name and site_filter:
-        # Invalidate specific cache
-        pattern = f"site_query_*{model_name}*{site_filter}*"
-        cache.delete_pattern(pattern)
-        logger.info("Invalidated cache: %s @ %s", model_name, site_filter)
-    else:
-        # Invalidate all site query cache
-        cache.delete_pattern("site_query_*")
-        logger.info("Invalidated all site query cache")
+    normalized = _normalize_site_filter(site_filter) if site_filter is not None else None
+    
+    bumped = 0
+    for db, models in list(_TRACKED_MODELS.items()):
+        if db_alias is not None and db != db_alias:
+            continue
+        for model in list(models.values()):
+            if model_name is None or model.__name__ == model_name:
+                DashboardCache.bump(db, model)
+                bumped += 1
+    
+    with _PREDICATE_CACHE_LOCK:
+        if model_name is None and normalized is None:
+            _PREDICATE_CACHE.clear()
+            logger.info("Invalidated all site predicate cache, %d result generation(s)", bumped)
+            return
+        
+        stale_keys = [
+            key for key in _PREDICATE_CACHE
+            if (model_name is None or key[0].rsplit('.', 1)[-1] == model_name)
+            and (normalized is None or key[1] == normalized)
+        ]
+        for key in stale_keys:
+            _PREDICATE_CACHE.pop(key, None)
+    
+    logger.info(
+        "Invalidated %d site predicate(s), %d result generation(s): %s @ %s",
+        len(stale_keys), bumped, model_name, site_filter
+    )
+
+
+# ==========================================
+# GENERATION NAMESPACES (cached results)
+# ==========================================
+
+def track_site_models(db_alias, app_label):
+    """
+    Bump the generation of every site-filtered model of a study app on write
+    
+    Site-filtered = has a `site_objects` manager. Call once per study, from
+    the study's signals module (post_save/post_delete, after commit).
+    
+    Returns:
+        list of tracked models
+    """
+    models = [
+        model for model in apps.get_app_config(app_label).get_models()
+        if hasattr(model, 'site_objects')
+    ]
+    DashboardCache.track_models(db_alias, models)
+    
+    tracked = _TRACKED_MODELS.setdefault(db_alias, {})
+    for model in models:
+        tracked[model._meta.label_lower] = model
+    
+    logger.debug("Tracking generations of %d site-filtered model(s) in %s", len(models), db_alias)
+    return models
+
+
+def get_generation(model, db_alias=None):
+    """Current generation (data version) of a model in a study database"""
+    return DashboardCache.get_versions(db_alias or DEFAULT_DB_ALIAS, [model])[0]
+
+
+def bump_generation(model, db_alias=None):
+    """
+    Invalidate all cached results of a model (after commit, O(1))
+    
+    For writes that bypass signals: QuerySet.update(), bulk_create(), raw SQL.
+    """
+    DashboardCache.bump_on_commit(db_alias or DEFAULT_DB_ALIAS, model)
+
+
+def get_cached_result(model, site_filter, filter_type, name, compute, db_alias=None,
+                      timeout=CACHE_TIMEOUT_SHORT, depends_on=()):
+    """
+    Cached result of a site-filtered query, in the model's generation namespace
+    
+    Key: site_query_<db>_<model>_<generations>_<site scope>_<name>. Results
+    computed after a write always land under the new generation, so a value
+    computed before the write can never be served again.
+    
+    Args:
+        model: Site-filtered model the result is computed from
+        site_filter, filter_type: Site filtering params (part of the key)
+        name: Result name, including any other parameters (e.g. date)
+        compute: callable() -> picklable value
+        db_alias: Database alias to use (default: DEFAULT_DB_ALIAS)
+        timeout: Cache TTL (default CACHE_TIMEOUT_SHORT)
+        depends_on: Other models the result reads
+    
+    Example:
+        stats = get_cached_result(
+            FollowUpStatus, site_filter, filter_type, f"late_stats_{today}",
+            lambda: _late_stats(site_filter, filter_type),
+        )
+    """
+    db = db_alias or DEFAULT_DB_ALIAS
+    
+    try:
+        generations = DashboardCache.get_versions(db, [model, *depends_on])
+        cache_key = _result_cache_key(
+            db, model._meta.label_lower, '.'.join(str(g) for g in generations),
+            DashboardCache.normalize_scope(site_filter, filter_type), name,
+        )
+        value = cache.get(cache_key)
+    except Exception as e:
+        logger.warning(f"[{model.__name__}] Result cache unavailable for {name}: {e}")
+        return compute()
+    
+    if value is None:
+        value = compute()
+        cache.set(cache_key, value, timeout)
+        logger.debug("Result cached: [%s] %s", model.__name__, name)
+    
+    return value
 
 
 def get_site_filtered_object_or_404(model, site_filter, filter_type, **kwargs):
@@ -0,0 +1,373 @@
+# backends/audit_logs/utils/verification.py
+"""
+Audit Verification Engine - Full-table, parallel, resumable HMAC verification
+
+Verifies every logging.audit_log row of a study against its stored
+checksum:
+
+- Streams the table in (timestamp, id) keyset chunks; each chunk is one
+  query for the logs plus one for their details (no per-row queries).
+- HMACs are recomputed in a process pool while the next chunk is read.
+- A watermark "verified up to (timestamp, id)" is checkpointed per study
+  after every completed chunk, so a nightly run only verifies rows added
+  since the previous run, and an interrupted run resumes where it stopped.
+- Rows newer than SETTLE_SECONDS are left for the next run: a transaction
+  that commits late can insert a row with an older timestamp, which would
+  otherwise fall behind the watermark.
+- For studies using the async writer (outbox.py) the run also stops before
+  the oldest entry still queued in the outbox: those are inserted later
+  (retries, broker outages) with their original request timestamp.
+
+Checkpoints and JSON reports are written to settings.AUDIT_VERIFICATION_ROOT.
+
+Usage:
+    engine = AuditVerificationEngine('study_43en', 'db_study_43en', pool=pool)
+    report = engine.run()                  # incremental
+    report = engine.run(full=True)         # whole table, ignore the watermark
+"""
+
+import hmac
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .integrity import IntegrityChecker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# Rows younger than this are verified by the next run
+SETTLE_SECONDS = 300
+
+LOG_FIELDS = ('id', 'user_id', 'username', 'action', 'model_name', 'patient_id',
+              'timestamp', 'reason', 'checksum')
+
+
+def _init_worker():
+    """Process pool initializer (needed with the 'spawn' start method)"""
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def verify_chunk(rows: List[dict]) -> List[int]:
+    """
+    Recompute the checksums of one chunk (runs in a pool worker)
+
+    Args:
+        rows: log values with 'details' = [(field_name, old_value, new_value)]
+
+    Returns:
+        ids of rows whose checksum does not match
+    """
+    invalid = []
+    for row in rows:
+        calculated = IntegrityChecker.checksum_for_row(row, row['details'])
+        if not row['checksum'] or not hmac.compare_digest(calculated, row['checksum']):
+            invalid.append(row['id'])
+    return invalid
+
+
+def create_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Process pool shared by the engines of all studies"""
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker)
+
+
+class AuditVerificationEngine:
+    """
+    Engine kiểm tra toàn vẹn audit log cho một nghiên cứu
+
+    One engine per (study, database); several engines can share a pool.
+    """
+
+    def __init__(self, app_label: str, db_alias: str, pool: Optional[ProcessPoolExecutor] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, max_in_flight: Optional[int] = None):
+        from backends.audit_logs.models import get_audit_models
+
+        models = get_audit_models(app_label)
+        if not models:
+            raise LookupError(f'Audit models not found for {app_label}')
+
+        self.AuditLog, self.AuditLogDetail = models
+        self.app_label = app_label
+        self.db_alias = db_alias
+        self.pool = pool
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight or 2 * (os.cpu_count() or 1)
+
+    # ==========================================
+    # RUN
+    # ==========================================
+
+    def run(self, full: bool = False, since: Optional[datetime] = None, limit: Optional[int] = None,
+            mark_invalid: bool = False, checkpoint: bool = True) -> dict:
+        """
+        Verify rows after the watermark (or all rows with full=True)
+
+        Args:
+            full: Ignore the stored watermark and start from the first row
+            since: Only rows at/after this time (spot check, no checkpoint)
+            limit: Stop after this many rows (spot check, no checkpoint)
+            mark_invalid: Set is_verified=False on mismatching rows
+            checkpoint: Store the watermark after each completed chunk
+
+        Returns:
+            report dict (also written as JSON, see write_report())
+        """
+        started = timezone.now()
+        clock = time.perf_counter()
+        checkpoint = checkpoint and since is None and limit is None
+
+        state = {} if full else self.load_checkpoint()
+        position = self._decode_position(state.get('watermark'))
+        cutoff = started - timedelta(seconds=SETTLE_SECONDS)
+        held_by = self._oldest_queued_entry()
+        if held_by is not None and held_by < cutoff:
+            cutoff = held_by
+        else:
+            held_by = None
+
+        report = {
+            'study': self.app_label,
+            'database': self.db_alias,
+            'mode': 'full' if full else 'incremental',
+            'started_at': started.isoformat(),
+            'watermark_from': state.get('watermark'),
+            'watermark_to': state.get('watermark'),
+            'checked': 0,
+            'valid': 0,
+            'invalid': [],
+            'chunks': 0,
+            'held_by_outbox': held_by.isoformat() if held_by else None,
+        }
+
+        pending = deque()   # (future, chunk meta)
+        remaining = limit
+
+        for chunk in self._iter_chunks(position, cutoff, since):
+            if remaining is not None:
+                chunk = chunk[:remaining]
+                remaining -= len(chunk)
+            if not chunk:
+                break
+
+            meta = {
+                'ids': {row['id']: row for row in chunk},
+                'last': (chunk[-1]['timestamp'], chunk[-1]['id']),
+                'size': len(chunk),
+            }
+            pending.append((self._submit(chunk), meta))
+
+            while len(pending) >= self.max_in_flight:
+                self._collect(pending.popleft(), report, mark_invalid, checkpoint)
+
+            if remaining is not None and remaining <= 0:
+                break
+
+        while pending:
+            self._collect(pending.popleft(), report, mark_invalid, checkpoint)
+
+        elapsed = time.perf_counter() - clock
+        report.update({
+            'finished_at': timezone.now().isoformat(),
+            'duration_seconds': round(elapsed, 3),
+            'rows_per_second': round(report['checked'] / elapsed) if elapsed else None,
+            'invalid_count': len(report['invalid']),
+        })
+        logger.info(
+            f"Audit verification {self.app_label}: {report['checked']} rows, "
+            f"{report['invalid_count']} invalid in {elapsed:.1f}s"
+        )
+        return report
+
+    def _oldest_queued_entry(self) -> Optional[datetime]:
+        """Timestamp of the oldest audit entry not yet written by the outbox writer"""
+        from .outbox import AuditOutboxWriter, outbox_enabled
+
+        if not outbox_enabled(self.app_label):
+            return None
+        held_by = AuditOutboxWriter(self.app_label, self.db_alias).oldest_pending_timestamp()
+        if held_by is not None:
+            logger.info(f"Audit verification {self.app_label}: held before queued outbox entry at {held_by}")
+        return held_by
+
+    def _submit(self, chunk: List[dict]):
+        if self.pool is None:
+            return _ImmediateResult(verify_chunk(chunk))
+        return self.pool.submit(verify_chunk, chunk)
+
+    def _collect(self, item, report: dict, mark_invalid: bool, checkpoint: bool):
+        """Record one finished chunk (chunks complete in submission order)"""
+        future, meta = item
+        invalid_ids = future.result()
+
+        for log_id in invalid_ids:
+            row = meta['ids'][log_id]
+            report['invalid'].append({
+                'id': log_id,
+                'timestamp': row['timestamp'].isoformat(),
+                'username': row['username'],
+                'action': row['action'],
+                'model_name': row['model_name'],
+                'patient_id': row['patient_id'],
+            })
+            logger.error(f"INTEGRITY VIOLATION: {self.app_label} AuditLog {log_id} - checksum mismatch")
+
+        if invalid_ids and mark_invalid:
+            # Queryset update bypasses the immutable save()
+            self.AuditLog.objects.using(self.db_alias).filter(pk__in=invalid_ids).update(is_verified=False)
+
+        report['checked'] += meta['size']
+        report['valid'] += meta['size'] - len(invalid_ids)
+        report['chunks'] += 1
+        report['watermark_to'] = self._encode_position(meta['last'])
+
+        if checkpoint:
+            self.save_checkpoint(report['watermark_to'], report)
+
+    # ==========================================
+    # READ - keyset chunks joined with details
+    # ==========================================
+
+    def _iter_chunks(self, position, cutoff: datetime, since: Optional[datetime]):
+        """Chunks of log values (ascending timestamp, id) with their details attached"""
+        queryset = self.AuditLog.objects.using(self.db_alias).filter(timestamp__lt=cutoff).order_by()
+        if since is not None:
+            queryset = queryset.filter(timestamp__gte=since)
+
+        while True:
+            page = queryset
+            if position is not None:
+                timestamp, pk = position
+                page = page.filter(timestamp__gte=timestamp).filter(Q(timestamp__gt=timestamp) | Q(pk__gt=pk))
+
+            rows = list(page.order_by('timestamp', 'pk').values(*LOG_FIELDS)[:self.chunk_size])
+            if not rows:
+                return
+
+            details = {}
+            for log_id, field_name, old_value, new_value in (
+                self.AuditLogDetail.objects.using(self.db_alias)
+                .filter(audit_log_id__in=[row['id'] for row in rows])
+                .order_by()
+                .values_list('audit_log_id', 'field_name', 'old_value', 'new_value')
+            ):
+                details.setdefault(log_id, []).append((field_name, old_value, new_value))
+
+            for row in rows:
+                row['details'] = details.get(row['id'], [])
+
+            yield rows
+            position = (rows[-1]['timestamp'], rows[-1]['id'])
+
+    # ==========================================
+    # CHECKPOINT & REPORT
+    # ==========================================
+
+    @property
+    def checkpoint_path(self) -> Path:
+        return Path(settings.AUDIT_VERIFICATION_ROOT) / f'{self.app_label}.checkpoint.json'
+
+    def load_checkpoint(self) -> dict:
+        try:
+            return json.loads(self.checkpoint_path.read_text())
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logger.warning(f"Corrupt verification checkpoint {self.checkpoint_path} - starting from the beginning")
+            return {}
+
+    def save_checkpoint(self, watermark: str, report: dict):
+        """Atomically replace the study's checkpoint file"""
+        path = self.checkpoint_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps({
+            'study': self.app_label,
+            'database': self.db_alias,
+            'watermark': watermark,
+            'updated_at': timezone.now().isoformat(),
+            'last_run_started_at': report['started_at'],
+        }, indent=2))
+        os.replace(tmp, path)
+
+    def write_report(self, report: dict, path: Optional[str] = None) -> Path:
+        """Write the report as JSON (default: <root>/<study>_<started>.json)"""
+        if path is None:
+            stamp = report['started_at'][:19].replace(':', '').replace('-', '')
+            path = Path(settings.AUDIT_VERIFICATION_ROOT) / f'{self.app_label}_{stamp}.json'
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        return path
+
+    @staticmethod
+    def _encode_position(position) -> str:
+        timestamp, pk = position
+        return f'{timestamp.isoformat()}|{pk}'
+
+    @staticmethod
+    def _decode_position(watermark: Optional[str]):
+        if not watermark:
+            return None
+        timestamp, pk = watermark.rsplit('|', 1)
+        return datetime.fromisoformat(timestamp), int(pk)
+
+
+class _ImmediateResult:
+    """Future-like result for in-process verification (no pool)"""
+
+    def __init__(self, value):
+        self._value = value
+
+    def result(self):
+        return self._value
+
+
+def verify_studies(targets: Dict[str, str], workers: Optional[int] = None, **run_options) -> Dict[str, dict]:
+    """
+    Verify several studies concurrently over one shared process pool
+
+    Args:
+        targets: {app_label: db_alias}
+        workers: Pool size (default: CPU count)
+        run_options: Passed to AuditVerificationEngine.run()
+
+    Returns:
+        {app_label: report} - a study that failed has {'error': message}
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from django.db import connections
+
+    chunk_size = run_options.pop('chunk_size', DEFAULT_CHUNK_SIZE)
+
+    # Fork the workers before any study connection is opened
+    connections.close_all()
+
+    def verify(app_label, db_alias):
+        try:
+            engine = AuditVerificationEngine(app_label, db_alias, pool=pool, chunk_size=chunk_size)
+            report = engine.run(**run_options)
+            report['report_path'] = str(engine.write_report(report))
+            return report
+        except Exception as e:
+            logger.exception(f"Audit verification failed for {app_label}")
+            return {'study': app_label, 'database': db_alias, 'error': str(e)}
+        finally:
+            connections[db_alias].close()
+
+    with create_pool(workers) as pool, ThreadPoolExecutor(max_workers=len(targets) or 1) as readers:
+        futures = {app_label: readers.submit(verify, app_label, db_alias) for app_label, db_alias in targets.items()}
+        return {app_label: future.result() for app_label, future in futures.items()}
@@ -0,0 +1,262 @@
+# backends/studies/blind_index.py
+"""
+Blind Index - Searchable keyed hashes for encrypted PII fields
+===============================================================
+
+EncryptedCharField values are Fernet tokens with a random IV: the database
+cannot compare, search or group them. A blind index is a companion column
+holding HMAC-SHA256(BLIND_INDEX_KEY, normalized value), truncated:
+
+- exact index  (<FIELD>_BIDX):        equality lookups and GROUP BY
+- prefix index (<FIELD>_BIDX_PREFIX): HMAC of the first N normalized
+  characters - narrows "starts with" searches to a few candidates, which
+  are then verified after decryption
+
+Normalization makes lookups case/accent/format-insensitive:
+    phone: digits only, +84 → 0        '+84 903-123-456' → '0903123456'
+    text:  no accents, đ → d, lower     'Phường Bến Nghé' → 'phuong ben nghe'
+
+Columns are maintained by BlindIndexField.pre_save() on save() and
+bulk_create(). QuerySet.update() must pass blind_index_values(); for
+bulk_update() / raw SQL run `python manage.py rebuild_blind_indexes`
+afterwards (and after changing BLIND_INDEX_KEY).
+
+Usage:
+    class PERSONAL_DATA(models.Model):
+        PHONE = EncryptedCharField(...)
+        PHONE_BIDX = BlindIndexField(source='PHONE', kind=KIND_PHONE)
+        PHONE_BIDX_PREFIX = BlindIndexField(source='PHONE', kind=KIND_PHONE, prefix_length=6)
+
+    PERSONAL_DATA.objects.filter(blind_exact_q(PERSONAL_DATA, 'PHONE', '0903 123 456'))
+    FollowUpStatus.objects.filter(blind_search_q(FollowUpStatus, 'PHONE', '090312'))
+"""
+
+import hashlib
+import hmac
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Min, Q
+
+
+KIND_PHONE = 'phone'
+KIND_TEXT = 'text'
+
+# Hex characters kept from the HMAC (128 bits)
+DIGEST_LENGTH = 32
+
+_NON_DIGIT = re.compile(r'\D+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+# ==========================================
+# NORMALIZATION + HMAC
+# ==========================================
+
+def normalize(value, kind: str = KIND_TEXT) -> str:
+    """Canonical form hashed by the index ('' when there is nothing to index)"""
+    if value is None:
+        return ''
+    value = str(value)
+
+    if kind == KIND_PHONE:
+        digits = _NON_DIGIT.sub('', value)
+        # Vietnamese international prefix: 84xxxxxxxxx → 0xxxxxxxxx
+        if digits.startswith('84') and len(digits) >= 11:
+            digits = '0' + digits[2:]
+        return digits
+
+    value = value.replace('đ', 'd').replace('Đ', 'D')
+    value = unicodedata.normalize('NFKD', value)
+    value = ''.join(ch for ch in value if not unicodedata.combining(ch))
+    return _WHITESPACE.sub(' ', value).strip().casefold()
+
+
+@lru_cache(maxsize=1)
+def _hmac_key() -> bytes:
+    key = getattr(settings, 'BLIND_INDEX_KEY', None)
+    if key:
+        return key.encode('utf-8')
+    # Stable fallback derived from the same secrets as the encrypted fields
+    salt = f"{settings.SALT_KEY}:blind-index".encode('utf-8')
+    return hashlib.pbkdf2_hmac('sha256', settings.SECRET_KEY.encode('utf-8'), salt, 100_000)
+
+
+def blind_index(value, kind: str = KIND_TEXT, prefix_length: Optional[int] = None) -> Optional[str]:
+    """
+    Blind index of a plaintext value
+
+    Returns None for empty values, and for prefix indexes of values shorter
+    than prefix_length.
+    """
+    normalized = normalize(value, kind)
+    if not normalized:
+        return None
+    if prefix_length:
+        if len(normalized) < prefix_length:
+            return None
+        normalized = normalized[:prefix_length]
+
+    # kind + prefix length separate the domains (a 6-digit prefix never
+    # collides with a 6-digit full value)
+    message = f"{kind}:{prefix_length or 0}:{normalized}".encode('utf-8')
+    return hmac.new(_hmac_key(), message, hashlib.sha256).hexdigest()[:DIGEST_LENGTH]
+
+
+# ==========================================
+# MODEL FIELD
+# ==========================================
+
+class BlindIndexField(models.CharField):
+    """
+    Indexed CharField holding the blind index of another field
+
+    Computed in pre_save() from `source`; never edited by hand.
+    """
+
+    description = 'Blind index (keyed HMAC) of another field'
+
+    _DEFAULTS = {
+        'max_length': DIGEST_LENGTH,
+        'null': True,
+        'blank': True,
+        'editable': False,
+        'db_index': True,
+    }
+
+    def __init__(self, *args, source: str = None, kind: str = KIND_TEXT,
+                 prefix_length: Optional[int] = None, **kwargs):
+        self.source = source
+        self.kind = kind
+        self.prefix_length = prefix_length
+        for key, value in self._DEFAULTS.items():
+            kwargs.setdefault(key, value)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        for key, value in self._DEFAULTS.items():
+            if kwargs.get(key, value) == value:
+                kwargs.pop(key, None)
+        kwargs['source'] = self.source
+        kwargs['kind'] = self.kind
+        if self.prefix_length:
+            kwargs['prefix_length'] = self.prefix_length
+        return name, path, args, kwargs
+
+    def compute(self, model_instance) -> Optional[str]:
+        return blind_index(getattr(model_instance, self.source), self.kind, self.prefix_length)
+
+    def pre_save(self, model_instance, add):
+        value = self.compute(model_instance)
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+# ==========================================
+# LOOKUPS
+# ==========================================
+
+def get_blind_indexes(model) -> Dict[str, Dict[str, BlindIndexField]]:
+    """{source field: {'exact': field, 'prefix': field}} for a model"""
+    indexes = {}
+    for field in model._meta.concrete_fields:
+        if isinstance(field, BlindIndexField):
+            kind = 'prefix' if field.prefix_length else 'exact'
+            indexes.setdefault(field.source, {})[kind] = field
+    return indexes
+
+
+def blind_index_values(model, source: str, value) -> Dict[str, Optional[str]]:
+    """
+    {index field name: digest} for all indexes of `source`
+
+    For QuerySet.update(), which bypasses pre_save:
+        qs.update(PHONE=phone, **blind_index_values(FollowUpStatus, 'PHONE', phone))
+    """
+    return {
+        field.name: blind_index(value, field.kind, field.prefix_length)
+        for field in get_blind_indexes(model).get(source, {}).values()
+    }
+
+
+def _index_fields(model, source: str) -> Dict[str, BlindIndexField]:
+    fields = get_blind_indexes(model).get(source)
+    if not fields or 'exact' not in fields:
+        raise ValueError(f"{model.__name__}.{source} has no blind index")
+    return fields
+
+
+def blind_exact_q(model, source: str, value, path: str = '') -> Q:
+    """
+    Q for rows whose decrypted `source` equals `value` (after normalization)
+
+    Args:
+        model: Model holding the encrypted field
+        source: Encrypted field name (e.g. 'PHONE')
+        value: Plaintext to look up
+        path: Relation prefix when filtering another model,
+              e.g. 'personal_data__' from HH_CASE
+    """
+    field = _index_fields(model, source)['exact']
+    digest = blind_index(value, field.kind)
+    if digest is None:
+        return Q(pk__in=[])
+    return Q(**{f'{path}{field.name}': digest})
+
+
+def blind_search_q(model, source: str, query, path: str = '') -> Q:
+    """
+    Q for rows whose decrypted `source` starts with `query` (after normalization)
+
+    - query shorter than the prefix length: exact match only
+    - query of exactly the prefix length: prefix index only (no decryption)
+    - longer query: prefix index selects candidates, which are decrypted
+      and verified here (one indexed query, candidate rows only)
+    """
+    fields = _index_fields(model, source)
+    prefix_field = fields.get('prefix')
+    normalized = normalize(query, fields['exact'].kind)
+
+    if not normalized:
+        return Q(pk__in=[])
+
+    if prefix_field is None or len(normalized) < prefix_field.prefix_length:
+        return blind_exact_q(model, source, query, path)
+
+    prefix_digest = blind_index(normalized, prefix_field.kind, prefix_field.prefix_length)
+    if len(normalized) == prefix_field.prefix_length:
+        return Q(**{f'{path}{prefix_field.name}': prefix_digest})
+
+    candidates = model._default_manager.filter(**{prefix_field.name: prefix_digest})
+    matched = [
+        pk for pk, value in candidates.values_list('pk', source)
+        if normalize(value, prefix_field.kind).startswith(normalized)
+    ]
+    return Q(**{f'{path}pk__in': matched})
+
+
+def blind_group_labels(queryset, source: str) -> Dict[str, str]:
+    """
+    {exact blind index: decrypted value} for every group in the queryset
+
+    Decrypts one representative row per distinct value (not every row), so
+    GROUP BY <FIELD>_BIDX results can be labelled for display.
+    """
+    field = _index_fields(queryset.model, source)['exact']
+    representatives = (
+        queryset.exclude(**{f'{field.name}__isnull': True})
+        .values(field.name)
+        .annotate(representative=Min('pk'))
+        .order_by()
+    )
+    pks = {row['representative']: row[field.name] for row in representatives}
+    if not pks:
+        return {}
+
+    rows = queryset.model._default_manager.using(queryset.db).filter(pk__in=pks).values_list('pk', source)
+    return {pks[pk]: value for pk, value in rows}
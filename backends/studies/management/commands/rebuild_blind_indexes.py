@@ -0,0 +1,144 @@
+"""
+Management command to (re)compute blind indexes of encrypted fields.
+
+Usage:
+    python manage.py rebuild_blind_indexes --dry-run
+    python manage.py rebuild_blind_indexes
+    python manage.py rebuild_blind_indexes --model study_43en.FollowUpStatus
+
+Run it:
+- once after deploying the blind index columns (backfill)
+- after changing BLIND_INDEX_KEY
+- after bulk_update() / QuerySet.update() / raw SQL writes to encrypted fields
+
+This command:
+- Finds all models with BlindIndexField columns
+- Decrypts the source fields and recomputes the indexes in batches
+- Writes only rows whose index changed (bulk_update)
+"""
+
+import logging
+from typing import Any
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from backends.studies.blind_index import BlindIndexField
+
+logger = logging.getLogger("audit")
+
+
+class Command(BaseCommand):
+    help = "Recompute blind indexes (searchable HMAC columns) of encrypted fields"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count rows that would change without writing",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of records to process in each batch (default: 500)",
+        )
+        parser.add_argument(
+            "--model",
+            type=str,
+            help="Only process specific model (format: app_label.ModelName)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        dry_run = options["dry_run"]
+        batch_size = options["batch_size"]
+        target_model = options.get("model")
+
+        indexed_models = self._find_indexed_models(target_model)
+
+        if not indexed_models:
+            self.stdout.write(self.style.WARNING("No blind index fields found."))
+            return
+
+        total_changed = 0
+
+        for model, fields in indexed_models.items():
+            model_label = f"{model._meta.app_label}.{model.__name__}"
+            self.stdout.write(f"\nProcessing {model_label}...")
+            self.stdout.write(f"  Blind indexes: {', '.join(field.name for field in fields)}")
+
+            scanned, changed = self._process_model(model, fields, batch_size, dry_run)
+            total_changed += changed
+
+            prefix = "[DRY-RUN] Would update" if dry_run else "Updated"
+            self.stdout.write(
+                self.style.SUCCESS(f"  Scanned: {scanned}, {prefix}: {changed}")
+            )
+
+        self.stdout.write("\n" + "=" * 50)
+        if dry_run:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"DRY-RUN complete. {total_changed} row(s) would change."
+                )
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f"Blind indexes rebuilt. Rows updated: {total_changed}")
+            )
+            logger.info(
+                "Blind index rebuild completed",
+                extra={"updated": total_changed},
+            )
+
+    def _find_indexed_models(self, target_model: str | None) -> dict:
+        """Find all models that have blind index fields."""
+        indexed_models = {}
+
+        for model in apps.get_models():
+            if target_model:
+                model_label = f"{model._meta.app_label}.{model.__name__}"
+                if model_label.lower() != target_model.lower():
+                    continue
+
+            fields = [
+                field for field in model._meta.concrete_fields
+                if isinstance(field, BlindIndexField)
+            ]
+            if fields:
+                indexed_models[model] = fields
+
+        return indexed_models
+
+    def _process_model(self, model, fields: list, batch_size: int, dry_run: bool) -> tuple[int, int]:
+        """Recompute indexes in batches; write only changed rows."""
+        scanned = 0
+        changed = 0
+        pending = []
+        field_names = [field.name for field in fields]
+        sources = sorted({field.source for field in fields})
+
+        queryset = model.objects.only("pk", *sources, *field_names).order_by("pk")
+
+        for obj in queryset.iterator(chunk_size=batch_size):
+            scanned += 1
+            dirty = False
+            for field in fields:
+                value = field.compute(obj)
+                if getattr(obj, field.attname) != value:
+                    setattr(obj, field.attname, value)
+                    dirty = True
+
+            if dirty:
+                changed += 1
+                pending.append(obj)
+
+            if len(pending) >= batch_size:
+                if not dry_run:
+                    model.objects.bulk_update(pending, field_names)
+                pending = []
+
+        if pending and not dry_run:
+            model.objects.bulk_update(pending, field_names)
+
+        return scanned, changed
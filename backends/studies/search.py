@@ -0,0 +1,75 @@
+# backends/studies/search.py
+"""
+Trigram Search - Index-backed substring search for study list views
+====================================================================
+
+Search boxes match anywhere in a value ("contains", case-insensitive). On
+PostgreSQL Django compiles `field__icontains` to
+
+    UPPER("field"::text) LIKE UPPER('%query%')
+
+which a B-tree index cannot serve (leading wildcard). A pg_trgm GIN index
+on the same expression, UPPER("field") gin_trgm_ops, can: PostgreSQL
+extracts the query's trigrams, intersects the posting lists and only
+rechecks the candidate rows - so lookups stay fast as tables grow.
+
+- Indexes: trigram_index() in the model's Meta.indexes, created by the
+  study migration (pg_trgm extension + CREATE INDEX CONCURRENTLY). Study
+  tables live in the `data` schema, audit tables in `logging`; an index is
+  always created in its table's schema.
+- Lookups: search_q() builds the OR of icontains lookups the views filter
+  on. Queries shorter than MIN_TRIGRAM_LENGTH have no trigram to look up;
+  they still work, the other filters (site, date) then narrow the scan.
+
+Encrypted PII (PHONE, names) cannot be searched this way - combine with
+blind_index.blind_search_q().
+
+Usage:
+    class SCR_CASE(models.Model):
+        class Meta:
+            indexes = [trigram_index('USUBJID', 'idx_scr_usubjid_trgm')]
+
+    cases.filter(search_q(query, 'USUBJID', 'INITIAL'))
+    followups.filter(search_q(query, 'USUBJID', 'INITIAL') | blind_search_q(FollowUpStatus, 'PHONE', query))
+
+Benchmark: python manage.py benchmark_search --rows 100000
+"""
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models import Q
+from django.db.models.functions import Upper
+
+
+TRIGRAM_OPCLASS = 'gin_trgm_ops'
+
+# pg_trgm pads words to 3-character trigrams
+MIN_TRIGRAM_LENGTH = 3
+
+# Audit log search box (trigram-indexed in AuditLog Meta, audit_logs/models/base.py)
+AUDIT_SEARCH_FIELDS = ('username', 'patient_id', 'reason', 'model_name')
+
+
+def trigram_index(field: str, name: str) -> GinIndex:
+    """GIN trigram index matching field__icontains (UPPER(field) gin_trgm_ops)"""
+    return GinIndex(OpClass(Upper(field), name=TRIGRAM_OPCLASS), name=name)
+
+
+def search_q(query: str, *fields: str) -> Q:
+    """
+    Case-insensitive substring match on any of the fields
+
+    Returns an empty Q() (no filter) for a blank query.
+    """
+    query = (query or '').strip()
+    if not query:
+        return Q()
+
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f'{field}__icontains': query})
+    return condition
+
+
+def is_indexable(query: str) -> bool:
+    """True when the query is long enough to use trigram indexes"""
+    return len((query or '').strip()) >= MIN_TRIGRAM_LENGTH
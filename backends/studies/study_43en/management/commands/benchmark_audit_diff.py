@@ -0,0 +1,182 @@
+# backends/studies/study_43en/management/commands/benchmark_audit_diff.py
+"""
+Benchmark change detection of the laboratory formset (audit processors)
+
+Binds LaboratoryTestFormSet to --rows existing LaboratoryTest rows (POST data
+built from the rows, every --change-every'th performed result edited) and
+times the two audit steps of ComplexAuditProcessor:
+
+- capture: old data of the formset rows
+- detect:  changes of every form
+
+once with the previous per-instance path (model_to_dict, extract_new_data,
+detect_changes) and once with the compiled DiffPlan, and checks both find
+exactly the same changes. Both paths share _get_formset_display_name, so
+"detect" is the diff itself. Read-only - nothing is saved.
+
+Usage:
+    python manage.py benchmark_audit_diff
+    python manage.py benchmark_audit_diff --rows 300 --iterations 20
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backends.audit_logs.utils.processors import ComplexAuditProcessor, filter_metadata_fields
+from backends.studies.study_43en.forms.patient.CLI_laboratory import LaboratoryTestFormSet
+from backends.studies.study_43en.models.patient import LaboratoryTest
+from backends.tenancy.db_router import tenant_db
+
+# Database alias for study_43en
+DB_ALIAS = 'db_study_43en'
+
+FORMSET_NAME = 'laboratory_tests'
+PREFIX = 'labtest'
+
+
+class Command(BaseCommand):
+    help = 'Đo thời gian phát hiện thay đổi của formset xét nghiệm (cũ vs DiffPlan)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=300,
+            help='Số dòng LaboratoryTest trong formset (mặc định: 300)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=10,
+            help='Số lần chạy mỗi bước, lấy trung vị (mặc định: 10)',
+        )
+        parser.add_argument(
+            '--change-every',
+            type=int,
+            default=20,
+            help='Sửa kết quả của 1/N xét nghiệm đã thực hiện (mặc định: 20)',
+        )
+
+    def handle(self, *args, **options):
+        with tenant_db(DB_ALIAS):
+            pks = list(
+                LaboratoryTest.objects.order_by('pk').values_list('pk', flat=True)[:options['rows']]
+            )
+            if len(pks) < options['rows']:
+                raise CommandError(f"{DB_ALIAS} has only {len(pks)} LaboratoryTest rows (--rows {options['rows']})")
+
+            queryset = LaboratoryTest.objects.filter(pk__in=pks).order_by('CATEGORY', 'TESTTYPE')
+            data, edited = self._post_data(queryset, options['change_every'])
+
+            formset = LaboratoryTestFormSet(data, queryset=queryset, prefix=PREFIX)
+            if not formset.is_valid():
+                raise CommandError(f'Formset not valid: {formset.errors} {formset.non_form_errors()}')
+
+            self.stdout.write(
+                f"🚀 {len(pks)} dòng xét nghiệm, {edited} kết quả đã sửa, {options['iterations']} lần/bước..."
+            )
+
+            processor = ComplexAuditProcessor()
+            timings = {'legacy': ([], []), 'compiled': ([], [])}
+            results = {}
+
+            for _ in range(options['iterations']):
+                for label, capture, detect in (
+                    ('legacy', self._legacy_capture, self._legacy_detect),
+                    ('compiled', processor._capture_formset_old_data, processor._detect_formset_changes),
+                ):
+                    started = time.perf_counter()
+                    old_data = capture(FORMSET_NAME, {'queryset': queryset.all()})
+                    captured = time.perf_counter()
+                    changes = detect(FORMSET_NAME, formset, old_data)
+                    finished = time.perf_counter()
+
+                    timings[label][0].append((captured - started) * 1000)
+                    timings[label][1].append((finished - captured) * 1000)
+                    results[label] = changes
+
+        if results['legacy'] != results['compiled']:
+            raise CommandError(
+                f"Compiled plan found {len(results['compiled'])} changes, legacy path {len(results['legacy'])}"
+            )
+
+        self.stdout.write('\n' + '=' * 60)
+        self.stdout.write(f"  {'Step':<10} {'Legacy':>12} {'DiffPlan':>12} {'Speedup':>9}")
+        self.stdout.write('-' * 60)
+        for index, step in enumerate(('capture', 'detect')):
+            slow = statistics.median(timings['legacy'][index])
+            fast = statistics.median(timings['compiled'][index])
+            self.stdout.write(f"  {step:<10} {slow:>9.2f} ms {fast:>9.2f} ms {slow / max(fast, 0.001):>8.1f}x")
+        self.stdout.write('=' * 60)
+        self.stdout.write(f"  {len(results['compiled'])} thay đổi - giống nhau ở cả hai cách")
+        self.stdout.write(self.style.SUCCESS('✅ Hoàn thành!'))
+
+    @staticmethod
+    def _post_data(queryset, change_every: int):
+        """POST data of the formset as the lab page submits it, with some results edited"""
+        tests = list(queryset)
+        data = {
+            f'{PREFIX}-TOTAL_FORMS': str(len(tests)),
+            f'{PREFIX}-INITIAL_FORMS': str(len(tests)),
+            f'{PREFIX}-MIN_NUM_FORMS': '0',
+            f'{PREFIX}-MAX_NUM_FORMS': '1000',
+        }
+
+        edited = performed = 0
+        for i, test in enumerate(tests):
+            data[f'{PREFIX}-{i}-id'] = str(test.pk)
+            if not test.PERFORMED:
+                continue
+
+            performed += 1
+            result = test.RESULT or ''
+            if change_every and performed % change_every == 0:
+                result = f'{result} (bench)'.strip()
+                edited += 1
+
+            data[f'{PREFIX}-{i}-PERFORMED'] = 'on'
+            data[f'{PREFIX}-{i}-PERFORMEDDATE'] = test.PERFORMEDDATE.strftime('%d/%m/%Y') if test.PERFORMEDDATE else ''
+            data[f'{PREFIX}-{i}-RESULT'] = result
+
+        return data, edited
+
+    # ==========================================
+    # PREVIOUS PER-INSTANCE PATH (reference)
+    # ==========================================
+
+    @staticmethod
+    def _legacy_capture(name, config):
+        processor = ComplexAuditProcessor()
+        return {
+            obj.pk: filter_metadata_fields(processor.detector.extract_old_data(obj))
+            for obj in config['queryset']
+        }
+
+    @staticmethod
+    def _legacy_detect(name, formset, formset_old_data):
+        processor = ComplexAuditProcessor()
+        detector = processor.detector
+        changes = []
+
+        for form in formset.forms:
+            if not form.cleaned_data:
+                continue
+
+            instance = form.instance
+            if instance.pk and instance.pk in formset_old_data:
+                old_data = formset_old_data[instance.pk]
+                new_data = filter_metadata_fields(detector.extract_new_data(form))
+                old_data_filtered = {k: v for k, v in old_data.items() if k in new_data}
+
+                form_changes = detector.detect_changes(old_data_filtered, new_data)
+                for change in form_changes:
+                    change['field'] = f"{name}_{instance.pk}_{change['field']}"
+                    display_name = processor._get_formset_display_name(instance, change['field'])
+                    if display_name:
+                        change['display_name'] = display_name
+
+                changes.extend(form_changes)
+
+        return changes
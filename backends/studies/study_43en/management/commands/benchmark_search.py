@@ -0,0 +1,154 @@
+# backends/studies/study_43en/management/commands/benchmark_search.py
+"""
+Benchmark audit log search with and without trigram indexes
+
+Loads synthetic audit rows into a TEMP copy of logging.audit_log, runs the
+audit_log view's search query (page + count) for a few terms, adds the same
+UPPER(col) gin_trgm_ops indexes as AuditLog Meta and runs it again.
+Everything happens in one transaction that is rolled back - nothing is
+written to the real tables.
+
+PostgreSQL only (pg_trgm must be installable, see migration 0005).
+
+Usage:
+    python manage.py benchmark_search
+    python manage.py benchmark_search --rows 100000 --iterations 10
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from backends.studies.search import AUDIT_SEARCH_FIELDS, TRIGRAM_OPCLASS, search_q
+from backends.studies.study_43en.models import AuditLog
+
+# Database alias for study_43en
+DB_ALIAS = 'db_study_43en'
+
+BENCH_TABLE = 'bench_audit_log'
+
+PAGE_SIZE = 25
+
+# (label, term) - typical searches typed in the audit log search box
+SEARCH_TERMS = [
+    ('patient id', '003-A-0123'),
+    ('username', 'minh'),
+    ('model', 'microbio'),
+    ('reason', 'yêu cầu'),
+    ('rare', 'a1b2c'),
+]
+
+SEED_SQL = f"""
+    INSERT INTO "{BENCH_TABLE}" (
+        user_id, username, timestamp, action, model_name, patient_id,
+        "SITEID", reason, checksum, is_verified
+    )
+    SELECT
+        i % 40 + 1,
+        (ARRAY['lan.nguyen', 'minh.tran', 'hoa.le', 'tuan.pham', 'thu.vo'])[i % 5 + 1] || (i % 40),
+        now() - make_interval(mins => i),
+        (ARRAY['CREATE', 'UPDATE', 'VIEW'])[i % 3 + 1],
+        (ARRAY['SCR_CASE', 'ENR_CASE', 'CLI_CASE', 'LAB_MICROBIOLOGY', 'FU_CASE_28', 'DISCH_CASE'])[i % 6 + 1],
+        (ARRAY['003', '011', '020'])[i % 3 + 1] || '-A-' || lpad(((i / 7) % 2000)::text, 4, '0'),
+        (ARRAY['003', '011', '020'])[i % 3 + 1],
+        'Cập nhật theo yêu cầu ' || md5(i::text),
+        md5(i::text) || md5((i + 1)::text),
+        true
+    FROM generate_series(1, %s) AS i
+"""
+
+
+class Command(BaseCommand):
+    help = 'Đo thời gian tìm kiếm audit log (không index vs trigram index)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=100000,
+            help='Số dòng audit log giả lập (mặc định: 100000)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=5,
+            help='Số lần chạy mỗi truy vấn, lấy trung vị (mặc định: 5)',
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[DB_ALIAS]
+        if connection.vendor != 'postgresql':
+            raise CommandError(f'{DB_ALIAS} is {connection.vendor} - trigram search needs PostgreSQL')
+
+        rows, iterations = options['rows'], options['iterations']
+        self.stdout.write(f'🚀 {rows} dòng audit log giả lập, {iterations} lần/truy vấn...')
+
+        with transaction.atomic(using=DB_ALIAS), connection.cursor() as cursor:
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            cursor.execute(
+                f'CREATE TEMP TABLE "{BENCH_TABLE}" '
+                f'(LIKE "logging"."audit_log" INCLUDING DEFAULTS) ON COMMIT DROP'
+            )
+            cursor.execute(SEED_SQL, [rows])
+            cursor.execute(f'CREATE INDEX ON "{BENCH_TABLE}" (timestamp DESC)')
+            cursor.execute(f'ANALYZE "{BENCH_TABLE}"')
+
+            before = self._run_terms(cursor, iterations)
+
+            for field in AUDIT_SEARCH_FIELDS:
+                cursor.execute(
+                    f'CREATE INDEX ON "{BENCH_TABLE}" USING gin ((UPPER("{field}")) {TRIGRAM_OPCLASS})'
+                )
+            cursor.execute(f'ANALYZE "{BENCH_TABLE}"')
+
+            after = self._run_terms(cursor, iterations)
+
+            transaction.set_rollback(True, using=DB_ALIAS)
+
+        self.stdout.write('\n' + '=' * 72)
+        self.stdout.write(f"  {'Term':<24} {'Matches':>8} {'No index':>12} {'Trigram':>12} {'Speedup':>9}")
+        self.stdout.write('-' * 72)
+        for label, term in SEARCH_TERMS:
+            matches, slow = before[term]
+            _, fast = after[term]
+            self.stdout.write(
+                f"  {f'{label} ({term})':<24} {matches:>8} {slow:>9.1f} ms {fast:>9.1f} ms {slow / max(fast, 0.001):>8.1f}x"
+            )
+        self.stdout.write('=' * 72)
+        self.stdout.write(self.style.SUCCESS('✅ Hoàn thành! (dữ liệu giả lập đã được rollback)'))
+
+    def _run_terms(self, cursor, iterations: int) -> dict:
+        """{term: (matches, median ms for page + count)}"""
+        results = {}
+        for _, term in SEARCH_TERMS:
+            page_sql, count_sql, params = self._search_sql(term)
+
+            timings = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                cursor.execute(page_sql, params)
+                cursor.fetchall()
+                cursor.execute(count_sql, params)
+                matches = cursor.fetchone()[0]
+                timings.append((time.perf_counter() - started) * 1000)
+
+            results[term] = (matches, statistics.median(timings))
+        return results
+
+    @staticmethod
+    def _search_sql(term: str):
+        """The audit_log view's page and count SQL, pointed at the bench table"""
+        qs = AuditLog.objects.using(DB_ALIAS).filter(search_q(term, *AUDIT_SEARCH_FIELDS)).order_by('-timestamp')
+
+        page_sql, params = qs[:PAGE_SIZE].query.sql_with_params()
+        count_sql, _ = qs.values('pk').order_by().query.sql_with_params()
+        count_sql = f'SELECT COUNT(*) FROM ({count_sql}) AS matched'
+
+        real_table = '"logging"."audit_log"'
+        return (
+            page_sql.replace(real_table, f'"{BENCH_TABLE}"'),
+            count_sql.replace(real_table, f'"{BENCH_TABLE}"'),
+            params,
+        )
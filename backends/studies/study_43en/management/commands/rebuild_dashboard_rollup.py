@@ -0,0 +1,46 @@
+# backends/studies/study_43en/management/commands/rebuild_dashboard_rollup.py
+"""
+Rebuild SiteMonthlyRollup from the CRF tables
+
+The rollup is kept up to date by signals; run this after bulk imports,
+raw SQL fixes, or when deploying the rollup table for the first time.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from backends.studies.study_43en.services.rollup_service import (
+    DashboardRollupService, ROLLUP_SOURCES, DB_ALIAS
+)
+
+
+class Command(BaseCommand):
+    help = 'Tính lại bảng tổng hợp dashboard theo site/tháng (SiteMonthlyRollup)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source',
+            action='append',
+            choices=[source.model_name for source in ROLLUP_SOURCES],
+            help='Chỉ tính lại cho bảng nguồn này (có thể lặp lại)',
+        )
+
+    def handle(self, *args, **options):
+        sources = ROLLUP_SOURCES
+        if options.get('source'):
+            sources = [source for source in ROLLUP_SOURCES if source.model_name in options['source']]
+
+        self.stdout.write('🚀 Bắt đầu tính lại bảng tổng hợp dashboard...')
+        started = time.perf_counter()
+
+        written = DashboardRollupService(using=DB_ALIAS).rebuild(sources)
+
+        for source in sources:
+            for metric in source.metrics:
+                self.stdout.write(f'  {source.model_name} → {metric}: {written.get(metric, 0)} dòng')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Hoàn thành! {sum(written.values())} dòng trong '
+            f'{(time.perf_counter() - started) * 1000:.1f} ms'
+        ))
@@ -0,0 +1,44 @@
+# backends/studies/study_43en/management/commands/rebuild_subject_progress.py
+"""
+Rebuild PatientProgress / ContactProgress from the CRF tables
+
+The progress tables are kept up to date by signals; run this after bulk
+imports, raw SQL fixes, or when deploying the progress tables for the
+first time.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from backends.studies.study_43en.services.progress_service import (
+    SubjectProgressService, PROGRESS_SPECS, DB_ALIAS
+)
+
+
+class Command(BaseCommand):
+    help = 'Tính lại bảng tiến độ CRF theo đối tượng (PatientProgress / ContactProgress)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--kind',
+            action='append',
+            choices=list(PROGRESS_SPECS),
+            help='Chỉ tính lại cho loại đối tượng này (có thể lặp lại)',
+        )
+
+    def handle(self, *args, **options):
+        kinds = options.get('kind') or list(PROGRESS_SPECS)
+
+        self.stdout.write('🚀 Bắt đầu tính lại bảng tiến độ đối tượng...')
+        started = time.perf_counter()
+
+        written = SubjectProgressService(using=DB_ALIAS).rebuild(kinds)
+
+        for kind in kinds:
+            self.stdout.write(f'  {kind}: {written.get(kind, 0)} dòng')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Hoàn thành! {sum(written.values())} dòng trong '
+            f'{(time.perf_counter() - started) * 1000:.1f} ms'
+        ))
@@ -6,8 +6,13 @@ Flow:
 1. Get all enrolled patients (ENR_CASE) and contacts (ENR_CONTACT)
 2. For each, find matching ENROLLMENT_DATE in ExpectedCalendar
 3. Create/update ExpectedDates and ContactExpectedDates records
+
+--bulk: load the calendar once and write only changed rows in batches
+        (ScheduleSyncService); --dry-run prints the diff without writing
 """
 
+import time
+
 from django.core.management.base import BaseCommand
 from datetime import date
 
@@ -16,6 +21,9 @@ from backends.studies.study_43en.models.contact import ENR_CONTACT
 from backends.studies.study_43en.models.schedule import (
     ExpectedDates, ContactExpectedDates, ExpectedCalendar
 )
+from backends.studies.study_43en.services.schedule_sync_service import (
+    ScheduleSyncService, DEFAULT_BATCH_SIZE
+)
 
 STUDY_DATABASE = 'db_study_43en'
 
@@ -29,10 +37,31 @@ class Command(BaseCommand):
             action='store_true',
             help='Delete all existing ExpectedDates and ContactExpectedDates before syncing',
         )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Bulk mode: preload calendar, diff in memory, write changed rows in batches',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would change without writing (implies --bulk)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Rows per batch in bulk mode (default: {DEFAULT_BATCH_SIZE})',
+        )
 
     def handle(self, *args, **options):
         self.stdout.write('🚀 Bắt đầu đồng bộ Expected Dates...')
         
+        if options['bulk'] or options['dry_run']:
+            return self._handle_bulk(options)
+        
+        started = time.perf_counter()
+        
         if options.get('reset', False):
             deleted_patient = ExpectedDates.objects.using(STUDY_DATABASE).all().delete()
             deleted_contact = ContactExpectedDates.objects.using(STUDY_DATABASE).all().delete()
@@ -47,6 +76,45 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(
             f'✅ Hoàn thành! Đã đồng bộ {patient_count} bệnh nhân và {contact_count} người tiếp xúc'
         ))
+        self.stdout.write(f'⏱️  {(time.perf_counter() - started) * 1000:.1f} ms')
+
+    def _handle_bulk(self, options):
+        """Bulk rebuild via ScheduleSyncService"""
+        dry_run = options['dry_run']
+        service = ScheduleSyncService(using=STUDY_DATABASE, batch_size=options['batch_size'])
+        
+        if options.get('reset', False):
+            if dry_run:
+                self.stdout.write(self.style.WARNING('--reset bị bỏ qua khi --dry-run'))
+            else:
+                with service.timed('reset'):
+                    deleted_patient = ExpectedDates.objects.using(STUDY_DATABASE).all().delete()
+                    deleted_contact = ContactExpectedDates.objects.using(STUDY_DATABASE).all().delete()
+                self.stdout.write(f'🗑️  Đã xóa {deleted_patient[0]} ExpectedDates và {deleted_contact[0]} ContactExpectedDates')
+        
+        plans = [service.plan_expected_dates(), service.plan_contact_expected_dates()]
+        
+        for plan in plans:
+            self.stdout.write(f'  📋 {plan.summary()}')
+            for warning in plan.warnings[:10]:
+                self.stdout.write(self.style.WARNING(f'   {warning}'))
+            if len(plan.warnings) > 10:
+                self.stdout.write(self.style.WARNING(f'   ... và {len(plan.warnings) - 10} cảnh báo khác'))
+        
+        if dry_run:
+            for plan in plans:
+                for line in plan.describe():
+                    self.stdout.write(f'     {line}')
+            self.stdout.write(self.style.WARNING('🔍 Dry run - không ghi thay đổi nào'))
+        else:
+            service.apply(plans)
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ Hoàn thành! Đã ghi {sum(len(plan.rows) for plan in plans)} bản ghi thay đổi'
+            ))
+        
+        self.stdout.write('⏱️  Thời gian:')
+        for line in service.format_timings():
+            self.stdout.write(f'     {line}')
 
     def _sync_patient_expected_dates(self):
         """Sync ExpectedDates from ENR_CASE"""
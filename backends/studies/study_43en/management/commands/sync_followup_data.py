@@ -1,13 +1,19 @@
 # management/commands/sync_followup_status.py
 
+import time
+
 from django.core.management.base import BaseCommand
 from django.db.models import Q
-from datetime import datetime, timedelta
+from datetime import timedelta
 from backends.studies.study_43en.models.schedule import (
     FollowUpStatus, ExpectedDates, ContactExpectedDates,
 )
 from backends.studies.study_43en.models.patient import SCR_CASE, ENR_CASE,FU_CASE_28, FU_CASE_90
 from backends.studies.study_43en.models.contact import ENR_CONTACT, FU_CONTACT_28, FU_CONTACT_90
+from backends.studies.study_43en.services.followup_status_service import FollowUpStatusService
+from backends.studies.study_43en.services.schedule_sync_service import (
+    ScheduleSyncService, DEFAULT_BATCH_SIZE
+)
 
 
 class Command(BaseCommand):
@@ -16,11 +22,19 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('--reset', action='store_true', help='Xóa tất cả bản ghi FollowUpStatus trước khi đồng bộ')
         parser.add_argument('--force-initial', action='store_true', help='Cập nhật lại trường INITIAL cho tất cả bản ghi')
+        parser.add_argument('--bulk', action='store_true', help='Chế độ bulk: tải dữ liệu nguồn một lần, chỉ ghi bản ghi thay đổi theo lô')
+        parser.add_argument('--dry-run', action='store_true', help='Chỉ hiển thị thay đổi, không ghi (bao gồm --bulk)')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Số bản ghi mỗi lô ở chế độ bulk')
 
     def handle(self, *args, **kwargs):
         reset = kwargs.get('reset', False)
         force_initial = kwargs.get('force_initial', False)
         
+        if kwargs.get('bulk') or kwargs.get('dry_run'):
+            return self._handle_bulk(kwargs)
+        
+        started = time.perf_counter()
+        
         if reset:
             self.stdout.write(self.style.WARNING('Đang xóa tất cả bản ghi FollowUpStatus...'))
             FollowUpStatus.objects.all().delete()
@@ -36,6 +50,54 @@ class Command(BaseCommand):
         self._update_status_based_on_date()
         
         self.stdout.write(self.style.SUCCESS('Đã hoàn thành đồng bộ dữ liệu'))
+        self.stdout.write(f'Thời gian: {(time.perf_counter() - started) * 1000:.1f} ms')
+
+    def _handle_bulk(self, options):
+        """Bulk rebuild via ScheduleSyncService (statuses are resolved while planning)"""
+        dry_run = options.get('dry_run', False)
+        service = ScheduleSyncService(using='db_study_43en', batch_size=options['batch_size'])
+        
+        if options.get('reset', False):
+            if dry_run:
+                self.stdout.write(self.style.WARNING('--reset bị bỏ qua khi --dry-run'))
+            else:
+                self.stdout.write(self.style.WARNING('Đang xóa tất cả bản ghi FollowUpStatus...'))
+                with service.timed('reset'):
+                    FollowUpStatus.objects.using('db_study_43en').all().delete()
+        
+        if options.get('force_initial', False) and not options.get('reset', False):
+            plans = [service.plan_initials()]
+        else:
+            plans = [service.plan_followups()]
+        
+        for plan in plans:
+            self.stdout.write(plan.summary())
+            for warning in plan.warnings[:10]:
+                self.stdout.write(self.style.WARNING(f'  {warning}'))
+            if len(plan.warnings) > 10:
+                self.stdout.write(self.style.WARNING(f'  ... và {len(plan.warnings) - 10} cảnh báo khác'))
+        
+        if dry_run:
+            for plan in plans:
+                for line in plan.describe():
+                    self.stdout.write(f'  {line}')
+            self.stdout.write(self.style.WARNING('Dry run - không ghi thay đổi nào'))
+        else:
+            service.apply(plans)
+            
+            # Rows not produced by the sync (e.g. orphaned) still follow today's rules
+            with service.timed('recompute status'):
+                transitions = service.status_service.recompute()
+            if transitions:
+                self.stdout.write(f'Trạng thái: {service.status_service.format_transitions(transitions)}')
+            
+            self.stdout.write(self.style.SUCCESS(
+                f'Đã hoàn thành đồng bộ dữ liệu ({sum(len(plan.rows) for plan in plans)} bản ghi thay đổi)'
+            ))
+        
+        self.stdout.write('Thời gian:')
+        for line in service.format_timings():
+            self.stdout.write(f'  {line}')
 
     def _sync_from_patients(self):
         """ UPDATED: Sync PHONE from ENR_CASE"""
@@ -168,8 +230,8 @@ class Command(BaseCommand):
             if ed.V2_EXPECTED_DATE:
                 try:
                     fu_case = FU_CONTACT_28.objects.using('db_study_43en').get(USUBJID=ed.USUBJID)
-                    actual_date = fu_case.EvaluateDate
-                    status = 'COMPLETED' if fu_case.EvaluatedAtDay28 == 'Yes' else 'MISSED'
+                    actual_date = fu_case.ASSESSDATE
+                    status = 'COMPLETED' if fu_case.ASSESSED == 'Yes' else 'MISSED'
                 except FU_CONTACT_28.DoesNotExist:
                     actual_date = None
                     status = 'UPCOMING'
@@ -195,8 +257,8 @@ class Command(BaseCommand):
             if ed.V3_EXPECTED_DATE:
                 try:
                     fu_case = FU_CONTACT_90.objects.using('db_study_43en').get(USUBJID=ed.USUBJID)
-                    actual_date = fu_case.EvaluateDate
-                    status = 'COMPLETED' if fu_case.EvaluatedAtDay90 == 'Yes' else 'MISSED'
+                    actual_date = fu_case.ASSESSDATE
+                    status = 'COMPLETED' if fu_case.ASSESSED == 'Yes' else 'MISSED'
                 except FU_CONTACT_90.DoesNotExist:
                     actual_date = None
                     status = 'UPCOMING'
@@ -224,26 +286,13 @@ class Command(BaseCommand):
         """Cập nhật trạng thái dựa trên ngày hiện tại"""
         self.stdout.write('Đang cập nhật trạng thái dựa trên ngày hiện tại...')
         
-        today = datetime.now().date()
-        
-        upcoming_to_late = FollowUpStatus.objects.using('db_study_43en').filter(
-            STATUS='UPCOMING',
-            EXPECTED_DATE__lte=today
-        )
-        
-        late_count = upcoming_to_late.count()
-        upcoming_to_late.update(STATUS='LATE')
-        
-        late_to_missed = FollowUpStatus.objects.using('db_study_43en').filter(
-            STATUS='LATE',
-            EXPECTED_TO__lt=today
-        )
+        transitions = FollowUpStatusService(auto_miss=True).recompute()
         
-        missed_count = late_to_missed.count()
-        late_to_missed.update(STATUS='MISSED')
+        for (source, target), count in sorted(transitions.items()):
+            self.stdout.write(f'  {source} → {target}: {count}')
         
         self.stdout.write(self.style.SUCCESS(
-            f'Đã cập nhật {late_count} lịch "sắp tới" thành "trễ" và {missed_count} lịch "trễ" thành "lỡ hẹn"'
+            f'Đã cập nhật {sum(transitions.values())} trạng thái theo dõi'
         ))
     
     def _update_initials(self):
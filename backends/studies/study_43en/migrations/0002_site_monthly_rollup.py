@@ -0,0 +1,33 @@
+# Generated by Django 5.1.15 on 2026-10-16 18:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('study_43en', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SiteMonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('SITEID', models.CharField(blank=True, default='', max_length=10, verbose_name='Site ID')),
+                ('MONTH', models.DateField(help_text='First day of month (1900-01-01 = undated records)', verbose_name='Month')),
+                ('METRIC', models.CharField(max_length=50, verbose_name='Metric')),
+                ('COUNT', models.PositiveIntegerField(default=0, verbose_name='Count')),
+                ('LAST_DATE', models.DateField(blank=True, help_text='Latest record date within the month', null=True, verbose_name='Last Date')),
+                ('UPDATED_AT', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+            ],
+            options={
+                'verbose_name': 'Site Monthly Rollup',
+                'verbose_name_plural': 'Site Monthly Rollups',
+                'db_table': 'site_monthly_rollup',
+                'ordering': ['METRIC', 'SITEID', 'MONTH'],
+                'indexes': [models.Index(fields=['METRIC', 'MONTH'], name='idx_rollup_metric_month')],
+                'unique_together': {('SITEID', 'MONTH', 'METRIC')},
+            },
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.1.15 on 2026-10-16 19:03
+
+import backends.studies.blind_index
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('study_43en', '0002_site_monthly_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='followupstatus',
+            name='PHONE_BIDX',
+            field=backends.studies.blind_index.BlindIndexField(kind='phone', source='PHONE'),
+        ),
+        migrations.AddField(
+            model_name='followupstatus',
+            name='PHONE_BIDX_PREFIX',
+            field=backends.studies.blind_index.BlindIndexField(kind='phone', prefix_length=6, source='PHONE'),
+        ),
+        migrations.AddField(
+            model_name='personal_contact_data',
+            name='FULLNAME_BIDX',
+            field=backends.studies.blind_index.BlindIndexField(kind='text', source='FULLNAME'),
+        ),
+        migrations.AddField(
+            model_name='personal_contact_data',
+            name='FULLNAME_BIDX_PREFIX',
+            field=backends.studies.blind_index.BlindIndexField(kind='text', prefix_length=3, source='FULLNAME'),
+        ),
+        migrations.AddField(
+            model_name='personal_contact_data',
+            name='PHONE_BIDX',
+            field=backends.studies.blind_index.BlindIndexField(kind='phone', source='PHONE'),
+        ),
+        migrations.AddField(
+            model_name='personal_contact_data',
+            name='PHONE_BIDX_PREFIX',
+            field=backends.studies.blind_index.BlindIndexField(kind='phone', prefix_length=6, source='PHONE'),
+        ),
+        migrations.AddField(
+            model_name='personal_data',
+            name='FULLNAME_BIDX',
+            field=backends.studies.blind_index.BlindIndexField(kind='text', source='FULLNAME'),
+        ),
+        migrations.AddField(
+            model_name='personal_data',
+            name='FULLNAME_BIDX_PREFIX',
+            field=backends.studies.blind_index.BlindIndexField(kind='text', prefix_length=3, source='FULLNAME'),
+        ),
+        migrations.AddField(
+            model_name='personal_data',
+            name='PHONE_BIDX',
+            field=backends.studies.blind_index.BlindIndexField(kind='phone', source='PHONE'),
+        ),
+        migrations.AddField(
+            model_name='personal_data',
+            name='PHONE_BIDX_PREFIX',
+            field=backends.studies.blind_index.BlindIndexField(kind='phone', prefix_length=6, source='PHONE'),
+        ),
+        migrations.AddField(
+            model_name='personal_data',
+            name='WARD_BIDX',
+            field=backends.studies.blind_index.BlindIndexField(kind='text', source='WARD'),
+        ),
+        migrations.AddField(
+            model_name='personal_data',
+            name='WARD_NEW_BIDX',
+            field=backends.studies.blind_index.BlindIndexField(kind='text', source='WARD_NEW'),
+        ),
+    ]
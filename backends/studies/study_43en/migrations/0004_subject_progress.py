@@ -0,0 +1,61 @@
+# Generated by Django 5.1.15 on 2026-10-16 19:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('study_43en', '0003_blind_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactProgress',
+            fields=[
+                ('HAS_ENROLLMENT', models.BooleanField(default=False, verbose_name='Enrolled')),
+                ('ENRDATE', models.DateField(blank=True, null=True, verbose_name='Enrollment Date')),
+                ('IS_DECEASED', models.BooleanField(default=False, verbose_name='Deceased')),
+                ('CRF_COUNT', models.PositiveSmallIntegerField(default=0, help_text='Number of tracked CRFs entered (progress sort key)', verbose_name='CRFs Entered')),
+                ('PROCESS_STATUS', models.CharField(choices=[('not_enrolled', 'Not Enrolled'), ('ongoing', 'Ongoing'), ('completed', 'Study Completed')], default='not_enrolled', max_length=20, verbose_name='Study Process')),
+                ('UPDATED_AT', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('SCRID', models.OneToOneField(db_column='SCRID', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='progress', serialize=False, to='study_43en.scr_contact', verbose_name='Screening ID')),
+                ('HAS_ENDCASE', models.BooleanField(default=False, verbose_name='End Case')),
+                ('HAS_FU28', models.BooleanField(default=False, verbose_name='Follow-up Day 28')),
+                ('HAS_FU90', models.BooleanField(default=False, verbose_name='Follow-up Day 90')),
+                ('HAS_SAMPLE', models.BooleanField(default=False, verbose_name='Sample')),
+            ],
+            options={
+                'verbose_name': 'Contact Progress',
+                'verbose_name_plural': 'Contact Progress',
+                'db_table': 'contact_progress',
+                'indexes': [models.Index(fields=['PROCESS_STATUS'], name='idx_cprog_status'), models.Index(fields=['CRF_COUNT'], name='idx_cprog_crf_count'), models.Index(fields=['ENRDATE'], name='idx_cprog_enrdate')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PatientProgress',
+            fields=[
+                ('HAS_ENROLLMENT', models.BooleanField(default=False, verbose_name='Enrolled')),
+                ('ENRDATE', models.DateField(blank=True, null=True, verbose_name='Enrollment Date')),
+                ('IS_DECEASED', models.BooleanField(default=False, verbose_name='Deceased')),
+                ('CRF_COUNT', models.PositiveSmallIntegerField(default=0, help_text='Number of tracked CRFs entered (progress sort key)', verbose_name='CRFs Entered')),
+                ('PROCESS_STATUS', models.CharField(choices=[('not_enrolled', 'Not Enrolled'), ('ongoing', 'Ongoing'), ('completed', 'Study Completed')], default='not_enrolled', max_length=20, verbose_name='Study Process')),
+                ('UPDATED_AT', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('SCRID', models.OneToOneField(db_column='SCRID', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='progress', serialize=False, to='study_43en.scr_case', verbose_name='Screening ID')),
+                ('HAS_CLI', models.BooleanField(default=False, verbose_name='Clinical')),
+                ('HAS_DISCH', models.BooleanField(default=False, verbose_name='Discharge')),
+                ('HAS_ENDCASE', models.BooleanField(default=False, verbose_name='End Case')),
+                ('HAS_FU28', models.BooleanField(default=False, verbose_name='Follow-up Day 28')),
+                ('HAS_FU90', models.BooleanField(default=False, verbose_name='Follow-up Day 90')),
+                ('HAS_SAMPLE', models.BooleanField(default=False, verbose_name='Sample')),
+                ('HAS_LAB', models.BooleanField(default=False, verbose_name='Laboratory Test')),
+            ],
+            options={
+                'verbose_name': 'Patient Progress',
+                'verbose_name_plural': 'Patient Progress',
+                'db_table': 'patient_progress',
+                'indexes': [models.Index(fields=['PROCESS_STATUS', 'IS_DECEASED'], name='idx_pprog_status'), models.Index(fields=['CRF_COUNT'], name='idx_pprog_crf_count'), models.Index(fields=['ENRDATE'], name='idx_pprog_enrdate')],
+            },
+        ),
+    ]
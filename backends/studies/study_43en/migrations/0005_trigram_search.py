@@ -0,0 +1,60 @@
+# Generated by Django 5.1.15 on 2026-10-16 19:28
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('study_43en', '0004_subject_progress'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='auditlog',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('username'), name='gin_trgm_ops'), name='s43_audit_log_user_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='auditlog',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('patient_id'), name='gin_trgm_ops'), name='s43_audit_log_patient_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='auditlog',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('reason'), name='gin_trgm_ops'), name='s43_audit_log_reason_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='auditlog',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('model_name'), name='gin_trgm_ops'), name='s43_audit_log_model_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='followupstatus',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('USUBJID'), name='gin_trgm_ops'), name='idx_fus_usubjid_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='followupstatus',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('INITIAL'), name='gin_trgm_ops'), name='idx_fus_initial_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='scr_case',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('USUBJID'), name='gin_trgm_ops'), name='idx_scr_usubjid_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='scr_case',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('INITIAL'), name='gin_trgm_ops'), name='idx_scr_initial_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='scr_contact',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('USUBJID'), name='gin_trgm_ops'), name='idx_csc_usubjid_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='scr_contact',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('INITIAL'), name='gin_trgm_ops'), name='idx_csc_initial_trgm'),
+        ),
+    ]
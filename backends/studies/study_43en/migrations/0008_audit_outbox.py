@@ -0,0 +1,32 @@
+# Generated by Django 5.1.15 on 2026-10-16 19:41
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('study_43en', '0007_audit_hash_chain'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditOutbox',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('payload', models.JSONField(help_text='Audit entry fields, details and checksum data')),
+                ('attempts', models.PositiveIntegerField(default=0, help_text='Failed drain attempts')),
+                ('last_error', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'verbose_name': 'Audit Outbox Entry',
+                'verbose_name_plural': 'Audit Outbox',
+                'db_table': 'logging"."audit_outbox',
+                'db_table_comment': 'Audit records waiting to be written to audit_log',
+                'ordering': ['id'],
+                'default_permissions': ('view',),
+            },
+        ),
+    ]
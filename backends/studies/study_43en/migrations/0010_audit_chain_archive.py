@@ -0,0 +1,37 @@
+# Generated by Django 5.1.15 on 2026-10-16 20:03
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('study_43en', '0009_audit_log_partitioning'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditChainArchive',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('partition', models.CharField(help_text='Dropped partition (e.g. audit_log_y2024m01)', max_length=63)),
+                ('first_seq', models.BigIntegerField()),
+                ('last_seq', models.BigIntegerField()),
+                ('seq_ranges', models.JSONField(help_text='Archived seq numbers as [first, last] runs')),
+                ('entries', models.BigIntegerField(help_text='Chained entries in the archive file')),
+                ('file', models.CharField(help_text='Archive file, relative to AUDIT_ARCHIVE_ROOT (absolute when archived elsewhere)', max_length=255)),
+                ('sha256', models.CharField(max_length=64)),
+                ('signature', models.CharField(help_text='HMAC over partition, seq ranges, entries and file hash', max_length=64)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Audit Chain Archive',
+                'verbose_name_plural': 'Audit Chain Archives',
+                'db_table': 'logging"."audit_chain_archive',
+                'db_table_comment': 'Chained audit entries moved to archive files',
+                'ordering': ['first_seq'],
+                'default_permissions': ('view',),
+            },
+        ),
+    ]
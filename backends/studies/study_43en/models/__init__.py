@@ -3,15 +3,23 @@
 Main models package for study_43en
 Import all model subpackages for Django registry
 
-AuditLog and AuditLogDetail are created via factory function from audit_logs.
+AuditLog, AuditLogDetail, AuditLogUser, AuditOutbox and the hash chain models are created via
+factory function from audit_logs.
 This ensures makemigrations study_43en includes audit tables.
 """
 
 # ==========================================
 # AUDIT LOG MODELS (Created via factory)
 # ==========================================
-from backends.audit_logs.models.base import create_audit_models
+from backends.audit_logs.models.base import (
+    create_audit_models, get_audit_user_model, get_audit_chain_models,
+    get_audit_outbox_model, get_audit_chain_archive_model,
+)
 AuditLog, AuditLogDetail = create_audit_models('study_43en')
+AuditLogUser = get_audit_user_model('study_43en')
+AuditChainHead, AuditChainCheckpoint = get_audit_chain_models('study_43en')
+AuditOutbox = get_audit_outbox_model('study_43en')
+AuditChainArchive = get_audit_chain_archive_model('study_43en')
 
 
 # ==========================================
@@ -30,6 +38,8 @@ from .contact import *
 
 # Import standalone models
 from .schedule import *
+from .rollup import SiteMonthlyRollup
+from .progress import ProcessStatus, PatientProgress, ContactProgress
 
 
 # ==========================================
@@ -41,6 +51,11 @@ __all__ = [
     # ==========================================
     'AuditLog',
     'AuditLogDetail',
+    'AuditLogUser',
+    'AuditChainHead',
+    'AuditChainCheckpoint',
+    'AuditOutbox',
+    'AuditChainArchive',
     
     # ==========================================
     # BASE MODELS
@@ -95,6 +110,18 @@ __all__ = [
     # Personal Data
     'PERSONAL_DATA',
     
+    # ==========================================
+    # DASHBOARD ROLLUP
+    # ==========================================
+    'SiteMonthlyRollup',
+    
+    # ==========================================
+    # SUBJECT PROGRESS
+    # ==========================================
+    'ProcessStatus',
+    'PatientProgress',
+    'ContactProgress',
+    
     # ==========================================
     # STUDY 43EN CONTACT MODELS
     # ==========================================
@@ -15,6 +15,7 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
 from encrypted_fields.fields import EncryptedCharField
+from backends.studies.blind_index import BlindIndexField, KIND_PHONE, KIND_TEXT
 from backends.studies.study_43en.models.base_models import AuditFieldsMixin
 
 
@@ -63,6 +64,14 @@ class PERSONAL_CONTACT_DATA(AuditFieldsMixin):
         help_text=_('Contact phone number (encrypted)')
     )
     
+    # ==========================================
+    # BLIND INDEXES (keyed HMAC - search/group without decrypting)
+    # ==========================================
+    FULLNAME_BIDX = BlindIndexField(source='FULLNAME', kind=KIND_TEXT)
+    FULLNAME_BIDX_PREFIX = BlindIndexField(source='FULLNAME', kind=KIND_TEXT, prefix_length=3)
+    PHONE_BIDX = BlindIndexField(source='PHONE', kind=KIND_PHONE)
+    PHONE_BIDX_PREFIX = BlindIndexField(source='PHONE', kind=KIND_PHONE, prefix_length=6)
+    
     # ==========================================
     # META OPTIONS
     # ==========================================
@@ -71,7 +80,7 @@ class PERSONAL_CONTACT_DATA(AuditFieldsMixin):
         verbose_name = _('Contact Personal Data')
         verbose_name_plural = _('Contact Personal Data')
         indexes = [
-            # NO INDEXES on encrypted fields for security
+            # NO INDEXES on encrypted fields for security (blind indexes are db_index=True)
             models.Index(fields=['last_modified_by_id', '-last_modified_at'], name='idx_pcdata_modified'),
         ]
     
@@ -4,6 +4,7 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from backends.studies.study_43en.study_site_manage import SiteFilteredManager
 from backends.studies.study_43en.models.base_models import AuditFieldsMixin
+from backends.studies.search import trigram_index
 
 
 class SCR_CONTACT(AuditFieldsMixin):
@@ -130,6 +131,9 @@ class SCR_CONTACT(AuditFieldsMixin):
             models.Index(fields=['SITEID', '-SCREENINGFORMDATE'], name='idx_csc_site_date'),
             models.Index(fields=['is_confirmed', 'SITEID'], name='idx_csc_confirmed'),
             models.Index(fields=['last_modified_by_id', '-last_modified_at'], name='idx_csc_modified'),
+            # Search box (icontains)
+            trigram_index('USUBJID', 'idx_csc_usubjid_trgm'),
+            trigram_index('INITIAL', 'idx_csc_initial_trgm'),
         ]
     
     def __str__(self):
@@ -4,6 +4,7 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from backends.studies.study_43en.study_site_manage import SiteFilteredManager
 from backends.studies.study_43en.models.base_models import AuditFieldsMixin
+from backends.studies.search import trigram_index
 from django.conf import settings
 
 
@@ -148,6 +149,9 @@ class SCR_CASE(AuditFieldsMixin):
             models.Index(fields=['SITEID', '-SCREENINGFORMDATE'], name='idx_scr_site_date'),
             models.Index(fields=['is_confirmed', 'SITEID'], name='idx_scr_confirmed'),
             models.Index(fields=['last_modified_by_id', '-last_modified_at'], name='idx_scr_modified'),
+            # Search box (icontains)
+            trigram_index('USUBJID', 'idx_scr_usubjid_trgm'),
+            trigram_index('INITIAL', 'idx_scr_initial_trgm'),
         ]
     
     def __str__(self):
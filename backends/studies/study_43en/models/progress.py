@@ -0,0 +1,140 @@
+# backends/studies/study_43en/models/progress.py
+"""
+Subject Progress Models
+Precomputed CRF completion per screening subject for the patient/contact lists
+"""
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class ProcessStatus(models.TextChoices):
+    """Study process of a subject (patient_list / contact_list badge)"""
+    NOT_ENROLLED = 'not_enrolled', _('Not Enrolled')
+    ONGOING = 'ongoing', _('Ongoing')
+    COMPLETED = 'completed', _('Study Completed')
+
+
+class SubjectProgressBase(models.Model):
+    """
+    Common progress columns
+
+    Maintained by CRF signals (refreshed after commit) and fully rebuildable
+    with `rebuild_subject_progress`. CRF lists and status rules live in
+    services/progress_service.py.
+    """
+
+    objects = models.Manager()
+    # Note: No SiteFilteredManager - filtered through the screening record
+
+    HAS_ENROLLMENT = models.BooleanField(
+        default=False,
+        verbose_name=_('Enrolled')
+    )
+    ENRDATE = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name=_('Enrollment Date')
+    )
+    IS_DECEASED = models.BooleanField(
+        default=False,
+        verbose_name=_('Deceased')
+    )
+    CRF_COUNT = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_('CRFs Entered'),
+        help_text=_('Number of tracked CRFs entered (progress sort key)')
+    )
+    PROCESS_STATUS = models.CharField(
+        max_length=20,
+        choices=ProcessStatus.choices,
+        default=ProcessStatus.NOT_ENROLLED,
+        verbose_name=_('Study Process')
+    )
+    UPDATED_AT = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('Updated At')
+    )
+
+    class Meta:
+        abstract = True
+
+    @property
+    def process_label(self):
+        if self.PROCESS_STATUS == ProcessStatus.COMPLETED and self.IS_DECEASED:
+            return 'Study Completed (Died)'
+        return ProcessStatus(self.PROCESS_STATUS).label
+
+    @property
+    def process_badge(self):
+        if self.PROCESS_STATUS == ProcessStatus.COMPLETED:
+            return 'dark' if self.IS_DECEASED else 'success'
+        if self.PROCESS_STATUS == ProcessStatus.ONGOING:
+            return 'primary'
+        return 'secondary'
+
+
+class PatientProgress(SubjectProgressBase):
+    """
+    Progress of one screened patient, one row per SCR_CASE
+    """
+
+    SCRID = models.OneToOneField('SCR_CASE',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        db_column='SCRID',
+        related_name='progress',
+        verbose_name=_('Screening ID')
+    )
+
+    HAS_CLI = models.BooleanField(default=False, verbose_name=_('Clinical'))
+    HAS_DISCH = models.BooleanField(default=False, verbose_name=_('Discharge'))
+    HAS_ENDCASE = models.BooleanField(default=False, verbose_name=_('End Case'))
+    HAS_FU28 = models.BooleanField(default=False, verbose_name=_('Follow-up Day 28'))
+    HAS_FU90 = models.BooleanField(default=False, verbose_name=_('Follow-up Day 90'))
+    HAS_SAMPLE = models.BooleanField(default=False, verbose_name=_('Sample'))
+    HAS_LAB = models.BooleanField(default=False, verbose_name=_('Laboratory Test'))
+
+    class Meta:
+        db_table = 'patient_progress'
+        verbose_name = _('Patient Progress')
+        verbose_name_plural = _('Patient Progress')
+        indexes = [
+            models.Index(fields=['PROCESS_STATUS', 'IS_DECEASED'], name='idx_pprog_status'),
+            models.Index(fields=['CRF_COUNT'], name='idx_pprog_crf_count'),
+            models.Index(fields=['ENRDATE'], name='idx_pprog_enrdate'),
+        ]
+
+    def __str__(self):
+        return f"{self.SCRID_id}: {self.PROCESS_STATUS} ({self.CRF_COUNT} CRFs)"
+
+
+class ContactProgress(SubjectProgressBase):
+    """
+    Progress of one screened contact, one row per SCR_CONTACT
+    """
+
+    SCRID = models.OneToOneField('SCR_CONTACT',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        db_column='SCRID',
+        related_name='progress',
+        verbose_name=_('Screening ID')
+    )
+
+    HAS_ENDCASE = models.BooleanField(default=False, verbose_name=_('End Case'))
+    HAS_FU28 = models.BooleanField(default=False, verbose_name=_('Follow-up Day 28'))
+    HAS_FU90 = models.BooleanField(default=False, verbose_name=_('Follow-up Day 90'))
+    HAS_SAMPLE = models.BooleanField(default=False, verbose_name=_('Sample'))
+
+    class Meta:
+        db_table = 'contact_progress'
+        verbose_name = _('Contact Progress')
+        verbose_name_plural = _('Contact Progress')
+        indexes = [
+            models.Index(fields=['PROCESS_STATUS'], name='idx_cprog_status'),
+            models.Index(fields=['CRF_COUNT'], name='idx_cprog_crf_count'),
+            models.Index(fields=['ENRDATE'], name='idx_cprog_enrdate'),
+        ]
+
+    def __str__(self):
+        return f"{self.SCRID_id}: {self.PROCESS_STATUS} ({self.CRF_COUNT} CRFs)"
@@ -0,0 +1,67 @@
+# backends/studies/study_43en/models/rollup.py
+"""
+Dashboard Rollup Model
+Pre-aggregated per-site monthly counts for dashboard charts
+"""
+from datetime import date
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+# Bucket for records without a date (still counted in totals)
+UNDATED_MONTH = date(1900, 1, 1)
+
+
+class SiteMonthlyRollup(models.Model):
+    """
+    Per-site monthly counts, one row per (SITEID, MONTH, METRIC)
+
+    Maintained incrementally by CRF signals (only the touched buckets are
+    recomputed) and fully rebuildable with `rebuild_dashboard_rollup`.
+    Metric definitions live in services/rollup_service.py.
+    """
+
+    objects = models.Manager()
+    # Note: No SiteFilteredManager - filtered directly on SITEID
+
+    SITEID = models.CharField(
+        max_length=10,
+        blank=True,
+        default='',
+        verbose_name=_('Site ID')
+    )
+    MONTH = models.DateField(
+        verbose_name=_('Month'),
+        help_text=_('First day of month (1900-01-01 = undated records)')
+    )
+    METRIC = models.CharField(
+        max_length=50,
+        verbose_name=_('Metric')
+    )
+    COUNT = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Count')
+    )
+    LAST_DATE = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name=_('Last Date'),
+        help_text=_('Latest record date within the month')
+    )
+    UPDATED_AT = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('Updated At')
+    )
+
+    class Meta:
+        db_table = 'site_monthly_rollup'
+        verbose_name = _('Site Monthly Rollup')
+        verbose_name_plural = _('Site Monthly Rollups')
+        unique_together = ('SITEID', 'MONTH', 'METRIC')
+        ordering = ['METRIC', 'SITEID', 'MONTH']
+        indexes = [
+            models.Index(fields=['METRIC', 'MONTH'], name='idx_rollup_metric_month'),
+        ]
+
+    def __str__(self):
+        return f"{self.METRIC} {self.SITEID} {self.MONTH:%m/%Y}: {self.COUNT}"
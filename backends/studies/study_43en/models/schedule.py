@@ -7,6 +7,8 @@ from datetime import date
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from encrypted_fields.fields import EncryptedCharField
+from backends.studies.blind_index import BlindIndexField, KIND_PHONE
+from backends.studies.search import trigram_index
 
 from backends.studies.study_43en.study_site_manage import SiteFilteredManager
 
@@ -474,6 +476,8 @@ class FollowUpStatus(models.Model):
         null=True,
         verbose_name=_('Phone Number')
     )
+    PHONE_BIDX = BlindIndexField(source='PHONE', kind=KIND_PHONE)
+    PHONE_BIDX_PREFIX = BlindIndexField(source='PHONE', kind=KIND_PHONE, prefix_length=6)
     
     # Metadata
     CREATED_AT = models.DateTimeField(
@@ -495,6 +499,9 @@ class FollowUpStatus(models.Model):
             models.Index(fields=['SUBJECT_TYPE', 'STATUS'], name='idx_fus_type_status'),
             models.Index(fields=['EXPECTED_DATE', 'STATUS'], name='idx_fus_date_status'),
             models.Index(fields=['USUBJID', 'VISIT'], name='idx_fus_subj_visit'),
+            # Search box (icontains)
+            trigram_index('USUBJID', 'idx_fus_usubjid_trgm'),
+            trigram_index('INITIAL', 'idx_fus_initial_trgm'),
         ]
     
     def __str__(self):
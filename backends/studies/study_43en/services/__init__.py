@@ -6,8 +6,18 @@ Contains business logic for report generation and data processing
 
 from .report_generator import TMGReportGenerator
 from .report_data_service import ReportDataService
+from .export_service import CRFExportService
+from .followup_status_service import FollowUpStatusService
+from .schedule_sync_service import ScheduleSyncService
+from .rollup_service import DashboardRollupService
+from .sample_stats_service import SampleStatsService
 
 __all__ = [
     'TMGReportGenerator',
     'ReportDataService',
+    'CRFExportService',
+    'FollowUpStatusService',
+    'ScheduleSyncService',
+    'DashboardRollupService',
+    'SampleStatsService',
 ]
@@ -0,0 +1,394 @@
+# backends/studies/study_43en/services/export_service.py
+"""
+CRF Export Service - Streaming Version
+
+Exports CRF tables to CSV / XLSX without loading a whole table into memory.
+
+- Rows are read through a server-side cursor (QuerySet.iterator) in chunks
+- Date/datetime formatters are resolved once per column, then applied per chunk
+- CSV is produced as a generator for StreamingHttpResponse
+- XLSX is written with openpyxl write-only mode into a spooled temp file
+
+Peak memory is bounded by chunk_size, not by table size.
+"""
+
+import csv
+import json
+import logging
+import tempfile
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from django.apps import apps
+from django.db import models
+
+from backends.studies.blind_index import BlindIndexField
+
+logger = logging.getLogger(__name__)
+
+# Database alias for study_43en
+DB_ALIAS = 'db_study_43en'
+
+APP_LABEL = 'study_43en'
+
+# Rows fetched per server-side cursor round trip
+DEFAULT_CHUNK_SIZE = 2000
+
+# XLSX is kept in RAM up to this size, then spills to disk
+SPOOL_MAX_SIZE = 16 * 1024 * 1024  # 16 MB
+
+# PII columns removed unless include_sensitive=True
+SENSITIVE_FIELDS = ['FULLNAME', 'PHONE', 'ADDRESS', 'MEDRECORDID']
+
+# Date field priority used for the start/end date filter
+DATE_FILTER_FIELDS = [
+    'SCREENINGFORMDATE',
+    'ENRDATE',
+    'ADMISDATE',
+    'created_at',
+    'last_modified_at',
+]
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+CSV_CONTENT_TYPE = 'text/csv'
+
+
+class _Echo:
+    """File-like object whose write() returns the value (for csv.writer)"""
+
+    def write(self, value):
+        return value
+
+
+def _format_datetime(value):
+    return value.strftime('%Y-%m-%d %H:%M:%S %z') if value is not None else ''
+
+
+def _format_date(value):
+    return value.strftime('%Y-%m-%d') if value is not None else ''
+
+
+def _format_json(value):
+    if value is None:
+        return ''
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def _format_str(value):
+    return str(value) if value is not None else ''
+
+
+class ExportTable:
+    """
+    One CRF table prepared for export
+
+    Holds the filtered queryset plus the column list and the per-column
+    formatters, so formatting decisions are made once per table.
+    """
+
+    def __init__(self, name: str, model, queryset, columns: List[str], formatters: List):
+        self.name = name
+        self.model = model
+        self.queryset = queryset
+        self.columns = columns
+        self.formatters = formatters
+        self.row_count = 0
+        self.error = None  # set when writing the rows failed
+
+    @property
+    def sheet_name(self) -> str:
+        return self.name[:31]  # Excel sheet name limit
+
+
+class CRFExportService:
+    """
+    Service xuất dữ liệu CRF theo dạng streaming
+
+    Usage:
+        service = CRFExportService(site_filter, filter_type, start_date, end_date)
+        tables, skipped = service.build_tables(['SCR_CASE', 'ENR_CASE'])
+
+        # CSV
+        StreamingHttpResponse(service.iter_csv(tables), content_type='text/csv')
+
+        # XLSX
+        fileobj, size = service.write_xlsx(tables)
+    """
+
+    def __init__(
+        self,
+        site_filter,
+        filter_type: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        include_sensitive: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress_callback: Optional[Callable[[ExportTable], None]] = None,
+    ):
+        self.site_filter = site_filter
+        self.filter_type = filter_type
+        self.start_date = start_date or None
+        self.end_date = end_date or None
+        self.sensitive_fields = set() if include_sensitive else set(SENSITIVE_FIELDS)
+        self.chunk_size = chunk_size
+        self.progress_callback = progress_callback
+
+    # ==========================================
+    # PLAN
+    # ==========================================
+
+    def build_tables(self, model_names: List[str]) -> Tuple[List[ExportTable], List[str]]:
+        """
+        Resolve model names into export tables
+
+        A model that cannot be filtered or queried is logged and skipped,
+        so one broken CRF does not fail the whole export.
+
+        Returns:
+            (tables, skipped_models) - tables with no matching rows are dropped
+        """
+        from backends.studies.study_43en.utils.site_utils import get_filtered_queryset
+
+        tables = []
+        skipped = []
+
+        for model_name in model_names:
+            try:
+                model = apps.get_model(APP_LABEL, model_name)
+            except LookupError:
+                logger.warning(f"Skipping {model_name}: unknown model")
+                skipped.append(model_name)
+                continue
+
+            #  Skip models without site_objects (child/related models)
+            if not hasattr(model, 'site_objects'):
+                logger.warning(f" Skipping {model_name}: No site_objects manager (likely a related model)")
+                skipped.append(model_name)
+                continue
+
+            try:
+                queryset = get_filtered_queryset(model, self.site_filter, self.filter_type)
+                queryset = self._apply_date_filter(model, queryset)
+                has_rows = queryset.exists()
+                columns, formatters = self._build_columns(model)
+            except Exception as e:
+                # Handle models with complex relationships that fail site filtering
+                if 'OneToOneField' in str(e) or 'startswith' in str(e):
+                    logger.warning(f" Skipping {model_name}: Cannot apply site filtering ({str(e)[:100]})")
+                else:
+                    logger.error(f"Error exporting {model_name}: {str(e)}", exc_info=True)
+                skipped.append(model_name)
+                continue
+
+            if not has_rows:
+                logger.info(f"No data for {model_name} with current filters")
+                continue
+
+            tables.append(ExportTable(
+                name=model_name,
+                model=model,
+                queryset=queryset.order_by('pk').values_list(*columns),
+                columns=columns,
+                formatters=formatters,
+            ))
+
+        return tables, skipped
+
+    def _apply_date_filter(self, model, queryset):
+        """Apply start/end date filter on the first available date field"""
+        if not (self.start_date or self.end_date):
+            return queryset
+
+        date_field = next((f for f in DATE_FILTER_FIELDS if hasattr(model, f)), None)
+        if not date_field:
+            return queryset
+
+        if self.start_date:
+            queryset = queryset.filter(**{f'{date_field}__gte': self.start_date})
+        if self.end_date:
+            queryset = queryset.filter(**{f'{date_field}__lte': self.end_date})
+        return queryset
+
+    def _build_columns(self, model) -> Tuple[List[str], List]:
+        """
+        Column names (same as QuerySet.values() keys) and one formatter per column
+
+        DateTimeField must be checked before DateField (it is a subclass).
+        """
+        columns = []
+        formatters = []
+
+        for field in model._meta.concrete_fields:
+            if field.name in self.sensitive_fields or field.attname in self.sensitive_fields:
+                continue
+            # Blind indexes are internal search hashes, never exported
+            if isinstance(field, BlindIndexField):
+                continue
+
+            columns.append(field.attname)
+
+            if isinstance(field, models.DateTimeField):
+                formatters.append(_format_datetime)
+            elif isinstance(field, models.DateField):
+                formatters.append(_format_date)
+            elif isinstance(field, models.JSONField):
+                formatters.append(_format_json)
+            elif isinstance(field, (models.UUIDField, models.TimeField, models.DurationField)):
+                formatters.append(_format_str)
+            else:
+                formatters.append(None)
+
+        return columns, formatters
+
+    # ==========================================
+    # ROW STREAM
+    # ==========================================
+
+    def iter_chunks(self, table: ExportTable) -> Iterator[List[list]]:
+        """
+        Yield formatted rows in chunks of chunk_size
+
+        QuerySet.iterator() uses a server-side cursor on PostgreSQL, so only
+        one chunk is held in memory at a time.
+        """
+        formatted_columns = [
+            (index, formatter)
+            for index, formatter in enumerate(table.formatters)
+            if formatter is not None
+        ]
+
+        chunk = []
+        for row in table.queryset.iterator(chunk_size=self.chunk_size):
+            chunk.append(list(row))
+            if len(chunk) >= self.chunk_size:
+                yield self._format_chunk(chunk, formatted_columns)
+                table.row_count += len(chunk)
+                chunk = []
+
+        if chunk:
+            yield self._format_chunk(chunk, formatted_columns)
+            table.row_count += len(chunk)
+
+    @staticmethod
+    def _format_chunk(chunk: List[list], formatted_columns) -> List[list]:
+        """Format date/json columns for a whole chunk, column by column"""
+        for index, formatter in formatted_columns:
+            for row in chunk:
+                row[index] = formatter(row[index])
+        return chunk
+
+    def _table_done(self, table: ExportTable):
+        if table.error:
+            logger.error(f"Error exporting {table.name}: {table.error}")
+        else:
+            logger.info(f"Successfully exported {table.name}: {table.row_count} records")
+        if self.progress_callback:
+            self.progress_callback(table)
+
+    # ==========================================
+    # CSV
+    # ==========================================
+
+    def iter_csv(self, tables: List[ExportTable]) -> Iterator[str]:
+        """
+        Generator of CSV text for StreamingHttpResponse
+
+        Tables are separated by a blank line and a '# <model>' header,
+        same layout as the legacy export. Rows already sent cannot be taken
+        back, so a table that fails midway ends with a '# <model>: export
+        failed' line and the next table follows.
+        """
+        writer = csv.writer(_Echo())
+
+        for position, table in enumerate(tables):
+            if position > 0:
+                yield '\n\n'
+            yield f"# {table.name}\n"
+            yield writer.writerow(table.columns)
+
+            try:
+                for chunk in self.iter_chunks(table):
+                    yield ''.join(writer.writerow(row) for row in chunk)
+            except Exception as e:
+                table.error = str(e)
+                yield f"# {table.name}: export failed\n"
+
+            self._table_done(table)
+
+    def write_csv(self, tables: List[ExportTable], fileobj):
+        """
+        Write CSV into a binary file object (used by background export jobs)
+
+        Returns:
+            file_size in bytes
+        """
+        for text in self.iter_csv(tables):
+            fileobj.write(text.encode('utf-8'))
+        return fileobj.tell()
+
+    # ==========================================
+    # XLSX
+    # ==========================================
+
+    def write_xlsx(self, tables: List[ExportTable], fileobj=None):
+        """
+        Write tables to an XLSX file using openpyxl write-only mode
+
+        A table whose rows fail to load is left out of the workbook (its
+        error is kept on the table).
+
+        Args:
+            tables: Export tables from build_tables()
+            fileobj: Optional binary file object; defaults to a SpooledTemporaryFile
+
+        Returns:
+            (fileobj, file_size) - fileobj is rewound to position 0
+        """
+        from openpyxl import Workbook
+        from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+        if fileobj is None:
+            fileobj = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE, suffix='.xlsx')
+
+        workbook = Workbook(write_only=True)
+
+        for table in tables:
+            sheet = workbook.create_sheet(title=table.sheet_name)
+            sheet.append(table.columns)
+
+            try:
+                for chunk in self.iter_chunks(table):
+                    for row in chunk:
+                        sheet.append([
+                            ILLEGAL_CHARACTERS_RE.sub('', value) if isinstance(value, str) else value
+                            for value in row
+                        ])
+            except Exception as e:
+                table.error = str(e)
+                table.row_count = 0
+                sheet.close()
+                workbook.remove(sheet)
+
+            self._table_done(table)
+
+        workbook.save(fileobj)
+
+        file_size = fileobj.tell()
+        fileobj.seek(0)
+        return fileobj, file_size
+
+
+def build_export_filename(site_filter, filter_type: str, export_format: str, timestamp: str) -> str:
+    """Generate export filename with site info"""
+    if filter_type == 'single':
+        site_suffix = f"_site_{site_filter}"
+    elif filter_type == 'multiple':
+        site_suffix = f"_sites_{'_'.join(sorted(site_filter))}"
+    else:
+        site_suffix = "_all_sites"
+
+    extension = 'xlsx' if export_format == 'excel' else 'csv'
+    return f'study_43en{site_suffix}_export_{timestamp}.{extension}'
+
+
+def get_export_content_type(export_format: str) -> str:
+    return XLSX_CONTENT_TYPE if export_format == 'excel' else CSV_CONTENT_TYPE
@@ -0,0 +1,180 @@
+# backends/studies/study_43en/services/followup_status_service.py
+"""
+Follow-up Status Service - Set-based recomputation
+
+Recomputes FollowUpStatus.STATUS from today's date with a handful of
+UPDATE ... WHERE statements instead of loading and saving rows one by one.
+
+Rules (same priority as FollowUpStatus.save()):
+    COMPLETED  - ACTUAL_DATE is set
+    MISSED     - MISSED_DATE is set (manual), or window closed when auto_miss=True
+    LATE       - EXPECTED_DATE or EXPECTED_TO is before today
+    UPCOMING   - otherwise (LATE rows return to UPCOMING when their expected
+                 dates are moved forward, as update_daily_status did)
+
+LATE follows the tracking page, which re-evaluated it on every view; the
+old update_daily_status flagged LATE from EXPECTED_FROM, i.e. as soon as
+the visit window opened, and the page kept those rows LATE. A visit is
+only late once its expected date has passed.
+
+COMPLETED and MISSED are terminal: rows in those states are never moved
+back by date rules.
+"""
+
+from datetime import date
+from typing import Dict, Tuple
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from backends.audit_logs.utils.site_utils import bump_generation
+
+logger = logging.getLogger(__name__)
+
+# Database alias for study_43en
+DB_ALIAS = 'db_study_43en'
+
+# Minimum interval between on-demand recomputations (per day key)
+THROTTLE_SECONDS = 900  # 15 minutes
+THROTTLE_KEY_PREFIX = 'study_43en_followup_status_recompute'
+
+
+class FollowUpStatusService:
+    """
+    Service cập nhật trạng thái lịch hẹn theo ngày hiện tại (set-based)
+
+    Usage:
+        transitions = FollowUpStatusService().recompute()
+        # {('UPCOMING', 'LATE'): 12, ('LATE', 'COMPLETED'): 3}
+    """
+
+    def __init__(self, today: date = None, auto_miss: bool = False, using: str = DB_ALIAS):
+        """
+        Args:
+            today: Reference date (default: date.today())
+            auto_miss: Also move LATE/UPCOMING rows whose window closed to MISSED
+            using: Database alias
+        """
+        self.today = today or date.today()
+        self.auto_miss = auto_miss
+        self.using = using
+
+    def _base_queryset(self):
+        from backends.studies.study_43en.models.schedule import FollowUpStatus
+        return FollowUpStatus.objects.using(self.using)
+
+    def _overdue_q(self) -> Q:
+        return Q(EXPECTED_DATE__lt=self.today) | Q(EXPECTED_TO__lt=self.today)
+
+    def _rules(self):
+        """
+        Ordered (from_status, to_status, condition) rules
+
+        Each rule becomes one UPDATE ... WHERE STATUS = from_status AND condition.
+        """
+        rules = []
+
+        # 1. Actual visit recorded → COMPLETED
+        for source in ('UPCOMING', 'LATE', 'MISSED'):
+            rules.append((source, 'COMPLETED', Q(ACTUAL_DATE__isnull=False)))
+
+        # 2. Manually marked missed → MISSED
+        for source in ('UPCOMING', 'LATE'):
+            rules.append((source, 'MISSED', Q(MISSED_DATE__isnull=False)))
+
+        # 3. Window closed without a visit → MISSED (optional)
+        if self.auto_miss:
+            for source in ('UPCOMING', 'LATE'):
+                rules.append((source, 'MISSED', Q(EXPECTED_TO__lt=self.today)))
+
+        # 4. Past expected date → LATE
+        rules.append(('UPCOMING', 'LATE', self._overdue_q()))
+
+        # 5. Expected dates moved forward → back to UPCOMING
+        rules.append(('LATE', 'UPCOMING', ~self._overdue_q()))
+
+        return rules
+
+    def resolve_status(self, status, actual_date=None, missed_date=None,
+                       expected_date=None, expected_to=None) -> str:
+        """
+        Same rules as _rules(), evaluated in Python for a single row
+
+        Used by bulk writers that build rows in memory, so the status they
+        write already matches what recompute() would produce.
+        """
+        if actual_date:
+            return 'COMPLETED'
+        if status in ('COMPLETED', 'MISSED'):
+            return status
+        if missed_date:
+            return 'MISSED'
+        if self.auto_miss and expected_to and expected_to < self.today:
+            return 'MISSED'
+        if (expected_date and expected_date < self.today) or (expected_to and expected_to < self.today):
+            return 'LATE'
+        return 'UPCOMING'
+
+    def recompute(self) -> Dict[Tuple[str, str], int]:
+        """
+        Apply all rules in one transaction
+
+        Returns:
+            dict {(from_status, to_status): rows_moved} - only non-zero entries
+        """
+        transitions = {}
+        now = timezone.now()
+
+        with transaction.atomic(using=self.using):
+            for source, target, condition in self._rules():
+                moved = self._base_queryset().filter(
+                    condition, STATUS=source
+                ).update(STATUS=target, UPDATED_AT=now)
+
+                if moved:
+                    key = (source, target)
+                    transitions[key] = transitions.get(key, 0) + moved
+
+        if transitions:
+            # QuerySet.update() sends no signals: invalidate cached results
+            from backends.studies.study_43en.models.schedule import FollowUpStatus
+            bump_generation(FollowUpStatus, self.using)
+            logger.info(f"Follow-up status recompute ({self.today}): {self.format_transitions(transitions)}")
+
+        return transitions
+
+    @staticmethod
+    def format_transitions(transitions: Dict[Tuple[str, str], int]) -> str:
+        if not transitions:
+            return 'no changes'
+        return ', '.join(
+            f"{source}→{target}: {count}"
+            for (source, target), count in sorted(transitions.items())
+        )
+
+    @classmethod
+    def recompute_throttled(cls, throttle_seconds: int = THROTTLE_SECONDS):
+        """
+        Recompute at most once per throttle window (shared across workers)
+
+        The key includes today's date so the first request after midnight
+        always recomputes.
+
+        Returns:
+            transitions dict, or None if skipped by the throttle
+        """
+        today = date.today()
+        throttle_key = f"{THROTTLE_KEY_PREFIX}_{today.isoformat()}"
+
+        # cache.add is atomic: only one worker wins the window
+        if not cache.add(throttle_key, 1, throttle_seconds):
+            return None
+
+        try:
+            return cls(today=today).recompute()
+        except Exception:
+            cache.delete(throttle_key)
+            raise
@@ -0,0 +1,283 @@
+# backends/studies/study_43en/services/progress_service.py
+"""
+Subject Progress Service - Precomputed CRF completion per subject
+
+Maintains PatientProgress / ContactProgress so patient_list and
+contact_list read one joined, indexed query instead of checking every CRF
+table for each page (and can filter/sort by progress).
+
+- refresh(): recompute given subjects - one query with EXISTS per CRF,
+  then one upsert; called (after commit) from CRF signals
+- rebuild(): full recompute (management command `rebuild_subject_progress`)
+
+Status rules (same as the former per-page computation):
+    not_enrolled  no enrollment CRF
+    completed     died at discharge, End Case CRF entered, or all tracked CRFs entered
+    ongoing       otherwise
+
+QuerySet.update() / bulk_create() bypass signals - run the rebuild command
+after bulk imports.
+"""
+
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q, Subquery
+
+logger = logging.getLogger(__name__)
+
+# Database alias for study_43en
+DB_ALIAS = 'db_study_43en'
+
+APP_LABEL = 'study_43en'
+
+REBUILD_BATCH_SIZE = 1000
+
+
+class ProgressSpec:
+    """One subject type: screening/enrollment models, tracked CRFs and death rule"""
+
+    def __init__(self, kind: str, progress_model: str, screening_model: str, enrollment_model: str,
+                 crfs: Dict[str, str], completion_crf: str, deceased: Optional[tuple] = None):
+        self.kind = kind
+        self.progress_model_name = progress_model
+        self.screening_model_name = screening_model
+        self.enrollment_model_name = enrollment_model
+        self.crfs = crfs                       # {progress flag: CRF model name}
+        self.completion_crf = completion_crf   # Flag that alone completes the study
+        self.deceased = deceased               # (CRF model name, Q) or None
+
+    @property
+    def progress_model(self):
+        return apps.get_model(APP_LABEL, self.progress_model_name)
+
+    @property
+    def screening_model(self):
+        return apps.get_model(APP_LABEL, self.screening_model_name)
+
+    @property
+    def crf_model_names(self) -> List[str]:
+        names = [self.enrollment_model_name, *self.crfs.values()]
+        if self.deceased and self.deceased[0] not in names:
+            names.append(self.deceased[0])
+        return names
+
+    def _subject_rows(self, model_name: str, condition: Optional[Q] = None):
+        """Rows of a CRF table belonging to the outer screening record"""
+        qs = apps.get_model(APP_LABEL, model_name).objects.filter(USUBJID_id=OuterRef('USUBJID'))
+        return qs.filter(condition) if condition is not None else qs
+
+    def annotations(self) -> dict:
+        """EXISTS / enrollment date annotations on the screening model"""
+        result = {
+            'HAS_ENROLLMENT': Exists(self._subject_rows(self.enrollment_model_name)),
+            'ENRDATE': Subquery(self._subject_rows(self.enrollment_model_name).values('ENRDATE')[:1]),
+        }
+        for flag, model_name in self.crfs.items():
+            result[flag] = Exists(self._subject_rows(model_name))
+        if self.deceased:
+            result['IS_DECEASED'] = Exists(self._subject_rows(*self.deceased))
+        return result
+
+    def build(self, row: dict):
+        """Progress instance from one annotated screening row"""
+        from backends.studies.study_43en.models.progress import ProcessStatus
+
+        flags = {flag: bool(row[flag]) for flag in self.crfs}
+        deceased = bool(row.get('IS_DECEASED', False))
+        crf_count = sum(flags.values())
+
+        if not row['HAS_ENROLLMENT']:
+            status = ProcessStatus.NOT_ENROLLED
+        elif deceased or flags[self.completion_crf] or all(
+            value for flag, value in flags.items() if flag != self.completion_crf
+        ):
+            # Died → study ends early, remaining CRFs are not expected
+            status = ProcessStatus.COMPLETED
+        else:
+            status = ProcessStatus.ONGOING
+
+        return self.progress_model(
+            SCRID_id=row['SCRID'],
+            HAS_ENROLLMENT=bool(row['HAS_ENROLLMENT']),
+            ENRDATE=row['ENRDATE'],
+            IS_DECEASED=deceased,
+            CRF_COUNT=crf_count,
+            PROCESS_STATUS=status,
+            **flags,
+        )
+
+    def update_fields(self) -> List[str]:
+        return ['HAS_ENROLLMENT', 'ENRDATE', 'IS_DECEASED', 'CRF_COUNT', 'PROCESS_STATUS',
+                'UPDATED_AT', *self.crfs]
+
+
+PROGRESS_SPECS = {
+    'patient': ProgressSpec(
+        'patient', 'PatientProgress', 'SCR_CASE', 'ENR_CASE',
+        crfs={
+            'HAS_CLI': 'CLI_CASE',
+            'HAS_DISCH': 'DISCH_CASE',
+            'HAS_ENDCASE': 'EndCaseCRF',
+            'HAS_FU28': 'FU_CASE_28',
+            'HAS_FU90': 'FU_CASE_90',
+            'HAS_SAMPLE': 'SAM_CASE',
+            'HAS_LAB': 'LaboratoryTest',
+        },
+        completion_crf='HAS_ENDCASE',
+        deceased=('DISCH_CASE', Q(DEATHATDISCH='Yes')),
+    ),
+    'contact': ProgressSpec(
+        'contact', 'ContactProgress', 'SCR_CONTACT', 'ENR_CONTACT',
+        crfs={
+            'HAS_ENDCASE': 'ContactEndCaseCRF',
+            'HAS_FU28': 'FU_CONTACT_28',
+            'HAS_FU90': 'FU_CONTACT_90',
+            'HAS_SAMPLE': 'SAM_CONTACT',
+        },
+        completion_crf='HAS_ENDCASE',
+    ),
+}
+
+# Models whose save/delete changes a subject's progress: {model name: kind}
+SOURCE_MODELS = {
+    model_name: spec.kind
+    for spec in PROGRESS_SPECS.values()
+    for model_name in [spec.screening_model_name, *spec.crf_model_names]
+}
+
+# Subjects waiting for transaction commit: {db_alias: {(kind, field, value)}}
+_pending = threading.local()
+
+
+class SubjectProgressService:
+    """
+    Service cập nhật tiến độ CRF theo từng đối tượng (patient/contact)
+
+    Usage:
+        SubjectProgressService().refresh('patient', usubjids=['003-A-001'])
+        SubjectProgressService().rebuild()
+    """
+
+    def __init__(self, using: str = DB_ALIAS):
+        self.using = using
+
+    # ==========================================
+    # WRITE - incremental
+    # ==========================================
+
+    def refresh(self, kind: str, scrids: Iterable[str] = (), usubjids: Iterable[str] = ()) -> list:
+        """
+        Recompute the progress rows of the given subjects
+
+        Subjects are matched by screening ID or USUBJID (CRF signals only
+        know the USUBJID). Unknown subjects are ignored.
+
+        Returns:
+            list of progress instances written
+        """
+        scrids, usubjids = set(scrids), set(usubjids)
+        if not scrids and not usubjids:
+            return []
+
+        spec = PROGRESS_SPECS[kind]
+        rows = self._compute(spec, spec.screening_model.objects.using(self.using).filter(
+            Q(SCRID__in=scrids) | Q(USUBJID__in=usubjids)
+        ))
+        self._write(spec, rows)
+        return rows
+
+    @classmethod
+    def schedule_refresh(cls, kind: str, field: str, value: str, using: str = DB_ALIAS):
+        """
+        Queue a subject and refresh it once after the current transaction commits
+
+        All CRF saves of one subject in a transaction collapse into a single
+        refresh (same queueing as DashboardRollupService.schedule_refresh).
+        """
+        if not value:
+            return
+
+        pending = getattr(_pending, 'subjects', None)
+        if pending is None:
+            pending = _pending.subjects = {}
+
+        pending.setdefault(using, set()).add((kind, field, value))
+        transaction.on_commit(lambda: cls._flush(using), using=using)
+
+    @classmethod
+    def _flush(cls, using: str):
+        queued = _pending.subjects.pop(using, set())
+        if not queued:
+            return
+
+        service = cls(using=using)
+        for kind in PROGRESS_SPECS:
+            scrids = {value for k, field, value in queued if k == kind and field == 'SCRID'}
+            usubjids = {value for k, field, value in queued if k == kind and field == 'USUBJID'}
+            try:
+                service.refresh(kind, scrids=scrids, usubjids=usubjids)
+            except Exception as e:
+                # Never break a CRF save because of the progress table
+                logger.error(f"Subject progress refresh failed for {kind}: {e}", exc_info=True)
+
+    # ==========================================
+    # WRITE - full rebuild
+    # ==========================================
+
+    def rebuild(self, kinds: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Recompute the progress rows of every screening record
+
+        Screening records are read in primary-key batches; each batch is one
+        annotated query and one upsert.
+
+        Returns:
+            {kind: rows written}
+        """
+        written = {}
+
+        for kind in kinds or PROGRESS_SPECS:
+            spec = PROGRESS_SPECS[kind]
+            written[kind] = 0
+            last_scrid = None
+
+            while True:
+                batch = spec.screening_model.objects.using(self.using).order_by('SCRID')
+                if last_scrid is not None:
+                    batch = batch.filter(SCRID__gt=last_scrid)
+                scrids = list(batch.values_list('SCRID', flat=True)[:REBUILD_BATCH_SIZE])
+                if not scrids:
+                    break
+
+                rows = self._compute(spec, spec.screening_model.objects.using(self.using).filter(SCRID__in=scrids))
+                self._write(spec, rows)
+                written[kind] += len(rows)
+                last_scrid = scrids[-1]
+
+            logger.info(f"Subject progress rebuilt: {written[kind]} {kind} rows")
+
+        return written
+
+    # ==========================================
+    # HELPERS
+    # ==========================================
+
+    def _compute(self, spec: ProgressSpec, screening_qs) -> list:
+        annotations = spec.annotations()
+        rows = screening_qs.annotate(**annotations).values('SCRID', *annotations).order_by()
+        return [spec.build(row) for row in rows]
+
+    def _write(self, spec: ProgressSpec, rows: list):
+        if not rows:
+            return
+        spec.progress_model.objects.using(self.using).bulk_create(
+            rows,
+            batch_size=REBUILD_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['SCRID'],
+            update_fields=spec.update_fields(),
+        )
@@ -6,11 +6,12 @@ Fetches data from database for TMG report generation.
 Uses same logic as dashboard.py for consistency.
 """
 
-from django.db.models import Count, Q, Case, When, IntegerField
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
 import logging
 
+from .sample_stats_service import SampleStatsService
+
 logger = logging.getLogger(__name__)
 
 # Database alias for study_43en
@@ -131,61 +132,28 @@ class ReportDataService:
         - SAMPLE_TYPE='3': Day 28
         - SAMPLE_TYPE='4': Day 90
         
-        OPTIMIZED: Uses aggregation to reduce N+1 queries
+        OPTIMIZED: One conditional aggregate per table (SampleStatsService)
         """
         try:
-            from backends.studies.study_43en.models.patient import SAM_CASE
-            from backends.studies.study_43en.models.contact import SAM_CONTACT
-            
-            # Build base querysets with site filtering
-            if self.site_filter:
-                patient_samples_qs = SAM_CASE.site_objects.using(DB_ALIAS).filter_by_site(self.site_filter)
-                contact_samples_qs = SAM_CONTACT.site_objects.using(DB_ALIAS).filter_by_site(self.site_filter)
-            else:
-                patient_samples_qs = SAM_CASE.objects.using(DB_ALIAS)
-                contact_samples_qs = SAM_CONTACT.objects.using(DB_ALIAS)
-            
-            def _aggregate_sample_stats(samples_qs):
-                """
-                OPTIMIZED: Single query with conditional aggregation
-                Instead of 4 visits x 5 counts = 20 queries, now just 1 query
-                """
-                stats = {}
-                
-                # Use values + annotate for efficient grouped aggregation
-                aggregated = samples_qs.filter(SAMPLE=True).values('SAMPLE_TYPE').annotate(
-                    total=Count('pk'),
-                    blood=Count(Case(When(BLOOD=True, then=1), output_field=IntegerField())),
-                    stool=Count(Case(When(STOOL=True, then=1), output_field=IntegerField())),
-                    rectswab=Count(Case(When(RECTSWAB=True, then=1), output_field=IntegerField())),
-                    throatswab=Count(Case(When(THROATSWAB=True, then=1), output_field=IntegerField())),
-                )
-                
-                # Convert to dict by visit
-                for row in aggregated:
-                    visit_key = f"visit{row['SAMPLE_TYPE']}"
-                    stats[visit_key] = {
-                        'total': row['total'],
-                        'blood': row['blood'],
-                        'stool': row['stool'],
-                        'rectswab': row['rectswab'],
-                        'throatswab': row['throatswab'],
+            service = SampleStatsService(using=DB_ALIAS)
+            sites = [self.site_filter] if self.site_filter else None
+            
+            def _sample_stats(subject):
+                visits = service.by_visit(service.sample_matrix(subject, sites))
+                return {
+                    f"visit{visit}": {
+                        'total': metrics['sampled'],
+                        'blood': metrics['blood'],
+                        'stool': metrics['stool'],
+                        'rectswab': metrics['rectswab'],
+                        'throatswab': metrics['throatswab'],
                     }
-                
-                # Ensure all visits have entries (even if 0)
-                for visit_num in ['1', '2', '3', '4']:
-                    visit_key = f"visit{visit_num}"
-                    if visit_key not in stats:
-                        stats[visit_key] = {
-                            'total': 0, 'blood': 0, 'stool': 0,
-                            'rectswab': 0, 'throatswab': 0
-                        }
-                
-                return stats
+                    for visit, metrics in visits.items()
+                }
             
             return {
-                'patient': _aggregate_sample_stats(patient_samples_qs),
-                'contact': _aggregate_sample_stats(contact_samples_qs),
+                'patient': _sample_stats('patient'),
+                'contact': _sample_stats('contact'),
             }
             
         except Exception as e:
@@ -226,89 +194,42 @@ class ReportDataService:
         Lấy thống kê K. pneumoniae isolation
         Giống format Table 7 trong PDF report
         
-        OPTIMIZED: Reduced from ~40 queries per site to ~4 queries per site
-        using aggregation
+        OPTIMIZED: One grouped query per table for all sites (SampleStatsService)
         """
         try:
-            from backends.studies.study_43en.models.patient import SCR_CASE, ENR_CASE, SAM_CASE
-            from backends.studies.study_43en.models.contact import ENR_CONTACT, SAM_CONTACT
-            
             sites_to_query = [self.site_filter] if self.site_filter else ['003', '020', '011']
             result_data = {}
             
-            def _aggregate_kp_stats(samples_qs):
-                """
-                OPTIMIZED: Single query with conditional aggregation for all visits
-                """
-                stats = {}
-                
-                # Group by SAMPLE_TYPE and aggregate all counts in one query
-                aggregated = samples_qs.values('SAMPLE_TYPE').annotate(
-                    throat_total=Count(Case(When(THROATSWAB=True, then=1), output_field=IntegerField())),
-                    throat_kp=Count(Case(When(THROATSWAB=True, KLEBPNEU_3=True, then=1), output_field=IntegerField())),
-                    stool_total=Count(Case(
-                        When(Q(STOOL=True) | Q(RECTSWAB=True), then=1), 
-                        output_field=IntegerField()
-                    )),
-                    stool_kp=Count(Case(
-                        When(
-                            (Q(STOOL=True) | Q(RECTSWAB=True)) & (Q(KLEBPNEU_1=True) | Q(KLEBPNEU_2=True)),
-                            then=1
-                        ),
-                        output_field=IntegerField()
-                    )),
-                )
-                
-                for row in aggregated:
-                    visit_key = f"visit{row['SAMPLE_TYPE']}"
-                    stats[visit_key] = {
-                        'throat_total': row['throat_total'],
-                        'throat_kp': row['throat_kp'],
-                        'stool_total': row['stool_total'],
-                        'stool_kp': row['stool_kp'],
+            service = SampleStatsService(using=DB_ALIAS)
+            subject_counts = service.subject_counts(sites_to_query)
+            patient_matrix = service.sample_matrix('patient', sites_to_query)
+            contact_matrix = service.sample_matrix('contact', sites_to_query)
+            
+            def _kp_stats(visits):
+                return {
+                    f"visit{visit}": {
+                        'throat_total': metrics['throat_total'],
+                        'throat_kp': metrics['throat_kp'],
+                        'stool_total': metrics['stool_total'],
+                        'stool_kp': metrics['stool_kp'],
                     }
-                
-                # Ensure all visits exist
-                for visit_num in ['1', '2', '3', '4']:
-                    visit_key = f"visit{visit_num}"
-                    if visit_key not in stats:
-                        stats[visit_key] = {
-                            'throat_total': 0, 'throat_kp': 0,
-                            'stool_total': 0, 'stool_kp': 0
-                        }
-                
-                return stats
+                    for visit, metrics in visits.items()
+                }
             
             for site_code in sites_to_query:
                 site_name = SITE_NAMES.get(site_code, site_code)
-                
-                # PATIENT DATA - Use site_objects for consistent filtering
-                patient_count = ENR_CASE.site_objects.using(DB_ALIAS).filter_by_site(site_code).count()
-                
-                # Clinical Kp (at screening)
-                clinical_kp = SCR_CASE.site_objects.using(DB_ALIAS).filter_by_site(site_code).filter(
-                    ISOLATEDKPNFROMINFECTIONORBLOOD=True
-                ).count()
-                
-                # Patient samples - Use site_objects
-                patient_samples = SAM_CASE.site_objects.using(DB_ALIAS).filter_by_site(site_code)
-                patient_kp_data = _aggregate_kp_stats(patient_samples)
-                
-                # CONTACT DATA
-                contact_count = ENR_CONTACT.site_objects.using(DB_ALIAS).filter_by_site(site_code).count()
-                contact_samples = SAM_CONTACT.site_objects.using(DB_ALIAS).filter_by_site(site_code)
-                contact_kp_data = _aggregate_kp_stats(contact_samples)
+                counts = subject_counts[site_code]
                 
                 result_data[site_code] = {
                     'site_name': site_name,
                     'patient': {
-                        'count': patient_count,
-                        'clinical_kp': clinical_kp,
-                        'sampling': patient_kp_data,
+                        'count': counts['patients'],
+                        'clinical_kp': counts['clinical_kp_screened'],  # At screening
+                        'sampling': _kp_stats(patient_matrix[site_code]),
                     },
                     'contact': {
-                        'count': contact_count,
-                        'sampling': contact_kp_data,
+                        'count': counts['contacts'],
+                        'sampling': _kp_stats(contact_matrix[site_code]),
                     },
                 }
             
@@ -0,0 +1,327 @@
+# backends/studies/study_43en/services/rollup_service.py
+"""
+Dashboard Rollup Service - Per-site monthly counts
+
+Maintains SiteMonthlyRollup so dashboard charts read a few dozen
+pre-aggregated rows instead of grouping CRF tables on every request.
+
+- refresh_buckets(): recompute only the (site, month) buckets touched by a
+  save/delete - one conditional aggregate per bucket, called from signals
+- rebuild(): full recompute (management command `rebuild_dashboard_rollup`)
+- totals() / monthly(): read helpers for the dashboard views
+
+QuerySet.update() / bulk_create() bypass signals - run the rebuild command
+after bulk imports.
+"""
+
+import logging
+import threading
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dateutil.relativedelta import relativedelta
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+
+from backends.tenancy.utils.dashboard_cache import DashboardCache
+
+logger = logging.getLogger(__name__)
+
+# Database alias for study_43en
+DB_ALIAS = 'db_study_43en'
+
+APP_LABEL = 'study_43en'
+
+# Mirrors SCR_CASE eligibility used by the management report
+PATIENT_ELIGIBLE_Q = Q(
+    UPPER16AGE=True,
+    INFPRIOR2OR48HRSADMIT=True,
+    ISOLATEDKPNFROMINFECTIONORBLOOD=True,
+    KPNISOUNTREATEDSTABLE=False,
+    CONSENTTOSTUDY=True,
+    is_confirmed=True,
+)
+
+
+class RollupSource:
+    """One CRF table feeding the rollup and the metrics derived from it"""
+
+    def __init__(self, model_name: str, site_field: str, date_field: str, metrics: Dict[str, Optional[Q]]):
+        self.model_name = model_name
+        self.site_field = site_field      # ORM path to SITEID
+        self.date_field = date_field      # Date bucketed by month
+        self.metrics = metrics            # {metric: extra filter or None}
+
+    @property
+    def model(self):
+        return apps.get_model(APP_LABEL, self.model_name)
+
+    @property
+    def has_direct_site(self) -> bool:
+        return self.site_field == 'SITEID'
+
+    def aggregates(self) -> dict:
+        """Count + Max(date) per metric, as conditional aggregates"""
+        result = {}
+        for metric, condition in self.metrics.items():
+            condition = condition or Q()
+            result[metric] = Count('pk', filter=condition)
+            result[f'{metric}__last'] = Max(self.date_field, filter=condition)
+        return result
+
+
+ROLLUP_SOURCES = [
+    RollupSource('SCR_CASE', 'SITEID', 'SCREENINGFORMDATE', {
+        'patient_screening': None,
+        'patient_screening_confirmed': Q(is_confirmed=True),
+        'patient_eligible': PATIENT_ELIGIBLE_Q,
+    }),
+    RollupSource('ENR_CASE', 'USUBJID__SITEID', 'ENRDATE', {
+        'patient_enrollment': None,
+    }),
+    RollupSource('SCR_CONTACT', 'SITEID', 'SCREENINGFORMDATE', {
+        'contact_screening': None,
+        'contact_screening_confirmed': Q(is_confirmed=True),
+    }),
+    RollupSource('ENR_CONTACT', 'USUBJID__SITEID', 'ENRDATE', {
+        'contact_enrollment': None,
+    }),
+]
+
+SOURCES_BY_MODEL = {source.model_name: source for source in ROLLUP_SOURCES}
+
+# Buckets waiting for transaction commit: {db_alias: {(model_name, site, month)}}
+_pending = threading.local()
+
+
+def month_start(value: Optional[date]) -> date:
+    """Bucket key for a record date"""
+    from backends.studies.study_43en.models.rollup import UNDATED_MONTH
+
+    return value.replace(day=1) if value else UNDATED_MONTH
+
+
+class DashboardRollupService:
+    """
+    Service tổng hợp số liệu dashboard theo site/tháng
+
+    Usage:
+        service = DashboardRollupService()
+        service.totals(['patient_screening'], site_filter, filter_type)
+        service.monthly('patient_enrollment', site_filter, filter_type)
+    """
+
+    def __init__(self, using: str = DB_ALIAS):
+        self.using = using
+
+    def _rollup_model(self):
+        from backends.studies.study_43en.models.rollup import SiteMonthlyRollup
+        return SiteMonthlyRollup
+
+    # ==========================================
+    # WRITE - incremental
+    # ==========================================
+
+    def refresh_buckets(self, source: RollupSource, buckets: Iterable[Tuple[str, date]]) -> int:
+        """
+        Recompute the given (site, month) buckets for one source
+
+        Returns:
+            number of rollup rows written
+        """
+        from backends.studies.study_43en.models.rollup import UNDATED_MONTH
+
+        Rollup = self._rollup_model()
+        rows = []
+
+        for site, month in set(buckets):
+            qs = source.model.objects.using(self.using)
+
+            if site:
+                qs = qs.filter(**{source.site_field: site})
+            else:
+                qs = qs.filter(Q(**{f'{source.site_field}__isnull': True}) | Q(**{source.site_field: ''}))
+
+            if month == UNDATED_MONTH:
+                qs = qs.filter(**{f'{source.date_field}__isnull': True})
+            else:
+                qs = qs.filter(**{
+                    f'{source.date_field}__gte': month,
+                    f'{source.date_field}__lt': month + relativedelta(months=1),
+                })
+
+            values = qs.aggregate(**source.aggregates())
+            for metric in source.metrics:
+                rows.append(Rollup(
+                    SITEID=site or '',
+                    MONTH=month,
+                    METRIC=metric,
+                    COUNT=values[metric] or 0,
+                    LAST_DATE=values[f'{metric}__last'],
+                ))
+
+        if rows:
+            Rollup.objects.using(self.using).bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['SITEID', 'MONTH', 'METRIC'],
+                update_fields=['COUNT', 'LAST_DATE', 'UPDATED_AT'],
+            )
+            # bulk_create sends no signals - invalidate cached dashboards here
+            DashboardCache.bump(self.using, Rollup)
+        return len(rows)
+
+    @classmethod
+    def schedule_refresh(cls, model_name: str, buckets: Iterable[Tuple[str, date]], using: str = DB_ALIAS):
+        """
+        Queue buckets and refresh them once after the current transaction commits
+
+        Several saves of the same subject in one transaction collapse into
+        a single refresh per bucket: the first callback refreshes everything
+        queued, later ones find the queue empty. Buckets left over from a
+        rolled-back transaction are refreshed with the next commit
+        (recomputing a bucket is idempotent).
+        """
+        pending = getattr(_pending, 'buckets', None)
+        if pending is None:
+            pending = _pending.buckets = {}
+
+        pending.setdefault(using, set()).update(
+            (model_name, site, month) for site, month in buckets
+        )
+        transaction.on_commit(lambda: cls._flush(using), using=using)
+
+    @classmethod
+    def _flush(cls, using: str):
+        queued = _pending.buckets.pop(using, set())
+        if not queued:
+            return
+        by_source = {}
+        for model_name, site, month in queued:
+            by_source.setdefault(model_name, set()).add((site, month))
+
+        service = cls(using=using)
+        for model_name, buckets in by_source.items():
+            try:
+                service.refresh_buckets(SOURCES_BY_MODEL[model_name], buckets)
+            except Exception as e:
+                # Never break a CRF save because of the dashboard rollup
+                logger.error(f"Rollup refresh failed for {model_name}: {e}", exc_info=True)
+
+    # ==========================================
+    # WRITE - full rebuild
+    # ==========================================
+
+    def rebuild(self, sources: Optional[List[RollupSource]] = None) -> Dict[str, int]:
+        """
+        Recompute all rollup rows for the given sources (default: all)
+
+        One GROUP BY (site, month) query per source, then replace the
+        rollup rows of those metrics in one transaction.
+
+        Returns:
+            {metric: rows written}
+        """
+        from backends.studies.study_43en.models.rollup import UNDATED_MONTH
+
+        Rollup = self._rollup_model()
+        sources = sources or ROLLUP_SOURCES
+        rows = []
+        written = {}
+
+        for source in sources:
+            grouped = (
+                source.model.objects.using(self.using)
+                .annotate(
+                    rollup_site=Coalesce(F(source.site_field), Value('')),
+                    rollup_month=TruncMonth(source.date_field),
+                )
+                .values('rollup_site', 'rollup_month')
+                .annotate(**source.aggregates())
+                .order_by()
+            )
+
+            for row in grouped:
+                for metric in source.metrics:
+                    if not row[metric]:
+                        continue
+                    rows.append(Rollup(
+                        SITEID=row['rollup_site'],
+                        MONTH=row['rollup_month'] or UNDATED_MONTH,
+                        METRIC=metric,
+                        COUNT=row[metric],
+                        LAST_DATE=row[f'{metric}__last'],
+                    ))
+                    written[metric] = written.get(metric, 0) + 1
+
+        metrics = [metric for source in sources for metric in source.metrics]
+        with transaction.atomic(using=self.using):
+            Rollup.objects.using(self.using).filter(METRIC__in=metrics).delete()
+            Rollup.objects.using(self.using).bulk_create(rows, batch_size=1000)
+        DashboardCache.bump(self.using, Rollup)
+
+        logger.info(f"Dashboard rollup rebuilt: {len(rows)} rows for {len(metrics)} metrics")
+        return written
+
+    # ==========================================
+    # READ
+    # ==========================================
+
+    def _filtered(self, metrics: List[str], site_filter, filter_type):
+        qs = self._rollup_model().objects.using(self.using).filter(METRIC__in=metrics)
+
+        if filter_type == 'single' and site_filter and site_filter != 'all':
+            qs = qs.filter(SITEID=site_filter)
+        elif filter_type == 'multiple':
+            qs = qs.filter(SITEID__in=list(site_filter or []))
+
+        return qs
+
+    def totals(self, metrics: List[str], site_filter, filter_type) -> Optional[Dict[str, int]]:
+        """
+        {metric: total count} over all months (including undated)
+
+        Returns None when the rollup has no row for the scope, so callers
+        can fall back to a live count (rollup not built yet).
+        """
+        rows = list(
+            self._filtered(metrics, site_filter, filter_type)
+            .values('METRIC')
+            .annotate(total=Sum('COUNT'))
+            .order_by()
+        )
+        if not rows:
+            return None
+
+        totals = {metric: 0 for metric in metrics}
+        totals.update({row['METRIC']: row['total'] or 0 for row in rows})
+        return totals
+
+    def monthly(self, metric: str, site_filter, filter_type,
+                start_month: Optional[date] = None, end_month: Optional[date] = None
+                ) -> Optional[Dict[date, Tuple[int, Optional[date]]]]:
+        """
+        {month: (count, last_date)} summed over the selected sites
+
+        Undated records are excluded. Returns None when the rollup has no
+        row for the scope.
+        """
+        from backends.studies.study_43en.models.rollup import UNDATED_MONTH
+
+        qs = self._filtered([metric], site_filter, filter_type).exclude(MONTH=UNDATED_MONTH)
+        if start_month:
+            qs = qs.filter(MONTH__gte=start_month)
+        if end_month:
+            qs = qs.filter(MONTH__lte=end_month)
+
+        rows = list(
+            qs.values('MONTH')
+            .annotate(total=Sum('COUNT'), last=Max('LAST_DATE'))
+            .order_by('MONTH')
+        )
+        if not rows:
+            return None
+
+        return {row['MONTH']: (row['total'] or 0, row['last']) for row in rows}
@@ -0,0 +1,176 @@
+# backends/studies/study_43en/services/sample_stats_service.py
+"""
+Sample Statistics Service - Conditional aggregation
+
+Computes the sample matrix (site × visit × metric) of SAM_CASE / SAM_CONTACT
+with ONE grouped query per table: every metric is a Count(filter=Q(...))
+evaluated in the same pass, grouped by (SITEID, SAMPLE_TYPE).
+
+Shared by the dashboard (sampling follow-up, K. pneumoniae isolation panels)
+and the TMG report (ReportDataService), so both show the same numbers.
+"""
+
+from typing import Dict, Iterable, Optional
+import logging
+
+from django.db.models import Count, F, Q
+
+logger = logging.getLogger(__name__)
+
+# Database alias for study_43en
+DB_ALIAS = 'db_study_43en'
+
+# SAMPLE_TYPE = visit: 1 (Day 1), 2 (Day 10), 3 (Day 28), 4 (Day 90)
+VISITS = ('1', '2', '3', '4')
+
+# SAM_* → ENR_* → SCR_*.SITEID
+SAMPLE_SITE_PATH = 'USUBJID__USUBJID__SITEID'
+
+STOOL_OR_RECTAL_Q = Q(STOOL=True) | Q(RECTSWAB=True)
+
+SAMPLE_METRICS = {
+    # Sample collection (SAMPLE=True)
+    'sampled': Q(SAMPLE=True),
+    'blood': Q(SAMPLE=True, BLOOD=True),
+    'stool': Q(SAMPLE=True, STOOL=True),
+    'rectswab': Q(SAMPLE=True, RECTSWAB=True),
+    'throatswab': Q(SAMPLE=True, THROATSWAB=True),
+    # K. pneumoniae culture results
+    'throat_total': Q(THROATSWAB=True),
+    'throat_kp': Q(THROATSWAB=True, KLEBPNEU_3=True),
+    'stool_total': STOOL_OR_RECTAL_Q,
+    'stool_kp': STOOL_OR_RECTAL_Q & (Q(KLEBPNEU_1=True) | Q(KLEBPNEU_2=True)),
+}
+
+CLINICAL_KP_Q = Q(ISOLATEDKPNFROMINFECTIONORBLOOD=True)
+
+SUBJECT_COUNTS = ('patients', 'contacts', 'clinical_kp', 'clinical_kp_screened')
+
+
+class SampleStatsService:
+    """
+    Service thống kê mẫu xét nghiệm (1 query / bảng)
+
+    Usage:
+        service = SampleStatsService()
+        matrix = service.sample_matrix('patient', sites=['003'])
+        # {'003': {'1': {'sampled': 10, 'blood': 4, ...}, '2': {...}}}
+        by_visit = service.by_visit(matrix)
+        # {'1': {'sampled': 10, ...}, ...} summed over sites
+    """
+
+    def __init__(self, using: str = DB_ALIAS):
+        self.using = using
+
+    def _models(self):
+        from backends.studies.study_43en.models.patient import SCR_CASE, ENR_CASE, SAM_CASE
+        from backends.studies.study_43en.models.contact import ENR_CONTACT, SAM_CONTACT
+        return {
+            'patient': (SCR_CASE, ENR_CASE, SAM_CASE),
+            'contact': (None, ENR_CONTACT, SAM_CONTACT),
+        }
+
+    @staticmethod
+    def _empty_visits() -> Dict[str, Dict[str, int]]:
+        return {visit: {metric: 0 for metric in SAMPLE_METRICS} for visit in VISITS}
+
+    # ==========================================
+    # SAMPLE MATRIX
+    # ==========================================
+
+    def sample_matrix(self, subject: str, sites: Optional[Iterable[str]] = None
+                      ) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """
+        {site: {visit: {metric: count}}} for one subject type
+
+        Args:
+            subject: 'patient' (SAM_CASE) or 'contact' (SAM_CONTACT)
+            sites: Site codes to include (None = all sites, including
+                   subjects without a site, grouped under '')
+
+        Every requested site and every visit is present (zero-filled).
+        """
+        sample_model = self._models()[subject][2]
+        qs = sample_model.objects.using(self.using)
+
+        matrix = {}
+        if sites is not None:
+            sites = list(sites)
+            if not sites:
+                return matrix
+            qs = qs.filter(**{f'{SAMPLE_SITE_PATH}__in': sites})
+            matrix = {site: self._empty_visits() for site in sites}
+
+        rows = (
+            qs.values(site=F(SAMPLE_SITE_PATH), visit=F('SAMPLE_TYPE'))
+            .annotate(**{metric: Count('pk', filter=q) for metric, q in SAMPLE_METRICS.items()})
+            .order_by()
+        )
+
+        for row in rows:
+            if row['visit'] not in VISITS:
+                continue
+            # NULL and '' SITEID both land in the '' bucket
+            metrics = matrix.setdefault(row['site'] or '', self._empty_visits())[row['visit']]
+            for metric in SAMPLE_METRICS:
+                metrics[metric] += row[metric]
+
+        return matrix
+
+    @staticmethod
+    def by_visit(matrix: Dict[str, Dict[str, Dict[str, int]]]) -> Dict[str, Dict[str, int]]:
+        """Sum a sample matrix over sites → {visit: {metric: count}}"""
+        totals = SampleStatsService._empty_visits()
+        for visits in matrix.values():
+            for visit, metrics in visits.items():
+                for metric, count in metrics.items():
+                    totals[visit][metric] += count
+        return totals
+
+    # ==========================================
+    # SUBJECT COUNTS
+    # ==========================================
+
+    def subject_counts(self, sites: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Per-site subject counts used next to the sample matrix
+
+        Returns:
+            {site: {'patients', 'contacts', 'clinical_kp', 'clinical_kp_screened'}}
+            clinical_kp counts confirmed screenings only (dashboard);
+            clinical_kp_screened counts all screenings (TMG report).
+        """
+        models = self._models()
+        scr_case, enr_case, _ = models['patient']
+        _, enr_contact, _ = models['contact']
+
+        site_list = list(sites) if sites is not None else None
+        counts = {site: dict.fromkeys(SUBJECT_COUNTS, 0) for site in site_list or []}
+        if site_list is not None and not site_list:
+            return counts
+
+        def _grouped(model, site_path, **aggregates):
+            qs = model.objects.using(self.using)
+            if site_list is not None:
+                qs = qs.filter(**{f'{site_path}__in': site_list})
+            return qs.values(site=F(site_path)).annotate(**aggregates).order_by()
+
+        def _row(site):
+            return counts.setdefault(site or '', dict.fromkeys(SUBJECT_COUNTS, 0))
+
+        for row in _grouped(enr_case, 'USUBJID__SITEID', total=Count('pk')):
+            _row(row['site'])['patients'] += row['total']
+
+        for row in _grouped(enr_contact, 'USUBJID__SITEID', total=Count('pk')):
+            _row(row['site'])['contacts'] += row['total']
+
+        for row in _grouped(
+            scr_case, 'SITEID',
+            clinical_kp=Count('pk', filter=CLINICAL_KP_Q & Q(is_confirmed=True)),
+            clinical_kp_screened=Count('pk', filter=CLINICAL_KP_Q),
+        ):
+            counts_row = _row(row['site'])
+            counts_row['clinical_kp'] += row['clinical_kp']
+            counts_row['clinical_kp_screened'] += row['clinical_kp_screened']
+
+        return counts
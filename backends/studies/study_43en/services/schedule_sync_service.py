@@ -0,0 +1,523 @@
+# backends/studies/study_43en/services/schedule_sync_service.py
+"""
+Schedule Sync Service - Bulk rebuild of schedule tables
+
+Bulk counterpart of the sync_expected_dates / sync_followup_data commands.
+
+- ExpectedCalendar is loaded once into a {ENROLLMENT_DATE: calendar} dict
+- Source rows (ENR/SCR/PER/FU) are fetched with a handful of queries
+- Target rows are diffed in memory against what is already stored
+- Only new/changed rows are written, with bulk_create(update_conflicts=True)
+  or bulk_update in batches inside one transaction
+
+A plan can be inspected (dry run) without touching the database.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from django.db import transaction
+
+from backends.audit_logs.utils.site_utils import bump_generation
+from backends.studies.blind_index import BlindIndexField, get_blind_indexes
+
+logger = logging.getLogger(__name__)
+
+# Database alias for study_43en
+DB_ALIAS = 'db_study_43en'
+
+DEFAULT_BATCH_SIZE = 1000
+
+EXPECTED_DATE_FIELDS = [
+    'ENROLLMENT_DATE',
+    'V2_EXPECTED_FROM', 'V2_EXPECTED_TO', 'V2_EXPECTED_DATE',
+    'V3_EXPECTED_FROM', 'V3_EXPECTED_TO', 'V3_EXPECTED_DATE',
+    'V4_EXPECTED_FROM', 'V4_EXPECTED_TO', 'V4_EXPECTED_DATE',
+]
+
+CONTACT_EXPECTED_DATE_FIELDS = [
+    'ENROLLMENT_DATE',
+    'V2_EXPECTED_FROM', 'V2_EXPECTED_TO', 'V2_EXPECTED_DATE',
+    'V3_EXPECTED_FROM', 'V3_EXPECTED_TO', 'V3_EXPECTED_DATE',
+]
+
+# Contact V2 = Patient V3 (28-day), Contact V3 = Patient V4 (90-day)
+CONTACT_CALENDAR_MAP = {
+    'V2_EXPECTED_FROM': 'V3_EXPECTED_FROM',
+    'V2_EXPECTED_TO': 'V3_EXPECTED_TO',
+    'V2_EXPECTED_DATE': 'V3_EXPECTED_DATE',
+    'V3_EXPECTED_FROM': 'V4_EXPECTED_FROM',
+    'V3_EXPECTED_TO': 'V4_EXPECTED_TO',
+    'V3_EXPECTED_DATE': 'V4_EXPECTED_DATE',
+}
+
+FOLLOWUP_KEY_FIELDS = ['USUBJID', 'SUBJECT_TYPE', 'VISIT']
+
+FOLLOWUP_SYNC_FIELDS = [
+    'INITIAL', 'PHONE',
+    'EXPECTED_DATE', 'EXPECTED_FROM', 'EXPECTED_TO',
+    'ACTUAL_DATE', 'STATUS',
+]
+
+
+def _same_value(old, new) -> bool:
+    # Encrypted fields store '' as NULL - treat both as empty
+    if old in (None, '') and new in (None, ''):
+        return True
+    return old == new
+
+
+class SyncPlan:
+    """
+    Pending writes for one target table
+
+    creates: {key: field values}
+    updates: {key: {field: (old, new)}} - only the fields that differ
+    rows:    {key: field values} - full desired values of created/changed rows
+
+    upsert=True plans are written with bulk_create(update_conflicts=True);
+    upsert=False plans only touch existing rows (bulk_update by pk).
+    """
+
+    def __init__(self, model, label: str, key_fields: List[str], sync_fields: List[str], upsert: bool = True):
+        self.model = model
+        self.label = label
+        self.key_fields = key_fields
+        self.sync_fields = sync_fields
+        self.upsert = upsert
+        self.creates: Dict[tuple, dict] = {}
+        self.updates: Dict[tuple, dict] = {}
+        self.rows: Dict[tuple, dict] = {}
+        self.pks: Dict[tuple, object] = {}
+        self.unchanged = 0
+        self.warnings: List[str] = []
+
+    def add(self, key: tuple, values: dict, existing: Optional[dict], pk=None):
+        """Diff desired values against the stored row (None = not stored)"""
+        if existing is None:
+            self.creates[key] = values
+            self.rows[key] = values
+            return
+
+        changes = {
+            field: (existing.get(field), value)
+            for field, value in values.items()
+            if not _same_value(existing.get(field), value)
+        }
+        if changes:
+            self.updates[key] = changes
+            self.rows[key] = values
+            if pk is not None:
+                self.pks[key] = pk
+        else:
+            self.unchanged += 1
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.creates or self.updates)
+
+    def summary(self) -> str:
+        return (
+            f"{self.label}: mới {len(self.creates)}, cập nhật {len(self.updates)}, "
+            f"không đổi {self.unchanged}"
+        )
+
+    def describe(self, limit: int = 20) -> List[str]:
+        """Human-readable diff lines (for --dry-run)"""
+        lines = []
+        for key, values in list(self.creates.items())[:limit]:
+            lines.append(f"+ {'/'.join(map(str, key))}")
+        for key, changes in list(self.updates.items())[:limit]:
+            detail = ', '.join(
+                f"{field}: {old!r} → {new!r}" for field, (old, new) in changes.items()
+            )
+            lines.append(f"~ {'/'.join(map(str, key))}: {detail}")
+        hidden = max(len(self.creates) - limit, 0) + max(len(self.updates) - limit, 0)
+        if hidden:
+            lines.append(f"... và {hidden} thay đổi khác")
+        return lines
+
+
+class ScheduleSyncService:
+    """
+    Service đồng bộ lịch hẹn theo lô (bulk)
+
+    Usage:
+        service = ScheduleSyncService(batch_size=1000)
+        plans = [service.plan_expected_dates(), service.plan_contact_expected_dates()]
+        if not dry_run:
+            service.apply(plans)
+        print(service.timings)
+    """
+
+    def __init__(self, using: str = DB_ALIAS, batch_size: int = DEFAULT_BATCH_SIZE, status_service=None):
+        from backends.studies.study_43en.services.followup_status_service import FollowUpStatusService
+
+        self.using = using
+        self.batch_size = batch_size
+        self.status_service = status_service or FollowUpStatusService(auto_miss=True, using=using)
+        self.timings: Dict[str, float] = {}
+        self._calendar = None
+
+    @contextmanager
+    def timed(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0) + time.perf_counter() - started
+
+    # ==========================================
+    # LOOKUPS
+    # ==========================================
+
+    def get_calendar(self) -> dict:
+        """{ENROLLMENT_DATE: ExpectedCalendar} - one query, cached on the instance"""
+        if self._calendar is None:
+            from backends.studies.study_43en.models.schedule import ExpectedCalendar
+
+            with self.timed('load calendar'):
+                self._calendar = {
+                    calendar.ENROLLMENT_DATE: calendar
+                    for calendar in ExpectedCalendar.objects.using(self.using).all()
+                }
+        return self._calendar
+
+    @staticmethod
+    def _get_phone(enrollment) -> str:
+        """PHONE lives on personal_data (prefetched with select_related)"""
+        try:
+            return enrollment.personal_data.PHONE or ''
+        except Exception:
+            return ''
+
+    # ==========================================
+    # EXPECTED DATES
+    # ==========================================
+
+    def plan_expected_dates(self) -> SyncPlan:
+        """ExpectedDates from ENR_CASE.ENRDATE + ExpectedCalendar"""
+        from backends.studies.study_43en.models.patient import ENR_CASE
+        from backends.studies.study_43en.models.schedule import ExpectedDates
+
+        calendar = self.get_calendar()
+        plan = SyncPlan(ExpectedDates, 'ExpectedDates', ['USUBJID'], EXPECTED_DATE_FIELDS)
+
+        with self.timed('plan expected dates'):
+            existing = {
+                row['USUBJID']: row
+                for row in ExpectedDates.objects.using(self.using).values('USUBJID', *EXPECTED_DATE_FIELDS)
+            }
+            enrollments = ENR_CASE.objects.using(self.using).filter(
+                ENRDATE__isnull=False
+            ).values_list('USUBJID', 'ENRDATE')
+
+            for usubjid, enrollment_date in enrollments.iterator(chunk_size=self.batch_size):
+                entry = calendar.get(enrollment_date)
+                if entry is None:
+                    plan.warnings.append(f"{usubjid}: Không tìm thấy lịch cho ngày {enrollment_date}")
+                    continue
+
+                values = {'ENROLLMENT_DATE': enrollment_date}
+                values.update({field: getattr(entry, field) for field in EXPECTED_DATE_FIELDS[1:]})
+                plan.add((usubjid,), values, existing.get(usubjid))
+
+        return plan
+
+    def plan_contact_expected_dates(self) -> SyncPlan:
+        """ContactExpectedDates from ENR_CONTACT.ENRDATE + ExpectedCalendar"""
+        from backends.studies.study_43en.models.contact import ENR_CONTACT
+        from backends.studies.study_43en.models.schedule import ContactExpectedDates
+
+        calendar = self.get_calendar()
+        plan = SyncPlan(ContactExpectedDates, 'ContactExpectedDates', ['USUBJID'], CONTACT_EXPECTED_DATE_FIELDS)
+
+        with self.timed('plan contact expected dates'):
+            existing = {
+                row['USUBJID']: row
+                for row in ContactExpectedDates.objects.using(self.using).values('USUBJID', *CONTACT_EXPECTED_DATE_FIELDS)
+            }
+            enrollments = ENR_CONTACT.objects.using(self.using).filter(
+                ENRDATE__isnull=False
+            ).values_list('USUBJID', 'ENRDATE')
+
+            for usubjid, enrollment_date in enrollments.iterator(chunk_size=self.batch_size):
+                entry = calendar.get(enrollment_date)
+                if entry is None:
+                    plan.warnings.append(f"{usubjid}: Không tìm thấy lịch cho ngày {enrollment_date}")
+                    continue
+
+                values = {'ENROLLMENT_DATE': enrollment_date}
+                values.update({
+                    field: getattr(entry, source)
+                    for field, source in CONTACT_CALENDAR_MAP.items()
+                })
+                plan.add((usubjid,), values, existing.get(usubjid))
+
+        return plan
+
+    # ==========================================
+    # FOLLOW-UP STATUS
+    # ==========================================
+
+    def _existing_followups(self) -> Dict[tuple, dict]:
+        from backends.studies.study_43en.models.schedule import FollowUpStatus
+
+        # Model instances (not values()) so PHONE comes back decrypted
+        return {
+            (followup.USUBJID, followup.SUBJECT_TYPE, followup.VISIT): {
+                field: getattr(followup, field)
+                for field in FOLLOWUP_SYNC_FIELDS + ['MISSED_DATE']
+            }
+            for followup in FollowUpStatus.objects.using(self.using).only(
+                *FOLLOWUP_KEY_FIELDS, *FOLLOWUP_SYNC_FIELDS, 'MISSED_DATE'
+            ).iterator(chunk_size=self.batch_size)
+        }
+
+    def _followup_values(self, existing: Optional[dict], initial, phone, window, fu_case, has_form: bool):
+        """
+        Desired FollowUpStatus values for one visit
+
+        Mirrors the row-by-row command: with an FU form the visit is
+        COMPLETED/MISSED from the assessed flag, otherwise UPCOMING; the
+        final STATUS then goes through the same rules as the status service.
+        """
+        expected_from, expected_to, expected_date = window
+        values = {
+            'INITIAL': initial,
+            'PHONE': phone,
+            'EXPECTED_DATE': expected_date,
+            'EXPECTED_FROM': expected_from,
+            'EXPECTED_TO': expected_to,
+        }
+
+        if not has_form:
+            # V2 (Sample) has no FU form - ACTUAL_DATE is left untouched
+            status = 'UPCOMING'
+            actual_date = existing.get('ACTUAL_DATE') if existing else None
+            values['ACTUAL_DATE'] = actual_date
+        elif fu_case is not None:
+            actual_date = fu_case[0]
+            status = 'COMPLETED' if fu_case[1] == 'Yes' else 'MISSED'
+            values['ACTUAL_DATE'] = actual_date
+        else:
+            actual_date = None
+            status = 'UPCOMING'
+            values['ACTUAL_DATE'] = None
+
+        values['STATUS'] = self.status_service.resolve_status(
+            status,
+            actual_date=actual_date,
+            missed_date=existing.get('MISSED_DATE') if existing else None,
+            expected_date=expected_date,
+            expected_to=expected_to,
+        )
+        return values
+
+    def _plan_visits(self, plan, existing, subject_type, expected_rows, visits):
+        """
+        Args:
+            expected_rows: ExpectedDates/ContactExpectedDates with USUBJID,
+                USUBJID__USUBJID and USUBJID__personal_data selected
+            visits: [(visit, field_prefix, {usubjid: (assess_date, assessed)} or None)]
+        """
+        for expected in expected_rows:
+            usubjid = expected.USUBJID_id
+            initial = ''
+            phone = ''
+            try:
+                enrollment = expected.USUBJID
+                screening = enrollment.USUBJID
+                initial = screening.INITIAL if screening else ''
+                phone = self._get_phone(enrollment)
+            except Exception as e:
+                plan.warnings.append(f"Lỗi khi lấy thông tin {usubjid}: {e}")
+
+            for visit, prefix, fu_cases in visits:
+                expected_date = getattr(expected, f'{prefix}_EXPECTED_DATE')
+                if not expected_date:
+                    continue
+
+                key = (usubjid, subject_type, visit)
+                stored = existing.get(key)
+                window = (
+                    getattr(expected, f'{prefix}_EXPECTED_FROM'),
+                    getattr(expected, f'{prefix}_EXPECTED_TO'),
+                    expected_date,
+                )
+                fu_case = fu_cases.get(usubjid) if fu_cases is not None else None
+                values = self._followup_values(stored, initial, phone, window, fu_case, fu_cases is not None)
+                plan.add(key, values, stored)
+
+    def plan_followups(self) -> SyncPlan:
+        """FollowUpStatus for all patient (V2/V3/V4) and contact (V2/V3) visits"""
+        from backends.studies.study_43en.models.schedule import (
+            FollowUpStatus, ExpectedDates, ContactExpectedDates,
+        )
+        from backends.studies.study_43en.models.patient import FU_CASE_28, FU_CASE_90
+        from backends.studies.study_43en.models.contact import FU_CONTACT_28, FU_CONTACT_90
+
+        plan = SyncPlan(FollowUpStatus, 'FollowUpStatus', FOLLOWUP_KEY_FIELDS, FOLLOWUP_SYNC_FIELDS)
+
+        with self.timed('load follow-up sources'):
+            existing = self._existing_followups()
+
+            def fu_map(model, date_field, assessed_field):
+                return {
+                    usubjid: (assess_date, assessed)
+                    for usubjid, assess_date, assessed in model.objects.using(self.using).values_list(
+                        'USUBJID', date_field, assessed_field
+                    )
+                }
+
+            fu_case_28 = fu_map(FU_CASE_28, 'EvaluateDate', 'EvaluatedAtDay28')
+            fu_case_90 = fu_map(FU_CASE_90, 'EvaluateDate', 'EvaluatedAtDay90')
+            fu_contact_28 = fu_map(FU_CONTACT_28, 'ASSESSDATE', 'ASSESSED')
+            fu_contact_90 = fu_map(FU_CONTACT_90, 'ASSESSDATE', 'ASSESSED')
+
+        with self.timed('plan follow-ups'):
+            patients = ExpectedDates.objects.using(self.using).select_related(
+                'USUBJID',                 # ENR_CASE
+                'USUBJID__USUBJID',        # SCR_CASE
+                'USUBJID__personal_data',  # PER_DATA (PHONE)
+            )
+            self._plan_visits(plan, existing, 'PATIENT', patients.iterator(chunk_size=self.batch_size), [
+                ('V2', 'V2', None),
+                ('V3', 'V3', fu_case_28),
+                ('V4', 'V4', fu_case_90),
+            ])
+
+            contacts = ContactExpectedDates.objects.using(self.using).select_related(
+                'USUBJID',                 # ENR_CONTACT
+                'USUBJID__USUBJID',        # SCR_CONTACT
+                'USUBJID__personal_data',  # PER_CONTACT_DATA (PHONE)
+            )
+            self._plan_visits(plan, existing, 'CONTACT', contacts.iterator(chunk_size=self.batch_size), [
+                ('V2', 'V2', fu_contact_28),
+                ('V3', 'V3', fu_contact_90),
+            ])
+
+        return plan
+
+    def plan_initials(self) -> SyncPlan:
+        """Refresh FollowUpStatus.INITIAL for patients from SCR_CASE (one query each side)"""
+        from backends.studies.study_43en.models.schedule import FollowUpStatus
+        from backends.studies.study_43en.models.patient import SCR_CASE
+
+        plan = SyncPlan(FollowUpStatus, 'FollowUpStatus.INITIAL', FOLLOWUP_KEY_FIELDS, ['INITIAL'], upsert=False)
+
+        with self.timed('plan initials'):
+            followups = list(
+                FollowUpStatus.objects.using(self.using).filter(
+                    SUBJECT_TYPE='PATIENT'
+                ).values_list('pk', 'USUBJID', 'SUBJECT_TYPE', 'VISIT', 'INITIAL')
+            )
+            initials = dict(
+                SCR_CASE.objects.using(self.using).filter(
+                    USUBJID__in={row[1] for row in followups}
+                ).values_list('USUBJID', 'INITIAL')
+            )
+
+            for pk, usubjid, subject_type, visit, initial in followups:
+                if usubjid not in initials:
+                    plan.warnings.append(f"{usubjid}: Không tìm thấy SCR_CASE")
+                    continue
+                plan.add(
+                    (usubjid, subject_type, visit),
+                    {'INITIAL': initials[usubjid]},
+                    {'INITIAL': initial},
+                    pk=pk,
+                )
+
+        return plan
+
+    # ==========================================
+    # WRITE
+    # ==========================================
+
+    def _build_object(self, plan: SyncPlan, key: tuple, values: dict):
+        kwargs = dict(values)
+        for field_name, value in zip(plan.key_fields, key):
+            # FK key fields are written through their column (USUBJID_id)
+            kwargs[plan.model._meta.get_field(field_name).attname] = value
+        if key in plan.pks:
+            kwargs['pk'] = plan.pks[key]
+        return plan.model(**kwargs)
+
+    def _write_fields(self, plan: SyncPlan) -> List[str]:
+        fields = list(plan.sync_fields)
+        # Blind indexes follow their encrypted source field (e.g. PHONE_BIDX)
+        for source, indexes in get_blind_indexes(plan.model).items():
+            if source in plan.sync_fields:
+                fields.extend(field.name for field in indexes.values())
+        if any(field.name == 'UPDATED_AT' for field in plan.model._meta.concrete_fields):
+            fields.append('UPDATED_AT')
+        return fields
+
+    def apply(self, plans: List[SyncPlan]) -> Dict[str, int]:
+        """
+        Write all plans in one transaction
+
+        Upsert plans use bulk_create(update_conflicts=True) on the table's
+        unique key, so the rebuild stays correct if a row appears between
+        planning and writing. Update-only plans use bulk_update by pk.
+        """
+        from django.utils import timezone
+
+        written = {}
+        now = timezone.now()
+
+        with transaction.atomic(using=self.using):
+            for plan in plans:
+                written[plan.label] = 0
+                if not plan.has_changes:
+                    continue
+
+                with self.timed(f'write {plan.label}'):
+                    objects = [
+                        self._build_object(plan, key, values)
+                        for key, values in plan.rows.items()
+                    ]
+                    fields = self._write_fields(plan)
+                    manager = plan.model.objects.using(self.using)
+
+                    if plan.upsert:
+                        manager.bulk_create(
+                            objects,
+                            batch_size=self.batch_size,
+                            update_conflicts=True,
+                            unique_fields=plan.key_fields,
+                            update_fields=fields,
+                        )
+                    else:
+                        # bulk_update does not run pre_save (auto_now, blind indexes)
+                        blind_fields = [
+                            field for field in plan.model._meta.concrete_fields
+                            if isinstance(field, BlindIndexField) and field.name in fields
+                        ]
+                        for obj in objects:
+                            if 'UPDATED_AT' in fields:
+                                obj.UPDATED_AT = now
+                            for field in blind_fields:
+                                field.pre_save(obj, add=False)
+                        manager.bulk_update(
+                            [obj for obj in objects if obj.pk is not None],
+                            fields,
+                            batch_size=self.batch_size,
+                        )
+
+                written[plan.label] = len(plan.rows)
+                logger.info(f"Bulk sync {plan.summary()}")
+
+                # Bulk writes send no signals: invalidate cached results (after commit)
+                bump_generation(plan.model, self.using)
+
+        return written
+
+    def format_timings(self) -> List[str]:
+        total = sum(self.timings.values())
+        lines = [f"{name}: {seconds * 1000:.1f} ms" for name, seconds in self.timings.items()]
+        lines.append(f"tổng: {total * 1000:.1f} ms")
+        return lines
@@ -9,8 +9,26 @@ from backends.studies.study_43en.utils.site_utils import (
     batch_get_related,
     batch_check_exists,
     invalidate_cache,
+    get_cached_result,
+    bump_generation,
+    aget_filtered_queryset,
+    aget_site_filter_params,
 )
 
+__all__ = [
+    'get_site_filtered_object_or_404',
+    'get_filtered_queryset',
+    'get_site_filter_params',
+    'batch_get_related',
+    'batch_check_exists',
+    'invalidate_cache',
+    'get_cached_result',
+    'bump_generation',
+    'aget_filtered_queryset',
+    'aget_site_filter_params',
+    'get_queryset_for_model',
+]
+
 
 def get_queryset_for_model(model_class, site_id=None):
     """
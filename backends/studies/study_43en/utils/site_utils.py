@@ -11,9 +11,10 @@ OPTIMIZED: Redis caching integrated
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from django.core.exceptions import PermissionDenied
-from django.core.cache import cache
+from asgiref.sync import sync_to_async
 import logging
-import hashlib
+
+from backends.audit_logs.utils import site_utils as _shared_site_utils
 
 logger = logging.getLogger(__name__)
 
@@ -124,70 +125,38 @@ def get_site_filter_params(request):
 
 def get_filtered_queryset(model, site_filter, filter_type, use_cache=True):
     """
-    🚀 OPTIMIZED: Get filtered queryset với Redis caching
+    🚀 OPTIMIZED: Get filtered queryset với cached site-filter predicate
+    
+    Delegates to the shared implementation in audit_logs.utils.site_utils,
+    which caches the site predicate (not a PK list) per model/site filter.
     
     Args:
         model: Django model class
         site_filter: 'all' | str | list
         filter_type: 'all' | 'single' | 'multiple'
-        use_cache: Enable/disable caching (default True)
+        use_cache: Enable/disable predicate caching (default True)
     
     Returns:
         Filtered QuerySet using db_study_43en
     """
-    # 🔥 Cache key generation
-    if use_cache:
-        cache_key = _generate_cache_key('queryset', model.__name__, site_filter, filter_type)
-        
-        # Try to get from cache
-        cached_pks = cache.get(cache_key)
-        if cached_pks is not None:
-            logger.debug(f"Cache HIT: [{model.__name__}] {len(cached_pks)} objects")
-            # Return queryset filtered by cached PKs
-            return model.objects.using(DB_ALIAS).filter(pk__in=cached_pks)
-    
-    # Cache MISS - query database
-    if filter_type == 'all':
-        logger.debug(f"[{model.__name__}] Query all sites")
-        queryset = model.objects.using(DB_ALIAS)
-    
-    elif filter_type == 'multiple':
-        logger.debug(f"[{model.__name__}] Query multiple sites: {site_filter}")
-        
-        if not site_filter:
-            logger.warning(f"[{model.__name__}] Empty site filter - returning empty")
-            return model.objects.using(DB_ALIAS).none()
-        
-        # Use manager's filter_by_site which handles multiple sites
-        queryset = model.site_objects.using(DB_ALIAS).filter_by_site(site_filter)
-    
-    else:  # filter_type == 'single'
-        logger.debug(f"[{model.__name__}] Query single site: {site_filter}")
-        queryset = model.site_objects.using(DB_ALIAS).filter_by_site(site_filter)
-    
-    # 🔥 Cache the result (PKs only to save memory)
-    if use_cache:
-        try:
-            pks = list(queryset.values_list('pk', flat=True))
-            cache.set(cache_key, pks, CACHE_TIMEOUT_SHORT)
-            logger.debug(f"Cached: [{model.__name__}] {len(pks)} objects")
-        except Exception as e:
-            logger.warning(f"Failed to cache queryset: {e}")
-    
-    return queryset
+    return _shared_site_utils.get_filtered_queryset(
+        model, site_filter, filter_type, use_cache=use_cache, db_alias=DB_ALIAS
+    )
+
+
+async def aget_site_filter_params(request):
+    """Async get_site_filter_params() (ASGI views)"""
+    return await sync_to_async(get_site_filter_params)(request)
 
 
-def _generate_cache_key(*args):
+async def aget_filtered_queryset(model, site_filter, filter_type, use_cache=True):
     """
-    Generate unique cache key from arguments
-    
-    Example: 'site_query_SCR_CASE_all_all_v1'
+    Async get_filtered_queryset() (ASGI views) - no database access;
+    evaluate with acount() / async for
     """
-    # Create deterministic hash
-    content = '_'.join(str(arg) for arg in args)
-    hash_suffix = hashlib.md5(content.encode()).hexdigest()[:8]
-    
-    return f"site_query_{hash_suffix}_v1"
+    return await _shared_site_utils.aget_filtered_queryset(
+        model, site_filter, filter_type, use_cache=use_cache, db_alias=DB_ALIAS
+    )
 
 
 def batch_get_related(primary_instances, related_model, fk_field, site_filter, filter_type):
@@ -285,21 +254,32 @@ def batch_check_exists(instances, check_models, fk_field, site_filter, filter_ty
 
 def invalidate_cache(model_name=None, site_filter=None):
     """
-    🗑️ Invalidate cache khi có data changes
+    🗑️ Invalidate cached site-filter predicates + cached results (generation bump)
     
     Args:
         model_name: Specific model to invalidate (None = all)
         site_filter: Specific site filter (None = all)
     """
-    if model_name and site_filter:
-        # Invalidate specific cache
-        pattern = f"site_query_*{model_name}*{site_filter}*"
-        cache.delete_pattern(pattern)
-        logger.info(f"🗑️ Invalidated cache: {model_name} @ {site_filter}")
-    else:
-        # Invalidate all site query cache
-        cache.delete_pattern("site_query_*")
-        logger.info(f"🗑️ Invalidated all site query cache")
+    _shared_site_utils.invalidate_cache(model_name, site_filter, db_alias=DB_ALIAS)
+
+
+def get_cached_result(model, site_filter, filter_type, name, compute,
+                      timeout=_shared_site_utils.CACHE_TIMEOUT_SHORT, depends_on=()):
+    """
+    🚀 Cached result của site-filtered query (generation namespace, db_study_43en)
+    
+    Ghi dữ liệu (save/delete) tăng generation của model → key mới, không cần
+    xóa theo pattern.
+    """
+    return _shared_site_utils.get_cached_result(
+        model, site_filter, filter_type, name, compute,
+        db_alias=DB_ALIAS, timeout=timeout, depends_on=depends_on
+    )
+
+
+def bump_generation(model):
+    """Invalidate cached results của model (sau commit) - cho QuerySet.update()/bulk writes"""
+    _shared_site_utils.bump_generation(model, db_alias=DB_ALIAS)
 
 
 def get_site_filtered_object_or_404(model, site_filter, filter_type, **kwargs):
@@ -0,0 +1,804 @@
+# Generated by Django 5.1.15 on 2026-10-16 20:12
+
+import django.core.validators
+import django.db.models.deletion
+import django.utils.timezone
+import encrypted_fields.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Schema of study_44en before its first tracked migration; mark it applied
+    # on databases created from it: migrate study_44en 0001 --fake --database db_study_44en
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FollowUp_Hospitalization',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('HOSPITAL_TYPE', models.CharField(choices=[('central', 'Bệnh viện trung ương'), ('city', 'Bệnh viện thành phố'), ('district', 'Bệnh viện quận, huyện'), ('private', 'Bệnh viện tư'), ('other', 'Other')], db_index=True, max_length=20)),
+                ('HOSPITAL_OTHER', models.CharField(blank=True, max_length=200, null=True)),
+                ('DURATION', models.CharField(blank=True, choices=[('1-3', '1-3 ngày'), ('3-5', '3-5 ngày'), ('5-7', '5-7 ngày'), ('>7', 'Trên 7 ngày')], max_length=10, null=True)),
+            ],
+            options={
+                'verbose_name': 'Follow-up Hospitalization',
+                'verbose_name_plural': 'Follow-up Hospitalizations',
+                'db_table': 'FollowUp_Hospitalization',
+                'ordering': ['FOLLOW_UP', 'HOSPITAL_TYPE'],
+            },
+        ),
+        migrations.CreateModel(
+            name='HH_Animal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('ANIMAL_TYPE', models.CharField(choices=[('dog', 'Dog'), ('cat', 'Cat'), ('cow', 'Cow'), ('bird', 'Bird'), ('poultry', 'Chicken/Duck'), ('other', 'Other')], db_index=True, max_length=20)),
+                ('ANIMAL_TYPE_OTHER', models.CharField(blank=True, max_length=200, null=True)),
+            ],
+            options={
+                'verbose_name': 'Animal',
+                'verbose_name_plural': 'Animals',
+                'db_table': 'HH_Animal',
+                'ordering': ['HHID', 'ANIMAL_TYPE'],
+            },
+        ),
+        migrations.CreateModel(
+            name='HH_CASE',
+            fields=[
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('HHID', models.CharField(max_length=50, primary_key=True, serialize=False, verbose_name='Household ID')),
+                ('STUDYID', models.CharField(default='44EN', max_length=50, verbose_name='Study ID')),
+                ('RESPONDENT_MEMBER_NUM', models.IntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(10)], verbose_name='Respondent Member Number')),
+                ('TOTAL_MEMBERS', models.IntegerField(blank=True, db_index=True, null=True, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(10)], verbose_name='Total Household Members')),
+                ('MONTHLY_INCOME', models.CharField(blank=True, choices=[('<15', '< 15 million VND'), ('15-30', '15-30 million VND'), ('31-50', '31-50 million VND'), ('>50', '> 50 million VND')], db_index=True, max_length=10, null=True, verbose_name='Average Monthly Household Income')),
+                ('OWNERSHIP', models.CharField(blank=True, choices=[('rented', 'Rented'), ('owned', 'Owned')], max_length=20, null=True, verbose_name='House Ownership')),
+                ('LAND_AREA', models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(0)], verbose_name='Land Area (m²)')),
+                ('NUM_FLOORS', models.IntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(1)], verbose_name='Number of Floors')),
+                ('NUM_ROOMS', models.IntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(0)], verbose_name='Number of Rooms')),
+                ('HOUSING_TYPE', models.CharField(blank=True, choices=[('permanent', 'Permanent house'), ('temporary', 'Temporary/rudimentary house'), ('other', 'Other')], max_length=20, null=True, verbose_name='Housing Type')),
+                ('HOUSING_TYPE_OTHER', models.CharField(blank=True, max_length=200, null=True, verbose_name='Other Housing Type')),
+                ('FLOOR_MATERIAL', models.CharField(blank=True, choices=[('ceramic', 'Ceramic/Granite tiles'), ('wood', 'Wooden floor'), ('vinyl', 'Vinyl/Plastic floor'), ('stone', 'Natural stone'), ('concrete', 'Concrete/Cement'), ('other', 'Other')], max_length=20, null=True, verbose_name='Floor Material')),
+                ('FLOOR_MATERIAL_OTHER', models.CharField(blank=True, max_length=200, null=True, verbose_name='Other Floor Material')),
+                ('ROOF_MATERIAL', models.CharField(blank=True, choices=[('concrete', 'Reinforced concrete'), ('metal', 'Metal sheets/Corrugated iron'), ('tile', 'Tiles'), ('fiber', 'Fiber cement sheets'), ('other', 'Other')], max_length=20, null=True, verbose_name='Roof Material')),
+                ('ROOF_MATERIAL_OTHER', models.CharField(blank=True, max_length=200, null=True, verbose_name='Other Roof Material')),
+                ('TV', models.BooleanField(default=False, verbose_name='Television')),
+                ('AC', models.BooleanField(default=False, verbose_name='Air Conditioner')),
+                ('COMPUTER', models.BooleanField(default=False, verbose_name='Desktop/Laptop')),
+                ('REFRIGERATOR', models.BooleanField(default=False, verbose_name='Refrigerator')),
+                ('INTERNET', models.BooleanField(default=False, verbose_name='Internet Access')),
+                ('WASHING_MACHINE', models.BooleanField(default=False, verbose_name='Washing Machine')),
+                ('MOBILE_PHONE', models.BooleanField(default=False, verbose_name='Mobile Phone')),
+                ('WATER_HEATER', models.BooleanField(default=False, verbose_name='Water Heater')),
+                ('BICYCLE', models.BooleanField(default=False, verbose_name='Bicycle')),
+                ('GAS_STOVE', models.BooleanField(default=False, verbose_name='Gas Stove')),
+                ('MOTORCYCLE', models.BooleanField(default=False, verbose_name='Motorcycle')),
+                ('INDUCTION_COOKER', models.BooleanField(default=False, verbose_name='Induction Cooker')),
+                ('CAR', models.BooleanField(default=False, verbose_name='Car')),
+                ('RICE_COOKER', models.BooleanField(default=False, verbose_name='Rice Cooker')),
+            ],
+            options={
+                'verbose_name': 'Household Case',
+                'verbose_name_plural': 'Household Cases',
+                'db_table': 'HH_CASE',
+                'ordering': ['HHID'],
+            },
+        ),
+        migrations.CreateModel(
+            name='HH_Member',
+            fields=[
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('MEMBERID', models.CharField(blank=True, max_length=50, primary_key=True, serialize=False, verbose_name='Member ID')),
+                ('MEMBER_NUM', models.IntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(10)], verbose_name='Member Number')),
+                ('RELATIONSHIP', models.CharField(blank=True, choices=[('A', 'Household head'), ('B', 'Wife'), ('C', 'Husband'), ('D', 'Child'), ('E', 'Parent'), ('F', 'Grandparent'), ('G', 'Other')], max_length=5, null=True, verbose_name='Relationship')),
+                ('CHILD_ORDER', models.IntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(1)], verbose_name='Child Order')),
+                ('BIRTH_YEAR', models.IntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(1900)], verbose_name='Birth Year')),
+                ('GENDER', models.CharField(blank=True, choices=[('Male', 'Male'), ('Female', 'Female')], max_length=10, null=True, verbose_name='Gender')),
+                ('ISRESPONDENT', models.BooleanField(default=False, verbose_name='Is Respondent')),
+            ],
+            options={
+                'verbose_name': 'Household Member',
+                'verbose_name_plural': 'Household Members',
+                'db_table': 'HH_Member',
+                'ordering': ['HHID', 'MEMBER_NUM'],
+            },
+        ),
+        migrations.CreateModel(
+            name='HH_WaterSource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('SOURCE_TYPE', models.CharField(choices=[('tap', 'Tap water'), ('bottled', 'Bottled water'), ('well', 'Well water'), ('rain', 'Rain water'), ('river', 'River water'), ('pond', 'Pond/Lake water'), ('other', 'Other')], db_index=True, max_length=20)),
+                ('SOURCE_TYPE_OTHER', models.CharField(blank=True, max_length=200, null=True)),
+                ('DRINKING', models.BooleanField(default=False)),
+                ('LIVING', models.BooleanField(default=False)),
+                ('IRRIGATION', models.BooleanField(default=False)),
+                ('OTHER', models.BooleanField(default=False)),
+                ('OTHER_PURPOSE', models.CharField(blank=True, max_length=200, null=True)),
+            ],
+            options={
+                'verbose_name': 'Water Source',
+                'verbose_name_plural': 'Water Sources',
+                'db_table': 'HH_WaterSource',
+                'ordering': ['HHID', 'SOURCE_TYPE'],
+            },
+        ),
+        migrations.CreateModel(
+            name='HH_WaterTreatment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('TREATMENT_TYPE', models.CharField(choices=[('boiling', 'Boiling'), ('filter_machine', 'Filter machine'), ('filter_portable', 'Portable filter'), ('chemical', 'Chemical disinfection'), ('sodis', 'Solar disinfection (SODIS)'), ('other', 'Other')], db_index=True, max_length=20)),
+                ('TREATMENT_TYPE_OTHER', models.CharField(blank=True, max_length=200, null=True)),
+            ],
+            options={
+                'verbose_name': 'Water Treatment Method',
+                'verbose_name_plural': 'Water Treatment Methods',
+                'db_table': 'HH_WaterTreatment',
+                'ordering': ['HHID', 'TREATMENT_TYPE'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Individual_Comorbidity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('COMORBIDITY_TYPE', models.CharField(choices=[('hypertension', 'Cao huyết áp'), ('diabetes', 'Đái tháo đường'), ('dyslipidemia', 'Rối loạn mỡ máu'), ('cardiovascular', 'Bệnh tim mạch'), ('asthma', 'Hen suyễn'), ('copd', 'Bệnh COPD'), ('osteoarthritis', 'Thoái hoá khớp'), ('osteoporosis', 'Loãng xương'), ('dementia', 'Sa sút trí tuệ'), ('stroke', 'Tai biến'), ('depression', 'Trầm cảm'), ('chronic_kidney', 'Suy thận mạn'), ('chronic_hepatitis', 'Viêm gan mạn'), ('gerd', 'Viêm dạ dày trào ngược'), ('chronic_infection', 'Nhiễm trùng mạn tính'), ('obesity', 'Béo phì'), ('alcohol_addiction', 'Nghiện bia rượu'), ('tobacco_addiction', 'Nghiện thuốc lá'), ('other', 'Other')], db_index=True, max_length=30)),
+                ('COMORBIDITY_OTHER', models.CharField(blank=True, max_length=200, null=True)),
+                ('TREATMENT_STATUS', models.CharField(blank=True, choices=[('treating', 'Đang điều trị'), ('not_treating', 'Không điều trị')], max_length=20, null=True)),
+            ],
+            options={
+                'verbose_name': 'Comorbidity',
+                'verbose_name_plural': 'Comorbidities',
+                'db_table': 'Individual_Comorbidity',
+                'ordering': ['MEMBERID', 'COMORBIDITY_TYPE'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Individual_FollowUp',
+            fields=[
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('FUID', models.CharField(editable=False, max_length=50, primary_key=True, serialize=False, verbose_name='Follow-up ID')),
+                ('VISIT_TIME', models.CharField(choices=[('day_14', 'Day 14 ± 3'), ('day_28', 'Day 28 ± 3'), ('day_90', 'Day 90 ± 3')], db_index=True, max_length=10)),
+                ('ASSESSED', models.CharField(blank=True, choices=[('yes', 'Yes'), ('no', 'No'), ('na', 'Not applicable')], max_length=10, null=True, verbose_name='Was Assessed')),
+                ('ASSESSMENT_DATE', models.DateField(blank=True, null=True, verbose_name='Assessment Date')),
+                ('HAS_SYMPTOMS', models.CharField(blank=True, choices=[('yes', 'Yes'), ('no', 'No'), ('na', 'Not applicable')], max_length=10, null=True, verbose_name='Has Symptoms')),
+                ('HOSPITALIZED', models.CharField(blank=True, choices=[('yes', 'Yes'), ('no', 'No'), ('na', 'Not applicable')], max_length=10, null=True, verbose_name='Hospitalized')),
+                ('USED_MEDICATION', models.CharField(blank=True, choices=[('yes', 'Yes'), ('no', 'No'), ('na', 'Not applicable')], max_length=10, null=True, verbose_name='Used Medication')),
+                ('ANTIBIOTIC_TYPE', models.CharField(blank=True, max_length=500, null=True, verbose_name='Antibiotic Type')),
+                ('STEROID_TYPE', models.CharField(blank=True, max_length=500, null=True, verbose_name='Steroid Type')),
+                ('OTHER_MEDICATION', models.CharField(blank=True, max_length=500, null=True, verbose_name='Other Medication')),
+            ],
+            options={
+                'verbose_name': 'Follow-up Visit',
+                'verbose_name_plural': 'Follow-up Visits',
+                'db_table': 'Individual_FollowUp',
+                'ordering': ['MEMBERID', 'VISIT_TIME'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Individual_Hospitalization',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('HOSPITAL_TYPE', models.CharField(choices=[('central', 'Bệnh viện trung ương'), ('city', 'Bệnh viện thành phố'), ('district', 'Bệnh viện quận, huyện'), ('private', 'Bệnh viện tư'), ('other', 'Other')], db_index=True, max_length=20)),
+                ('HOSPITAL_OTHER', models.CharField(blank=True, max_length=200, null=True)),
+                ('DURATION', models.CharField(blank=True, choices=[('1-3', '1-3 ngày'), ('3-5', '3-5 ngày'), ('5-7', '5-7 ngày'), ('>7', 'Trên 7 ngày')], max_length=10, null=True)),
+            ],
+            options={
+                'verbose_name': 'Hospitalization',
+                'verbose_name_plural': 'Hospitalizations',
+                'db_table': 'Individual_Hospitalization',
+                'ordering': ['MEMBERID', 'HOSPITAL_TYPE'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Individual_Medication',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('MEDICATION_TYPE', models.CharField(choices=[('antibiotic', 'Kháng sinh'), ('acid_suppressor', 'Thuốc ức chế acid dịch vị'), ('chronic_disease', 'Thuốc trị bệnh mạn tính'), ('probiotics', 'Probiotics và prebiotics'), ('herbal', 'Thuốc thảo dược, đông y')], db_index=True, max_length=30)),
+                ('MEDICATION_DETAIL', models.CharField(blank=True, max_length=500, null=True, verbose_name='Medication Detail')),
+                ('DURATION', models.CharField(blank=True, choices=[('1-3', '1-3 ngày'), ('3-5', '3-5 ngày'), ('5-7', '5-7 ngày'), ('7-14', '7-14 ngày'), ('>14', '> 14 ngày')], max_length=10, null=True)),
+            ],
+            options={
+                'verbose_name': 'Medication',
+                'verbose_name_plural': 'Medications',
+                'db_table': 'Individual_Medication',
+                'ordering': ['MEMBERID', 'MEDICATION_TYPE'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Individual_Sample',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('SAMPLE_TIME', models.CharField(choices=[('baseline', 'Ngày tham gia + 3'), ('day_14', 'Ngày 14 ± 3'), ('day_28', 'Ngày 28 ± 3'), ('day_90', 'Ngày 90 ± 3')], db_index=True, max_length=10)),
+                ('SAMPLE_COLLECTED', models.CharField(blank=True, choices=[('yes', 'Yes'), ('no', 'No'), ('na', 'Not applicable')], max_length=10, null=True, verbose_name='Sample Collected')),
+                ('STOOL_DATE', models.DateField(blank=True, null=True, verbose_name='Stool Sample Date')),
+                ('THROAT_SWAB_DATE', models.DateField(blank=True, null=True, verbose_name='Throat Swab Date')),
+                ('NOT_COLLECTED_REASON', models.CharField(blank=True, max_length=500, null=True, verbose_name='Reason Not Collected')),
+            ],
+            options={
+                'verbose_name': 'Sample Collection',
+                'verbose_name_plural': 'Sample Collections',
+                'db_table': 'Individual_Sample',
+                'ordering': ['MEMBERID', 'SAMPLE_TIME'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Individual_Symptom',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('SYMPTOM_TYPE', models.CharField(choices=[('fatigue', 'Mệt mỏi'), ('fever', 'Sốt'), ('cough', 'Ho'), ('eye_pain', 'Đau mắt'), ('red_eyes', 'Đỏ mắt'), ('muscle_pain', 'Đau nhức cơ'), ('anorexia', 'Chán ăn'), ('dyspnea', 'Thở mệt'), ('jaundice', 'Vàng da'), ('headache', 'Nhức đầu'), ('dysuria', 'Tiểu gắt/buốt'), ('hematuria', 'Tiểu đỏ'), ('difficult_urination', 'Tiểu khó/lắt nhắt'), ('pyuria', 'Tiểu mủ/đục/hôi'), ('vomiting', 'Nôn ói'), ('nausea', 'Buồn nôn'), ('diarrhea', 'Tiêu chảy'), ('abdominal_pain', 'Đau bụng'), ('other', 'Other')], db_index=True, max_length=30)),
+                ('SYMPTOM_OTHER', models.CharField(blank=True, max_length=200, null=True)),
+            ],
+            options={
+                'verbose_name': 'Symptom',
+                'verbose_name_plural': 'Symptoms',
+                'db_table': 'FollowUp_Symptom',
+                'ordering': ['FOLLOW_UP', 'SYMPTOM_TYPE'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Individual_Travel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('TRAVEL_TYPE', models.CharField(choices=[('international', 'Nước ngoài'), ('domestic', 'Tỉnh thành trong nước')], db_index=True, max_length=20)),
+                ('FREQUENCY', models.CharField(blank=True, choices=[('daily', 'Mỗi ngày'), ('1-2/week', '1-2 lần/tuần'), ('1-2/month', '1-2 lần/tháng'), ('<1/month', '< 1 lần/tháng'), ('never', 'Không đi')], max_length=15, null=True)),
+            ],
+            options={
+                'verbose_name': 'Travel History',
+                'verbose_name_plural': 'Travel Histories',
+                'db_table': 'Individual_Travel',
+                'ordering': ['MEMBERID', 'TRAVEL_TYPE'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Individual_Vaccine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('VACCINE_TYPE', models.CharField(choices=[('bcg', 'BCG (bệnh lao)'), ('flu', 'Cúm'), ('rubella', 'Rubella'), ('hepatitis_a', 'Viêm gan A'), ('hib', 'Haemophilus influenzae type B'), ('chickenpox', 'Bệnh thuỷ đậu'), ('hepatitis_b', 'Viêm gan B'), ('polio', 'Sốt bại liệt'), ('japanese_encephalitis', 'Viêm não Nhật Bản'), ('diphtheria', 'Bạch hầu'), ('measles', 'Sởi'), ('meningitis', 'Viêm màng não'), ('tetanus', 'Uốn ván'), ('mumps', 'Quai bị'), ('rotavirus', 'Rotavirus'), ('pertussis', 'Ho gà'), ('rabies', 'Bệnh dại'), ('pneumococcal', 'Phế cầu khuẩn'), ('other', 'Other')], db_index=True, max_length=30)),
+                ('VACCINE_OTHER', models.CharField(blank=True, max_length=200, null=True)),
+            ],
+            options={
+                'verbose_name': 'Vaccine',
+                'verbose_name_plural': 'Vaccines',
+                'db_table': 'Individual_Vaccine',
+                'ordering': ['MEMBERID', 'VACCINE_TYPE'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Individual_WaterSource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('SOURCE_TYPE', models.CharField(choices=[('tap', 'Tap water'), ('bottled', 'Bottled water'), ('well', 'Well water'), ('rain', 'Rain water'), ('river', 'River water'), ('pond', 'Pond/Lake water'), ('other', 'Other')], db_index=True, max_length=20)),
+                ('SOURCE_TYPE_OTHER', models.CharField(blank=True, max_length=200, null=True)),
+                ('DRINKING', models.BooleanField(default=False)),
+                ('LIVING', models.BooleanField(default=False)),
+                ('IRRIGATION', models.BooleanField(default=False)),
+                ('FOR_OTHER', models.BooleanField(default=False)),
+                ('OTHER_PURPOSE', models.CharField(blank=True, max_length=200, null=True)),
+            ],
+            options={
+                'verbose_name': 'Individual Water Source',
+                'verbose_name_plural': 'Individual Water Sources',
+                'db_table': 'Individual_WaterSource',
+                'ordering': ['MEMBERID', 'SOURCE_TYPE'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Individual_WaterTreatment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('TREATMENT_TYPE', models.CharField(choices=[('boiling', 'Boiling'), ('filter_machine', 'Filter machine'), ('filter_portable', 'Portable filter'), ('chemical', 'Chemical disinfection'), ('sodis', 'Solar disinfection (SODIS)'), ('other', 'Other')], db_index=True, max_length=20)),
+                ('TREATMENT_TYPE_OTHER', models.CharField(blank=True, max_length=200, null=True)),
+            ],
+            options={
+                'verbose_name': 'Individual Water Treatment',
+                'verbose_name_plural': 'Individual Water Treatments',
+                'db_table': 'Individual_WaterTreatment',
+                'ordering': ['MEMBERID', 'TREATMENT_TYPE'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AuditLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_id', models.IntegerField(db_index=True, help_text='User ID from management database')),
+                ('username', models.CharField(db_index=True, help_text='Username backup', max_length=150)),
+                ('timestamp', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('action', models.CharField(choices=[('CREATE', 'Create'), ('UPDATE', 'Update'), ('VIEW', 'View')], db_index=True, max_length=10)),
+                ('model_name', models.CharField(db_index=True, help_text='CRF model (e.g., SCREENINGCASE)', max_length=100)),
+                ('patient_id', models.CharField(db_index=True, help_text='Patient identifier (USUBJID or SCRID)', max_length=50)),
+                ('SITEID', models.CharField(blank=True, db_index=True, help_text='Site code for filtering', max_length=10, null=True)),
+                ('reason', models.TextField(help_text='Combined change reason')),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('session_id', models.CharField(blank=True, max_length=40, null=True)),
+                ('checksum', models.CharField(editable=False, help_text='SHA-256 checksum for integrity verification', max_length=64)),
+                ('is_verified', models.BooleanField(default=True, help_text='Integrity status')),
+            ],
+            options={
+                'verbose_name': 'Audit Log',
+                'verbose_name_plural': 'Audit Logs',
+                'db_table': 'logging"."audit_log',
+                'db_table_comment': 'Audit log entries for tracking data changes',
+                'ordering': ['-timestamp'],
+                'default_permissions': ('add', 'view'),
+                'indexes': [models.Index(fields=['-timestamp'], name='s44_audit_log_time_idx'), models.Index(fields=['patient_id', '-timestamp'], name='s44_audit_log_patient_idx'), models.Index(fields=['user_id', '-timestamp'], name='s44_audit_log_user_idx'), models.Index(fields=['SITEID', '-timestamp'], name='s44_audit_log_site_idx'), models.Index(fields=['model_name', 'action'], name='s44_audit_log_model_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='AuditLogDetail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field_name', models.CharField(help_text='Technical field name', max_length=100)),
+                ('old_value', models.TextField(blank=True, help_text='Old value (as string)', null=True)),
+                ('new_value', models.TextField(blank=True, help_text='New value (as string)', null=True)),
+                ('reason', models.TextField(help_text='Reason for this specific field change')),
+                ('audit_log', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='details', to='study_44en.auditlog')),
+            ],
+            options={
+                'verbose_name': 'Audit Log Detail',
+                'verbose_name_plural': 'Audit Log Details',
+                'db_table': 'logging"."audit_log_detail',
+                'db_table_comment': 'Audit log detail entries for field-level changes',
+                'ordering': ['field_name'],
+                'default_permissions': ('add', 'view'),
+            },
+        ),
+        migrations.CreateModel(
+            name='HH_Exposure',
+            fields=[
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('HHID', models.OneToOneField(db_column='HHID', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='exposure', serialize=False, to='study_44en.hh_case')),
+                ('TOILET_TYPE', models.CharField(blank=True, choices=[('septic_flush', 'Toilet with septic tank'), ('no_septic', 'Toilet without septic tank'), ('outdoor', 'Outdoor toilet'), ('no_toilet', 'No toilet'), ('other', 'Other')], db_index=True, max_length=20, null=True)),
+                ('TOILET_TYPE_OTHER', models.CharField(blank=True, max_length=200, null=True)),
+                ('NUM_TOILETS', models.IntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(0)])),
+                ('COOKING_FUEL', models.CharField(blank=True, choices=[('gas', 'Gas'), ('coal', 'Coal'), ('wood', 'Wood/Firewood'), ('oil', 'Oil'), ('electricity', 'Electricity'), ('other', 'Other')], db_index=True, max_length=20, null=True)),
+                ('COOKING_FUEL_OTHER', models.CharField(blank=True, max_length=200, null=True)),
+                ('WATER_TREATMENT', models.CharField(blank=True, choices=[('yes', 'Yes'), ('no', 'No')], max_length=10, null=True)),
+                ('RAISES_ANIMALS', models.CharField(blank=True, choices=[('yes', 'Yes'), ('no', 'No')], max_length=10, null=True)),
+            ],
+            options={
+                'verbose_name': 'Household Exposure',
+                'verbose_name_plural': 'Household Exposures',
+                'db_table': 'HH_Exposure',
+            },
+        ),
+        migrations.CreateModel(
+            name='HH_FoodFrequency',
+            fields=[
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('HHID', models.OneToOneField(db_column='HHID', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='food_frequency', serialize=False, to='study_44en.hh_case')),
+                ('RICE_NOODLES', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('RED_MEAT', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('POULTRY', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('FISH_SEAFOOD', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('EGGS', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('RAW_VEGETABLES', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('COOKED_VEGETABLES', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('DAIRY', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('FERMENTED', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('BEER', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('ALCOHOL', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+            ],
+            options={
+                'verbose_name': 'Food Frequency',
+                'verbose_name_plural': 'Food Frequencies',
+                'db_table': 'HH_FoodFrequency',
+            },
+        ),
+        migrations.CreateModel(
+            name='HH_FoodSource',
+            fields=[
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('HHID', models.OneToOneField(db_column='HHID', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='food_source', serialize=False, to='study_44en.hh_case')),
+                ('TRADITIONAL_MARKET', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('SUPERMARKET', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('CONVENIENCE_STORE', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('RESTAURANT', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('ONLINE', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('SELF_GROWN', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('GIFTED', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('OTHER', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('OTHER_SPECIFY', models.CharField(blank=True, max_length=200, null=True)),
+            ],
+            options={
+                'verbose_name': 'Food Source',
+                'verbose_name_plural': 'Food Sources',
+                'db_table': 'HH_FoodSource',
+            },
+        ),
+        migrations.CreateModel(
+            name='HH_PERSONAL_DATA',
+            fields=[
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('HHID', models.OneToOneField(db_column='HHID', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='personal_data', serialize=False, to='study_44en.hh_case', verbose_name='Household ID')),
+                ('HOUSE_NUMBER', encrypted_fields.fields.EncryptedCharField(blank=True, help_text='House number, building name, apartment, etc. (encrypted)', max_length=255, null=True, verbose_name='House Number/Building Details')),
+                ('STREET', encrypted_fields.fields.EncryptedCharField(blank=True, help_text='Street or road name (encrypted)', max_length=255, null=True, verbose_name='Street/Road Name')),
+                ('WARD', encrypted_fields.fields.EncryptedCharField(blank=True, help_text='Ward or commune (encrypted)', max_length=255, null=True, verbose_name='Ward/Commune')),
+                ('CITY', encrypted_fields.fields.EncryptedCharField(blank=True, help_text='City (encrypted)', max_length=255, null=True, verbose_name='City')),
+            ],
+            options={
+                'verbose_name': 'Household Personal Data',
+                'verbose_name_plural': 'Household Personal Data',
+                'db_table': 'HH_PERSONAL_DATA',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='hh_case',
+            index=models.Index(fields=['TOTAL_MEMBERS'], name='idx_hh_members'),
+        ),
+        migrations.AddIndex(
+            model_name='hh_case',
+            index=models.Index(fields=['MONTHLY_INCOME'], name='idx_hh_income'),
+        ),
+        migrations.CreateModel(
+            name='Individual',
+            fields=[
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('MEMBERID', models.OneToOneField(db_column='MEMBERID', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='individual_info', serialize=False, to='study_44en.hh_member', verbose_name='Household Member')),
+                ('SUBJECTID', models.CharField(blank=True, db_index=True, editable=False, help_text='Auto-populated from MEMBERID. Format: 44EN-001-1', max_length=50, null=True, unique=True, verbose_name='Subject ID')),
+                ('INITIALS', models.CharField(blank=True, max_length=20, null=True, verbose_name='Name Initials')),
+                ('DATE_OF_BIRTH', models.DateField(blank=True, null=True, verbose_name='Date of Birth')),
+                ('AGE', models.IntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(150)], verbose_name='Age (if DOB unknown)')),
+                ('ETHNICITY', models.CharField(blank=True, choices=[('kinh', 'Kinh'), ('other', 'Other')], max_length=20, null=True, verbose_name='Ethnicity')),
+                ('ETHNICITY_OTHER', models.CharField(blank=True, max_length=100, null=True, verbose_name='Other Ethnicity')),
+                ('EDUCATION', models.CharField(blank=True, choices=[('illiterate', 'Không biết chữ'), ('literate', 'Biết đọc, biết viết'), ('not_school_age', 'Trẻ chưa đi học'), ('primary', 'Tiểu học'), ('secondary', 'Trung học cơ sở'), ('high_school', 'Trung học phổ thông'), ('vocational', 'Trường nghề/Trung cấp/Cao đẳng'), ('university', 'Đại học trở lên')], max_length=30, null=True, verbose_name='Education Level')),
+                ('OCCUPATION', models.CharField(blank=True, choices=[('leader', 'Lãnh đạo, quản lý'), ('high_professional', 'Nhà chuyên môn bậc cao'), ('mid_professional', 'Nhà chuyên môn bậc trung'), ('office_staff', 'Nhân viên trợ lý văn phòng'), ('service_sales', 'Nhân viên dịch vụ và bán hàng'), ('agriculture', 'Lao động nông nghiệp, lâm nghiệp, thủy sản'), ('craft', 'Lao động thủ công'), ('machine_operator', 'Thợ lắp ráp và vận hành máy móc'), ('elementary', 'Lao động giản đơn'), ('armed_forces', 'Lực lượng vũ trang'), ('retired', 'Hưu trí/Mất sức lao động'), ('student', 'Còn nhỏ/Đi học'), ('unemployed', 'Không có việc làm')], max_length=30, null=True, verbose_name='Occupation')),
+                ('OCCUPATION_DETAIL', models.CharField(blank=True, max_length=200, null=True, verbose_name='Occupation Detail')),
+                ('INDIVIDUAL_INCOME', models.CharField(blank=True, choices=[('none', 'Không có thu nhập'), ('<5', '< 5 triệu'), ('5-12', '5-12 triệu'), ('13-25', '13-25 triệu'), ('>25', '> 25 triệu')], max_length=10, null=True, verbose_name='Monthly Income')),
+                ('HAS_HEALTH_INSURANCE', models.CharField(blank=True, choices=[('yes', 'Yes'), ('no', 'No')], max_length=10, null=True, verbose_name='Has Health Insurance')),
+            ],
+            options={
+                'verbose_name': 'Individual',
+                'verbose_name_plural': 'Individuals',
+                'db_table': 'Individual',
+            },
+        ),
+        migrations.AddField(
+            model_name='hh_member',
+            name='HHID',
+            field=models.ForeignKey(db_column='HHID', on_delete=django.db.models.deletion.CASCADE, related_name='members', to='study_44en.hh_case'),
+        ),
+        migrations.AddField(
+            model_name='followup_hospitalization',
+            name='FOLLOW_UP',
+            field=models.ForeignKey(db_column='FUID', on_delete=django.db.models.deletion.CASCADE, related_name='hospitalizations', to='study_44en.individual_followup'),
+        ),
+        migrations.AddField(
+            model_name='individual_symptom',
+            name='FOLLOW_UP',
+            field=models.ForeignKey(db_column='FUID', on_delete=django.db.models.deletion.CASCADE, related_name='symptoms', to='study_44en.individual_followup'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlogdetail',
+            index=models.Index(fields=['audit_log', 'field_name'], name='s44_audit_detail_idx'),
+        ),
+        migrations.AddField(
+            model_name='hh_watertreatment',
+            name='HHID',
+            field=models.ForeignKey(db_column='HHID', on_delete=django.db.models.deletion.CASCADE, related_name='treatment_methods', to='study_44en.hh_exposure'),
+        ),
+        migrations.AddField(
+            model_name='hh_watersource',
+            name='HHID',
+            field=models.ForeignKey(db_column='HHID', on_delete=django.db.models.deletion.CASCADE, related_name='water_sources', to='study_44en.hh_exposure'),
+        ),
+        migrations.AddIndex(
+            model_name='hh_exposure',
+            index=models.Index(fields=['TOILET_TYPE'], name='idx_exp_toilet'),
+        ),
+        migrations.AddIndex(
+            model_name='hh_exposure',
+            index=models.Index(fields=['COOKING_FUEL'], name='idx_exp_fuel'),
+        ),
+        migrations.AddIndex(
+            model_name='hh_exposure',
+            index=models.Index(fields=['WATER_TREATMENT'], name='idx_exp_water'),
+        ),
+        migrations.AddIndex(
+            model_name='hh_exposure',
+            index=models.Index(fields=['RAISES_ANIMALS'], name='idx_exp_animals'),
+        ),
+        migrations.AddConstraint(
+            model_name='hh_exposure',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('TOILET_TYPE', 'other'), _negated=True), ('TOILET_TYPE_OTHER__isnull', False), _connector='OR'), name='hh_toilet_type_other_detail', violation_error_message='Please specify other toilet type'),
+        ),
+        migrations.AddConstraint(
+            model_name='hh_exposure',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('COOKING_FUEL', 'other'), _negated=True), ('COOKING_FUEL_OTHER__isnull', False), _connector='OR'), name='hh_cooking_fuel_other_detail', violation_error_message='Please specify other cooking fuel'),
+        ),
+        migrations.AddConstraint(
+            model_name='hh_exposure',
+            constraint=models.CheckConstraint(condition=models.Q(('NUM_TOILETS__isnull', True), models.Q(('NUM_TOILETS__gte', 0), ('NUM_TOILETS__lte', 10)), _connector='OR'), name='hh_num_toilets_range', violation_error_message='Number of toilets must be between 0 and 10'),
+        ),
+        migrations.AddField(
+            model_name='hh_animal',
+            name='HHID',
+            field=models.ForeignKey(db_column='HHID', on_delete=django.db.models.deletion.CASCADE, related_name='animals', to='study_44en.hh_exposure'),
+        ),
+        migrations.AddIndex(
+            model_name='hh_personal_data',
+            index=models.Index(fields=['last_modified_by_id', '-last_modified_at'], name='idx_hhpdata_modified'),
+        ),
+        migrations.CreateModel(
+            name='Individual_Exposure',
+            fields=[
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('MEMBERID', models.OneToOneField(db_column='MEMBERID', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='exposure', serialize=False, to='study_44en.individual', verbose_name='Individual')),
+                ('SHARED_TOILET', models.CharField(blank=True, choices=[('yes', 'Yes'), ('no', 'No')], max_length=10, null=True, verbose_name='Uses Shared Toilet')),
+                ('WATER_TREATMENT', models.CharField(blank=True, choices=[('yes', 'Yes'), ('no', 'No')], max_length=10, null=True, verbose_name='Treats Water')),
+                ('HAS_COMORBIDITY', models.CharField(blank=True, choices=[('yes', 'Yes'), ('no', 'No')], max_length=10, null=True, verbose_name='Has Comorbidity')),
+                ('VACCINATION_STATUS', models.CharField(blank=True, choices=[('never', 'Never vaccinated'), ('not_remember', 'Not remember'), ('vaccinated_not_remember', 'Vaccinated but not remember type'), ('vaccinated_specific', 'Vaccinated specific diseases')], max_length=30, null=True, verbose_name='Vaccination Status')),
+                ('HOSPITALIZED_3M', models.CharField(blank=True, choices=[('yes', 'Yes'), ('no', 'No')], max_length=10, null=True, verbose_name='Hospitalized (3 months)')),
+                ('MEDICATION_3M', models.CharField(blank=True, choices=[('yes', 'Yes'), ('no', 'No'), ('unknown', "Don't know")], max_length=20, null=True, verbose_name='Used Medication (3 months)')),
+            ],
+            options={
+                'verbose_name': 'Individual Exposure',
+                'verbose_name_plural': 'Individual Exposures',
+                'db_table': 'Individual_Exposure',
+            },
+        ),
+        migrations.CreateModel(
+            name='Individual_FoodFrequency',
+            fields=[
+                ('version', models.IntegerField(default=0, editable=False, help_text='Version number for optimistic locking')),
+                ('last_modified_by_id', models.IntegerField(blank=True, db_index=True, editable=False, help_text='User ID who last modified this record', null=True)),
+                ('last_modified_by_username', models.CharField(blank=True, db_index=True, editable=False, help_text='Username backup for audit trail', max_length=150, null=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True, db_index=True, help_text='Timestamp of last modification')),
+                ('MEMBERID', models.OneToOneField(db_column='MEMBERID', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='food_frequency', serialize=False, to='study_44en.individual')),
+                ('RICE_NOODLES', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('RED_MEAT', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('POULTRY', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('FISH_SEAFOOD', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('EGGS', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('RAW_VEGETABLES', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('COOKED_VEGETABLES', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('DAIRY', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('FERMENTED', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('BEER', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+                ('ALCOHOL', models.CharField(blank=True, choices=[('never', 'Never'), ('1-3/month', '1-3 times/month'), ('1-2/week', '1-2 times/week'), ('3-5/week', '3-5 times/week'), ('1/day', '1 time/day'), ('2+/day', '2+ times/day')], max_length=15, null=True)),
+            ],
+            options={
+                'verbose_name': 'Individual Food Frequency',
+                'verbose_name_plural': 'Individual Food Frequencies',
+                'db_table': 'Individual_FoodFrequency',
+            },
+        ),
+        migrations.AddField(
+            model_name='individual_travel',
+            name='MEMBERID',
+            field=models.ForeignKey(db_column='MEMBERID', on_delete=django.db.models.deletion.CASCADE, related_name='travel_history', to='study_44en.individual'),
+        ),
+        migrations.AddField(
+            model_name='individual_sample',
+            name='MEMBERID',
+            field=models.ForeignKey(db_column='MEMBERID', on_delete=django.db.models.deletion.CASCADE, related_name='samples', to='study_44en.individual'),
+        ),
+        migrations.AddField(
+            model_name='individual_followup',
+            name='MEMBERID',
+            field=models.ForeignKey(db_column='MEMBERID', on_delete=django.db.models.deletion.CASCADE, related_name='follow_ups', to='study_44en.individual'),
+        ),
+        migrations.AddIndex(
+            model_name='individual',
+            index=models.Index(fields=['SUBJECTID'], name='idx_individual_subjectid'),
+        ),
+        migrations.AddConstraint(
+            model_name='individual',
+            constraint=models.CheckConstraint(condition=models.Q(('DATE_OF_BIRTH__isnull', False), ('AGE__isnull', False), _connector='OR'), name='individual_dob_or_age_required', violation_error_message='Either Date of Birth or Age must be provided'),
+        ),
+        migrations.AddConstraint(
+            model_name='individual',
+            constraint=models.CheckConstraint(condition=models.Q(('AGE__isnull', True), models.Q(('AGE__gte', 0), ('AGE__lte', 150)), _connector='OR'), name='individual_age_reasonable', violation_error_message='Age must be between 0 and 150'),
+        ),
+        migrations.AddConstraint(
+            model_name='individual',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('ETHNICITY', 'other'), _negated=True), ('ETHNICITY_OTHER__isnull', False), _connector='OR'), name='individual_ethnicity_other_detail', violation_error_message='Please specify other ethnicity'),
+        ),
+        migrations.AddIndex(
+            model_name='hh_member',
+            index=models.Index(fields=['HHID', 'MEMBER_NUM'], name='idx_hhmem_hh_num'),
+        ),
+        migrations.AddIndex(
+            model_name='hh_member',
+            index=models.Index(fields=['RELATIONSHIP', 'CHILD_ORDER'], name='idx_hhmem_child'),
+        ),
+        migrations.AddConstraint(
+            model_name='hh_member',
+            constraint=models.UniqueConstraint(condition=models.Q(('ISRESPONDENT', True)), fields=('HHID',), name='unique_respondent'),
+        ),
+        migrations.AddConstraint(
+            model_name='hh_member',
+            constraint=models.UniqueConstraint(condition=models.Q(('RELATIONSHIP', 'D')), fields=('HHID', 'CHILD_ORDER'), name='unique_child_order'),
+        ),
+        migrations.AddConstraint(
+            model_name='hh_member',
+            constraint=models.CheckConstraint(condition=models.Q(('MEMBER_NUM__gte', 1), ('MEMBER_NUM__lte', 10)), name='hh_member_num_range', violation_error_message='Member number must be between 1 and 10'),
+        ),
+        migrations.AddConstraint(
+            model_name='hh_member',
+            constraint=models.CheckConstraint(condition=models.Q(('BIRTH_YEAR__isnull', True), models.Q(('BIRTH_YEAR__gte', 1900), ('BIRTH_YEAR__lte', 2025)), _connector='OR'), name='hh_member_birth_year_range', violation_error_message='Birth year must be between 1900 and current year'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='followup_hospitalization',
+            unique_together={('FOLLOW_UP', 'HOSPITAL_TYPE')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='individual_symptom',
+            unique_together={('FOLLOW_UP', 'SYMPTOM_TYPE')},
+        ),
+        migrations.AddIndex(
+            model_name='hh_watertreatment',
+            index=models.Index(fields=['HHID', 'TREATMENT_TYPE'], name='idx_treatment_hh_type'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='hh_watertreatment',
+            unique_together={('HHID', 'TREATMENT_TYPE')},
+        ),
+        migrations.AddIndex(
+            model_name='hh_watersource',
+            index=models.Index(fields=['HHID', 'SOURCE_TYPE'], name='idx_water_hh_type'),
+        ),
+        migrations.AddIndex(
+            model_name='hh_watersource',
+            index=models.Index(fields=['DRINKING'], name='idx_water_drinking'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='hh_watersource',
+            unique_together={('HHID', 'SOURCE_TYPE')},
+        ),
+        migrations.AddIndex(
+            model_name='hh_animal',
+            index=models.Index(fields=['HHID', 'ANIMAL_TYPE'], name='idx_animal_hh_type'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='hh_animal',
+            unique_together={('HHID', 'ANIMAL_TYPE')},
+        ),
+        migrations.AddField(
+            model_name='individual_watertreatment',
+            name='MEMBERID',
+            field=models.ForeignKey(db_column='MEMBERID', on_delete=django.db.models.deletion.CASCADE, related_name='treatment_methods', to='study_44en.individual_exposure'),
+        ),
+        migrations.AddField(
+            model_name='individual_watersource',
+            name='MEMBERID',
+            field=models.ForeignKey(db_column='MEMBERID', on_delete=django.db.models.deletion.CASCADE, related_name='water_sources', to='study_44en.individual_exposure'),
+        ),
+        migrations.AddField(
+            model_name='individual_vaccine',
+            name='MEMBERID',
+            field=models.ForeignKey(db_column='MEMBERID', on_delete=django.db.models.deletion.CASCADE, related_name='vaccines', to='study_44en.individual_exposure'),
+        ),
+        migrations.AddField(
+            model_name='individual_medication',
+            name='MEMBERID',
+            field=models.ForeignKey(db_column='MEMBERID', on_delete=django.db.models.deletion.CASCADE, related_name='medications', to='study_44en.individual_exposure'),
+        ),
+        migrations.AddField(
+            model_name='individual_hospitalization',
+            name='MEMBERID',
+            field=models.ForeignKey(db_column='MEMBERID', on_delete=django.db.models.deletion.CASCADE, related_name='hospitalizations', to='study_44en.individual_exposure'),
+        ),
+        migrations.AddField(
+            model_name='individual_comorbidity',
+            name='MEMBERID',
+            field=models.ForeignKey(db_column='MEMBERID', on_delete=django.db.models.deletion.CASCADE, related_name='comorbidities', to='study_44en.individual_exposure'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='individual_travel',
+            unique_together={('MEMBERID', 'TRAVEL_TYPE')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='individual_sample',
+            unique_together={('MEMBERID', 'SAMPLE_TIME')},
+        ),
+        migrations.AddConstraint(
+            model_name='individual_followup',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('ASSESSED', 'yes'), _negated=True), ('ASSESSMENT_DATE__isnull', False), _connector='OR'), name='followup_assessed_needs_date', violation_error_message='Assessment date required when assessed=yes'),
+        ),
+        migrations.AddConstraint(
+            model_name='individual_followup',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('ASSESSED', 'no'), _negated=True), ('ASSESSMENT_DATE__isnull', True), _connector='OR'), name='followup_not_assessed_no_date', violation_error_message='Assessment date should be empty when assessed=no'),
+        ),
+        migrations.AddConstraint(
+            model_name='individual_followup',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('USED_MEDICATION', 'yes'), _negated=True), ('ANTIBIOTIC_TYPE__isnull', False), ('STEROID_TYPE__isnull', False), ('OTHER_MEDICATION__isnull', False), _connector='OR'), name='followup_medication_details', violation_error_message='Please specify medication type when used_medication=yes'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='individual_watertreatment',
+            unique_together={('MEMBERID', 'TREATMENT_TYPE')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='individual_watersource',
+            unique_together={('MEMBERID', 'SOURCE_TYPE')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='individual_vaccine',
+            unique_together={('MEMBERID', 'VACCINE_TYPE')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='individual_comorbidity',
+            unique_together={('MEMBERID', 'COMORBIDITY_TYPE')},
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.1.15 on 2026-10-16 20:20
+
+import django.utils.timezone
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+# Users already in the log (latest username per user)
+BACKFILL_AUDIT_LOG_USER = """
+    INSERT INTO "logging"."audit_log_user" (user_id, username, last_seen)
+    SELECT DISTINCT ON (user_id) user_id, username, timestamp
+    FROM "logging"."audit_log"
+    ORDER BY user_id, timestamp DESC
+    ON CONFLICT (user_id) DO NOTHING
+"""
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('study_44en', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditLogUser',
+            fields=[
+                ('user_id', models.IntegerField(help_text='User ID from management database', primary_key=True, serialize=False)),
+                ('username', models.CharField(help_text='Latest username seen in the log', max_length=150)),
+                ('last_seen', models.DateTimeField(default=django.utils.timezone.now, help_text='Timestamp of a recent audit entry (refreshed at most hourly)')),
+            ],
+            options={
+                'verbose_name': 'Audit Log User',
+                'verbose_name_plural': 'Audit Log Users',
+                'db_table': 'logging"."audit_log_user',
+                'db_table_comment': 'Users appearing in the audit log (filter dropdown)',
+                'ordering': ['username'],
+                'default_permissions': ('view',),
+            },
+        ),
+        migrations.RunSQL(BACKFILL_AUDIT_LOG_USER, migrations.RunSQL.noop),
+        AddIndexConcurrently(
+            model_name='auditlog',
+            index=models.Index(fields=['-timestamp', '-id'], name='s44_audit_log_keyset_idx'),
+        ),
+        # Prefix of the keyset index
+        RemoveIndexConcurrently(
+            model_name='auditlog',
+            name='s44_audit_log_time_idx',
+        ),
+    ]
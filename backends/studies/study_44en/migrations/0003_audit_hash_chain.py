@@ -0,0 +1,67 @@
+# Generated by Django 5.1.15 on 2026-10-16 20:21
+
+import django.utils.timezone
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('study_44en', '0002_audit_keyset_pagination'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditChainCheckpoint',
+            fields=[
+                ('block_no', models.IntegerField(primary_key=True, serialize=False)),
+                ('first_seq', models.BigIntegerField()),
+                ('last_seq', models.BigIntegerField()),
+                ('merkle_root', models.CharField(help_text="Merkle root of the block's chain hashes", max_length=64)),
+                ('end_chain_hash', models.CharField(help_text="chain_hash of the block's last entry", max_length=64)),
+                ('signature', models.CharField(help_text='HMAC over the checkpoint and the previous signature', max_length=64)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Audit Chain Checkpoint',
+                'verbose_name_plural': 'Audit Chain Checkpoints',
+                'db_table': 'logging"."audit_chain_checkpoint',
+                'db_table_comment': 'Signed Merkle checkpoints over blocks of chained audit entries',
+                'ordering': ['block_no'],
+                'default_permissions': ('add', 'view'),
+            },
+        ),
+        migrations.CreateModel(
+            name='AuditChainHead',
+            fields=[
+                ('id', models.PositiveSmallIntegerField(default=1, primary_key=True, serialize=False)),
+                ('seq', models.BigIntegerField(default=0, help_text='seq of the last chained entry')),
+                ('chain_hash', models.CharField(default='0000000000000000000000000000000000000000000000000000000000000000', help_text='chain_hash of the last chained entry', max_length=64)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Audit Chain Head',
+                'db_table': 'logging"."audit_chain_head',
+                'db_table_comment': 'Last entry of the audit log hash chain',
+                'default_permissions': ('view',),
+            },
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='chain_hash',
+            field=models.CharField(blank=True, editable=False, help_text='HMAC over previous chain hash, seq and checksum', max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='seq',
+            field=models.BigIntegerField(blank=True, editable=False, help_text="Position in the study's hash chain (gap-free)", null=True),
+        ),
+        AddIndexConcurrently(
+            model_name='auditlog',
+            index=models.Index(fields=['seq'], name='s44_audit_log_seq_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.15 on 2026-10-16 20:22
+
+import backends.studies.blind_index
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('study_44en', '0003_audit_hash_chain'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hh_personal_data',
+            name='CITY_BIDX',
+            field=backends.studies.blind_index.BlindIndexField(kind='text', source='CITY'),
+        ),
+        migrations.AddField(
+            model_name='hh_personal_data',
+            name='CITY_BIDX_PREFIX',
+            field=backends.studies.blind_index.BlindIndexField(kind='text', prefix_length=3, source='CITY'),
+        ),
+        migrations.AddField(
+            model_name='hh_personal_data',
+            name='WARD_BIDX',
+            field=backends.studies.blind_index.BlindIndexField(kind='text', source='WARD'),
+        ),
+        migrations.AddField(
+            model_name='hh_personal_data',
+            name='WARD_BIDX_PREFIX',
+            field=backends.studies.blind_index.BlindIndexField(kind='text', prefix_length=3, source='WARD'),
+        ),
+    ]
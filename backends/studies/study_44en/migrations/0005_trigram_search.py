@@ -0,0 +1,36 @@
+# Generated by Django 5.1.15 on 2026-10-16 20:23
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('study_44en', '0004_blind_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='auditlog',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('username'), name='gin_trgm_ops'), name='s44_audit_log_user_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='auditlog',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('patient_id'), name='gin_trgm_ops'), name='s44_audit_log_patient_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='auditlog',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('reason'), name='gin_trgm_ops'), name='s44_audit_log_reason_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='auditlog',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('model_name'), name='gin_trgm_ops'), name='s44_audit_log_model_trgm'),
+        ),
+    ]
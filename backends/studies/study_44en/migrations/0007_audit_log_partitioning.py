@@ -0,0 +1,68 @@
+# Generated by Django 5.1.15 on 2026-10-16 20:25
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+import django.utils.timezone
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    # Single-column B-trees dropped (covered by the composite indexes), BRIN on
+    # timestamp added, and no FK constraint to audit_log so it can be
+    # partitioned (python manage.py partition_audit_log --convert)
+
+    dependencies = [
+        ('study_44en', '0006_audit_outbox'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditlog',
+            name='SITEID',
+            field=models.CharField(blank=True, help_text='Site code for filtering', max_length=10, null=True),
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='action',
+            field=models.CharField(choices=[('CREATE', 'Create'), ('UPDATE', 'Update'), ('VIEW', 'View')], max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='model_name',
+            field=models.CharField(help_text='CRF model (e.g., SCREENINGCASE)', max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='patient_id',
+            field=models.CharField(help_text='Patient identifier (USUBJID or SCRID)', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='user_id',
+            field=models.IntegerField(help_text='User ID from management database'),
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='username',
+            field=models.CharField(help_text='Username backup', max_length=150),
+        ),
+        migrations.AlterField(
+            model_name='auditlogdetail',
+            name='audit_log',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.PROTECT, related_name='details', to='study_44en.auditlog'),
+        ),
+        AddIndexConcurrently(
+            model_name='auditlog',
+            index=django.contrib.postgres.indexes.BrinIndex(autosummarize=True, fields=['timestamp'], name='s44_audit_log_time_brin'),
+        ),
+    ]
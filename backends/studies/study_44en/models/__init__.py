@@ -2,15 +2,23 @@
 """
 Main models package for study_44en
 
-AuditLog and AuditLogDetail are created via factory function from audit_logs.
+AuditLog, AuditLogDetail, AuditLogUser, AuditOutbox and the hash chain models are created via
+factory function from audit_logs.
 This ensures makemigrations study_44en includes audit tables.
 """
 
 # ==========================================
 # AUDIT LOG MODELS (Created via factory)
 # ==========================================
-from backends.audit_logs.models import create_audit_models
+from backends.audit_logs.models import (
+    create_audit_models, get_audit_user_model, get_audit_chain_models,
+    get_audit_outbox_model, get_audit_chain_archive_model,
+)
 AuditLog, AuditLogDetail = create_audit_models('study_44en')
+AuditLogUser = get_audit_user_model('study_44en')
+AuditChainHead, AuditChainCheckpoint = get_audit_chain_models('study_44en')
+AuditOutbox = get_audit_outbox_model('study_44en')
+AuditChainArchive = get_audit_chain_archive_model('study_44en')
 
 # ==========================================
 # BASE MODELS (MIXINS)
@@ -84,6 +92,11 @@ __all__ = [
     # Audit Log
     'AuditLog',
     'AuditLogDetail',
+    'AuditLogUser',
+    'AuditChainHead',
+    'AuditChainCheckpoint',
+    'AuditOutbox',
+    'AuditChainArchive',
     
     # Base Models
     'AuditFieldsMixin',
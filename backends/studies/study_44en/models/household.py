@@ -10,6 +10,7 @@ from django.db.models import Q
 from datetime import date
 import re
 from backends.studies.study_44en.models.per_data import HH_PERSONAL_DATA
+from backends.studies.blind_index import blind_exact_q
 
 
 # ==========================================
@@ -597,7 +598,8 @@ class HH_CASEQuerySet(models.QuerySet):
         return self.select_related('exposure', 'food_frequency', 'food_source').prefetch_related('members', 'exposure__water_sources', 'exposure__animals')
     
     def by_ward(self, ward):
-        return self.filter(WARD__iexact=ward)
+        # WARD is encrypted on personal_data - match on its blind index
+        return self.filter(blind_exact_q(HH_PERSONAL_DATA, 'WARD', ward, path='personal_data__'))
     
     def recent(self, days=30):
         from datetime import date, timedelta
@@ -14,6 +14,7 @@ CRITICAL SECURITY NOTES:
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from encrypted_fields.fields import EncryptedCharField
+from backends.studies.blind_index import BlindIndexField, KIND_TEXT
 from backends.studies.study_44en.models.base_models import AuditFieldsMixin
 
 
@@ -78,6 +79,14 @@ class HH_PERSONAL_DATA(AuditFieldsMixin):
         help_text=_('City (encrypted)')
     )
     
+    # ==========================================
+    # BLIND INDEXES (keyed HMAC - search/group without decrypting)
+    # ==========================================
+    WARD_BIDX = BlindIndexField(source='WARD', kind=KIND_TEXT)
+    WARD_BIDX_PREFIX = BlindIndexField(source='WARD', kind=KIND_TEXT, prefix_length=3)
+    CITY_BIDX = BlindIndexField(source='CITY', kind=KIND_TEXT)
+    CITY_BIDX_PREFIX = BlindIndexField(source='CITY', kind=KIND_TEXT, prefix_length=3)
+    
     # ==========================================
     # META OPTIONS
     # ==========================================
@@ -86,7 +95,7 @@ class HH_PERSONAL_DATA(AuditFieldsMixin):
         verbose_name = _('Household Personal Data')
         verbose_name_plural = _('Household Personal Data')
         indexes = [
-            # NO INDEXES on encrypted fields for security
+            # NO INDEXES on encrypted fields for security (blind indexes are db_index=True)
             models.Index(fields=['last_modified_by_id', '-last_modified_at'], name='idx_hhpdata_modified'),
         ]
     
@@ -60,6 +60,7 @@ class DatabaseConnection:
     - Uses parameterized queries
     - Sanitizes connection info in logs
     - Proper resource cleanup
+    - Borrows from the shared pools when STUDY_DB_POOL is enabled
     """
     
     def __init__(self, db_name: str = "postgres"):
@@ -67,26 +68,33 @@ class DatabaseConnection:
         self.db_name = validate_identifier(db_name, "database name")
         self.conn: Optional[psycopg.Connection] = None
         self._env = environ.Env()
+        self._borrow = None
     
     def __enter__(self) -> psycopg.Connection:
+        from backends.tenancy.db_pool import StudyConnectionPools
+        
         # Build connection parameters (not string) - more secure
-        self.conn = psycopg.connect(
-            host=self._env("PGHOST", default="localhost"),
-            port=self._env.int("PGPORT", default=5432),
-            user=self._env("PGUSER"),
-            password=self._env("PGPASSWORD"),
-            dbname=self.db_name,
-            autocommit=True,
-            connect_timeout=10,
-        )
+        conn_params = {
+            "host": self._env("PGHOST", default="localhost"),
+            "port": self._env.int("PGPORT", default=5432),
+            "user": self._env("PGUSER"),
+            "password": self._env("PGPASSWORD"),
+            "dbname": self.db_name,
+            "connect_timeout": 10,
+        }
+        self._borrow = StudyConnectionPools.connection(conn_params, autocommit=True)
+        self.conn = self._borrow.__enter__()
         return self.conn
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.conn:
+        if self._borrow:
             try:
-                self.conn.close()
+                self._borrow.__exit__(exc_type, exc_val, exc_tb)
             except Exception:
                 pass  # Ignore close errors
+            finally:
+                self._borrow = None
+                self.conn = None
 
 
 class StudyAppLoader:
@@ -5,13 +5,13 @@ Enhanced Study Database Manager with psycopg3 support
 Features:
 - Instance-level and Django cache for database configurations
 - Automatic schema setup (data schema)
-- Connection pooling and health checks
-- Thread-safe operations
+- Connection pooling (STUDY_DB_POOL: shared psycopg_pool per study) and health checks
+- Thread-safe operations (lock-free registration fast path, boot warm-up)
 - Usage statistics tracking
 """
 import logging
 from contextlib import contextmanager
-from typing import Dict, Any
+from typing import Any, Dict, FrozenSet
 from datetime import datetime
 from django.db import connections
 from django.conf import settings
@@ -22,6 +22,8 @@ import psycopg
 from psycopg import sql
 from psycopg.rows import dict_row
 
+from backends.tenancy.db_pool import StudyConnectionPools
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,6 +55,9 @@ class EnhancedStudyDatabaseManager:
         
         self._db_configs: Dict[str, Dict[str, Any]] = {}
         self._usage_stats: Dict[str, Dict[str, Any]] = {}
+        # Immutable snapshot of registered aliases - replaced (never mutated)
+        # under the lock, read without it
+        self._registered: FrozenSet[str] = frozenset()
         self._last_cleanup = datetime.now()
         self._initialized = True
         
@@ -65,38 +70,83 @@ class EnhancedStudyDatabaseManager:
     def add_study_db(self, db_name: str) -> None:
         """
         Add study database configuration
-        Optimized with quick existence check
+        
+        Lock-free fast path: called on every study request, so an already
+        registered alias is a single frozenset lookup. The lock is only taken
+        the first time an alias is seen (double-checked).
         
         Args:
             db_name: Database name (e.g., 'db_study_43en')
         """
+        # Fast path: immutable snapshot, no lock
+        if db_name in self._registered:
+            self._track_usage(db_name, 'reuse')
+            return
+        
         with self._lock:
-            # Quick check if already registered
-            if db_name in connections.databases:
-                self._track_usage(db_name, 'reuse')
-                logger.debug(f"Database {db_name} already registered")
+            if db_name in self._registered:
                 return
             
-            # Validate database name
-            if not db_name.startswith(settings.STUDY_DB_PREFIX):
-                raise ValueError(f"Invalid study database name: {db_name}")
-            
-            # Get or build configuration
-            config = self._get_config_with_schema(db_name)
-            
-            # Add to Django's connection registry
-            connections.databases[db_name] = config
+            if db_name in connections.databases:
+                # Configured in settings (or by another code path)
+                logger.debug(f"Database {db_name} already registered")
+            else:
+                # Validate database name
+                if not db_name.startswith(settings.STUDY_DB_PREFIX):
+                    raise ValueError(f"Invalid study database name: {db_name}")
+                
+                # Get or build configuration
+                config = self._get_config_with_schema(db_name)
+                
+                # Add to Django's connection registry
+                connections.databases[db_name] = config
+                
+                logger.debug(f"Registered study database: {db_name} (schema: data)")
             
             # Track usage
-            self._usage_stats[db_name] = {
+            self._usage_stats.setdefault(db_name, {
                 'created_at': datetime.now(),
                 'last_used': datetime.now(),
                 'usage_count': 1,
                 'schema': 'data',
                 'errors': 0,
-            }
+            })
+            
+            # Publish a new snapshot (atomic reference swap)
+            self._registered = self._registered | {db_name}
+    
+    def warm_up(self) -> int:
+        """
+        Pre-register all active study databases (worker boot)
+        
+        Requests then never take the registration lock. Errors are logged,
+        never raised - a study that fails here is registered lazily.
+        
+        Returns:
+            Number of study databases registered
+        """
+        try:
+            from backends.tenancy.models import Study
             
-            logger.debug(f"Registered study database: {db_name} (schema: data)")
+            db_names = list(
+                Study.objects.filter(
+                    status__in=[Study.Status.ACTIVE, Study.Status.PLANNING]
+                ).values_list('db_name', flat=True)
+            )
+        except Exception as e:
+            logger.warning(f"Study database warm-up skipped: {e}")
+            return 0
+        
+        registered = 0
+        for db_name in db_names:
+            try:
+                self.add_study_db(db_name)
+                registered += 1
+            except Exception as e:
+                logger.error(f"Warm-up failed for {db_name}: {e}")
+        
+        logger.debug(f"Warm-up registered {registered} study database(s)")
+        return registered
     
     # ==========================================
     # CONTEXT MANAGER
@@ -161,8 +211,8 @@ class EnhancedStudyDatabaseManager:
             # Get connection params
             conn_params = DatabaseStudyCreator.get_connection_params(db_name)
             
-            # Psycopg3 context manager with autocommit
-            with psycopg.connect(**conn_params, autocommit=True) as conn:
+            # Psycopg3 context manager with autocommit (pooled when STUDY_DB_POOL)
+            with StudyConnectionPools.connection(conn_params, autocommit=True) as conn:
                 with conn.cursor() as cur:
                     # Check schema existence - parameterized
                     cur.execute(
@@ -348,7 +398,7 @@ class EnhancedStudyDatabaseManager:
     # ==========================================
     
     def _track_usage(self, db_name: str, action: str):
-        """Track database usage for statistics"""
+        """Track database usage for statistics (lock-free, counts are approximate)"""
         if db_name in self._usage_stats:
             self._usage_stats[db_name]['last_used'] = datetime.now()
             self._usage_stats[db_name]['usage_count'] = (
@@ -380,8 +430,30 @@ class EnhancedStudyDatabaseManager:
                 'usage_stats': dict(self._usage_stats),
                 'last_cleanup': self._last_cleanup.isoformat(),
                 'cache_size': len(self._db_configs),
+                'pools': self.get_pool_stats(),
             }
     
+    def get_pool_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Connection pool metrics (pooled mode only)
+        
+        Returns:
+            {alias or pool name: psycopg_pool stats} - pool_min, pool_max,
+            pool_size, pool_available, requests_waiting, requests_num, ...
+        """
+        stats = {}
+        
+        for db_name in self.get_registered_databases():
+            if not connections.databases[db_name].get('OPTIONS', {}).get('pool'):
+                continue
+            try:
+                stats[db_name] = connections[db_name].pool.get_stats()
+            except Exception as e:
+                logger.error(f"Pool stats failed for {db_name}: {e}")
+        
+        stats.update(StudyConnectionPools.get_stats())
+        return stats
+    
     def print_stats(self):
         """Print formatted statistics (for debugging)"""
         stats = self.get_stats()
@@ -396,6 +468,16 @@ class EnhancedStudyDatabaseManager:
             f"Last Cleanup: {stats['last_cleanup']}",
         ]
         
+        if stats['pools']:
+            output_lines.append("\nConnection Pools:")
+            for pool_name, pool_stats in stats['pools'].items():
+                output_lines.append(
+                    f"  {pool_name}: size {pool_stats.get('pool_size', 0)}"
+                    f"/{pool_stats.get('pool_max', 0)}, "
+                    f"available {pool_stats.get('pool_available', 0)}, "
+                    f"waiting {pool_stats.get('requests_waiting', 0)}"
+                )
+        
         if stats['usage_stats']:
             output_lines.append("\nDatabase Usage:")
             for db_name, db_stats in stats['usage_stats'].items():
@@ -440,7 +522,7 @@ class EnhancedStudyDatabaseManager:
         Returns:
             True if registered
         """
-        return db_name in connections.databases
+        return db_name in self._registered or db_name in connections.databases
 
 
 # ==========================================
@@ -475,6 +557,26 @@ def register_study_database(db_name: str) -> None:
     study_db_manager.add_study_db(db_name)
 
 
+def warm_up_study_databases() -> int:
+    """
+    Pre-register active study databases (called from wsgi.py / asgi.py)
+    
+    Disabled with STUDY_DB_WARMUP=False. The management DB connection used
+    for the lookup is closed afterwards so it is never shared across a fork
+    (gunicorn --preload).
+    
+    Returns:
+        Number of study databases registered
+    """
+    if not getattr(settings, 'STUDY_DB_WARMUP', True):
+        return 0
+    
+    try:
+        return study_db_manager.warm_up()
+    finally:
+        connections['default'].close()
+
+
 def check_database_health() -> Dict[str, Dict[str, Any]]:
     """
     Check health of all study databases (convenience function)
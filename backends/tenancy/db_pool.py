@@ -0,0 +1,202 @@
+# backend/tenancy/db_pool.py
+"""
+Shared psycopg connection pools for ad hoc (non-ORM) database work
+
+Metadata code (schema checks, database creation, study loader queries) used
+to open a fresh psycopg.connect() session per call. With STUDY_DB_POOL=True
+those calls borrow from pools instead:
+
+- Study aliases registered in Django with OPTIONS['pool'] (same credentials):
+  the alias' own Django pool - no extra backends at all
+- Everything else ('postgres', management DB, other credentials): one small
+  pool per (database, user, host, port), min_size=0 so idle connections are
+  closed after STUDY_DB_POOL_MAX_IDLE seconds
+
+Session state changed by the caller (SET search_path, read_only, autocommit)
+is reset before a connection goes back to a pool (Django's pools have no
+reset hook of their own).
+
+Import-safe before Django settings are configured (used by study_loader while
+settings are being built). Without STUDY_DB_POOL or psycopg_pool, connection()
+falls back to psycopg.connect().
+
+Usage:
+    with StudyConnectionPools.connection(conn_params, autocommit=True) as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+"""
+import importlib.util
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import environ
+import psycopg
+
+logger = logging.getLogger(__name__)
+
+
+def _reset_session(conn: psycopg.Connection) -> None:
+    """Undo per-borrow session changes before returning to a pool."""
+    conn.autocommit = True
+    conn.read_only = None
+    conn.execute("RESET ALL")
+
+
+class StudyConnectionPools:
+    """
+    Process-wide registry of ad hoc connection pools.
+
+    Thread-safe; pools are created lazily on first use.
+    """
+
+    _pools: Dict[str, Any] = {}
+    _lock = threading.Lock()
+    _env: Optional[environ.Env] = None
+
+    # =========================================================================
+    # Configuration
+    # =========================================================================
+
+    @classmethod
+    def get_env(cls) -> environ.Env:
+        """Get cached environment instance."""
+        if cls._env is None:
+            cls._env = environ.Env()
+        return cls._env
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        """Pooled mode on and psycopg_pool installed."""
+        if not cls.get_env().bool("STUDY_DB_POOL", default=False):
+            return False
+        return importlib.util.find_spec("psycopg_pool") is not None
+
+    @staticmethod
+    def _pool_name(conn_params: Dict[str, Any]) -> str:
+        return "adhoc:{user}@{host}:{port}/{dbname}".format(
+            user=conn_params.get("user", ""),
+            host=conn_params.get("host", ""),
+            port=conn_params.get("port", ""),
+            dbname=conn_params.get("dbname", ""),
+        )
+
+    # =========================================================================
+    # Pools
+    # =========================================================================
+
+    @classmethod
+    def _django_pool(cls, conn_params: Dict[str, Any]):
+        """Pool of a registered Django study alias with the same credentials."""
+        from django.apps import apps
+
+        if not apps.ready:
+            return None
+
+        from django.db import connections
+
+        db_name = conn_params.get("dbname")
+        settings_dict = connections.databases.get(db_name)
+        if not settings_dict or not settings_dict.get("OPTIONS", {}).get("pool"):
+            return None
+
+        same_server = (
+            settings_dict.get("USER") == conn_params.get("user")
+            and settings_dict.get("HOST") == conn_params.get("host")
+            and str(settings_dict.get("PORT")) == str(conn_params.get("port"))
+        )
+        if not same_server:
+            return None
+
+        pool = connections[db_name].pool
+        pool.open()
+        return pool
+
+    @classmethod
+    def _adhoc_pool(cls, conn_params: Dict[str, Any]):
+        """Small shared pool for one (database, user, host, port)."""
+        name = cls._pool_name(conn_params)
+        pool = cls._pools.get(name)
+        if pool is not None:
+            return pool
+
+        from psycopg_pool import ConnectionPool
+
+        env = cls.get_env()
+        with cls._lock:
+            if name not in cls._pools:
+                kwargs = dict(conn_params)
+                timeout = kwargs.get("connect_timeout", 10)
+                cls._pools[name] = ConnectionPool(
+                    kwargs=kwargs,
+                    name=name,
+                    min_size=0,
+                    max_size=env.int("STUDY_DB_POOL_ADHOC_MAX_SIZE", default=2),
+                    max_idle=env.int("STUDY_DB_POOL_MAX_IDLE", default=300),
+                    timeout=timeout,
+                    check=ConnectionPool.check_connection,
+                    open=True,
+                )
+                logger.debug(f"Created ad hoc connection pool {name}")
+            return cls._pools[name]
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    @classmethod
+    @contextmanager
+    def connection(cls, conn_params: Dict[str, Any], autocommit: bool = False
+                   ) -> Iterator[psycopg.Connection]:
+        """
+        Borrow a connection (or open one when pooling is off).
+
+        Args:
+            conn_params: psycopg.connect() keyword arguments (must include dbname)
+            autocommit: Autocommit mode for this borrow (required for
+                        CREATE/DROP DATABASE)
+
+        Behaves like `with psycopg.connect(...) as conn`: commits on success,
+        rolls back on error.
+        """
+        if not cls.is_enabled():
+            with psycopg.connect(**conn_params, autocommit=autocommit) as conn:
+                yield conn
+            return
+
+        pool = cls._django_pool(conn_params) or cls._adhoc_pool(conn_params)
+
+        conn = pool.getconn()
+        try:
+            conn.autocommit = autocommit
+            with conn:
+                yield conn
+        finally:
+            try:
+                _reset_session(conn)
+            except psycopg.Error:
+                # Broken session: the pool discards closed connections
+                conn.close()
+            pool.putconn(conn)
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, Dict[str, int]]:
+        """psycopg_pool statistics of the ad hoc pools."""
+        with cls._lock:
+            return {name: pool.get_stats() for name, pool in cls._pools.items()}
+
+    @classmethod
+    def close_database(cls, db_name: str) -> None:
+        """Close ad hoc pools holding connections to db_name (before DROP DATABASE)."""
+        with cls._lock:
+            for name in [name for name in cls._pools if name.endswith(f"/{db_name}")]:
+                cls._pools.pop(name).close()
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Close all ad hoc pools (tests, shutdown)."""
+        with cls._lock:
+            for pool in cls._pools.values():
+                pool.close()
+            cls._pools.clear()
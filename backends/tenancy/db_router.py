@@ -1,7 +1,9 @@
 # backends/tenancy/db_router.py - PRODUCTION-READY VERSION
 import logging
 import threading
-from typing import Any, Dict, Optional, Set
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Iterator, Optional, Set
 
 from django.conf import settings
 
@@ -9,26 +11,55 @@ logger = logging.getLogger(__name__)
 
 
 # =============================================================================
-# Thread-Local Database Context
+# Tenant Database Context (contextvars)
 # =============================================================================
+# A ContextVar behaves like a thread-local under WSGI (one context per
+# thread) and is also isolated per asyncio task under ASGI, where many
+# requests share one thread. asgiref's sync_to_async / async_to_sync copy
+# the context both ways, so sync views and ORM calls see the request's DB.
 
-_thread_local = threading.local()
+_current_db: ContextVar[str] = ContextVar('tenant_db', default='default')
 
 
 def get_current_db() -> str:
-    """Get current database for this thread."""
-    return getattr(_thread_local, 'db', 'default')
+    """Get current database for this request (thread or async task)."""
+    return _current_db.get()
 
 
-def set_current_db(db_alias: str) -> None:
-    """Set current database for this thread."""
-    _thread_local.db = db_alias if db_alias else 'default'
+def set_current_db(db_alias: str) -> Token:
+    """
+    Set current database for this request.
+    
+    Returns:
+        Token for reset_current_db() (restores the previous value)
+    """
+    return _current_db.set(db_alias if db_alias else 'default')
+
+
+def reset_current_db(token: Token) -> None:
+    """Restore the database context saved by set_current_db()."""
+    _current_db.reset(token)
 
 
 def clear_current_db() -> None:
     """Clear current database context."""
-    if hasattr(_thread_local, 'db'):
-        del _thread_local.db
+    _current_db.set('default')
+
+
+@contextmanager
+def tenant_db(db_alias: str) -> Iterator[str]:
+    """
+    Temporarily route study models to db_alias (tasks, scripts, async code).
+    
+    Example:
+        with tenant_db('db_study_43en'):
+            SCR_CASE.objects.count()
+    """
+    token = set_current_db(db_alias)
+    try:
+        yield get_current_db()
+    finally:
+        reset_current_db(token)
 
 
 # =============================================================================
@@ -95,7 +126,7 @@ class TenantRouter:
         # Fast path: check cache without lock
         cached = self._routing_cache.get(app_label)
         if cached is not None:
-            # For study apps, always use thread context
+            # For study apps, always use the request context
             if cached == '_STUDY_':
                 return get_current_db()
             return cached
@@ -106,7 +137,7 @@ class TenantRouter:
         elif app_label in self.STUDY_APPS or app_label.startswith('study_'):
             db = '_STUDY_'  # Marker for study apps
         else:
-            db = '_STUDY_'  # Unknown apps follow thread context
+            db = '_STUDY_'  # Unknown apps follow the request context
         
         # Cache result (lock only on write)
         with self._cache_lock:
@@ -0,0 +1,106 @@
+"""
+Management command to benchmark per-request study access resolution.
+
+Every study request needs the study, the user's permissions and site access,
+and an access-tracking check. This measures that work with warm caches:
+
+- legacy: previous middleware - 4 separate cache round trips (study,
+          site access, permissions, tracking throttle) (emulated)
+- L2:     StudyAccessCache with an empty L1 - 1 get_many
+- L1:     StudyAccessCache in-process hit - no round trip
+
+and, with --with-db, the single-query context build on a full miss.
+
+Run it against the production cache backend (Redis) for meaningful numbers.
+
+Usage:
+    python manage.py benchmark_study_access --user admin --study 43EN
+    python manage.py benchmark_study_access --user admin --study 43EN --iterations 5000 --with-db
+"""
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+
+from backends.tenancy.models import User
+from backends.tenancy.utils.access_context import StudyAccessCache
+from backends.tenancy.utils.tenancy_utils import TenancyUtils
+
+
+class Command(BaseCommand):
+    help = "Benchmark study access context resolution (legacy vs L2 vs L1)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", required=True, help="Username of a study member")
+        parser.add_argument("--study", required=True, help="Study code (e.g. 43EN)")
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=2000,
+            help="Requests per mode (default: 2000)",
+        )
+        parser.add_argument(
+            "--with-db",
+            action="store_true",
+            help="Also time the one-query context build (cache miss)",
+        )
+
+    def handle(self, *args, **options):
+        code = options["study"].upper()
+        iterations = options["iterations"]
+
+        user = User.objects.filter(username=options["user"]).first()
+        if user is None:
+            raise CommandError(f"User '{options['user']}' not found")
+
+        StudyAccessCache.clear_local()
+        context = StudyAccessCache.resolve(user, code)
+        if context is None:
+            raise CommandError(f"User '{user.username}' has no active membership in {code}")
+
+        legacy_keys = self._warm_legacy_keys(user, context)
+
+        results = {
+            "legacy": self._time(lambda: [cache.get(key) for key in legacy_keys], iterations),
+            "L2": self._time(lambda: (StudyAccessCache.clear_local(), StudyAccessCache.resolve(user, code)), iterations),
+            "L1": self._time(lambda: StudyAccessCache.resolve(user, code), iterations),
+        }
+        round_trips = {"legacy": len(legacy_keys), "L2": 1, "L1": 0}
+
+        self.stdout.write(f"🚀 {iterations} request(s) per mode, user={user.username}, study={code}")
+        self.stdout.write("\n" + "=" * 56)
+        for mode, per_request_us in results.items():
+            self.stdout.write(
+                f"  {mode:<8} {per_request_us:10.1f} µs/request   {round_trips[mode]} cache round trip(s)"
+            )
+
+        if options["with_db"]:
+            build_us = self._time(lambda: StudyAccessCache._build(user, code), max(1, iterations // 20))
+            self.stdout.write(f"  {'DB miss':<8} {build_us:10.1f} µs/request   1 query")
+
+        self.stdout.write("=" * 56)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Saved per request: {results['legacy'] - results['L2']:.1f} µs (L2 hit), "
+            f"{results['legacy'] - results['L1']:.1f} µs (L1 hit)"
+        ))
+
+    @staticmethod
+    def _warm_legacy_keys(user, context) -> list:
+        """Keys the previous middleware read on every study request (values cached)."""
+        study = context.study
+        keys = {
+            f"mw_study_{study.code}_{user.pk}": study,
+            TenancyUtils._cache_key('site_access', user.pk, study.pk): context.site_access,
+            TenancyUtils._cache_key('perms', user.pk, study.pk): set(context.permissions),
+            TenancyUtils._cache_key('access', user.pk, study.pk): True,
+        }
+        cache.set_many(keys, 300)
+        return list(keys)
+
+    @staticmethod
+    def _time(func, iterations: int) -> float:
+        """Mean µs per call."""
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - started) / iterations * 1_000_000
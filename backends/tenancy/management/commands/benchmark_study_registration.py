@@ -0,0 +1,110 @@
+"""
+Management command to benchmark per-request study DB registration.
+
+Every study request calls study_db_manager.add_study_db(). This measures
+that call under concurrent threads, before and after the lock-free fast
+path:
+
+- locked:    previous behaviour - take the manager RLock, then check
+             connections.databases (emulated)
+- lock-free: current add_study_db() - frozenset lookup, no lock
+
+Usage:
+    python manage.py benchmark_study_registration
+    python manage.py benchmark_study_registration --threads 32 --iterations 50000
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from backends.tenancy.db_loader import study_db_manager
+
+
+class Command(BaseCommand):
+    help = "Benchmark study database registration overhead under concurrent threads"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=16,
+            help="Number of concurrent threads (default: 16)",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20000,
+            help="Calls per thread (default: 20000)",
+        )
+
+    def handle(self, *args, **options):
+        threads = options["threads"]
+        iterations = options["iterations"]
+
+        db_names = [
+            alias for alias in connections.databases
+            if alias.startswith(settings.STUDY_DB_PREFIX)
+        ]
+        if not db_names:
+            self.stdout.write(self.style.WARNING("No study databases configured."))
+            return
+
+        for db_name in db_names:
+            study_db_manager.add_study_db(db_name)
+
+        self.stdout.write(
+            f"🚀 {threads} thread(s) × {iterations} call(s), databases: {', '.join(db_names)}"
+        )
+
+        results = {
+            "locked": self._run(self._locked_call, db_names, threads, iterations),
+            "lock-free": self._run(study_db_manager.add_study_db, db_names, threads, iterations),
+        }
+
+        self.stdout.write("\n" + "=" * 50)
+        for mode, (per_call_us, throughput) in results.items():
+            self.stdout.write(
+                f"  {mode:<10} {per_call_us:8.3f} µs/call   {throughput:12,.0f} calls/s"
+            )
+
+        speedup = results["locked"][0] / results["lock-free"][0] if results["lock-free"][0] else 0
+        self.stdout.write("=" * 50)
+        self.stdout.write(self.style.SUCCESS(f"✅ Lock-free path: {speedup:.1f}× faster per request"))
+
+    @staticmethod
+    def _locked_call(db_name: str) -> None:
+        """Previous add_study_db() fast path: lock first, then check."""
+        with study_db_manager._lock:
+            if db_name in connections.databases:
+                study_db_manager._track_usage(db_name, 'reuse')
+                return
+
+    @staticmethod
+    def _run(func, db_names: list, threads: int, iterations: int) -> tuple[float, float]:
+        """Run func concurrently; return (mean µs per call, total calls/s)."""
+        barrier = threading.Barrier(threads + 1)
+        per_thread = []
+
+        def worker(offset: int):
+            names = [db_names[(offset + i) % len(db_names)] for i in range(len(db_names))]
+            barrier.wait()
+            started = time.perf_counter()
+            for i in range(iterations):
+                func(names[i % len(names)])
+            per_thread.append(time.perf_counter() - started)
+
+        workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+        for thread in workers:
+            thread.start()
+
+        barrier.wait()
+        started = time.perf_counter()
+        for thread in workers:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        per_call_us = sum(per_thread) / (threads * iterations) * 1_000_000
+        return per_call_us, threads * iterations / wall
@@ -0,0 +1,67 @@
+# backend/tenancy/management/commands/rate_limit_stats.py
+"""
+Show rate limiter hit/deny counters per policy
+
+Counters are kept in Redis (shared by all workers); without Redis only this
+process' counters exist, so the command shows nothing useful in dev.
+
+Usage:
+    python manage.py rate_limit_stats
+    python manage.py rate_limit_stats --prometheus > /var/lib/node_exporter/rate_limit.prom
+    python manage.py rate_limit_stats --reset
+"""
+from django.core.management.base import BaseCommand
+
+from backends.tenancy.utils.rate_limiter import RateLimiter
+
+
+class Command(BaseCommand):
+    help = 'Show rate limiter hit/deny counters per policy'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prometheus',
+            action='store_true',
+            help='Output Prometheus text format (node_exporter textfile collector)'
+        )
+
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reset all counters after printing them'
+        )
+
+    def handle(self, *args, **options):
+        stats = RateLimiter.get_stats()
+
+        if options['prometheus']:
+            self._print_prometheus(stats)
+        else:
+            self._print_table(stats)
+
+        if options['reset']:
+            RateLimiter.reset_stats()
+            if not options['prometheus']:
+                self.stdout.write(self.style.SUCCESS('✅ Counters reset'))
+
+    def _print_table(self, stats):
+        if not stats:
+            self.stdout.write(self.style.WARNING('No rate limiter activity recorded.'))
+            return
+
+        self.stdout.write(f"{'Policy':<24} {'Allowed':>12} {'Denied':>10} {'Denied %':>9}")
+        self.stdout.write('=' * 58)
+        for name, counters in sorted(stats.items()):
+            total = counters['allowed'] + counters['denied']
+            denied_pct = counters['denied'] / total * 100 if total else 0
+            line = f"{name:<24} {counters['allowed']:>12,} {counters['denied']:>10,} {denied_pct:>8.1f}%"
+            self.stdout.write(self.style.WARNING(line) if counters['denied'] else line)
+
+    def _print_prometheus(self, stats):
+        self.stdout.write('# HELP resync_rate_limit_requests_total Write requests checked by the rate limiter')
+        self.stdout.write('# TYPE resync_rate_limit_requests_total counter')
+        for name, counters in sorted(stats.items()):
+            for outcome in ('allowed', 'denied'):
+                self.stdout.write(
+                    f'resync_rate_limit_requests_total{{policy="{name}",outcome="{outcome}"}} {counters[outcome]}'
+                )
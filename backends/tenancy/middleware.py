@@ -8,17 +8,19 @@ import re
 import time
 from typing import Callable, Optional
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.conf import settings
 from django.core.cache import cache
 from django.db import connection, connections
 from django.http import Http404, HttpRequest, HttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse
-from django.utils.functional import SimpleLazyObject
 
 from .db_loader import study_db_manager
-from .db_router import set_current_db, clear_current_db
+from .db_router import set_current_db, reset_current_db
 from .models import Study
+from .utils.access_context import StudyAccessCache, StudyAccessContext
+from .utils.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +31,7 @@ class UnifiedTenancyMiddleware:
     
     Features:
     - Study context management with caching
+    - Sync and async (ASGI) request handling, tenant DB in a ContextVar
     - Security headers injection
     - Performance monitoring
     - Database connection management
@@ -66,8 +69,14 @@ class UnifiedTenancyMiddleware:
     # Valid study code pattern (security)
     _valid_code_re = re.compile(r'^[A-Z0-9_]{2,20}$')
     
+    sync_capable = True
+    async_capable = True
+    
     def __init__(self, get_response: Callable):
         self.get_response = get_response
+        self._is_async = iscoroutinefunction(get_response)
+        if self._is_async:
+            markcoroutinefunction(self)
     
     # =========================================================================
     # Main Entry Point
@@ -75,69 +84,125 @@ class UnifiedTenancyMiddleware:
     
     def __call__(self, request: HttpRequest) -> HttpResponse:
         """Process request through middleware chain."""
-        # Start timing
-        request._start_time = time.time()
+        if self._is_async:
+            return self.__acall__(request)
         
-        if settings.DEBUG:
-            request._queries_start = len(connection.queries)
-        
-        # Setup axes attributes
-        self._setup_axes_attributes(request)
-        
-        # Normalize path
-        path = self._normalize_path(request.path)
+        path = self._start_request(request)
         
         # Fast path: static files
         if self._static_re.match(path):
             return self._handle_static(request)
         
-        # Set default database context
-        set_current_db('default')
+        # Set default database context (restored in finally)
+        token = set_current_db('default')
         
         try:
-            # Public paths
-            if self._public_re.match(path):
-                return self._process_request(request)
-            
-            # Check authentication
-            if not request.user.is_authenticated:
-                if self._auth_re.match(path):
-                    return redirect(f"{reverse('account_login')}?next={request.path}")
-                return self._process_request(request)
+            early_response = self._before_view(request, path)
+            if early_response is not None:
+                return early_response
             
-            # SECURITY: Check session idle timeout
-            idle_timeout_response = self._check_session_idle_timeout(request)
-            if idle_timeout_response:
-                return idle_timeout_response
+            response = self.get_response(request)
+            self._finalize_response(request, response)
+            return response
             
-            # Check if account is active
-            if not getattr(request.user, 'is_active', True):
-                return HttpResponse('Account deactivated.', status=403)
+        finally:
+            # Cleanup
+            reset_current_db(token)
+            self._cleanup_connections(request)
+    
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """
+        Async entry point (ASGI).
+        
+        The tenant DB lives in a ContextVar, so concurrent requests served by
+        one event loop never see each other's study. Session/ORM work runs in
+        the request's thread-sensitive executor; the view itself is awaited.
+        """
+        path = self._start_request(request)
+        
+        if self._static_re.match(path):
+            response = await self.get_response(request)
+            self._add_static_headers(response)
+            return response
+        
+        token = set_current_db('default')
+        
+        try:
+            early_response = await sync_to_async(self._before_view)(request, path)
+            if early_response is not None:
+                return early_response
             
-            # Admin paths
-            if self._admin_re.match(path):
-                if not request.user.is_superuser:
-                    raise Http404()
-                return self._process_request(request)
+            # sync_to_async copies ContextVars back: the study DB chosen in
+            # _before_view is now current for this task
+            response = await self.get_response(request)
+            await sync_to_async(self._finalize_response)(request, response)
+            return response
             
-            # Study paths
-            if self._study_path_re.match(path) or self._auth_re.match(path):
-                study = self._get_study_for_request(request, path)
-                
-                if not study:
-                    return redirect('select_study')
-                
-                # Setup study context
-                self._setup_study_context(request, study)
-                set_current_db(study.db_name)
-                study_db_manager.add_study_db(study.db_name)
+        finally:
+            reset_current_db(token)
+            await sync_to_async(self._cleanup_connections)(request)
+    
+    def _start_request(self, request: HttpRequest) -> str:
+        """Timing, axes attributes; returns the normalized path."""
+        # Start timing
+        request._start_time = time.time()
+        
+        if settings.DEBUG:
+            request._queries_start = len(connection.queries)
+        
+        # Setup axes attributes
+        self._setup_axes_attributes(request)
+        
+        # Normalize path
+        return self._normalize_path(request.path)
+    
+    def _before_view(self, request: HttpRequest, path: str) -> Optional[HttpResponse]:
+        """
+        Authentication, study routing and rate limiting (sync: session + ORM).
+        
+        Returns:
+            Early response (redirect, 403, 429), or None to call the view
+        """
+        # Public paths
+        if self._public_re.match(path):
+            return self._check_rate_limit(request)
+        
+        # Check authentication
+        if not request.user.is_authenticated:
+            if self._auth_re.match(path):
+                return redirect(f"{reverse('account_login')}?next={request.path}")
+            return self._check_rate_limit(request)
+        
+        # SECURITY: Check session idle timeout
+        idle_timeout_response = self._check_session_idle_timeout(request)
+        if idle_timeout_response:
+            return idle_timeout_response
+        
+        # Check if account is active
+        if not getattr(request.user, 'is_active', True):
+            return HttpResponse('Account deactivated.', status=403)
+        
+        # Admin paths
+        if self._admin_re.match(path):
+            if not request.user.is_superuser:
+                raise Http404()
+            return self._check_rate_limit(request)
+        
+        # Study paths
+        if self._study_path_re.match(path) or self._auth_re.match(path):
+            context = self._get_study_for_request(request, path)
             
-            return self._process_request(request)
+            if not context:
+                return redirect('select_study')
             
-        finally:
-            # Cleanup
-            clear_current_db()
-            self._cleanup_connections(request)
+            # Setup study context (one StudyAccessCache lookup)
+            self._setup_study_context(request, context)
+            study = context.study
+            set_current_db(study.db_name)
+            # Lock-free once registered (worker warm-up or first request)
+            study_db_manager.add_study_db(study.db_name)
+        
+        return self._check_rate_limit(request)
     
     # =========================================================================
     # Path Helpers
@@ -208,7 +273,9 @@ class UnifiedTenancyMiddleware:
         Check if session has been idle for too long.
         
         SECURITY: Logout inactive users to protect sensitive medical data.
-        Works with SESSION_SAVE_EVERY_REQUEST=True to track last activity.
+        Last activity is updated on every request; with the write-behind
+        session engine (Redis) that is a cache write, the database copy is
+        refreshed every SESSION_ACTIVITY_GRANULARITY seconds.
         
         Returns:
             HttpResponse if session expired, None otherwise
@@ -254,123 +321,65 @@ class UnifiedTenancyMiddleware:
     # Study Context
     # =========================================================================
     
-    def _get_study_for_request(self, request: HttpRequest, path: str) -> Optional[Study]:
-        """Get study from URL or session."""
+    def _get_study_for_request(self, request: HttpRequest, path: str) -> Optional[StudyAccessContext]:
+        """Get study access context from URL or session."""
         # Try URL first
         code = self._extract_study_code(path)
         if code:
-            study = self._get_study_by_code(request, code)
-            if study:
-                self._update_session(request, study)
-                return study
+            context = StudyAccessCache.resolve(request.user, code)
+            if context:
+                self._update_session(request, context.study)
+                return context
         
         # Fall back to session
         return self._get_study_from_session(request)
     
-    def _get_study_by_code(self, request: HttpRequest, code: str) -> Optional[Study]:
-        """Get study by code with caching."""
-        cache_key = f"{self.CACHE_PREFIX}study_{code}_{request.user.pk}"
-        study = cache.get(cache_key)
-        
-        if study is not None:
-            return study
-        
-        try:
-            study = Study.objects.select_related('created_by').get(
-                code=code,
-                memberships__user=request.user,
-                memberships__is_active=True,
-                status__in=[Study.Status.ACTIVE, Study.Status.PLANNING]
-            )
-            
-            # Ensure database is registered
-            if study.db_name not in connections.databases:
-                study_db_manager.add_study_db(study.db_name)
-            
-            cache.set(cache_key, study, self.CACHE_TTL)
-            return study
-            
-        except Study.DoesNotExist:
-            logger.debug(f"Study {code} not accessible by user {request.user.pk}")
-            return None
-        except Exception as e:
-            logger.error(f"Error loading study {code}: {type(e).__name__}")
-            return None
-    
-    def _get_study_from_session(self, request: HttpRequest) -> Optional[Study]:
-        """Get study from session with caching."""
-        # Request-level cache
-        if hasattr(request, '_study_cache'):
-            return request._study_cache
-        
-        study_id = request.session.get(self.STUDY_ID_KEY)
-        if not study_id:
-            return None
-        
-        # Django cache
-        cache_key = f"{self.CACHE_PREFIX}study_id_{study_id}_{request.user.pk}"
-        study = cache.get(cache_key)
-        
-        if study is None:
-            try:
-                study = Study.objects.select_related('created_by').get(
-                    id=study_id,
-                    memberships__user=request.user,
-                    memberships__is_active=True,
-                    status__in=[Study.Status.ACTIVE, Study.Status.PLANNING]
-                )
-                
-                if study.db_name not in connections.databases:
-                    study_db_manager.add_study_db(study.db_name)
-                
-                cache.set(cache_key, study, self.CACHE_TTL)
-                
-            except Study.DoesNotExist:
-                # Clear invalid session
-                self._clear_session_study(request)
-                return None
-            except Exception as e:
-                logger.error(f"Error loading study {study_id}: {type(e).__name__}")
+    def _get_study_from_session(self, request: HttpRequest) -> Optional[StudyAccessContext]:
+        """Get study access context of the session's current study."""
+        code = request.session.get(self.STUDY_CODE_KEY)
+        if not code:
+            study_id = request.session.get(self.STUDY_ID_KEY)
+            if not study_id:
                 return None
+            # Sessions written before the study code was stored
+            code = Study.objects.filter(pk=study_id).values_list('code', flat=True).first()
         
-        request._study_cache = study
-        return study
+        context = StudyAccessCache.resolve(request.user, code)
+        if context is None:
+            # Clear invalid session
+            self._clear_session_study(request)
+        return context
     
     def _update_session(self, request: HttpRequest, study: Study) -> None:
-        """Update session with study info."""
-        request.session[self.STUDY_ID_KEY] = study.pk
-        request.session[self.STUDY_CODE_KEY] = study.code
-        request.session[self.STUDY_DB_KEY] = study.db_name
-        request.session.modified = True
+        """Update session with study info (no session write if unchanged)."""
+        values = {
+            self.STUDY_ID_KEY: study.pk,
+            self.STUDY_CODE_KEY: study.code,
+            self.STUDY_DB_KEY: study.db_name,
+        }
+        for key, value in values.items():
+            if request.session.get(key) != value:
+                request.session[key] = value
     
     def _clear_session_study(self, request: HttpRequest) -> None:
         """Clear study from session."""
         for key in (self.STUDY_ID_KEY, self.STUDY_CODE_KEY, self.STUDY_DB_KEY):
             request.session.pop(key, None)
     
-    def _setup_study_context(self, request: HttpRequest, study: Study) -> None:
-        """Setup study context on request."""
+    def _setup_study_context(self, request: HttpRequest, context: StudyAccessContext) -> None:
+        """Setup study context on request (access tracked by StudyAccessCache)."""
+        study = context.study
         request.study = study
         request.study_code = study.code
         request.study_id = study.pk
         request.study_db = study.db_name
         
-        # Lazy load permissions and site access
-        from .utils import TenancyUtils
-        request.study_permissions = SimpleLazyObject(
-            lambda: TenancyUtils.get_user_permissions(request.user, study)
-        )
-        
-        # Get site access info (includes can_access_all_sites flag)
-        site_info = TenancyUtils.get_user_site_access(request.user, study)
-        request.can_access_all_sites = site_info['can_access_all']
-        request.user_sites = site_info['sites']
+        request.study_permissions = set(context.permissions)
+        request.can_access_all_sites = context.can_access_all
+        request.user_sites = list(context.sites)
         
         # Also set selected_site_id from session (for single site selection)
         request.selected_site_id = request.session.get('selected_site_id', 'all')
-        
-        # Track access
-        TenancyUtils.track_study_access(request.user, study)
     
     # =========================================================================
     # Request Processing
@@ -379,32 +388,27 @@ class UnifiedTenancyMiddleware:
     def _handle_static(self, request: HttpRequest) -> HttpResponse:
         """Handle static file requests."""
         response = self.get_response(request)
+        self._add_static_headers(response)
+        return response
+    
+    def _add_static_headers(self, response: HttpResponse) -> None:
         response['Cache-Control'] = 'public, max-age=31536000, immutable'
         response['Vary'] = 'Accept-Encoding'
-        return response
     
-    def _process_request(self, request: HttpRequest) -> HttpResponse:
-        """Process request and add headers."""
-        # Rate limit write operations
-        rate_limit_response = self._check_rate_limit(request)
-        if rate_limit_response:
-            return rate_limit_response
-        
-        response = self.get_response(request)
-        
+    def _finalize_response(self, request: HttpRequest, response: HttpResponse) -> None:
+        """Add performance, security and cache headers."""
         self._add_performance_headers(request, response)
         self._add_security_headers(response)
         self._add_cache_headers(request, response)
-        
-        return response
     
     def _check_rate_limit(self, request: HttpRequest) -> Optional[HttpResponse]:
         """
         Check rate limit for write operations (POST, PUT, DELETE, PATCH).
         
-        Rate limits:
-        - Anonymous users: 10 requests per minute
-        - Authenticated users: 60 requests per minute
+        Rate limits (sliding window, see RateLimiter):
+        - Endpoints listed in API_RATE_LIMIT_POLICIES: their own policy
+        - Anonymous users: API_RATE_LIMITS['anonymous'] per window (10/min)
+        - Authenticated users: API_RATE_LIMITS['authenticated'] per window (60/min)
         - Superusers: No limit
         
         Returns:
@@ -426,43 +430,28 @@ class UnifiedTenancyMiddleware:
         ip = request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')[0].strip() or \
              request.META.get('REMOTE_ADDR', 'unknown')
         
-        if request.user.is_authenticated:
-            key = f"{self.CACHE_PREFIX}rate:{request.user.id}"
-            max_requests = 60  # 60 requests per minute for authenticated users
-        else:
-            key = f"{self.CACHE_PREFIX}rate:anon:{ip}"
-            max_requests = 10  # 10 requests per minute for anonymous users
+        identity = f"user:{request.user.id}" if request.user.is_authenticated else f"anon:{ip}"
+        policy_name = RateLimiter.policy_for_path(request.path)
+        if policy_name is None:
+            policy_name = 'write_user' if request.user.is_authenticated else 'write_anon'
         
-        window = 60  # 1 minute window
+        result = RateLimiter.hit(RateLimiter.get_policy(policy_name), identity)
+        if result.allowed:
+            return None
         
-        # Get current count
-        count = cache.get(key, 0)
+        logger.warning(
+            f"Rate limit exceeded: user={getattr(request.user, 'username', 'anon')} "
+            f"ip={ip} path={request.path} policy={policy_name} count={result.count}"
+        )
         
-        if count >= max_requests:
-            logger.warning(
-                f"Rate limit exceeded: user={getattr(request.user, 'username', 'anon')} "
-                f"ip={ip} path={request.path} count={count}"
-            )
-            
-            # Send async alert for repeated violations
-            if count % 10 == 0:  # Every 10 violations
-                self._send_rate_limit_alert(request, ip, count)
-            
-            return HttpResponse(
-                'Quá nhiều yêu cầu. Vui lòng thử lại sau.',
-                status=429,
-                headers={
-                    'Retry-After': str(window),
-                    'X-RateLimit-Limit': str(max_requests),
-                    'X-RateLimit-Remaining': '0',
-                    'X-RateLimit-Reset': str(window),
-                }
-            )
-        
-        # Increment counter
-        cache.set(key, count + 1, window)
+        # Alert (throttled to once per 5 minutes per IP)
+        self._send_rate_limit_alert(request, ip, result.count)
         
-        return None
+        return HttpResponse(
+            'Quá nhiều yêu cầu. Vui lòng thử lại sau.',
+            status=429,
+            headers=result.headers(),
+        )
     
     def _send_rate_limit_alert(self, request: HttpRequest, ip: str, count: int) -> None:
         """Send async alert for rate limit violations."""
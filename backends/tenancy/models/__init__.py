@@ -1,8 +1,10 @@
 from .user import User
 from .study import Study, Site, StudySite
 from .permission import StudyMembership
+from .export import ExportJob
 
 __all__ = [
     'User',
     'Study', 'Site', 'StudySite',
-    'StudyMembership']
\ No newline at end of file
+    'StudyMembership',
+    'ExportJob']
\ No newline at end of file
@@ -0,0 +1,130 @@
+# backend/tenancy/models/export.py
+"""
+ExportJob model - Background data exports
+"""
+from django.db import models
+from django.conf import settings
+from django.utils import timezone
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ExportJob(models.Model):
+    """
+    Background export job
+
+    Created by the export page, built by a Celery task off the request path.
+    The artifact is kept in the export file store until expires_at.
+    Direct (non-background) exports are recorded too, without a stored file,
+    so they show up under Recent Exports.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        RUNNING = 'running', 'Running'
+        COMPLETED = 'completed', 'Completed'
+        FAILED = 'failed', 'Failed'
+        EXPIRED = 'expired', 'Expired'
+
+    class Format(models.TextChoices):
+        EXCEL = 'excel', 'Excel (.xlsx)'
+        CSV = 'csv', 'CSV (.csv)'
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="export_jobs",
+        verbose_name="User"
+    )
+
+    study = models.ForeignKey(
+        'Study',
+        on_delete=models.CASCADE,
+        related_name="export_jobs",
+        verbose_name="Study"
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+        db_index=True
+    )
+
+    export_format = models.CharField(
+        max_length=10,
+        choices=Format.choices,
+        default=Format.EXCEL
+    )
+
+    # Export parameters: crfs, start_date, end_date, include_sensitive,
+    # site_filter, filter_type
+    params = models.JSONField(default=dict, blank=True)
+
+    # Per-CRF progress: {"SCR_CASE": {"status": "done", "rows": 120}, ...}
+    progress = models.JSONField(default=dict, blank=True)
+    total_crfs = models.PositiveIntegerField(default=0)
+    completed_crfs = models.PositiveIntegerField(default=0)
+
+    filename = models.CharField(max_length=255, blank=True)
+    file_path = models.CharField(
+        max_length=500,
+        blank=True,
+        help_text="Path relative to EXPORT_STORAGE_ROOT"
+    )
+    file_size = models.BigIntegerField(default=0)
+    error_message = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        db_table = "export_jobs"
+        verbose_name = "Export Job"
+        verbose_name_plural = "Export Jobs"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'study', '-created_at']),
+            models.Index(fields=['status', 'expires_at']),
+        ]
+
+    def __str__(self):
+        return f"Export #{self.pk} ({self.study_id}) - {self.status}"
+
+    @property
+    def percent_complete(self) -> int:
+        if self.status == self.Status.COMPLETED:
+            return 100
+        if not self.total_crfs:
+            return 0
+        return int(self.completed_crfs * 100 / self.total_crfs)
+
+    @property
+    def is_downloadable(self) -> bool:
+        return (
+            self.status == self.Status.COMPLETED
+            and bool(self.file_path)
+            and (self.expires_at is None or self.expires_at > timezone.now())
+        )
+
+    @property
+    def file_size_display(self) -> str:
+        return f'{round(self.file_size / (1024 * 1024), 2)} MB'
+
+    def to_status_dict(self) -> dict:
+        """Payload for the polling endpoint"""
+        return {
+            'id': self.pk,
+            'status': self.status,
+            'percent': self.percent_complete,
+            'total_crfs': self.total_crfs,
+            'completed_crfs': self.completed_crfs,
+            'progress': self.progress,
+            'filename': self.filename,
+            'file_size': self.file_size_display if self.file_size else '',
+            'error': self.error_message,
+            'downloadable': self.is_downloadable,
+        }
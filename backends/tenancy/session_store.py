@@ -0,0 +1,82 @@
+# backend/tenancy/session_store.py
+"""
+Write-behind session engine (cache first, coalesced database writes)
+
+SESSION_ENGINE = "backends.tenancy.session_store" (enabled with Redis, see
+settings). Based on Django's cached_db engine:
+
+- Reads: from the cache; the database only on a cache miss
+- Writes that change session data (login, study switch, messages, ...):
+  written through to the database immediately, as with cached_db
+- Writes that only touch activity keys (_last_activity, updated by
+  UnifiedTenancyMiddleware on every request): cache only; the database copy
+  is refreshed once it is SESSION_ACTIVITY_GRANULARITY seconds old
+
+Idle-timeout checks read the cached session, so they stay exact. If the
+cache entry is lost, the database copy is at most one granularity behind:
+the timeout can then only fire early, never late.
+
+The cache must be shared by all workers (Redis): a per-process cache would
+keep serving a session another worker has logged out.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+
+logger = logging.getLogger(__name__)
+
+# Keys whose changes alone never force a database write
+ACTIVITY_KEYS = frozenset({'_last_activity'})
+
+# Time of the last database write (stored in the session itself)
+DB_SAVED_AT_KEY = '_db_saved_at'
+
+
+class SessionStore(CachedDBStore):
+    """cached_db session store with write-behind for activity timestamps."""
+
+    cache_key_prefix = 'resync.sessions.write_behind'
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._persisted_state = None
+
+    @staticmethod
+    def _stable_state(data: dict) -> dict:
+        """Session data without activity bookkeeping."""
+        return {
+            key: value for key, value in data.items()
+            if key not in ACTIVITY_KEYS and key != DB_SAVED_AT_KEY
+        }
+
+    def load(self):
+        data = super().load()
+        # Cached and database copies only differ in activity keys
+        self._persisted_state = self.serializer().dumps(self._stable_state(data))
+        return data
+
+    def _needs_db_write(self) -> bool:
+        if self._persisted_state is None or self.session_key is None:
+            return True
+
+        data = self._get_session()
+        if self.serializer().dumps(self._stable_state(data)) != self._persisted_state:
+            return True
+
+        granularity = getattr(settings, 'SESSION_ACTIVITY_GRANULARITY', 60)
+        return time.time() - data.get(DB_SAVED_AT_KEY, 0) >= granularity
+
+    def save(self, must_create=False):
+        if not must_create and not self._needs_db_write():
+            # Activity only: cache now, database within SESSION_ACTIVITY_GRANULARITY
+            try:
+                self._cache.set(self.cache_key, self._session, self.get_expiry_age())
+                return
+            except Exception:
+                logger.exception("Error saving session activity to cache, writing to database")
+
+        self._get_session(no_load=must_create)[DB_SAVED_AT_KEY] = time.time()
+        super().save(must_create)
+        self._persisted_state = self.serializer().dumps(self._stable_state(self._session))
@@ -5,7 +5,8 @@ from django.conf import settings
 from django.contrib.auth.signals import user_login_failed
 from django.core.cache import cache
 from django.db import connections
-from django.db.models.signals import post_migrate, post_save
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 from typing import Any, Optional
@@ -251,6 +252,79 @@ class DatabaseConnectionManager:
 # TenancyUtils.clear_user_cache(user) / TenancyUtils.clear_study_cache(study)
 
 
+# ==========================================
+# STUDY ACCESS CONTEXT INVALIDATION
+# ==========================================
+# StudyAccessCache (utils/access_context.py) caches study + permissions +
+# sites per (user, study); drop entries when any of their sources change.
+
+@receiver(post_save, sender='tenancy.StudyMembership')
+@receiver(post_delete, sender='tenancy.StudyMembership')
+def invalidate_access_on_membership_change(sender, instance, raw=False, **kwargs):
+    """Membership created / changed (role, active, all sites) / deleted"""
+    if raw:
+        return
+    try:
+        from backends.tenancy.utils.access_context import StudyAccessCache
+        StudyAccessCache.invalidate_on_commit([(instance.user_id, instance.study.code)])
+    except Exception as e:
+        logger.error(f"Error invalidating study access: {e}")
+
+
+@receiver(m2m_changed, sender='tenancy.StudyMembership_study_sites')
+def invalidate_access_on_membership_sites(sender, instance, action, reverse, **kwargs):
+    """Sites assigned to a membership changed"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    from backends.tenancy.utils.access_context import StudyAccessCache
+    if reverse:
+        # instance is a StudySite
+        StudyAccessCache.invalidate_memberships_on_commit(study_id=instance.study_id)
+    else:
+        StudyAccessCache.invalidate_on_commit([(instance.user_id, instance.study.code)])
+
+
+@receiver(post_save, sender='tenancy.StudySite')
+@receiver(post_delete, sender='tenancy.StudySite')
+def invalidate_access_on_study_site(sender, instance, raw=False, **kwargs):
+    """Site added to / removed from a study (all-sites members)"""
+    if raw:
+        return
+    from backends.tenancy.utils.access_context import StudyAccessCache
+    StudyAccessCache.invalidate_memberships_on_commit(study_id=instance.study_id)
+
+
+@receiver(post_save, sender='tenancy.Study')
+def invalidate_access_on_study(sender, instance, created, raw=False, **kwargs):
+    """Study status / database changed"""
+    if created or raw:
+        return
+    from backends.tenancy.utils.access_context import StudyAccessCache
+    StudyAccessCache.invalidate_memberships_on_commit(study_id=instance.pk)
+
+
+@receiver(post_save, sender='tenancy.Site')
+def invalidate_access_on_site(sender, instance, created, raw=False, **kwargs):
+    """Site code changed"""
+    if created or raw:
+        return
+    from backends.tenancy.utils.access_context import StudyAccessCache
+    StudyAccessCache.invalidate_memberships_on_commit(study__study_sites__site=instance)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_access_on_role_permissions(sender, instance, action, reverse, pk_set, **kwargs):
+    """Permissions of a role group changed"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    from backends.tenancy.utils.access_context import StudyAccessCache
+    if not reverse:
+        StudyAccessCache.invalidate_memberships_on_commit(group=instance)
+    elif pk_set:
+        # instance is a Permission, pk_set the groups
+        StudyAccessCache.invalidate_memberships_on_commit(group_id__in=list(pk_set))
+
+
 # ==========================================
 # UPDATED: STUDY DATABASE AUTO-CREATION
 # ==========================================
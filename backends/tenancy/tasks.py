@@ -6,6 +6,7 @@ Handles async operations like:
 - Database creation for new studies
 - Security alert emails
 - Permission syncing
+- Background data exports
 """
 import logging
 from celery import shared_task
@@ -183,3 +184,238 @@ def cleanup_expired_sessions_task():
     except Exception as e:
         logger.error(f"Error in cleanup task: {e}", exc_info=True)
         return {'status': 'error', 'message': str(e)}
+
+
+@shared_task(
+    bind=True,
+    max_retries=0,
+    acks_late=True,
+)
+def run_export_job_task(self, job_pk: int):
+    """
+    Build a data export off the request path.
+    
+    Per-CRF progress is written to ExportJob.progress after each table so
+    the export page can poll it. The artifact goes to ExportFileStore.
+    """
+    from django.utils import timezone
+    from backends.tenancy.models import ExportJob
+    from backends.tenancy.utils.export_store import ExportFileStore
+    from backends.studies.study_43en.services.export_service import (
+        CRFExportService,
+        build_export_filename,
+    )
+    
+    try:
+        job = ExportJob.objects.select_related('study').get(pk=job_pk)
+    except ExportJob.DoesNotExist:
+        logger.error(f"ExportJob with pk={job_pk} not found")
+        return {'status': 'error', 'message': 'Export job not found'}
+    
+    params = job.params
+    crfs = params.get('crfs', [])
+    
+    job.status = ExportJob.Status.RUNNING
+    job.started_at = timezone.now()
+    job.total_crfs = len(crfs)
+    job.progress = {name: {'status': 'pending', 'rows': 0} for name in crfs}
+    job.save(update_fields=['status', 'started_at', 'total_crfs', 'progress'])
+    
+    def on_table_done(table):
+        job.progress[table.name] = {
+            'status': 'skipped' if table.error else 'done',
+            'rows': table.row_count,
+        }
+        job.completed_crfs += 1
+        ExportJob.objects.filter(pk=job.pk).update(
+            progress=job.progress,
+            completed_crfs=job.completed_crfs,
+        )
+    
+    fileobj = None
+    relative_path = ''
+    try:
+        service = CRFExportService(
+            params.get('site_filter'),
+            params.get('filter_type'),
+            start_date=params.get('start_date'),
+            end_date=params.get('end_date'),
+            include_sensitive=params.get('include_sensitive', False),
+            progress_callback=on_table_done,
+        )
+        tables, skipped = service.build_tables(crfs)
+        
+        # CRFs without data / without site filtering are finished immediately
+        exported_names = {table.name for table in tables}
+        for name in crfs:
+            if name not in exported_names:
+                job.progress[name] = {
+                    'status': 'skipped' if name in skipped else 'empty',
+                    'rows': 0,
+                }
+        job.completed_crfs = len(crfs) - len(tables)
+        job.save(update_fields=['progress', 'completed_crfs'])
+        
+        if not tables:
+            job.status = ExportJob.Status.FAILED
+            job.error_message = 'No data found matching your filters!'
+            job.finished_at = timezone.now()
+            job.save(update_fields=['status', 'error_message', 'finished_at'])
+            return {'status': 'empty', 'job_id': job.pk}
+        
+        timestamp = timezone.localtime().strftime('%Y%m%d_%H%M%S')
+        job.filename = build_export_filename(
+            params.get('site_filter'), params.get('filter_type'), job.export_format, timestamp
+        )
+        
+        fileobj, relative_path = ExportFileStore.open_for_write(job)
+        if job.export_format == ExportJob.Format.EXCEL:
+            _, file_size = service.write_xlsx(tables, fileobj)
+        else:
+            file_size = service.write_csv(tables, fileobj)
+        fileobj.close()
+        
+        job.status = ExportJob.Status.COMPLETED
+        job.file_path = relative_path
+        job.file_size = file_size
+        job.finished_at = timezone.now()
+        job.expires_at = ExportFileStore.expiry_for_new_file()
+        job.save(update_fields=[
+            'status', 'filename', 'file_path', 'file_size', 'finished_at', 'expires_at'
+        ])
+        
+        ExportFileStore.enforce_user_quota(job.user_id, job.study_id)
+        
+        logger.info(
+            f"Export job {job.pk} completed: {len(tables)} CRFs, "
+            f"{job.file_size_display} ({job.filename})"
+        )
+        return {'status': 'success', 'job_id': job.pk, 'file_size': file_size}
+        
+    except Exception as e:
+        logger.error(f"Error in run_export_job_task ({job_pk}): {e}", exc_info=True)
+        if fileobj is not None and not fileobj.closed:
+            fileobj.close()
+        ExportFileStore.delete_file(relative_path)
+        ExportJob.objects.filter(pk=job.pk).update(
+            status=ExportJob.Status.FAILED,
+            error_message=str(e)[:500],
+            finished_at=timezone.now(),
+        )
+        return {'status': 'error', 'job_id': job.pk, 'message': str(e)}
+
+
+@shared_task
+def cleanup_expired_exports_task():
+    """
+    Periodic task to apply the export file retention policy.
+    """
+    try:
+        from backends.tenancy.utils.export_store import ExportFileStore
+        
+        stats = ExportFileStore.evict()
+        
+        if stats['expired'] or stats['evicted']:
+            logger.info(
+                f"Export store cleanup: expired={stats['expired']}, "
+                f"evicted={stats['evicted']}, freed={stats['bytes_freed']} bytes"
+            )
+        
+        return {'status': 'success', **stats}
+        
+    except Exception as e:
+        logger.error(f"Error in export cleanup task: {e}", exc_info=True)
+        return {'status': 'error', 'message': str(e)}
+
+
+@shared_task
+def recompute_followup_status_task(auto_miss: bool = False):
+    """
+    Periodic task to recompute study_43en follow-up statuses for today.
+    
+    Same rules as the follow-up tracking page (closed windows are not
+    marked MISSED); update_daily_status keeps its auto-miss.
+    """
+    try:
+        from backends.studies.study_43en.services.followup_status_service import (
+            FollowUpStatusService,
+        )
+        
+        service = FollowUpStatusService(auto_miss=auto_miss)
+        transitions = service.recompute()
+        
+        return {
+            'status': 'success',
+            'date': service.today.isoformat(),
+            'updated': sum(transitions.values()),
+            'transitions': {f"{source}->{target}": count for (source, target), count in transitions.items()},
+        }
+        
+    except Exception as e:
+        logger.error(f"Error recomputing follow-up statuses: {e}", exc_info=True)
+        return {'status': 'error', 'message': str(e)}
+
+
+@shared_task
+def seal_audit_chain_task():
+    """
+    Periodic task to seal complete blocks of the hash-chained audit logs.
+    """
+    from backends.audit_logs.utils.chain import AuditChain, chained_studies
+    
+    sealed = {}
+    for app_label, db_alias in chained_studies().items():
+        try:
+            sealed[app_label] = AuditChain(app_label, db_alias).seal()
+        except Exception as e:
+            logger.error(f"Error sealing audit chain of {app_label}: {e}", exc_info=True)
+            sealed[app_label] = 'error'
+    
+    return {'status': 'success', 'sealed': sealed}
+
+
+@shared_task
+def drain_audit_outbox_task(app_label: str = None):
+    """
+    Write queued audit entries of the async audit writer.
+    
+    Scheduled after each commit that queued entries (debounced per study)
+    and every minute by celery beat for anything left behind.
+    """
+    from backends.audit_logs.utils.outbox import AuditOutboxWriter, outbox_studies
+    
+    studies = outbox_studies()
+    if app_label is not None:
+        studies = {app_label: studies[app_label]} if app_label in studies else {}
+    
+    drained = {}
+    for label, db_alias in studies.items():
+        try:
+            drained[label] = AuditOutboxWriter(label, db_alias).drain()
+        except Exception as e:
+            logger.error(f"Error draining audit outbox of {label}: {e}", exc_info=True)
+            drained[label] = 'error'
+    
+    return {'status': 'success', 'drained': drained}
+
+
+@shared_task
+def maintain_audit_partitions_task():
+    """
+    Periodic task to create the coming months' audit log partitions.
+    
+    Only touches study databases whose audit_log is already partitioned.
+    """
+    from backends.audit_logs.utils.partitioning import AuditPartitionManager, study_databases
+    
+    created = {}
+    for app_label, db_alias in study_databases().items():
+        try:
+            manager = AuditPartitionManager(app_label, db_alias)
+            if manager.is_partitioned():
+                created[app_label] = manager.ensure_partitions()
+        except Exception as e:
+            logger.error(f"Error maintaining audit partitions of {app_label}: {e}", exc_info=True)
+            created[app_label] = 'error'
+    
+    return {'status': 'success', 'created': created}
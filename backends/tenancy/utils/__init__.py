@@ -5,6 +5,10 @@ from .tenancy_utils import TenancyUtils, validate_study_code, validate_database_
 from .role_manager import RoleTemplate, StudyRoleManager, initialize_study_roles, sync_study_permissions
 from .role_checker import RoleChecker, get_user_role, check_permission, is_study_admin
 from .db_study_creator import DatabaseStudyCreator
+from .export_store import ExportFileStore
+from .dashboard_cache import DashboardCache
+from .rate_limiter import RateLimiter, RateLimitPolicy
+from .access_context import StudyAccessCache, StudyAccessContext
 
 __all__ = [
     # Main utilities
@@ -25,6 +29,19 @@ __all__ = [
     # Database
     'DatabaseStudyCreator',
     
+    # Export file store
+    'ExportFileStore',
+    
+    # Dashboard response cache
+    'DashboardCache',
+    
+    # Rate limiting
+    'RateLimiter',
+    'RateLimitPolicy',
+    
+    # Study access context (middleware)
+    'StudyAccessCache',
+    'StudyAccessContext',
     
     # Validators
     'validate_study_code',
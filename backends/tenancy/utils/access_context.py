@@ -0,0 +1,280 @@
+"""
+Study Access Context - everything a study request needs about (user, study).
+
+One object instead of separate lookups for the study, the user's
+permissions, site access and access tracking:
+
+    L1  in-process LRU, STUDY_ACCESS_L1_TTL seconds    no round trip
+    L2  Django cache                                  1 get_many (context + tracking throttle)
+    DB  on L2 miss                                    1 query (membership + study + arrays)
+
+Entries are invalidated (after commit) when a membership, its sites, a study,
+a study site, a site code or a role's permissions change (signals.py).
+Other processes' L1 entries expire within STUDY_ACCESS_L1_TTL.
+
+Usage:
+    context = StudyAccessCache.resolve(request.user, '43EN')
+    if context:
+        context.study, context.permissions, context.sites, context.can_access_all
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import OuterRef, Value
+from django.db.models.functions import Concat, Lower
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StudyAccessContext:
+    """Study + what the user may do and see in it."""
+    study: Any
+    permissions: FrozenSet[str]
+    sites: Tuple[str, ...]
+    can_access_all: bool
+
+    @property
+    def site_access(self) -> Dict:
+        """Same shape as TenancyUtils.get_user_site_access()."""
+        return {
+            'can_access_all': self.can_access_all,
+            'sites': list(self.sites),
+            'membership_active': True,
+        }
+
+
+class StudyAccessCache:
+    """
+    Two-level cache of StudyAccessContext, keyed by (user, study code).
+    """
+
+    CACHE_TTL = 300  # 5 minutes
+    CACHE_PREFIX = 'tenancy_ctx_'
+    TRACK_INTERVAL = 300  # last_study_accessed update at most every 5 minutes
+    L1_MAX_SIZE = 2048
+
+    # (user pk, study code) -> [expires at, context, access tracked]
+    _l1: 'OrderedDict[Tuple[int, str], list]' = OrderedDict()
+    _lock = threading.Lock()
+
+    # =========================================================================
+    # Cache Helpers
+    # =========================================================================
+
+    @classmethod
+    def _cache_key(cls, *parts) -> str:
+        """Generate cache key."""
+        key = '_'.join(str(p) for p in parts)
+        if len(key) > 200:
+            key = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return f"{cls.CACHE_PREFIX}{key}"
+
+    @staticmethod
+    def _l1_ttl() -> float:
+        return getattr(settings, 'STUDY_ACCESS_L1_TTL', 5)
+
+    @classmethod
+    def _l1_get(cls, key: Tuple[int, str]) -> Optional[list]:
+        with cls._lock:
+            entry = cls._l1.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del cls._l1[key]
+                return None
+            cls._l1.move_to_end(key)
+            return entry
+
+    @classmethod
+    def _l1_put(cls, key: Tuple[int, str], context: StudyAccessContext, tracked: bool) -> None:
+        ttl = cls._l1_ttl()
+        if ttl <= 0:
+            return
+        with cls._lock:
+            cls._l1[key] = [time.monotonic() + ttl, context, tracked]
+            cls._l1.move_to_end(key)
+            while len(cls._l1) > cls.L1_MAX_SIZE:
+                cls._l1.popitem(last=False)
+
+    # =========================================================================
+    # Lookup
+    # =========================================================================
+
+    @classmethod
+    def resolve(cls, user, code: str) -> Optional[StudyAccessContext]:
+        """
+        Access context of an active/planning study the user is an active member of.
+
+        Also tracks the access (User.last_study_accessed*, throttled).
+
+        Returns:
+            StudyAccessContext, or None when the user has no access
+        """
+        if not user or not user.is_authenticated or not code:
+            return None
+
+        l1_key = (user.pk, code)
+        entry = cls._l1_get(l1_key)
+
+        if entry is not None:
+            _, context, tracked = entry
+        else:
+            context_key = cls._cache_key(user.pk, code)
+            track_key = cls._cache_key(user.pk, code, 'tracked')
+            try:
+                values = cache.get_many([context_key, track_key])
+            except Exception as e:
+                logger.warning(f"Study access cache unavailable: {e}")
+                values = {}
+
+            context = values.get(context_key)
+            tracked = track_key in values
+
+            if context is None:
+                context = cls._build(user, code)
+                if context is None:
+                    return None
+                cache.set(context_key, context, cls.CACHE_TTL)
+
+            cls._l1_put(l1_key, context, tracked)
+
+        if not tracked:
+            cls._track_access(user, context.study)
+
+        return context
+
+    @classmethod
+    def peek(cls, user_pk: int, code: str) -> Optional[StudyAccessContext]:
+        """L1 entry only (no round trip) - for helpers called later in the same request."""
+        entry = cls._l1_get((user_pk, code))
+        return entry[1] if entry is not None else None
+
+    @classmethod
+    def _build(cls, user, code: str) -> Optional[StudyAccessContext]:
+        """Context from the database in one query (PostgreSQL arrays)."""
+        from django.contrib.auth.models import Permission
+        from django.contrib.postgres.expressions import ArraySubquery
+
+        from backends.tenancy.models import Study, StudyMembership, StudySite
+
+        try:
+            membership = (
+                StudyMembership.objects
+                .filter(
+                    user=user,
+                    is_active=True,
+                    study__code=code,
+                    study__status__in=[Study.Status.ACTIVE, Study.Status.PLANNING],
+                )
+                .select_related('study', 'study__created_by')
+                .annotate(app_label=Concat(Value('study_'), Lower('study__code')))
+                .annotate(
+                    permission_codenames=ArraySubquery(
+                        Permission.objects.filter(
+                            group=OuterRef('group_id'),
+                            content_type__app_label=OuterRef('app_label'),
+                        ).values('codename')
+                    ),
+                    assigned_sites=ArraySubquery(
+                        StudySite.objects.filter(memberships=OuterRef('pk'))
+                        .values('site__code').order_by('site__code')
+                    ),
+                    all_sites=ArraySubquery(
+                        StudySite.objects.filter(study=OuterRef('study_id'))
+                        .values('site__code').order_by('site__code')
+                    ),
+                )
+                .first()
+            )
+        except Exception as e:
+            logger.error(f"Error loading study access {code}: {type(e).__name__}: {e}")
+            return None
+
+        if membership is None:
+            logger.debug(f"Study {code} not accessible by user {user.pk}")
+            return None
+
+        sites = membership.all_sites if membership.can_access_all_sites else membership.assigned_sites
+        return StudyAccessContext(
+            study=membership.study,
+            permissions=frozenset(membership.permission_codenames),
+            sites=tuple(dict.fromkeys(sites)),
+            can_access_all=membership.can_access_all_sites,
+        )
+
+    @classmethod
+    def _track_access(cls, user, study) -> None:
+        """Update User.last_study_accessed* (throttled)."""
+        try:
+            from backends.tenancy.models import User
+
+            User.objects.filter(pk=user.pk).update(
+                last_study_accessed_id=study.pk,
+                last_study_accessed_at=timezone.now()
+            )
+            cache.set(cls._cache_key(user.pk, study.code, 'tracked'), True, cls.TRACK_INTERVAL)
+
+        except Exception as e:
+            logger.debug(f"Error tracking access: {type(e).__name__}")
+
+        # Not before the L1 entry expires either way
+        with cls._lock:
+            entry = cls._l1.get((user.pk, study.code))
+            if entry is not None:
+                entry[2] = True
+
+    # =========================================================================
+    # Invalidation
+    # =========================================================================
+
+    @classmethod
+    def invalidate(cls, pairs: Iterable[Tuple[int, str]]) -> None:
+        """Drop the contexts of (user pk, study code) pairs (L1 of this process + L2)."""
+        pairs = set(pairs)
+        if not pairs:
+            return
+
+        with cls._lock:
+            for pair in pairs:
+                cls._l1.pop(pair, None)
+
+        try:
+            cache.delete_many([cls._cache_key(user_pk, code) for user_pk, code in pairs])
+        except Exception as e:
+            logger.warning(f"Study access cache invalidation failed: {e}")
+
+    @classmethod
+    def invalidate_memberships(cls, **filters) -> None:
+        """Drop the contexts of all memberships matching the filters (e.g. study=..., group_id=...)."""
+        from backends.tenancy.models import StudyMembership
+
+        cls.invalidate(
+            StudyMembership.objects.filter(**filters).values_list('user_id', 'study__code')
+        )
+
+    @classmethod
+    def invalidate_on_commit(cls, pairs: Iterable[Tuple[int, str]]) -> None:
+        """invalidate() once the current transaction commits (immediately in autocommit)."""
+        pairs = set(pairs)
+        transaction.on_commit(lambda: cls.invalidate(pairs))
+
+    @classmethod
+    def invalidate_memberships_on_commit(cls, **filters) -> None:
+        """invalidate_memberships() once the current transaction commits."""
+        transaction.on_commit(lambda: cls.invalidate_memberships(**filters))
+
+    @classmethod
+    def clear_local(cls) -> None:
+        """Clear this process' L1 (tests, benchmarks)."""
+        with cls._lock:
+            cls._l1.clear()
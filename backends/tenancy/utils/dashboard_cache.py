@@ -0,0 +1,321 @@
+"""
+Dashboard Cache - Shared response cache for dashboard JSON APIs.
+
+Dashboard numbers depend only on (study, site scope, data), not on the user,
+so responses are cached per:
+    study code + normalized site scope + today's date + data versions
+
+Data versions are per-table counters kept in the Django cache and bumped
+(after commit) by post_save/post_delete signals of the tracked models.
+Writes that bypass signals (QuerySet.update, bulk_create, raw SQL) must call
+DashboardCache.bump() themselves; entries also expire after RESPONSE_TTL as
+a safety net.
+
+Cached responses carry ETag / Last-Modified, so polling browsers get 304.
+
+cached_response() also works on async views; DashboardCache.async_view()
+turns a (cached) sync dashboard view into an ASGI-friendly async view.
+"""
+import hashlib
+import logging
+import time
+from functools import wraps
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+logger = logging.getLogger(__name__)
+
+
+class DashboardCache:
+    """
+    Versioned response cache for dashboard APIs.
+
+    Usage:
+        DashboardCache.track_models('db_study_43en', [SCR_CASE, ENR_CASE])
+
+        @DashboardCache.cached_response('43EN', 'db_study_43en', [SCR_CASE, ENR_CASE], scope=_site_scope)
+        def get_dashboard_stats_api(request):
+            ...
+    """
+
+    CACHE_PREFIX = 'dashboard_'
+    RESPONSE_TTL = 600  # 10 minutes
+
+    # =========================================================================
+    # Cache Helpers
+    # =========================================================================
+
+    @classmethod
+    def _cache_key(cls, *parts) -> str:
+        """Generate cache key."""
+        key = '_'.join(str(p) for p in parts)
+        if len(key) > 200:
+            key = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return f"{cls.CACHE_PREFIX}{key}"
+
+    @staticmethod
+    def _label(model) -> str:
+        return model if isinstance(model, str) else model._meta.label_lower
+
+    @classmethod
+    def _version_key(cls, db_alias: str, model) -> str:
+        return cls._cache_key('version', db_alias, cls._label(model))
+
+    @staticmethod
+    def normalize_scope(site_filter, filter_type) -> str:
+        """Same scope → same key, whatever the order of the site list."""
+        if filter_type == 'single' and site_filter and site_filter != 'all':
+            return f"site:{site_filter}"
+        if filter_type == 'multiple':
+            return 'sites:' + ','.join(sorted(site_filter or []))
+        return 'all'
+
+    # =========================================================================
+    # Data Versions
+    # =========================================================================
+
+    @classmethod
+    def get_versions(cls, db_alias: str, models: Iterable) -> Tuple[int, ...]:
+        """
+        Current data version of each model.
+
+        Missing counters are seeded with the current time (ms) rather than 1,
+        so a counter evicted from the cache never reuses an old version.
+        """
+        keys = [cls._version_key(db_alias, model) for model in models]
+        versions = cache.get_many(keys)
+
+        for key in keys:
+            if key not in versions:
+                cache.add(key, int(time.time() * 1000), None)
+                versions[key] = cache.get(key, 0)
+
+        return tuple(versions[key] for key in keys)
+
+    @classmethod
+    async def aget_versions(cls, db_alias: str, models: Iterable) -> Tuple[int, ...]:
+        """Async get_versions() (ASGI views)."""
+        keys = [cls._version_key(db_alias, model) for model in models]
+        versions = await cache.aget_many(keys)
+
+        for key in keys:
+            if key not in versions:
+                await cache.aadd(key, int(time.time() * 1000), None)
+                versions[key] = await cache.aget(key, 0)
+
+        return tuple(versions[key] for key in keys)
+
+    @classmethod
+    def bump(cls, db_alias: str, model):
+        """Invalidate every cached response that depends on this model."""
+        key = cls._version_key(db_alias, model)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, int(time.time() * 1000), None)
+
+    @classmethod
+    def bump_on_commit(cls, db_alias: str, model):
+        """Bump once the current transaction commits (immediately in autocommit)."""
+        transaction.on_commit(lambda: cls.bump(db_alias, model), using=db_alias)
+
+    @classmethod
+    def track_models(cls, db_alias: str, models: Iterable):
+        """Connect post_save/post_delete of the given models to bump_on_commit."""
+
+        def _bump(sender, raw=False, using=None, **kwargs):
+            if raw:
+                return
+            try:
+                cls.bump_on_commit(using or db_alias, sender)
+            except Exception as e:
+                # Never break a CRF save because of the dashboard cache
+                logger.error(f"Dashboard cache bump failed for {sender.__name__}: {e}", exc_info=True)
+
+        for model in models:
+            uid = f"dashboard_cache_{db_alias}_{cls._label(model)}"
+            post_save.connect(_bump, sender=model, weak=False, dispatch_uid=f"{uid}_save")
+            post_delete.connect(_bump, sender=model, weak=False, dispatch_uid=f"{uid}_delete")
+
+    # =========================================================================
+    # Response Cache
+    # =========================================================================
+
+    @classmethod
+    def response_key(cls, study_code: str, view_name: str, scope: str, versions: Tuple[int, ...]) -> str:
+        return cls._cache_key(
+            'response', study_code, view_name, scope,
+            timezone.localdate().isoformat(),
+            '.'.join(str(v) for v in versions),
+        )
+
+    @classmethod
+    def get_or_compute(cls, study_code: str, name: str, db_alias: str, models: Iterable,
+                       compute: Callable, scope: str = 'all'):
+        """
+        Cached value (not a response) keyed like cached_response().
+
+        For data shared by HTML views and APIs, e.g. the 44EN ward distribution.
+        Falls back to compute() when the cache is unavailable.
+        """
+        try:
+            versions = cls.get_versions(db_alias, [model for model in models if model is not None])
+            key = cls.response_key(study_code, name, scope, versions)
+            value = cache.get(key)
+        except Exception as e:
+            logger.warning(f"Dashboard cache unavailable for {name}: {e}")
+            return compute()
+
+        if value is None:
+            value = compute()
+            cache.set(key, value, cls.RESPONSE_TTL)
+        return value
+
+    @classmethod
+    def _build_response(cls, request, key: str, entry: dict) -> HttpResponse:
+        response = HttpResponse(entry['body'], content_type='application/json')
+        etag = quote_etag(hashlib.sha256(key.encode()).hexdigest()[:32])
+        response.headers['ETag'] = etag
+        response.headers['Last-Modified'] = http_date(entry['last_modified'])
+        response.headers['X-Dashboard-Cache'] = entry.get('status', 'HIT')
+        patch_cache_control(response, private=True, no_cache=True)
+
+        return get_conditional_response(
+            request, etag=etag, last_modified=entry['last_modified'], response=response
+        )
+
+    @classmethod
+    def cached_response(cls, study_code: str, db_alias: str, models: List,
+                        scope: Optional[Callable] = None):
+        """
+        Decorator caching a dashboard JSON view.
+
+        Args:
+            study_code: Study code (namespace of the key)
+            db_alias: Study database alias the models live in
+            models: Models the view reads (None entries are ignored)
+            scope: callable(request) -> (scope_key, error_response);
+                   error_response (e.g. site access denied) is returned as is.
+                   Default: single 'all' scope.
+        """
+        models = [model for model in models if model is not None]
+
+        def decorator(view_func):
+            view_name = view_func.__name__
+
+            if iscoroutinefunction(view_func):
+                return cls._async_cached(view_func, view_func, view_name, study_code, db_alias, models, scope)
+
+            @wraps(view_func)
+            def wrapper(request, *args, **kwargs):
+                scope_key = 'all'
+                if scope is not None:
+                    scope_key, error = scope(request)
+                    if error is not None:
+                        return error
+
+                try:
+                    versions = cls.get_versions(db_alias, models)
+                    key = cls.response_key(study_code, view_name, scope_key, versions)
+                    entry = cache.get(key)
+                except Exception as e:
+                    logger.warning(f"Dashboard cache unavailable for {view_name}: {e}")
+                    return view_func(request, *args, **kwargs)
+
+                if entry is not None:
+                    return cls._build_response(request, key, entry)
+
+                response = view_func(request, *args, **kwargs)
+
+                # Only cache successful payloads (errors are returned with 4xx/5xx)
+                if response.status_code != 200:
+                    return response
+
+                entry = {'body': response.content, 'last_modified': int(time.time())}
+                cache.set(key, entry, cls.RESPONSE_TTL)
+                return cls._build_response(request, key, {**entry, 'status': 'MISS'})
+
+            # Same cache, async lookups: the sync view only runs on a miss.
+            # No auth of its own - expose through DashboardCache.async_view()
+            wrapper._async_view = cls._async_cached(
+                view_func, sync_to_async(view_func), view_name, study_code, db_alias, models, scope
+            )
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def async_view(view):
+        """
+        ASGI variant of a dashboard API view (GET only, login required).
+
+        - Cached views (@cached_response): cache lookups are awaited, hits
+          never leave the event loop; the sync view only runs on a miss
+        - Other views: the whole sync view (with its own decorators) runs in
+          the request's thread-sensitive executor
+
+        Usage:
+            get_dashboard_stats_api_async = DashboardCache.async_view(get_dashboard_stats_api)
+        """
+        from django.contrib.auth.decorators import login_required
+        from django.views.decorators.http import require_GET
+
+        cached = getattr(view, '_async_view', None)
+        if cached is not None:
+            return require_GET(login_required(cached))
+
+        call_view = sync_to_async(view)
+
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            return await call_view(request, *args, **kwargs)
+
+        return wrapper
+
+    @classmethod
+    def _async_cached(cls, view_func, call_view, view_name: str, study_code: str,
+                      db_alias: str, models: List, scope: Optional[Callable]):
+        """
+        Async cached view (ASGI): cache hits are answered on the event loop.
+
+        call_view is the coroutine view, or the sync view wrapped in
+        sync_to_async (runs in the request's thread-sensitive executor).
+        Scope callables may read the session / ORM, so they run there too.
+        """
+
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            scope_key = 'all'
+            if scope is not None:
+                scope_key, error = await sync_to_async(scope)(request)
+                if error is not None:
+                    return error
+
+            try:
+                versions = await cls.aget_versions(db_alias, models)
+                key = cls.response_key(study_code, view_name, scope_key, versions)
+                entry = await cache.aget(key)
+            except Exception as e:
+                logger.warning(f"Dashboard cache unavailable for {view_name}: {e}")
+                return await call_view(request, *args, **kwargs)
+
+            if entry is not None:
+                return cls._build_response(request, key, entry)
+
+            response = await call_view(request, *args, **kwargs)
+
+            if response.status_code != 200:
+                return response
+
+            entry = {'body': response.content, 'last_modified': int(time.time())}
+            await cache.aset(key, entry, cls.RESPONSE_TTL)
+            return cls._build_response(request, key, {**entry, 'status': 'MISS'})
+
+        return async_wrapper
@@ -16,6 +16,8 @@ from psycopg.rows import dict_row
 
 from django.conf import settings
 
+from backends.tenancy.db_pool import StudyConnectionPools
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,7 +25,8 @@ class DatabaseStudyCreator:
     """
     PostgreSQL database and schema management.
     
-    Thread-safe with connection parameter caching.
+    Thread-safe with connection parameter caching. Connections are borrowed
+    from StudyConnectionPools (plain psycopg.connect unless STUDY_DB_POOL).
     """
     
     _env: Optional[environ.Env] = None
@@ -86,8 +89,8 @@ class DatabaseStudyCreator:
     def database_exists(cls, db_name: str) -> bool:
         """Check if database exists."""
         try:
-            with psycopg.connect(
-                **cls.get_connection_params('postgres'),
+            with StudyConnectionPools.connection(
+                cls.get_connection_params('postgres'),
                 autocommit=True
             ) as conn:
                 with conn.cursor() as cur:
@@ -118,8 +121,8 @@ class DatabaseStudyCreator:
                 return cls.ensure_all_schemas(db_name)
             
             try:
-                with psycopg.connect(
-                    **cls.get_connection_params('postgres'),
+                with StudyConnectionPools.connection(
+                    cls.get_connection_params('postgres'),
                     autocommit=True
                 ) as conn:
                     with conn.cursor() as cur:
@@ -159,8 +162,8 @@ class DatabaseStudyCreator:
         created = []
         
         try:
-            with psycopg.connect(
-                **cls.get_connection_params(db_name),
+            with StudyConnectionPools.connection(
+                cls.get_connection_params(db_name),
                 autocommit=True
             ) as conn:
                 current_user = conn.info.user
@@ -212,9 +215,12 @@ class DatabaseStudyCreator:
         if not cls.database_exists(db_name):
             return True, f"Database {db_name} does not exist"
         
+        # Idle pooled connections would block DROP DATABASE
+        StudyConnectionPools.close_database(db_name)
+        
         try:
-            with psycopg.connect(
-                **cls.get_connection_params('postgres'),
+            with StudyConnectionPools.connection(
+                cls.get_connection_params('postgres'),
                 autocommit=True
             ) as conn:
                 with conn.cursor() as cur:
@@ -247,7 +253,7 @@ class DatabaseStudyCreator:
             return None
         
         try:
-            with psycopg.connect(**cls.get_connection_params('postgres')) as conn:
+            with StudyConnectionPools.connection(cls.get_connection_params('postgres')) as conn:
                 conn.read_only = True
                 with conn.cursor(row_factory=dict_row) as cur:
                     cur.execute("""
@@ -277,7 +283,7 @@ class DatabaseStudyCreator:
     def get_schema_info(cls, db_name: str) -> Dict[str, Any]:
         """Get schema information."""
         try:
-            with psycopg.connect(**cls.get_connection_params(db_name)) as conn:
+            with StudyConnectionPools.connection(cls.get_connection_params(db_name)) as conn:
                 with conn.cursor(row_factory=dict_row) as cur:
                     cur.execute("""
                         SELECT 
@@ -302,9 +308,8 @@ class DatabaseStudyCreator:
     def test_connection(cls, db_name: str) -> Tuple[bool, str]:
         """Test database connection."""
         try:
-            with psycopg.connect(
-                **cls.get_connection_params(db_name),
-                connect_timeout=5
+            with StudyConnectionPools.connection(
+                {**cls.get_connection_params(db_name), 'connect_timeout': 5}
             ) as conn:
                 with conn.cursor() as cur:
                     cur.execute("SELECT version()")
@@ -0,0 +1,180 @@
+"""
+Export File Store - Local storage for background export artifacts.
+
+Files live under EXPORT_STORAGE_ROOT/<study_code>/<user_id>/.
+Retention policy:
+- Files expire EXPORT_RETENTION_HOURS after completion
+- Each user keeps at most EXPORT_MAX_FILES_PER_USER files per study
+- Total store size is capped at EXPORT_STORAGE_MAX_BYTES (oldest evicted first)
+"""
+import logging
+import os
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class ExportFileStore:
+    """Local file store with retention / eviction for ExportJob artifacts."""
+
+    DEFAULT_RETENTION_HOURS = 72
+    DEFAULT_MAX_FILES_PER_USER = 10
+    DEFAULT_MAX_BYTES = 5 * 1024 * 1024 * 1024  # 5 GB
+
+    # =========================================================================
+    # Configuration
+    # =========================================================================
+
+    @classmethod
+    def root(cls) -> Path:
+        root = getattr(settings, 'EXPORT_STORAGE_ROOT', None)
+        return Path(root) if root else Path(settings.BASE_DIR) / 'exports'
+
+    @classmethod
+    def retention(cls) -> timedelta:
+        hours = getattr(settings, 'EXPORT_RETENTION_HOURS', cls.DEFAULT_RETENTION_HOURS)
+        return timedelta(hours=hours)
+
+    @classmethod
+    def max_files_per_user(cls) -> int:
+        return getattr(settings, 'EXPORT_MAX_FILES_PER_USER', cls.DEFAULT_MAX_FILES_PER_USER)
+
+    @classmethod
+    def max_bytes(cls) -> int:
+        return getattr(settings, 'EXPORT_STORAGE_MAX_BYTES', cls.DEFAULT_MAX_BYTES)
+
+    # =========================================================================
+    # Paths
+    # =========================================================================
+
+    @classmethod
+    def relative_path(cls, job) -> str:
+        """Relative path for a job artifact (job id prefix keeps names unique)."""
+        return os.path.join(job.study.code, str(job.user_id), f"{job.pk}_{job.filename}")
+
+    @classmethod
+    def absolute_path(cls, relative_path: str) -> Path:
+        """Resolve a stored path, refusing anything outside the store root."""
+        root = cls.root().resolve()
+        path = (root / relative_path).resolve()
+        if root not in path.parents:
+            raise ValueError(f"Export path outside store: {relative_path}")
+        return path
+
+    @classmethod
+    def open_for_write(cls, job):
+        """Open the artifact file for a job; returns (fileobj, relative_path)."""
+        relative_path = cls.relative_path(job)
+        path = cls.absolute_path(relative_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return open(path, 'wb'), relative_path
+
+    @classmethod
+    def open_for_read(cls, job):
+        return open(cls.absolute_path(job.file_path), 'rb')
+
+    @classmethod
+    def delete_file(cls, relative_path: str) -> int:
+        """Delete an artifact; returns bytes freed."""
+        if not relative_path:
+            return 0
+        try:
+            path = cls.absolute_path(relative_path)
+            size = path.stat().st_size
+            path.unlink()
+            return size
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to delete export file {relative_path}: {e}")
+            return 0
+
+    @classmethod
+    def expiry_for_new_file(cls):
+        return timezone.now() + cls.retention()
+
+    # =========================================================================
+    # Eviction
+    # =========================================================================
+
+    @classmethod
+    def _expire(cls, job) -> int:
+        freed = cls.delete_file(job.file_path)
+        job.status = job.Status.EXPIRED
+        job.file_path = ''
+        job.save(update_fields=['status', 'file_path'])
+        return freed
+
+    @classmethod
+    def enforce_user_quota(cls, user_id: int, study_id: int) -> int:
+        """Keep only the newest max_files_per_user artifacts for a user/study."""
+        from backends.tenancy.models import ExportJob
+
+        stale = ExportJob.objects.filter(
+            user_id=user_id,
+            study_id=study_id,
+            status=ExportJob.Status.COMPLETED,
+        ).exclude(file_path='').order_by('-finished_at')[cls.max_files_per_user():]
+
+        return sum(cls._expire(job) for job in list(stale))
+
+    @classmethod
+    def evict(cls) -> Dict[str, int]:
+        """
+        Apply retention policy.
+
+        1. Expire artifacts past expires_at
+        2. Evict oldest artifacts while the store exceeds max_bytes
+        """
+        from backends.tenancy.models import ExportJob
+
+        now = timezone.now()
+        stats = {'expired': 0, 'evicted': 0, 'bytes_freed': 0}
+
+        expired = ExportJob.objects.filter(
+            status=ExportJob.Status.COMPLETED,
+            expires_at__lte=now,
+        ).exclude(file_path='')
+
+        for job in expired.iterator():
+            stats['bytes_freed'] += cls._expire(job)
+            stats['expired'] += 1
+
+        live = ExportJob.objects.filter(
+            status=ExportJob.Status.COMPLETED,
+        ).exclude(file_path='').order_by('finished_at')
+
+        total_bytes = sum(live.values_list('file_size', flat=True))
+        limit = cls.max_bytes()
+
+        if total_bytes > limit:
+            for job in live.iterator():
+                if total_bytes <= limit:
+                    break
+                total_bytes -= job.file_size
+                stats['bytes_freed'] += cls._expire(job)
+                stats['evicted'] += 1
+
+        return stats
+
+    @classmethod
+    def get_recent_exports(cls, user, study, limit: int = 5):
+        """Recent export jobs for the export page (newest first)."""
+        from backends.tenancy.models import ExportJob
+
+        return list(
+            ExportJob.objects.filter(user=user, study=study)
+            .order_by('-created_at')[:limit]
+        )
+
+    @classmethod
+    def get_job_for_user(cls, user, study, job_id) -> Optional[object]:
+        """The user's export job of this study (None for another study's job)."""
+        from backends.tenancy.models import ExportJob
+
+        return ExportJob.objects.filter(pk=job_id, user=user, study=study).select_related('study').first()
@@ -0,0 +1,306 @@
+# backends/tenancy/utils/rate_limiter.py
+"""
+Rate Limiter - Atomic sliding-window limiter shared by the tenancy middleware
+and the audit @rate_limit decorator.
+
+Algorithm (sliding window counter):
+    Each (policy, client) has one counter per fixed window. A request is
+    allowed while
+
+        previous_count * (1 - elapsed / window) + current_count < limit
+
+    so the limit applies to any `window` seconds, not just calendar windows,
+    and a denied request never restarts the window.
+
+Backends:
+- Redis (django-redis cache): one Lua script = one round trip per check.
+  Read, compare, INCR/EXPIRE and the hit/deny counters run atomically, so
+  concurrent POSTs cannot under-count.
+- Local memory (dev, non-Redis caches, Redis down): same algorithm per
+  process under a lock. After a Redis error the local backend is used for
+  REDIS_RETRY_AFTER seconds instead of waiting on socket timeouts.
+
+Policies (settings):
+    API_RATE_LIMITS / API_RATE_LIMIT_WINDOW   write_user / write_anon
+    API_RATE_LIMIT_POLICIES                   per endpoint / per decorator
+
+Usage:
+    result = RateLimiter.hit(RateLimiter.get_policy('write_user'), f"user:{user.id}")
+    if not result.allowed:
+        return HttpResponse(status=429, headers=result.headers())
+
+    RateLimiter.get_stats()   # {'write_user': {'allowed': 120, 'denied': 3}, ...}
+"""
+import logging
+import math
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+
+# Lua: KEYS = current window, previous window, stats hash
+#      ARGV = limit, weight of previous window (per mille), TTL, policy name
+_SLIDING_WINDOW_LUA = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local limit = tonumber(ARGV[1])
+local weight = tonumber(ARGV[2])
+
+if previous * weight + current * 1000 >= limit * 1000 then
+    redis.call('HINCRBY', KEYS[3], ARGV[4] .. ':denied', 1)
+    return {0, current, previous}
+end
+
+current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+redis.call('HINCRBY', KEYS[3], ARGV[4] .. ':allowed', 1)
+return {1, current, previous}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """Limit requests per sliding window of `window` seconds."""
+    name: str
+    limit: int
+    window: int = 60
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """Outcome of one RateLimiter.hit()."""
+    allowed: bool
+    policy: RateLimitPolicy
+    count: int          # Weighted requests in the sliding window (incl. this one if allowed)
+    retry_after: int    # Seconds until the current window rolls over
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.policy.limit - self.count)
+
+    def headers(self) -> Dict[str, str]:
+        """RFC 6585 / X-RateLimit-* response headers."""
+        headers = {
+            'X-RateLimit-Limit': str(self.policy.limit),
+            'X-RateLimit-Remaining': str(self.remaining),
+            'X-RateLimit-Reset': str(self.retry_after),
+        }
+        if not self.allowed:
+            headers['Retry-After'] = str(self.retry_after)
+        return headers
+
+
+class RateLimiter:
+    """
+    Process-wide rate limiter (class-level state, thread-safe).
+    """
+
+    KEY_PREFIX = 'ratelimit'
+    CACHE_ALIAS = 'default'
+    REDIS_RETRY_AFTER = 30  # seconds on the local backend after a Redis error
+    LOCAL_MAX_KEYS = 10000
+
+    _lock = threading.Lock()
+    _local_windows: Dict[str, List[int]] = {}   # client key -> [window id, current, previous]
+    _local_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {'allowed': 0, 'denied': 0})
+    _redis_script = None
+    _redis_down_until = 0.0
+
+    # =========================================================================
+    # Policies
+    # =========================================================================
+
+    @classmethod
+    def get_policy(cls, name: str, limit: Optional[int] = None, window: Optional[int] = None) -> RateLimitPolicy:
+        """
+        Policy by name; settings.API_RATE_LIMIT_POLICIES overrides the given defaults.
+
+        Built-in names:
+            write_user - authenticated writes (API_RATE_LIMITS['authenticated'])
+            write_anon - anonymous writes (API_RATE_LIMITS['anonymous'])
+        """
+        default_window = getattr(settings, 'API_RATE_LIMIT_WINDOW', 60)
+        rate_limits = getattr(settings, 'API_RATE_LIMITS', {})
+
+        if name == 'write_user':
+            limit = limit or rate_limits.get('authenticated', 60)
+        elif name == 'write_anon':
+            limit = limit or rate_limits.get('anonymous', 10)
+
+        override = getattr(settings, 'API_RATE_LIMIT_POLICIES', {}).get(name, {})
+        return RateLimitPolicy(
+            name=name,
+            limit=int(override.get('limit', limit or 60)),
+            window=int(override.get('window', window or default_window)),
+        )
+
+    @classmethod
+    def policy_for_path(cls, path: str) -> Optional[str]:
+        """Name of the endpoint policy whose 'paths' prefix matches (longest wins)."""
+        best_name, best_length = None, -1
+        for name, options in getattr(settings, 'API_RATE_LIMIT_POLICIES', {}).items():
+            for prefix in options.get('paths', ()):
+                if path.startswith(prefix) and len(prefix) > best_length:
+                    best_name, best_length = name, len(prefix)
+        return best_name
+
+    # =========================================================================
+    # Check
+    # =========================================================================
+
+    @classmethod
+    def hit(cls, policy: RateLimitPolicy, identity: str) -> RateLimitResult:
+        """
+        Count one request of `identity` (user id, IP, ...) against `policy`.
+
+        Denied requests are not counted, so a blocked client regains access
+        as soon as the window slides - it is not locked out by its retries.
+        """
+        now = time.time()
+        window_id, elapsed = divmod(now, policy.window)
+        window_id = int(window_id)
+        # Share of the previous window still inside the sliding window
+        # (rounded up: never under-count)
+        weight = math.ceil((1 - elapsed / policy.window) * 1000)
+        retry_after = max(1, math.ceil(policy.window - elapsed))
+
+        base_key = f"{cls.KEY_PREFIX}:{policy.name}:{identity}"
+
+        outcome = None
+        if now >= cls._redis_down_until:
+            outcome = cls._hit_redis(policy, base_key, window_id, weight)
+        if outcome is None:
+            outcome = cls._hit_local(policy, base_key, window_id, weight)
+
+        allowed, current, previous = outcome
+        count = math.ceil(previous * weight / 1000) + current
+        return RateLimitResult(allowed=allowed, policy=policy, count=count, retry_after=retry_after)
+
+    @classmethod
+    def _get_redis(cls):
+        """(redis client, registered script), or None when the cache is not Redis."""
+        try:
+            from django_redis import get_redis_connection
+        except ImportError:
+            return None
+
+        try:
+            client = get_redis_connection(cls.CACHE_ALIAS)
+        except NotImplementedError:
+            # Not a django-redis cache (locmem, database cache)
+            return None
+
+        if cls._redis_script is None:
+            cls._redis_script = client.register_script(_SLIDING_WINDOW_LUA)
+        return client, cls._redis_script
+
+    @classmethod
+    def _hit_redis(cls, policy: RateLimitPolicy, base_key: str, window_id: int,
+                   weight: int) -> Optional[Tuple[bool, int, int]]:
+        redis = cls._get_redis()
+        if redis is None:
+            cls._redis_down_until = float('inf')  # Cache backend never changes at runtime
+            return None
+
+        client, script = redis
+        cache = caches[cls.CACHE_ALIAS]
+        keys = [
+            cache.make_key(f"{base_key}:{window_id}"),
+            cache.make_key(f"{base_key}:{window_id - 1}"),
+            cache.make_key(f"{cls.KEY_PREFIX}:stats"),
+        ]
+        try:
+            allowed, current, previous = script(
+                keys=keys, args=[policy.limit, weight, policy.window * 2, policy.name], client=client
+            )
+        except Exception as e:
+            logger.warning(f"Rate limiter: Redis unavailable, using local memory for {cls.REDIS_RETRY_AFTER}s ({e})")
+            cls._redis_down_until = time.time() + cls.REDIS_RETRY_AFTER
+            return None
+
+        return bool(allowed), int(current), int(previous)
+
+    @classmethod
+    def _hit_local(cls, policy: RateLimitPolicy, base_key: str, window_id: int,
+                   weight: int) -> Tuple[bool, int, int]:
+        with cls._lock:
+            entry = cls._local_windows.get(base_key)
+
+            if entry is None or entry[0] < window_id - 1:
+                entry = [window_id, 0, 0]
+            elif entry[0] == window_id - 1:
+                entry = [window_id, 0, entry[1]]
+
+            _, current, previous = entry
+            allowed = previous * weight + current * 1000 < policy.limit * 1000
+            if allowed:
+                entry[1] = current = current + 1
+
+            if len(cls._local_windows) >= cls.LOCAL_MAX_KEYS and base_key not in cls._local_windows:
+                cls._prune_local(window_id)
+            cls._local_windows[base_key] = entry
+            cls._local_stats[policy.name]['allowed' if allowed else 'denied'] += 1
+
+        return allowed, current, previous
+
+    @classmethod
+    def _prune_local(cls, window_id: int) -> None:
+        """Drop windows that can no longer affect a decision (lock held)."""
+        for key in [key for key, entry in cls._local_windows.items() if entry[0] < window_id - 1]:
+            del cls._local_windows[key]
+        if len(cls._local_windows) >= cls.LOCAL_MAX_KEYS:
+            cls._local_windows.clear()
+
+    # =========================================================================
+    # Stats
+    # =========================================================================
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, Dict[str, int]]:
+        """
+        Allowed / denied counters per policy.
+
+        Redis counters are shared by all workers; local counters (dev, or
+        while Redis was down) are per process and added on top.
+        """
+        stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {'allowed': 0, 'denied': 0})
+
+        redis = cls._get_redis()
+        if redis is not None:
+            client, _ = redis
+            try:
+                raw = client.hgetall(caches[cls.CACHE_ALIAS].make_key(f"{cls.KEY_PREFIX}:stats"))
+            except Exception as e:
+                logger.warning(f"Rate limiter stats unavailable from Redis: {e}")
+                raw = {}
+            for field, value in raw.items():
+                field = field.decode() if isinstance(field, bytes) else field
+                name, _, outcome = field.rpartition(':')
+                if outcome in ('allowed', 'denied'):
+                    stats[name][outcome] += int(value)
+
+        with cls._lock:
+            for name, counters in cls._local_stats.items():
+                for outcome, value in counters.items():
+                    stats[name][outcome] += value
+
+        return dict(stats)
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        """Reset hit/deny counters (Redis and this process)."""
+        redis = cls._get_redis()
+        if redis is not None:
+            client, _ = redis
+            client.delete(caches[cls.CACHE_ALIAS].make_key(f"{cls.KEY_PREFIX}:stats"))
+        with cls._lock:
+            cls._local_stats.clear()
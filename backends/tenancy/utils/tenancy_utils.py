@@ -2,6 +2,8 @@
 Tenancy Utilities - Optimized with two-layer caching.
 
 Provides permission management, site access, and study tracking.
+Within a study request, permissions and site access come from the
+StudyAccessContext resolved by the middleware (see access_context.py).
 """
 import hashlib
 import logging
@@ -16,6 +18,8 @@ from django.core.exceptions import ValidationError
 from django.db.models import Prefetch
 from django.utils import timezone
 
+from .access_context import StudyAccessCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -57,6 +61,11 @@ class TenancyUtils:
         if not user or not study:
             return set()
         
+        # Resolved by the middleware for this request (no round trip)
+        context = StudyAccessCache.peek(user.pk, study.code)
+        if context is not None:
+            return set(context.permissions)
+        
         cache_key = cls._cache_key('perms', user.pk, study.pk)
         permissions = cache.get(cache_key)
         
@@ -136,6 +145,10 @@ class TenancyUtils:
         if not user or not study:
             return {'can_access_all': False, 'sites': [], 'membership_active': False}
         
+        context = StudyAccessCache.peek(user.pk, study.code)
+        if context is not None:
+            return context.site_access
+        
         cache_key = cls._cache_key('site_access', user.pk, study.pk)
         cached = cache.get(cache_key)
         
@@ -14,3 +14,9 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_asgi_application()
+
+# Pre-register active study databases once per worker, so requests never
+# take the registration lock (STUDY_DB_WARMUP=False to disable)
+from backends.tenancy.db_loader import warm_up_study_databases  # noqa: E402
+
+warm_up_study_databases()
@@ -0,0 +1,20 @@
+"""
+Celery app for the project.
+
+Tasks (@shared_task in backends/*/tasks.py) bind to this app; it reads the
+CELERY_* settings, including CELERY_BEAT_SCHEDULE.
+
+Usage:
+    celery -A config worker -l info
+    celery -A config beat -l info
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+app = Celery("config")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
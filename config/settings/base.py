@@ -14,6 +14,7 @@ from config.utils import (
     DatabaseConfig,
     build_fernet_keys,
     validate_salt_key,
+    validate_blind_index_key,
 )
 from .security import *  # noqa: F401, F403
 from .logging import LOGGING  # noqa: F401
@@ -129,6 +130,10 @@ DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
 DatabaseConfig.validate_config(DATABASES["default"], "default")
 
 # Load study databases
+# STUDY_DB_POOL=True: one shared psycopg_pool per study instead of one
+# persistent connection per thread. Sizing: STUDY_DB_POOL_MIN_SIZE,
+# STUDY_DB_POOL_MAX_SIZE, STUDY_DB_POOL_MAX_IDLE, STUDY_DB_POOL_TIMEOUT
+# (per study with a _<CODE> suffix, e.g. STUDY_DB_POOL_MAX_SIZE_43EN)
 from backends.studies.study_loader import get_study_databases
 
 study_databases = get_study_databases()
@@ -137,6 +142,9 @@ if study_databases:
 
 DATABASE_ROUTERS = ["backends.tenancy.db_router.TenantRouter"]
 
+# Pre-register active study databases at worker boot (wsgi.py / asgi.py)
+STUDY_DB_WARMUP = env.bool("STUDY_DB_WARMUP", default=True)
+
 # =============================================================================
 # CACHE & SESSION
 # =============================================================================
@@ -176,18 +184,32 @@ CACHE_MIDDLEWARE_ALIAS = "default"
 CACHE_MIDDLEWARE_SECONDS = 600
 CACHE_MIDDLEWARE_KEY_PREFIX = "resync"
 
+# Per-process cache of study access contexts (study + permissions + sites) in
+# seconds; changes made in another worker become visible after at most this long
+STUDY_ACCESS_L1_TTL = env.int("STUDY_ACCESS_L1_TTL", default=5)
+
 SESSION_COOKIE_NAME = env("SESSION_COOKIE_NAME", default="resync_sessionid")
-# Use database sessions (simpler, no cache dependency for critical auth)
-SESSION_ENGINE = "django.contrib.sessions.backends.db"
+# Sessions:
+# - Redis: cache-first write-behind engine - sessions are read from Redis, activity
+#   timestamps are written to Redis on every request and to the database at most every
+#   SESSION_ACTIVITY_GRANULARITY seconds; other session changes are written through
+# - No Redis: database sessions (a per-process cache cannot be shared by workers)
+if REDIS_ENABLED and REDIS_URL:
+    SESSION_ENGINE = "backends.tenancy.session_store"
+else:
+    SESSION_ENGINE = "django.contrib.sessions.backends.db"
+SESSION_ACTIVITY_GRANULARITY = env.int("SESSION_ACTIVITY_GRANULARITY", default=60)  # seconds
 SESSION_COOKIE_AGE = env.int("SESSION_COOKIE_AGE", default=28800)  # 8 hours
 SESSION_COOKIE_HTTPONLY = True
 SESSION_COOKIE_SECURE = not DEBUG
 SESSION_COOKIE_SAMESITE = "Lax"
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
-SESSION_SAVE_EVERY_REQUEST = True  # SECURITY: Update session on every request for idle timeout
+# UnifiedTenancyMiddleware updates _last_activity of authenticated sessions itself;
+# unchanged anonymous sessions are not re-saved
+SESSION_SAVE_EVERY_REQUEST = False
 
 # Session idle timeout (in seconds) - logout inactive users
-# This works with SESSION_SAVE_EVERY_REQUEST=True to track last activity
+# Last activity is tracked by UnifiedTenancyMiddleware on every request
 SESSION_IDLE_TIMEOUT = env.int("SESSION_IDLE_TIMEOUT", default=3600)  # 1 hour idle timeout
 
 # =============================================================================
@@ -411,6 +433,62 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 
+# Periodic tasks (config/celery.py; run `celery -A config beat` in production)
+CELERY_BEAT_SCHEDULE = {
+    "recompute-followup-status": {
+        "task": "backends.tenancy.tasks.recompute_followup_status_task",
+        "schedule": 60 * 60,  # hourly - statuses only change at day boundaries
+    },
+    "cleanup-expired-exports": {
+        "task": "backends.tenancy.tasks.cleanup_expired_exports_task",
+        "schedule": 60 * 60 * 6,
+    },
+    "seal-audit-chain": {
+        "task": "backends.tenancy.tasks.seal_audit_chain_task",
+        "schedule": 60 * 60,  # hourly - no-op unless AUDIT_HASH_CHAIN_STUDIES is set
+    },
+    "drain-audit-outbox": {
+        "task": "backends.tenancy.tasks.drain_audit_outbox_task",
+        "schedule": 60,  # safety net - commits trigger their own drain
+    },
+    "maintain-audit-partitions": {
+        "task": "backends.tenancy.tasks.maintain_audit_partitions_task",
+        "schedule": 60 * 60 * 24,  # daily - no-op until partition_audit_log --convert
+    },
+}
+
+# =============================================================================
+# DATA EXPORT
+# =============================================================================
+# Background export artifacts (ExportJob) - kept outside MEDIA_ROOT (not public)
+
+EXPORT_STORAGE_ROOT = env("EXPORT_STORAGE_ROOT", default=str(BASE_DIR / "exports"))
+EXPORT_RETENTION_HOURS = env.int("EXPORT_RETENTION_HOURS", default=72)
+EXPORT_MAX_FILES_PER_USER = env.int("EXPORT_MAX_FILES_PER_USER", default=10)
+EXPORT_STORAGE_MAX_BYTES = env.int("EXPORT_STORAGE_MAX_BYTES", default=5 * 1024 * 1024 * 1024)  # 5 GB
+
+# =============================================================================
+# AUDIT INTEGRITY VERIFICATION
+# =============================================================================
+# verify_audit_integrity checkpoints (watermark per study) and JSON reports
+
+AUDIT_VERIFICATION_ROOT = env("AUDIT_VERIFICATION_ROOT", default=str(BASE_DIR / "audit_reports"))
+
+# Hash-chained audit log (backends/audit_logs/utils/chain.py), e.g. "study_43en"
+AUDIT_HASH_CHAIN_STUDIES = env.list("AUDIT_HASH_CHAIN_STUDIES", default=[])
+AUDIT_CHAIN_BLOCK_SIZE = env.int("AUDIT_CHAIN_BLOCK_SIZE", default=1024)  # entries per signed checkpoint
+
+# Async audit writer (backends/audit_logs/utils/outbox.py), e.g. "study_43en"
+# Audit entries are queued in logging.audit_outbox with the CRF change and
+# written by a Celery worker (inline after commit when no broker is configured)
+AUDIT_OUTBOX_STUDIES = env.list("AUDIT_OUTBOX_STUDIES", default=[])
+AUDIT_OUTBOX_MAX_ATTEMPTS = env.int("AUDIT_OUTBOX_MAX_ATTEMPTS", default=5)  # failed drains before a row is parked
+
+# Monthly audit_log partitions and archival (backends/audit_logs/utils/partitioning.py)
+AUDIT_PARTITION_MONTHS_AHEAD = env.int("AUDIT_PARTITION_MONTHS_AHEAD", default=3)
+AUDIT_HOT_MONTHS = env.int("AUDIT_HOT_MONTHS", default=24)  # older months go to archive_audit_log
+AUDIT_ARCHIVE_ROOT = env("AUDIT_ARCHIVE_ROOT", default=str(BASE_DIR / "audit_archive"))
+
 # =============================================================================
 # RATE LIMITING
 # =============================================================================
@@ -430,6 +508,15 @@ API_RATE_LIMITS = {
 # Rate limit window in seconds
 API_RATE_LIMIT_WINDOW = env.int("API_RATE_LIMIT_WINDOW", default=60)
 
+# Per-endpoint policies (sliding window, backends/tenancy/utils/rate_limiter.py)
+# - "paths": URL prefixes limited by UnifiedTenancyMiddleware (longest prefix wins)
+# - names used by @rate_limit(key_prefix) override the decorator's arguments
+# Example:
+#     "login": {"limit": 10, "window": 60, "paths": ["/accounts/login/"]},
+#     "audit_update": {"limit": 5},
+# Hit/deny counters: python manage.py rate_limit_stats [--prometheus]
+API_RATE_LIMIT_POLICIES = {}
+
 # =============================================================================
 # ENCRYPTION & SECURITY KEYS
 # =============================================================================
@@ -446,6 +533,11 @@ FERNET_KEYS = build_fernet_keys(
 # Validation is handled by validate_salt_key() in config/utils.py
 SALT_KEY = validate_salt_key(env("SALT_KEY", default=None))
 
+# HMAC key for blind indexes (searchable hashes of encrypted PII fields)
+# Optional - derived from SECRET_KEY + SALT_KEY when unset.
+# Changing it requires: python manage.py rebuild_blind_indexes
+BLIND_INDEX_KEY = validate_blind_index_key(env("BLIND_INDEX_KEY", default=None))
+
 # Backup encryption (required in production, validated in prod.py)
 BACKUP_ENCRYPTION_PASSWORD = env("BACKUP_ENCRYPTION_PASSWORD", default=None)
 
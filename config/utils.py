@@ -4,7 +4,7 @@ Configuration utilities for database and study app management.
 import base64
 import logging
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +76,34 @@ def validate_salt_key(key: str, min_length: int = 32) -> str:
     return key
 
 
+def validate_blind_index_key(key: str, min_length: int = 32) -> str:
+    """
+    Validate the HMAC key used for blind indexes of encrypted fields.
+    
+    The key is optional: when empty, backends/studies/blind_index.py derives
+    one from SECRET_KEY + SALT_KEY.
+    
+    Args:
+        key: The blind index key to validate (may be empty)
+        min_length: Minimum required length (default: 32)
+        
+    Returns:
+        The validated key, or None if not set
+        
+    Raises:
+        ValueError: If the key is set but too short
+    """
+    if not key:
+        return None
+    
+    key = key.strip()
+    
+    if len(key) < min_length:
+        raise ValueError(f"BLIND_INDEX_KEY must be at least {min_length} characters for security.")
+    
+    return key
+
+
 def build_fernet_keys(primary_key: str, old_key: str = None) -> List[str]:
     """
     Build and validate list of Fernet keys for encryption/decryption.
@@ -296,6 +324,12 @@ class DatabaseConfig:
         
         conn_max_age = 0 if env.bool("DEBUG", default=False) else 300
         
+        # Pooled mode: one shared pool per study instead of one persistent
+        # connection per thread (Django requires CONN_MAX_AGE=0 with pools)
+        pool_options = cls.get_study_pool_options(db_name, env)
+        if pool_options:
+            conn_max_age = 0
+        
         # Query timeout: 30 seconds to prevent long-running queries blocking connections
         statement_timeout = env.int("STUDY_DB_STATEMENT_TIMEOUT", default=30000)
         
@@ -309,6 +343,8 @@ class DatabaseConfig:
             "keepalives_count": 3,
             "application_name": f"django_{db_name}",
         }
+        if pool_options:
+            options["pool"] = pool_options
         
         config = cls._build_config(
             db_name=db_name,
@@ -323,6 +359,50 @@ class DatabaseConfig:
         cls.validate_config(config, db_name)
         return config
 
+    @classmethod
+    def get_study_pool_options(cls, db_name: str, env) -> Optional[Dict]:
+        """
+        psycopg_pool options for a study database (Django OPTIONS['pool']).
+        
+        Disabled unless STUDY_DB_POOL=True. Sizes can be set per study with
+        a suffix, e.g. STUDY_DB_POOL_MAX_SIZE_43EN=8 overrides
+        STUDY_DB_POOL_MAX_SIZE for db_study_43en.
+        
+        Returns:
+            Pool options, or None when pooling is off or psycopg_pool is missing
+        """
+        if not env.bool("STUDY_DB_POOL", default=False):
+            return None
+        
+        try:
+            import psycopg_pool  # noqa: F401
+        except ImportError:
+            logger.warning("STUDY_DB_POOL is enabled but psycopg_pool is not installed")
+            return None
+        
+        prefix = env("STUDY_DB_PREFIX", default="db_study_")
+        code = db_name[len(prefix):].upper() if db_name.startswith(prefix) else db_name.upper()
+        
+        def _setting(name: str, default: int) -> int:
+            return env.int(f"{name}_{code}", default=env.int(name, default=default))
+        
+        min_size = _setting("STUDY_DB_POOL_MIN_SIZE", 1)
+        max_size = _setting("STUDY_DB_POOL_MAX_SIZE", 4)
+        if min_size < 0 or max_size < max(min_size, 1):
+            raise ValueError(
+                f"Invalid pool size for '{db_name}': min_size={min_size}, max_size={max_size}"
+            )
+        
+        return {
+            "name": db_name,
+            "min_size": min_size,
+            "max_size": max_size,
+            # Connections above min_size idle for longer than this are closed
+            "max_idle": _setting("STUDY_DB_POOL_MAX_IDLE", 300),
+            # Seconds a request waits for a free connection before failing
+            "timeout": _setting("STUDY_DB_POOL_TIMEOUT", 10),
+        }
+
     @classmethod
     def validate_config(cls, config: Dict, db_name: str = "default") -> None:
         """Validate database configuration has all required keys."""